@@ -0,0 +1,6 @@
+"""
+Benchmarks for the copy-trading system
+
+pipeline: end-to-end run of the real components against synthetic traffic
+kernels: micro-benchmarks for the scoring and risk math
+"""
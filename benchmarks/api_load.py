@@ -0,0 +1,178 @@
+"""
+API Concurrent Load Benchmark
+
+Fires requests from many concurrent clients at the dashboard API and
+reports throughput and latency percentiles.
+
+Two modes:
+
+- simulated (default): two in-process ASGI apps with the same endpoint
+  shape, served through httpx.ASGITransport. "blocking" runs its query
+  the way the API used to, synchronously inside an async handler;
+  "async" awaits it on a connection pool of --pool-size, the way the
+  endpoints do since they moved to src/api/db.py. Query time is fixed
+  with --query-ms, so the difference is purely event-loop blocking vs
+  pooled concurrency. Needs no database.
+- http: hits a running API at --base-url. Run it once per checkout
+  (before/after) against the same database to compare real numbers.
+
+Usage:
+    python3 -m benchmarks.api_load
+    python3 -m benchmarks.api_load --clients 50 --requests 1000 --query-ms 10 --pool-size 10
+    python3 -m benchmarks.api_load --base-url http://localhost:8000 --path /api/trades --path /api/whales
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import List, Optional, Sequence
+
+import httpx
+import numpy as np
+from fastapi import FastAPI
+
+
+@dataclass
+class LoadResult:
+    """Outcome of one load run"""
+    label: str
+    requests: int
+    errors: int
+    elapsed_s: float
+    requests_per_s: float
+    p50_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+def blocking_app(query_ms: float) -> FastAPI:
+    """Sync query inside an async handler: each request stalls the event loop"""
+    app = FastAPI()
+
+    @app.get("/api/trades")
+    async def get_trades():
+        time.sleep(query_ms / 1000)
+        return [{"id": 1}]
+
+    return app
+
+
+def async_app(query_ms: float, pool_size: int) -> FastAPI:
+    """Awaited query on a bounded pool: requests overlap up to pool_size"""
+    app = FastAPI()
+    pool = asyncio.Semaphore(pool_size)
+
+    @app.get("/api/trades")
+    async def get_trades():
+        async with pool:
+            await asyncio.sleep(query_ms / 1000)
+        return [{"id": 1}]
+
+    return app
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    paths: Sequence[str],
+    clients: int,
+    requests: int,
+    label: str = ""
+) -> LoadResult:
+    """Spread `requests` GETs over `clients` concurrent workers, cycling through paths"""
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                response = await client.get(paths[i % len(paths)])
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    samples = np.array(latencies) if latencies else np.zeros(1)
+    return LoadResult(
+        label=label,
+        requests=len(latencies),
+        errors=errors,
+        elapsed_s=elapsed,
+        requests_per_s=len(latencies) / elapsed if elapsed > 0 else 0.0,
+        p50_ms=float(np.percentile(samples, 50)),
+        p99_ms=float(np.percentile(samples, 99)),
+        max_ms=float(samples.max()),
+    )
+
+
+async def run_simulated(clients: int, requests: int, query_ms: float, pool_size: int) -> List[LoadResult]:
+    """Same load against the blocking and the async app"""
+    results = []
+    for label, app in (
+        ("blocking", blocking_app(query_ms)),
+        ("async", async_app(query_ms, pool_size)),
+    ):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            results.append(await run_load(client, ["/api/trades"], clients, requests, label))
+    return results
+
+
+async def run_http(base_url: str, paths: Sequence[str], clients: int, requests: int, timeout: float) -> LoadResult:
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        return await run_load(client, paths, clients, requests, label=base_url)
+
+
+def format_results(results: Sequence[LoadResult]) -> str:
+    lines = [
+        f"{'run':<24} {'req':>6} {'err':>5} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}",
+        "-" * 78,
+    ]
+    for r in results:
+        lines.append(
+            f"{r.label:<24} {r.requests:>6} {r.errors:>5} {r.requests_per_s:>10.1f} "
+            f"{r.p50_ms:>9.1f} {r.p99_ms:>9.1f} {r.max_ms:>9.1f}"
+        )
+    if len(results) == 2 and results[0].requests_per_s > 0:
+        lines.append(f"\nthroughput x{results[1].requests_per_s / results[0].requests_per_s:.1f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent load test for the dashboard API")
+    parser.add_argument("--clients", type=int, default=50, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=500, help="Total requests per run")
+    parser.add_argument("--query-ms", type=float, default=10.0, help="Simulated query time")
+    parser.add_argument("--pool-size", type=int, default=10, help="Simulated connection pool size")
+    parser.add_argument("--base-url", help="Load a running API instead of the simulation")
+    parser.add_argument("--path", action="append", dest="paths", help="Endpoint(s) to hit in http mode")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in http mode")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    if args.base_url:
+        paths = args.paths or ["/api/trades"]
+        results = [asyncio.run(run_http(args.base_url, paths, args.clients, args.requests, args.timeout))]
+    else:
+        results = asyncio.run(run_simulated(args.clients, args.requests, args.query_ms, args.pool_size))
+
+    if args.json:
+        print(json.dumps([asdict(r) for r in results], indent=2))
+    else:
+        print(format_results(results))
+    return 1 if any(r.errors for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Benchmark Baselines and Regression Checks
+
+Baselines are JSON files mapping a benchmark name to its recorded metrics
+and the configuration they were measured with. compare() checks a fresh
+result against one and reports every metric that moved the wrong way by
+more than the threshold.
+"""
+
+import json
+import os
+import platform
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+
+@dataclass
+class Regression:
+    metric: str
+    baseline: float
+    current: float
+    change_pct: float
+
+    def __str__(self) -> str:
+        return f"{self.metric}: {self.baseline:.4g} -> {self.current:.4g} ({self.change_pct:+.1f}%)"
+
+
+def load(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def best_of(runs: List[Dict[str, float]], higher_is_better: Optional[List[str]] = None) -> Dict[str, float]:
+    """Best value of each metric across repeated runs, the least noisy summary"""
+    higher_is_better = set(higher_is_better or ())
+    best: Dict[str, float] = {}
+    for metrics in runs:
+        for metric, value in metrics.items():
+            if metric not in best:
+                best[metric] = value
+            elif metric in higher_is_better:
+                best[metric] = max(best[metric], value)
+            else:
+                best[metric] = min(best[metric], value)
+    return best
+
+
+def save(path: str, name: str, metrics: Dict[str, float], config: Dict):
+    """Record metrics as the baseline for one benchmark name"""
+    baselines = load(path)
+    baselines[name] = {
+        "recorded_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "config": config,
+        "metrics": metrics,
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(current: Dict[str, float], baseline: Dict[str, float], threshold: float = 0.2,
+            higher_is_better: Optional[List[str]] = None, min_delta: float = 0.0) -> List[Regression]:
+    """
+    Metrics that regressed by more than `threshold` (0.2 = 20%).
+
+    Metrics are lower-is-better (latencies, timings) unless named in
+    higher_is_better (throughputs). Changes smaller than min_delta in
+    absolute terms are ignored so microsecond-scale stages don't flag on
+    scheduler noise. Metrics missing from either side are skipped.
+    """
+    higher_is_better = set(higher_is_better or ())
+    regressions = []
+    for metric, before in baseline.items():
+        after = current.get(metric)
+        if after is None or not before:
+            continue
+        change = (after - before) / before
+        worse = -change if metric in higher_is_better else change
+        if worse > threshold and abs(after - before) >= min_delta:
+            regressions.append(Regression(metric, before, after, change * 100))
+    return regressions
@@ -0,0 +1,442 @@
+"""
+Micro-Benchmarks for the Scoring and Risk Kernels
+
+Times the numeric functions that run on every signal (sizing, bet
+weighting, mVaR) or nightly over the whole whale universe (WQS,
+consistency, bootstrap, composite scoring) at several input sizes.
+
+Each case gets a warmup, is auto-ranged so one repeat lasts at least
+--min-time, and is repeated; per-call median and min are reported. Every
+run is appended to a JSON-lines history file, and `compare` checks the
+latest run against the saved baseline or an earlier run.
+
+Usage:
+    python3 -m benchmarks.kernels run
+    python3 -m benchmarks.kernels run --filter mvar --save-baseline
+    python3 -m benchmarks.kernels compare --threshold 0.2
+    python3 -m benchmarks.kernels compare --against-run -2
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from benchmarks import baseline
+
+HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "history", "kernels.jsonl")
+DEFAULT_BASELINE = os.path.join(baseline.BASELINE_DIR, "kernels.json")
+
+
+@dataclass
+class KernelCase:
+    """One kernel; setup(size, rng) builds inputs and returns the call to time"""
+    name: str
+    sizes: List[int]
+    setup: Callable[[int, np.random.Generator], Callable[[], object]]
+    unit: str
+
+
+@dataclass
+class Timing:
+    """Per-call timings for one kernel at one size"""
+    name: str
+    size: int
+    number: int
+    repeat: int
+    median_us: float
+    min_us: float
+    max_us: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.size}]"
+
+
+# ==================== Kernel Setups ====================
+
+def _trades(size: int, rng: np.random.Generator) -> List[Dict]:
+    start = datetime(2024, 1, 1)
+    offsets = np.sort(rng.uniform(0, 365 * 24, size))
+    return [
+        {
+            "timestamp": start + timedelta(hours=float(offset)),
+            "pnl": float(rng.normal(50, 400)),
+            "market_id": f"market_{rng.integers(0, max(1, size // 10))}",
+            "volume": float(rng.lognormal(8, 1)),
+        }
+        for offset in offsets
+    ]
+
+
+def setup_enhanced_wqs(size, rng):
+    from libs.analytics.enhanced_wqs import calculate_enhanced_wqs
+    from libs.analytics.bayesian_scoring import MarketCategory
+
+    trades = _trades(size, rng)
+    return lambda: calculate_enhanced_wqs(trades, MarketCategory.POLITICS)
+
+
+def setup_rolling_sharpe_consistency(size, rng):
+    from libs.analytics.consistency import calculate_rolling_sharpe_consistency
+
+    trades = _trades(size, rng)
+    dates = [t["timestamp"] for t in trades]
+    pnls = [t["pnl"] for t in trades]
+    return lambda: calculate_rolling_sharpe_consistency(dates, pnls)
+
+
+def setup_cornish_fisher_mvar(size, rng):
+    from libs.trading.risk_management import CornishFisherVaR
+
+    returns = rng.standard_t(4, size) * 0.02
+    return lambda: CornishFisherVaR.calculate_mvar(returns, 0.95)
+
+
+def setup_kelly_position_size(size, rng):
+    from libs.trading.position_sizing import AdaptiveKellyPositionSizer
+
+    sizer = AdaptiveKellyPositionSizer()
+    returns = list(rng.normal(0.001, 0.02, size))
+    return lambda: sizer.calculate_position_size(
+        win_probability=0.62,
+        win_payoff=1.1,
+        whale_quality_score=82.0,
+        market_id="market_0",
+        nav=100_000.0,
+        recent_returns=returns,
+        portfolio_correlation=0.2,
+        current_drawdown=0.05,
+    )
+
+
+def setup_kelly_batch_positions(size, rng):
+    from libs.trading.position_sizing import AdaptiveKellyPositionSizer
+
+    sizer = AdaptiveKellyPositionSizer()
+    # size = signals arriving in one burst
+    signals = [
+        {
+            "win_probability": float(rng.uniform(0.5, 0.8)),
+            "win_payoff": float(rng.uniform(0.3, 2.0)),
+            "whale_quality_score": float(rng.uniform(60, 95)),
+            "market_id": f"market_{i}",
+            "recent_returns": list(rng.normal(0.001, 0.02, 5)),
+            "portfolio_correlation": float(rng.uniform(-0.5, 0.5)),
+        }
+        for i in range(size)
+    ]
+    return lambda: sizer.calculate_batch_positions(signals, 100_000.0, 0.05, max_total_fraction=0.5)
+
+
+def setup_bet_weight(size, rng):
+    from libs.trading.bet_weighting import BetWeightingEngine, MarketContext, PortfolioState, WhaleProfile
+
+    engine = BetWeightingEngine()
+    whale = WhaleProfile(
+        address="0xwhale", quality_score=85.0, sharpe_ratio=1.8, win_rate=64.0,
+        total_pnl=250_000.0, total_volume=4_000_000.0, total_trades=600,
+        avg_position_size=6_500.0, consistency_score=72.0, recent_performance=0.12,
+    )
+    market = MarketContext(
+        market_id="market_0", title="Benchmark market", liquidity=250_000.0, spread=0.02,
+        volatility=0.15, current_price=0.45, category="politics", time_to_close=240,
+    )
+    categories = ["politics", "crypto", "sports", "economics"]
+    # size = open positions the portfolio constraints have to consider
+    by_market = {f"market_{i + 1}": float(rng.uniform(50, 500)) for i in range(size)}
+    by_category: Dict[str, float] = {}
+    for i, value in enumerate(by_market.values()):
+        category = categories[i % len(categories)]
+        by_category[category] = by_category.get(category, 0.0) + value
+    portfolio = PortfolioState(
+        total_balance=1_000_000.0, available_balance=600_000.0, open_positions=size,
+        total_exposure=sum(by_market.values()), unrealized_pnl=1_200.0, daily_pnl=300.0,
+        positions_by_market=by_market, positions_by_category=by_category,
+    )
+    return lambda: engine.calculate_bet_weight(whale, market, portfolio, 0.45)
+
+
+def setup_stationary_bootstrap(size, rng):
+    from src.scoring.skill_vs_luck_analyzer import SkillVsLuckAnalyzer
+
+    analyzer = SkillVsLuckAnalyzer()
+    returns = rng.normal(0.002, 0.03, size)
+
+    def run():
+        np.random.seed(0)
+        return analyzer.stationary_bootstrap(returns, num_iterations=200)
+    return run
+
+
+def setup_composite_score(size, rng):
+    from src.scoring.composite_whale_scorer import CompositeWhaleScorer, WhaleFeatures
+
+    scorer = CompositeWhaleScorer()
+    now = datetime(2024, 6, 1)
+    # size = whales scored per call, as in a nightly rescoring pass
+    whales = [
+        WhaleFeatures(
+            address=f"0x{i:040x}",
+            rolling_usd_volume_7d=float(rng.lognormal(10, 1)),
+            rolling_usd_volume_30d=float(rng.lognormal(11, 1)),
+            rolling_usd_volume_90d=float(rng.lognormal(12, 1)),
+            max_single_trade_size=float(rng.lognormal(9, 1)),
+            total_holdings_value=float(rng.lognormal(11, 1)),
+            realized_pnl=float(rng.normal(20_000, 50_000)),
+            per_dollar_pnl_roi=float(rng.normal(0.05, 0.1)),
+            maximum_drawdown=float(rng.uniform(0.02, 0.4)),
+            deflated_sharpe_ratio=float(rng.normal(1.0, 0.5)),
+            probabilistic_sharpe_ratio=float(rng.uniform(0, 1)),
+            information_coefficient=float(rng.uniform(-0.1, 0.3)),
+            maker_vs_taker_ratio=float(rng.uniform(0, 1)),
+            average_spread_captured=float(rng.uniform(0, 0.02)),
+            average_spread_paid=float(rng.uniform(0, 0.02)),
+            herfindahl_index=float(rng.uniform(0.2, 1)),
+            position_concentration_by_oi=float(rng.uniform(0, 0.2)),
+            entry_vs_price_move_correlation=float(rng.uniform(-0.3, 0.5)),
+            event_proximity_behavior_score=float(rng.uniform(0, 1)),
+            average_price_impact_per_1m=float(rng.uniform(0, 0.05)),
+            impact_persistence_ratio=float(rng.uniform(0, 1)),
+            liquidity_consumption_score=float(rng.uniform(0, 1)),
+            conditional_value_at_risk=float(rng.uniform(0.01, 0.2)),
+            recovery_time_avg_days=float(rng.uniform(1, 60)),
+            total_trades=int(rng.integers(10, 2000)),
+            first_trade_date=now - timedelta(days=int(rng.integers(30, 720))),
+            last_trade_date=now,
+        )
+        for i in range(size)
+    ]
+    return lambda: [scorer.compute_composite_score(features) for features in whales]
+
+
+KERNELS = [
+    KernelCase("enhanced_wqs", [50, 500, 2000], setup_enhanced_wqs, "trades"),
+    KernelCase("rolling_sharpe_consistency", [100, 1000, 3000], setup_rolling_sharpe_consistency, "trades"),
+    KernelCase("cornish_fisher_mvar", [250, 2500, 25000], setup_cornish_fisher_mvar, "returns"),
+    KernelCase("kelly_position_size", [10, 100, 1000], setup_kelly_position_size, "recent returns"),
+    KernelCase("kelly_batch_positions", [10, 50, 500], setup_kelly_batch_positions, "signals"),
+    KernelCase("bet_weight", [10, 100, 1000], setup_bet_weight, "open positions"),
+    KernelCase("stationary_bootstrap", [50, 250, 1000], setup_stationary_bootstrap, "returns x 200 resamples"),
+    KernelCase("composite_score", [1, 100, 1000], setup_composite_score, "whales"),
+]
+
+
+# ==================== Timing ====================
+
+def autorange(fn: Callable[[], object], min_time: float) -> int:
+    """Calls per repeat so that one repeat takes at least min_time seconds"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - start >= min_time:
+            return number
+        number *= 2 if number < 8 else 5
+
+
+def measure(fn: Callable[[], object], repeat: int = 5, min_time: float = 0.05, warmup: int = 1) -> Dict:
+    """Per-call microseconds over `repeat` auto-ranged batches, after warmup calls"""
+    for _ in range(warmup):
+        fn()
+    number = autorange(fn, min_time)
+    per_call = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            fn()
+        per_call.append((time.perf_counter_ns() - start) / number / 1000)
+    return {
+        "number": number,
+        "repeat": repeat,
+        "median_us": statistics.median(per_call),
+        "min_us": min(per_call),
+        "max_us": max(per_call),
+    }
+
+
+def run_kernels(names: Optional[List[str]] = None, sizes: Optional[List[int]] = None,
+                repeat: int = 5, min_time: float = 0.05, seed: int = 42,
+                max_size_index: Optional[int] = None) -> List[Timing]:
+    """
+    Time every selected kernel at every size.
+
+    Args:
+        names: Substrings selecting kernels (all when None)
+        sizes: Explicit sizes overriding each kernel's defaults
+        max_size_index: Only run each kernel's first N default sizes
+    """
+    timings = []
+    for case in KERNELS:
+        if names and not any(name in case.name for name in names):
+            continue
+        case_sizes = sizes or case.sizes[:max_size_index]
+        for size in case_sizes:
+            fn = case.setup(size, np.random.default_rng(seed))
+            stats = measure(fn, repeat=repeat, min_time=min_time)
+            timings.append(Timing(name=case.name, size=size, **stats))
+    return timings
+
+
+def timing_metrics(timings: List[Timing]) -> Dict[str, float]:
+    """Median per-call microseconds keyed by kernel[size], the compared metric"""
+    return {t.key: t.median_us for t in timings}
+
+
+# ==================== History ====================
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def append_history(timings: List[Timing], path: str = HISTORY_FILE) -> Dict:
+    """Append one run to the JSON-lines history file"""
+    entry = {
+        "recorded_at": datetime.utcnow().isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "numpy": np.__version__,
+        "results": {
+            t.key: {
+                "median_us": t.median_us, "min_us": t.min_us, "max_us": t.max_us,
+                "number": t.number, "repeat": t.repeat,
+            }
+            for t in timings
+        },
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(entry, sort_keys=True) + "\n")
+    return entry
+
+
+def load_history(path: str = HISTORY_FILE) -> List[Dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def history_metrics(entry: Dict) -> Dict[str, float]:
+    return {key: result["median_us"] for key, result in entry["results"].items()}
+
+
+# ==================== CLI ====================
+
+def print_timings(timings: List[Timing]):
+    units = {case.name: case.unit for case in KERNELS}
+    print(f"\n{'Kernel':<30}{'Size':>8}  {'Unit':<24}{'Median':>12}{'Min':>12}{'Calls':>8}")
+    print("-" * 94)
+    for t in timings:
+        print(f"{t.name:<30}{t.size:>8}  {units[t.name]:<24}{_fmt_us(t.median_us):>12}"
+              f"{_fmt_us(t.min_us):>12}{t.number * t.repeat:>8}")
+    print()
+
+
+def _fmt_us(us: float) -> str:
+    if us >= 1e6:
+        return f"{us / 1e6:.2f} s"
+    if us >= 1e3:
+        return f"{us / 1e3:.2f} ms"
+    return f"{us:.1f} us"
+
+
+def cmd_run(args) -> int:
+    timings = run_kernels(
+        names=args.filter, sizes=args.sizes, repeat=args.repeat,
+        min_time=args.min_time, seed=args.seed,
+        max_size_index=1 if args.quick else None,
+    )
+    print_timings(timings)
+    append_history(timings, args.history)
+    print(f"Appended run to {args.history}")
+    if args.save_baseline:
+        baseline.save(args.baseline, "kernels", timing_metrics(timings),
+                      {"repeat": args.repeat, "min_time": args.min_time, "seed": args.seed})
+        print(f"Baseline saved to {args.baseline}")
+    return 0
+
+
+def cmd_compare(args) -> int:
+    history = load_history(args.history)
+    if not history:
+        print(f"No runs in {args.history}; run `python3 -m benchmarks.kernels run` first")
+        return 1
+    current = history_metrics(history[-1])
+
+    if args.against_run is not None:
+        try:
+            reference = history_metrics(history[args.against_run])
+        except IndexError:
+            print(f"History has only {len(history)} runs")
+            return 1
+        label = f"run {args.against_run}"
+    else:
+        entry = baseline.load(args.baseline).get("kernels")
+        if entry is None:
+            print(f"No baseline in {args.baseline}; use `run --save-baseline`")
+            return 1
+        reference = entry["metrics"]
+        label = "baseline"
+
+    print(f"\n{'Case':<40}{label:>14}{'latest':>14}{'change':>10}")
+    print("-" * 78)
+    for key in sorted(set(current) & set(reference)):
+        change = (current[key] - reference[key]) / reference[key] * 100 if reference[key] else 0.0
+        print(f"{key:<40}{_fmt_us(reference[key]):>14}{_fmt_us(current[key]):>14}{change:>+9.1f}%")
+    print()
+
+    regressions = baseline.compare(current, reference, args.threshold)
+    if regressions:
+        print(f"REGRESSIONS (>{args.threshold:.0%}):")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print(f"No regressions beyond {args.threshold:.0%} against {label}")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Scoring and risk kernel micro-benchmarks")
+    parser.add_argument("--history", default=HISTORY_FILE, help="JSON-lines run history")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmarks and append to history")
+    run.add_argument("--filter", nargs="*", help="Only kernels whose name contains one of these")
+    run.add_argument("--sizes", nargs="*", type=int, help="Override input sizes")
+    run.add_argument("--quick", action="store_true", help="Smallest size of each kernel only")
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--min-time", type=float, default=0.05, help="Seconds per repeat")
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--save-baseline", action="store_true", help="Also record this run as the baseline")
+    run.set_defaults(func=cmd_run)
+
+    compare = commands.add_parser("compare", help="Check the latest run for regressions")
+    compare.add_argument("--against-run", type=int, help="Compare with a history entry (e.g. -2) instead of the baseline")
+    compare.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown (0.2 = 20%%)")
+    compare.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
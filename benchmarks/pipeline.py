@@ -0,0 +1,403 @@
+"""
+End-to-End Copy-Trading Pipeline Benchmark
+
+Replays a seeded stream of synthetic CLOB fill messages through the real
+components, in the order production runs them:
+
+    EnhancedWebSocketClient (parse, dedup, whale detection)
+      -> SignalPipeline (3-stage filter)
+      -> AdaptiveKellyPositionSizer
+      -> RiskManager (Cornish-Fisher mVaR limits)
+      -> OrderExecutor (slippage check, placement, fill confirmation)
+
+Only the network is replaced: websocket frames are fed straight into the
+client's parse/dispatch path, and the executor talks to
+StubPolymarketClient. Stage timings come from the shared latency tracer,
+so the stages match what production reports on /api/metrics.
+
+Usage:
+    python3 -m benchmarks.pipeline
+    python3 -m benchmarks.pipeline --messages 5000 --rate 500 --api-latency-ms 20
+    python3 -m benchmarks.pipeline --save-baseline
+    python3 -m benchmarks.pipeline --compare --threshold 0.3
+"""
+
+import argparse
+import asyncio
+import contextvars
+import json
+import logging
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from benchmarks import baseline
+from benchmarks.stub_api import StubPolymarketClient
+from benchmarks.synthetic import SyntheticUniverse
+from libs.trading.position_sizing import AdaptiveKellyPositionSizer
+from libs.trading.risk_management import RiskManager
+from libs.trading.signal_pipeline import SignalPipeline, WhaleSignal
+from src.monitoring.latency import (
+    DETECTION, END_TO_END, PIPELINE_STAGES,
+    RISK_CHECK, SIGNAL_EVALUATION, SIZING, tracer,
+)
+from src.realtime.enhanced_websocket import EnhancedWebSocketClient, EventType, StreamEvent
+from src.trading.order_executor import OrderExecutor, OrderStatus
+
+logger = logging.getLogger(__name__)
+
+# Parse + dedup + detection + handlers for every message, copied or not
+WS_MESSAGE = "ws_message"
+REPORTED_STAGES = (WS_MESSAGE,) + PIPELINE_STAGES + (END_TO_END,)
+
+DEFAULT_BASELINE = f"{baseline.BASELINE_DIR}/pipeline.json"
+HIGHER_IS_BETTER = ["messages_per_s"]
+MIN_DELTA_MS = 0.1
+
+_arrival_ns: contextvars.ContextVar = contextvars.ContextVar("arrival_ns")
+
+
+@dataclass
+class PipelineConfig:
+    """Workload shape; part of the baseline so comparisons are like for like"""
+    seed: int = 42
+    whales: int = 50
+    markets: int = 200
+    messages: int = 5000
+    rate: float = 0.0                 # messages/s; 0 runs closed-loop as fast as possible
+    whale_fraction: float = 0.3
+    duplicate_fraction: float = 0.02
+    api_latency_ms: float = 0.0       # simulated CLOB round trip
+    fill_after_polls: int = 1
+    fill_poll_interval: float = 0.001
+    nav: float = 1_000_000.0
+    max_positions: int = 5
+
+
+class BenchmarkPortfolio:
+    """Portfolio and whale-state provider for SignalPipeline"""
+
+    def __init__(self, universe: SyntheticUniverse, markets: Dict[str, Dict], nav: float, max_positions: int):
+        self.universe = universe
+        self.markets = markets
+        self.nav = nav
+        self.max_positions = max_positions
+        self.positions: List[Dict] = []
+
+    def get_whale_state(self, address: str) -> Dict:
+        whale = self.universe.whales[address]
+        return {
+            "wqs": whale.wqs,
+            "sharpe_30d": whale.sharpe_30d,
+            "sharpe_90d": whale.sharpe_90d,
+            "current_drawdown": whale.current_drawdown,
+            "category_win_rates": whale.category_win_rates,
+        }
+
+    def get_current_state(self) -> Dict:
+        sector_exposures: Dict[str, float] = {}
+        for position in self.positions:
+            value = position["size"] * position["price"]
+            sector_exposures[position["category"]] = sector_exposures.get(position["category"], 0) + value
+        return {
+            "nav": self.nav,
+            "total_exposure": sum(sector_exposures.values()),
+            "positions": self.positions,
+            "sector_exposures": sector_exposures,
+        }
+
+    def add_position(self, market_id: str, size: float, price: float):
+        market = self.markets[market_id]
+        self.positions.append({
+            "market_id": market_id,
+            "category": market["category"],
+            "end_date": market["end_date"],
+            "size": size,
+            "price": price,
+        })
+        # Oldest positions are treated as exited so the book reaches a steady state
+        if len(self.positions) > self.max_positions:
+            self.positions.pop(0)
+
+
+class MarketDataCache:
+    """Gamma market metadata, loaded once through the API stub"""
+
+    def __init__(self):
+        self.markets: Dict[str, Dict] = {}
+
+    async def load(self, client: StubPolymarketClient, page_size: int = 100):
+        offset = 0
+        while True:
+            page = await client.get_markets(limit=page_size, offset=offset)
+            for market in page:
+                self.markets[market["conditionId"]] = {
+                    "category": market["category"],
+                    "end_date": datetime.fromisoformat(market["endDate"]),
+                    "liquidity": market["liquidity"],
+                }
+            if len(page) < page_size:
+                return
+            offset += page_size
+
+    def get_market(self, market_id: str) -> Dict:
+        return self.markets[market_id]
+
+
+class PipelineBenchmark:
+    """Drives the copy-trading components with synthetic traffic"""
+
+    def __init__(self, config: PipelineConfig):
+        self.config = config
+        self.universe = SyntheticUniverse.generate(config.seed, config.whales, config.markets)
+        self.api = StubPolymarketClient(
+            self.universe,
+            latency_ms=config.api_latency_ms,
+            fill_after_polls=config.fill_after_polls,
+            seed=config.seed,
+        )
+        self.market_data = MarketDataCache()
+        self.portfolio: Optional[BenchmarkPortfolio] = None
+
+        self.ws = EnhancedWebSocketClient(
+            whale_addresses=set(self.universe.whales),
+            enable_rest_fallback=False,
+        )
+        self.ws.register_handler(EventType.WHALE_TRADE, self._on_whale_trade)
+        self.signal_pipeline: Optional[SignalPipeline] = None
+        self.sizer = AdaptiveKellyPositionSizer()
+        self.risk = RiskManager()
+        self.portfolio_returns = np.array(self.universe.portfolio_returns)
+        self.executor = OrderExecutor(client=self.api)
+        self.executor.fill_confirmer.poll_interval = config.fill_poll_interval
+
+        self.counts = {"whale_trades": 0, "signals_passed": 0, "sized": 0, "risk_passed": 0, "filled": 0}
+
+    async def setup(self):
+        await self.market_data.load(self.api)
+        self.portfolio = BenchmarkPortfolio(
+            self.universe, self.market_data.markets, self.config.nav, self.config.max_positions
+        )
+        self.signal_pipeline = SignalPipeline(self.portfolio, self.market_data)
+
+    # ==================== Pipeline ====================
+
+    async def process_message(self, index: int, message: str):
+        """One websocket frame, traced from arrival to fill"""
+        arrival = time.perf_counter_ns()
+        _arrival_ns.set(arrival)
+        with tracer.trace(f"msg_{index}", start_ns=arrival), tracer.span(WS_MESSAGE):
+            event = self.ws._parse_message(message, "orderbook")
+            if event:
+                await self.ws._handle_event(event)
+
+    async def _on_whale_trade(self, event: StreamEvent):
+        tracer.record(DETECTION, time.perf_counter_ns() - _arrival_ns.get())
+        self.counts["whale_trades"] += 1
+        data = event.data
+        market = self.market_data.get_market(event.market_id)
+        price = float(data["price"])
+        size = float(data["size"])
+
+        with tracer.span(SIGNAL_EVALUATION):
+            whale = self.portfolio.get_whale_state(event.user_address)
+            signal = self.signal_pipeline.process_whale_trade(WhaleSignal(
+                whale_address=event.user_address,
+                whale_pseudonym="",
+                market_id=event.market_id,
+                market_question="",
+                side=data["side"],
+                price=price,
+                size=size,
+                timestamp=datetime.fromtimestamp(event.timestamp),
+                whale_wqs=whale["wqs"],
+                market_category=market["category"],
+                market_liquidity=market["liquidity"],
+                time_to_resolution=(market["end_date"] - datetime.now()).total_seconds() / 3600,
+            ))
+        if signal is None:
+            return
+        self.counts["signals_passed"] += 1
+
+        with tracer.span(SIZING):
+            entry = price if data["side"] == "BUY" else 1 - price
+            sizing = self.sizer.calculate_position_size(
+                win_probability=whale["category_win_rates"][market["category"]],
+                win_payoff=(1 - entry) / entry,
+                whale_quality_score=whale["wqs"],
+                market_id=event.market_id,
+                nav=self.config.nav,
+            )
+        if sizing.dollar_size <= 0:
+            return
+        self.counts["sized"] += 1
+
+        with tracer.span(RISK_CHECK):
+            metrics = self.risk.calculate_risk_metrics(
+                self.portfolio_returns, self.portfolio.positions, self.config.nav
+            )
+            alerts = self.risk.check_risk_limits(metrics, self.config.nav)
+            self.risk.alerts.clear()
+        if any(alert.severity == "CRITICAL" for alert in alerts):
+            return
+        self.counts["risk_passed"] += 1
+
+        shares = Decimal(str(round(sizing.dollar_size / price, 2)))
+        result = await self.executor.execute_trade(
+            token_id=data["token_id"],
+            side=data["side"],
+            size=shares,
+            price=Decimal(str(price)),
+            fill_timeout=5,
+        )
+        if result.success and result.status == OrderStatus.FILLED:
+            self.counts["filled"] += 1
+            self.portfolio.add_position(event.market_id, float(shares), price)
+
+    # ==================== Run ====================
+
+    async def run(self) -> Dict:
+        config = self.config
+        await self.setup()
+        messages = list(self.universe.fill_messages(
+            config.messages, config.whale_fraction, config.duplicate_fraction
+        ))
+
+        tracer.reset()
+        tracer.enable()
+        start = time.perf_counter()
+
+        if config.rate > 0:
+            # Open loop: frames arrive on schedule whether or not earlier ones finished
+            tasks = []
+            for index, message in enumerate(messages):
+                delay = start + index / config.rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.create_task(self.process_message(index, message)))
+            await asyncio.gather(*tasks)
+        else:
+            for index, message in enumerate(messages):
+                await self.process_message(index, message)
+
+        elapsed = time.perf_counter() - start
+        return self._results(elapsed)
+
+    def _results(self, elapsed: float) -> Dict:
+        stages = {}
+        for stage in REPORTED_STAGES:
+            histogram = tracer.get_histogram(stage)
+            if histogram is None or not histogram.count:
+                continue
+            stages[stage] = {
+                "count": histogram.count,
+                "mean_ms": histogram.mean_ns() / 1e6,
+                "p50_ms": histogram.percentile(50) / 1e6,
+                "p99_ms": histogram.percentile(99) / 1e6,
+                "p999_ms": histogram.percentile(99.9) / 1e6,
+                "max_ms": histogram.max_ns / 1e6,
+            }
+        return {
+            "elapsed_s": elapsed,
+            "messages": self.config.messages,
+            "messages_per_s": self.config.messages / elapsed if elapsed else 0.0,
+            "fills_per_s": self.counts["filled"] / elapsed if elapsed else 0.0,
+            "counts": dict(self.counts, duplicates=self.ws.stats["duplicates_filtered"]),
+            "stages": stages,
+        }
+
+
+def baseline_metrics(results: Dict) -> Dict[str, float]:
+    """Flat metrics stored in and compared against the baseline file"""
+    metrics = {"messages_per_s": results["messages_per_s"]}
+    for stage, summary in results["stages"].items():
+        metrics[f"{stage}.p50_ms"] = summary["p50_ms"]
+        metrics[f"{stage}.p99_ms"] = summary["p99_ms"]
+    return metrics
+
+
+def print_report(results: Dict):
+    counts = results["counts"]
+    print(f"\n{'='*80}")
+    print(f"{results['messages']:,} messages in {results['elapsed_s']:.2f}s "
+          f"({results['messages_per_s']:,.0f} msg/s, {results['fills_per_s']:,.1f} fills/s)")
+    print(f"whale trades {counts['whale_trades']}, passed filters {counts['signals_passed']}, "
+          f"sized {counts['sized']}, passed risk {counts['risk_passed']}, filled {counts['filled']}, "
+          f"duplicates dropped {counts['duplicates']}")
+    print("-" * 80)
+    print(f"{'Stage':<20}{'Count':>8}{'p50 ms':>12}{'p99 ms':>12}{'p99.9 ms':>12}{'max ms':>12}")
+    for stage, summary in results["stages"].items():
+        print(f"{stage:<20}{summary['count']:>8}{summary['p50_ms']:>12.3f}{summary['p99_ms']:>12.3f}"
+              f"{summary['p999_ms']:>12.3f}{summary['max_ms']:>12.3f}")
+    print(f"{'='*80}\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    defaults = PipelineConfig()
+    parser = argparse.ArgumentParser(description="End-to-end copy-trading pipeline benchmark")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--whales", type=int, default=defaults.whales)
+    parser.add_argument("--markets", type=int, default=defaults.markets)
+    parser.add_argument("--messages", type=int, default=defaults.messages)
+    parser.add_argument("--rate", type=float, default=defaults.rate, help="Messages/s (0 = as fast as possible)")
+    parser.add_argument("--whale-fraction", type=float, default=defaults.whale_fraction)
+    parser.add_argument("--api-latency-ms", type=float, default=defaults.api_latency_ms)
+    parser.add_argument("--fill-after-polls", type=int, default=defaults.fill_after_polls)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs to take the best of")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--name", default="default", help="Baseline entry name")
+    parser.add_argument("--save-baseline", action="store_true", help="Record this run as the baseline")
+    parser.add_argument("--compare", action="store_true", help="Fail if slower than the baseline")
+    parser.add_argument("--threshold", type=float, default=0.3, help="Allowed regression (0.3 = 30%%)")
+    parser.add_argument("--json", help="Also write full results to this file")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    config = PipelineConfig(
+        seed=args.seed, whales=args.whales, markets=args.markets, messages=args.messages,
+        rate=args.rate, whale_fraction=args.whale_fraction, api_latency_ms=args.api_latency_ms,
+        fill_after_polls=args.fill_after_polls,
+    )
+    runs = []
+    for _ in range(max(1, args.repeat)):
+        results = asyncio.run(PipelineBenchmark(config).run())
+        print_report(results)
+        runs.append(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": asdict(config), "runs": runs}, f, indent=2)
+
+    metrics = baseline.best_of([baseline_metrics(results) for results in runs], HIGHER_IS_BETTER)
+    if args.save_baseline:
+        baseline.save(args.baseline, args.name, metrics, asdict(config))
+        print(f"Baseline '{args.name}' saved to {args.baseline}")
+
+    if args.compare:
+        entry = baseline.load(args.baseline).get(args.name)
+        if entry is None:
+            print(f"No baseline '{args.name}' in {args.baseline}")
+            return 1
+        if entry["config"] != asdict(config):
+            print("Warning: baseline was recorded with a different configuration")
+        regressions = baseline.compare(
+            metrics, entry["metrics"], args.threshold, HIGHER_IS_BETTER, min_delta=MIN_DELTA_MS
+        )
+        if regressions:
+            print(f"REGRESSIONS (>{args.threshold:.0%}):")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against '{args.name}'")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+In-Process Stub for the Polymarket Gamma / CLOB / Data APIs
+
+Stands in for src.api.polymarket_client.PolymarketClient so the real
+OrderExecutor, SlippageEstimator and FillConfirmer run unchanged against
+a synthetic universe. CLOB calls are synchronous in the real client, so
+the stub sleeps synchronously to model network latency; that blocks the
+event loop exactly as the production client does.
+"""
+
+import asyncio
+import random
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.synthetic import SyntheticUniverse
+
+
+class StubPolymarketClient:
+    """
+    Serves order books, accepts orders and reports fills from a universe.
+
+    Args:
+        universe: Synthetic whales/markets to serve
+        latency_ms: Mean simulated round trip per call (0 disables)
+        jitter: Relative spread of the simulated latency
+        fill_after_polls: get_orders() calls an order stays open before it fills
+    """
+
+    def __init__(self, universe: SyntheticUniverse, latency_ms: float = 0.0,
+                 jitter: float = 0.25, fill_after_polls: int = 1, seed: int = 0):
+        self.universe = universe
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.fill_after_polls = fill_after_polls
+        self._rng = random.Random(seed)
+        self._order_seq = 0
+        self.open_orders: Dict[str, Dict] = {}
+        self._polls_left: Dict[str, int] = {}
+        self.calls: Dict[str, int] = {}
+
+    def _network(self, endpoint: str):
+        self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+        if self.latency_ms > 0:
+            spread = self.latency_ms * self.jitter
+            time.sleep(max(0.0, self._rng.uniform(self.latency_ms - spread, self.latency_ms + spread)) / 1000)
+
+    async def _network_async(self, endpoint: str):
+        self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+        if self.latency_ms > 0:
+            await asyncio.sleep(self.latency_ms / 1000)
+
+    # ==================== Gamma / Data API ====================
+
+    async def get_markets(self, closed: Optional[bool] = None, active: Optional[bool] = None,
+                          limit: int = 100, offset: int = 0) -> List[Dict]:
+        await self._network_async("markets")
+        market_ids = list(self.universe.markets)[offset:offset + limit]
+        return [self.universe.gamma_market(market_id) for market_id in market_ids]
+
+    async def get_market(self, condition_id: str) -> Dict:
+        await self._network_async("market")
+        return self.universe.gamma_market(condition_id)
+
+    # ==================== CLOB API ====================
+
+    def get_orderbook(self, token_id: str) -> Dict:
+        self._network("book")
+        return self.universe.order_book(token_id)
+
+    def place_limit_order(self, token_id: str, price: float, size: float, side: str) -> Dict:
+        self._network("order")
+        return self._open_order(token_id, price, size, side)
+
+    def place_market_order(self, token_id: str, amount: float, side: str, order_type: str = "FOK") -> Dict:
+        self._network("order")
+        price = self.universe.by_token[token_id].mid_price
+        return self._open_order(token_id, price, amount / price, side)
+
+    def _open_order(self, token_id: str, price: float, size: float, side: str) -> Dict:
+        self._order_seq += 1
+        order_id = f"stub_order_{self._order_seq}"
+        self.open_orders[order_id] = {
+            "id": order_id, "asset_id": token_id, "side": side,
+            "price": price, "size": size, "sizeFilled": 0,
+        }
+        self._polls_left[order_id] = self.fill_after_polls
+        return {"orderID": order_id, "success": True}
+
+    def get_orders(self, market: Optional[str] = None) -> List[Dict]:
+        """Open orders; each poll moves every order one step closer to filled"""
+        self._network("orders")
+        for order_id in list(self.open_orders):
+            self._polls_left[order_id] -= 1
+            if self._polls_left[order_id] < 0:
+                # Filled orders drop off the open-orders list
+                del self.open_orders[order_id]
+                del self._polls_left[order_id]
+        return list(self.open_orders.values())
+
+    def cancel_order(self, order_id: str) -> Dict:
+        self._network("cancel")
+        self.open_orders.pop(order_id, None)
+        self._polls_left.pop(order_id, None)
+        return {"canceled": [order_id]}
@@ -0,0 +1,164 @@
+"""
+Seeded Synthetic Market Data for Benchmarks
+
+Generates a reproducible universe of whales, markets and order books, and
+a stream of CLOB websocket fill messages from it. The same seed always
+yields the same universe and the same message sequence.
+"""
+
+import json
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+CATEGORIES = ["Politics", "Crypto", "Sports", "Economics"]
+
+
+@dataclass
+class SyntheticWhale:
+    address: str
+    wqs: float
+    sharpe_30d: float
+    sharpe_90d: float
+    current_drawdown: float
+    category_win_rates: Dict[str, float]
+    typical_trade_usd: float
+
+
+@dataclass
+class SyntheticMarket:
+    market_id: str
+    token_id: str
+    question: str
+    category: str
+    end_date: datetime
+    liquidity: float
+    mid_price: float
+    book_levels: int = 10
+    book_seed: int = 0
+
+
+@dataclass
+class SyntheticUniverse:
+    """Whales, markets and derived data for one seed"""
+    seed: int
+    whales: Dict[str, SyntheticWhale] = field(default_factory=dict)
+    markets: Dict[str, SyntheticMarket] = field(default_factory=dict)
+    noise_traders: List[str] = field(default_factory=list)
+    portfolio_returns: List[float] = field(default_factory=list)
+    by_token: Dict[str, SyntheticMarket] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def generate(cls, seed: int = 42, n_whales: int = 50, n_markets: int = 200,
+                 n_noise_traders: int = 500) -> "SyntheticUniverse":
+        rng = random.Random(seed)
+        universe = cls(seed=seed)
+        now = datetime.now()
+
+        for n in range(n_whales):
+            address = f"0x{rng.getrandbits(160):040x}"
+            sharpe_90d = rng.uniform(0.5, 2.5)
+            universe.whales[address] = SyntheticWhale(
+                address=address,
+                wqs=rng.uniform(65, 95),
+                # Most whales are on positive momentum, some are fading
+                sharpe_30d=sharpe_90d + rng.uniform(-0.4, 0.8),
+                sharpe_90d=sharpe_90d,
+                current_drawdown=abs(rng.gauss(0.08, 0.08)),
+                category_win_rates={c: rng.uniform(0.5, 0.75) for c in CATEGORIES},
+                typical_trade_usd=rng.lognormvariate(9.6, 0.5),
+            )
+
+        for n in range(n_markets):
+            market_id = f"0x{rng.getrandbits(256):064x}"
+            universe.markets[market_id] = SyntheticMarket(
+                market_id=market_id,
+                token_id=str(rng.getrandbits(128)),
+                question=f"Synthetic market {n}?",
+                category=rng.choice(CATEGORIES),
+                end_date=now + timedelta(days=rng.uniform(2, 120)),
+                liquidity=rng.lognormvariate(18.5, 0.7),
+                mid_price=round(rng.uniform(0.08, 0.92), 3),
+                book_seed=rng.getrandbits(32),
+            )
+
+        universe.by_token = {m.token_id: m for m in universe.markets.values()}
+        universe.noise_traders = [f"0x{rng.getrandbits(160):040x}" for _ in range(n_noise_traders)]
+        universe.portfolio_returns = [rng.gauss(0.001, 0.02) for _ in range(250)]
+        return universe
+
+    def order_book(self, token_id: str) -> Dict[str, List[Dict]]:
+        """CLOB /book payload for a token (bids and asks best first)"""
+        market = self.by_token[token_id]
+        rng = random.Random(market.book_seed)
+        depth = market.liquidity / (2 * market.book_levels)
+        tick = 0.001
+        bids, asks = [], []
+        for level in range(market.book_levels):
+            bid = round(market.mid_price - tick * (level + 1), 3)
+            ask = round(market.mid_price + tick * (level + 1), 3)
+            if bid > 0:
+                bids.append({"price": str(bid), "size": str(round(depth * rng.uniform(0.5, 1.5) / max(bid, 0.01), 2))})
+            if ask < 1:
+                asks.append({"price": str(ask), "size": str(round(depth * rng.uniform(0.5, 1.5) / ask, 2))})
+        return {"market": market.market_id, "asset_id": token_id, "bids": bids, "asks": asks}
+
+    def gamma_market(self, market_id: str) -> Dict:
+        """Gamma /markets entry for a market"""
+        market = self.markets[market_id]
+        return {
+            "conditionId": market.market_id,
+            "question": market.question,
+            "category": market.category,
+            "endDate": market.end_date.isoformat(),
+            "liquidity": market.liquidity,
+            "clobTokenIds": [market.token_id],
+            "lastTradePrice": market.mid_price,
+        }
+
+    def fill_messages(self, n: int, whale_fraction: float = 0.3,
+                      duplicate_fraction: float = 0.02) -> Iterator[str]:
+        """
+        CLOB websocket "fill" messages.
+
+        Args:
+            n: Number of messages (duplicates included)
+            whale_fraction: Share of fills taken by tracked whales
+            duplicate_fraction: Share of messages that replay an earlier fill
+        """
+        rng = random.Random(self.seed * 7919 + n)
+        whales = list(self.whales.values())
+        markets = list(self.markets.values())
+        timestamp = int(datetime.now().timestamp())
+        sent: List[str] = []
+
+        for i in range(n):
+            if sent and rng.random() < duplicate_fraction:
+                yield rng.choice(sent)
+                continue
+
+            market = rng.choice(markets)
+            if rng.random() < whale_fraction:
+                whale = rng.choice(whales)
+                taker = whale.address
+                amount = whale.typical_trade_usd * rng.lognormvariate(0, 0.5)
+            else:
+                taker = rng.choice(self.noise_traders)
+                amount = rng.lognormvariate(5.0, 1.2)
+
+            price = min(0.99, max(0.01, round(market.mid_price + rng.uniform(-0.03, 0.03), 2)))
+            timestamp += rng.randint(0, 2)
+            message = json.dumps({
+                "type": "fill",
+                "fill_id": f"fill_{i}",
+                "market": market.market_id,
+                "token_id": market.token_id,
+                "taker": taker,
+                "side": "BUY" if rng.random() < 0.7 else "SELL",
+                "size": round(amount / price, 2),
+                "price": price,
+                "timestamp": timestamp,
+            })
+            sent.append(message)
+            yield message
@@ -0,0 +1,419 @@
+"""
+Streaming Return Moments
+O(1)-per-observation estimators for mean, variance, skewness and kurtosis.
+
+Risk code used to re-derive moments from full return arrays on every call
+(np.std + scipy skew/kurtosis, or an EWMA rebuilt from a weight vector).
+These estimators carry the sufficient statistics instead, so VaR, CVaR,
+Sharpe and the Kelly volatility adjustment read current moments directly.
+
+Estimators:
+- RunningMoments: exact moments of everything seen (Welford/Pébay updates)
+- RollingMoments: exact moments of the last `window` observations
+- EWMAMoments: exponentially weighted moments (λ=0.94 RiskMetrics default)
+
+Conventions match numpy/scipy defaults: variance(ddof=0) is np.var,
+skewness is scipy.stats.skew (biased) and excess_kurtosis is
+scipy.stats.kurtosis (Fisher, biased). Degenerate samples (zero variance)
+report 0 skew/kurtosis rather than NaN.
+
+All estimators serialize with to_dict()/from_dict().
+"""
+
+import math
+from collections import deque
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+
+_RESOLUTION = float(np.finfo(float).resolution)
+
+
+class RunningMoments:
+    """
+    Exact streaming central moments.
+
+    Keeps count, mean and the central sums M2, M3, M4 (Pébay 2008), so
+    observations can be added, removed and two estimators merged without
+    revisiting data.
+    """
+
+    __slots__ = ("n", "mean", "m2", "m3", "m4")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+
+    @classmethod
+    def from_values(cls, values: Iterable[float]) -> "RunningMoments":
+        """Moments of an existing sample in one vectorized pass"""
+        x = np.asarray(values, dtype=float)
+        moments = cls()
+        if x.size == 0:
+            return moments
+        mean = x.mean()
+        d = x - mean
+        d2 = d * d
+        moments.n = int(x.size)
+        moments.mean = float(mean)
+        moments.m2 = float(d2.sum())
+        moments.m3 = float((d2 * d).sum())
+        moments.m4 = float((d2 * d2).sum())
+        return moments
+
+    def update(self, x: float) -> None:
+        """Add one observation"""
+        n1 = self.n
+        self.n += 1
+        n = self.n
+        delta = x - self.mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * n1
+
+        self.mean += delta_n
+        self.m4 += term1 * delta_n2 * (n * n - 3 * n + 3) + 6 * delta_n2 * self.m2 - 4 * delta_n * self.m3
+        self.m3 += term1 * delta_n * (n - 2) - 3 * delta_n * self.m2
+        self.m2 += term1
+
+    def update_many(self, values: Iterable[float]) -> None:
+        """Add a batch of observations"""
+        self.merge(RunningMoments.from_values(values))
+
+    def remove(self, x: float) -> None:
+        """Remove one previously added observation (inverse of update)"""
+        if self.n <= 1:
+            RunningMoments.__init__(self)
+            return
+        n = self.n
+        n1 = n - 1
+        mean = (n * self.mean - x) / n1
+        delta = x - mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * n1
+
+        m2 = self.m2 - term1
+        m3 = self.m3 - term1 * delta_n * (n - 2) + 3 * delta_n * m2
+        m4 = self.m4 - term1 * delta_n2 * (n * n - 3 * n + 3) - 6 * delta_n2 * m2 + 4 * delta_n * m3
+
+        self.n = n1
+        self.mean = mean
+        self.m2 = max(m2, 0.0)
+        self.m3 = m3
+        self.m4 = max(m4, 0.0)
+
+    def merge(self, other: "RunningMoments") -> None:
+        """Combine with another estimator's sample (parallel Pébay formulas)"""
+        if other.n == 0:
+            return
+        if self.n == 0:
+            self.n, self.mean, self.m2, self.m3, self.m4 = other.n, other.mean, other.m2, other.m3, other.m4
+            return
+
+        na, nb = self.n, other.n
+        n = na + nb
+        delta = other.mean - self.mean
+        d2 = delta * delta
+        d3 = d2 * delta
+        d4 = d2 * d2
+
+        m2 = self.m2 + other.m2 + d2 * na * nb / n
+        m3 = (
+            self.m3 + other.m3
+            + d3 * na * nb * (na - nb) / (n * n)
+            + 3 * delta * (na * other.m2 - nb * self.m2) / n
+        )
+        m4 = (
+            self.m4 + other.m4
+            + d4 * na * nb * (na * na - na * nb + nb * nb) / (n ** 3)
+            + 6 * d2 * (na * na * other.m2 + nb * nb * self.m2) / (n * n)
+            + 4 * delta * (na * other.m3 - nb * self.m3) / n
+        )
+
+        self.n = n
+        self.mean += delta * nb / n
+        self.m2, self.m3, self.m4 = m2, m3, m4
+
+    # ==================== Statistics ====================
+
+    def variance(self, ddof: int = 0) -> float:
+        if self.n - ddof <= 0:
+            return 0.0
+        return self.m2 / (self.n - ddof)
+
+    def std(self, ddof: int = 0) -> float:
+        return math.sqrt(self.variance(ddof))
+
+    def _degenerate(self) -> bool:
+        # Same test scipy uses: variance within rounding of a constant sample
+        return self.n < 2 or self.m2 / self.n <= (_RESOLUTION * self.mean) ** 2
+
+    @property
+    def skewness(self) -> float:
+        """Biased sample skewness (scipy.stats.skew default)"""
+        if self._degenerate():
+            return 0.0
+        return math.sqrt(self.n) * self.m3 / self.m2 ** 1.5
+
+    @property
+    def excess_kurtosis(self) -> float:
+        """Biased Fisher kurtosis (scipy.stats.kurtosis default)"""
+        if self._degenerate():
+            return 0.0
+        return self.n * self.m4 / (self.m2 * self.m2) - 3.0
+
+    def __len__(self) -> int:
+        return self.n
+
+    # ==================== Serialization ====================
+
+    def to_dict(self) -> Dict:
+        return {"n": self.n, "mean": self.mean, "m2": self.m2, "m3": self.m3, "m4": self.m4}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RunningMoments":
+        moments = cls()
+        moments.n = int(data["n"])
+        moments.mean = float(data["mean"])
+        moments.m2 = float(data["m2"])
+        moments.m3 = float(data["m3"])
+        moments.m4 = float(data["m4"])
+        return moments
+
+
+class RollingMoments:
+    """
+    Exact moments of the most recent `window` observations.
+
+    Wraps a private RunningMoments rather than subclassing it: a window
+    evicts by age, so arbitrary remove() and merge() are not offered.
+    Eviction uses RunningMoments.remove, which accumulates rounding error
+    over very long streams, so the sums are recomputed from the window
+    once every `window` evictions (amortized O(1)).
+    """
+
+    __slots__ = ("window", "_values", "_evictions", "_moments")
+
+    def __init__(self, window: int):
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        self.window = window
+        self._values: deque = deque()
+        self._evictions = 0
+        self._moments = RunningMoments()
+
+    def update(self, x: float) -> Optional[float]:
+        """Add one observation; returns the evicted observation, if any"""
+        x = float(x)
+        self._values.append(x)
+        self._moments.update(x)
+        if len(self._values) <= self.window:
+            return None
+
+        evicted = self._values.popleft()
+        self._evictions += 1
+        if self._evictions >= self.window:
+            self._rebuild()
+        else:
+            self._moments.remove(evicted)
+        return evicted
+
+    def update_many(self, values: Iterable[float]) -> None:
+        for x in values:
+            self.update(x)
+
+    def _rebuild(self):
+        self._moments = RunningMoments.from_values(self._values)
+        self._evictions = 0
+
+    def values(self) -> np.ndarray:
+        """Current window, oldest first"""
+        return np.fromiter(self._values, dtype=float, count=len(self._values))
+
+    # ==================== Statistics ====================
+
+    @property
+    def n(self) -> int:
+        return self._moments.n
+
+    @property
+    def mean(self) -> float:
+        return self._moments.mean
+
+    def variance(self, ddof: int = 0) -> float:
+        return self._moments.variance(ddof)
+
+    def std(self, ddof: int = 0) -> float:
+        return self._moments.std(ddof)
+
+    @property
+    def skewness(self) -> float:
+        """Biased sample skewness of the window"""
+        return self._moments.skewness
+
+    @property
+    def excess_kurtosis(self) -> float:
+        """Biased Fisher kurtosis of the window"""
+        return self._moments.excess_kurtosis
+
+    def __len__(self) -> int:
+        return self._moments.n
+
+    # ==================== Serialization ====================
+
+    def to_dict(self) -> Dict:
+        return {"window": self.window, "values": list(self._values)}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RollingMoments":
+        moments = cls(int(data["window"]))
+        moments._values.extend(float(x) for x in data["values"][-moments.window:])
+        moments._rebuild()
+        return moments
+
+
+# Read-only view risk consumers accept: n, mean, variance/std, skewness,
+# excess_kurtosis
+SampleMoments = Union[RunningMoments, RollingMoments]
+
+
+class EWMAMoments:
+    """
+    Exponentially weighted moments with decay λ.
+
+    Observation i (of n) carries weight λ^(n-1-i), normalized to sum to 1,
+    which is identical to rebuilding the normalized EWMA weight vector
+    over the full history on every call.
+
+    `square_variance` is the RiskMetrics zero-mean variance (EWMA of
+    squared returns). By default it uses the same normalized weights; with
+    initial_variance it follows the seeded recursion
+    σ² ← λσ² + (1-λ)r² instead.
+    """
+
+    __slots__ = ("lambda_param", "n", "weight", "s1", "s2", "s3", "s4", "_seeded_variance")
+
+    def __init__(self, lambda_param: float = 0.94, initial_variance: Optional[float] = None):
+        if not 0 < lambda_param < 1:
+            raise ValueError("lambda_param must be in (0, 1)")
+        self.lambda_param = lambda_param
+        self.n = 0
+        self.weight = 0.0
+        self.s1 = 0.0
+        self.s2 = 0.0
+        self.s3 = 0.0
+        self.s4 = 0.0
+        self._seeded_variance = initial_variance
+
+    def update(self, x: float) -> None:
+        lam = self.lambda_param
+        x2 = x * x
+        self.n += 1
+        self.weight = lam * self.weight + 1.0
+        self.s1 = lam * self.s1 + x
+        self.s2 = lam * self.s2 + x2
+        self.s3 = lam * self.s3 + x2 * x
+        self.s4 = lam * self.s4 + x2 * x2
+        if self._seeded_variance is not None:
+            self._seeded_variance = lam * self._seeded_variance + (1 - lam) * x2
+
+    def update_many(self, values: Iterable[float]) -> None:
+        """Add a batch in one vectorized step (same result as repeated update)"""
+        x = np.asarray(values, dtype=float)
+        k = x.size
+        if k == 0:
+            return
+        if k < 16:
+            # NumPy call overhead outweighs the loop for short batches
+            for value in x.tolist():
+                self.update(value)
+            return
+        lam = self.lambda_param
+        decay = lam ** k
+        w = lam ** np.arange(k - 1, -1, -1, dtype=float)
+        x2 = x * x
+
+        self.n += k
+        self.weight = decay * self.weight + float(w.sum())
+        self.s1 = decay * self.s1 + float(w @ x)
+        self.s2 = decay * self.s2 + float(w @ x2)
+        self.s3 = decay * self.s3 + float(w @ (x2 * x))
+        self.s4 = decay * self.s4 + float(w @ (x2 * x2))
+        if self._seeded_variance is not None:
+            self._seeded_variance = decay * self._seeded_variance + (1 - lam) * float(w @ x2)
+
+    # ==================== Statistics ====================
+
+    @property
+    def mean(self) -> float:
+        return self.s1 / self.weight if self.weight else 0.0
+
+    @property
+    def square_variance(self) -> float:
+        """Zero-mean EWMA variance (RiskMetrics)"""
+        if self._seeded_variance is not None:
+            return self._seeded_variance
+        return self.s2 / self.weight if self.weight else 0.0
+
+    @property
+    def volatility(self) -> float:
+        return math.sqrt(self.square_variance)
+
+    def _central(self):
+        w = self.weight
+        mu = self.s1 / w
+        e2, e3, e4 = self.s2 / w, self.s3 / w, self.s4 / w
+        c2 = max(e2 - mu * mu, 0.0)
+        c3 = e3 - 3 * mu * e2 + 2 * mu ** 3
+        c4 = e4 - 4 * mu * e3 + 6 * mu * mu * e2 - 3 * mu ** 4
+        return c2, c3, c4
+
+    def variance(self) -> float:
+        """Weighted central variance"""
+        if not self.weight:
+            return 0.0
+        return self._central()[0]
+
+    def std(self) -> float:
+        return math.sqrt(self.variance())
+
+    @property
+    def skewness(self) -> float:
+        if self.n < 2:
+            return 0.0
+        c2, c3, _ = self._central()
+        return c3 / c2 ** 1.5 if c2 > 0 else 0.0
+
+    @property
+    def excess_kurtosis(self) -> float:
+        if self.n < 2:
+            return 0.0
+        c2, _, c4 = self._central()
+        return c4 / (c2 * c2) - 3.0 if c2 > 0 else 0.0
+
+    def __len__(self) -> int:
+        return self.n
+
+    # ==================== Serialization ====================
+
+    def to_dict(self) -> Dict:
+        return {
+            "lambda_param": self.lambda_param,
+            "n": self.n,
+            "weight": self.weight,
+            "s1": self.s1, "s2": self.s2, "s3": self.s3, "s4": self.s4,
+            "seeded_variance": self._seeded_variance,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "EWMAMoments":
+        moments = cls(float(data["lambda_param"]), data.get("seeded_variance"))
+        moments.n = int(data["n"])
+        moments.weight = float(data["weight"])
+        moments.s1, moments.s2 = float(data["s1"]), float(data["s2"])
+        moments.s3, moments.s4 = float(data["s3"]), float(data["s4"])
+        return moments
@@ -0,0 +1,490 @@
+"""
+Shared Backtest Dataset
+Columnar, load-once view of historical whale trades for every backtest entry point.
+
+The trades, whales and market_resolutions tables are read once and stored as
+sorted NumPy columns. A dataset can be written to a directory of ``.npy`` files
+and re-opened with ``mmap_mode='r'``, so optimizer worker processes share the
+same pages instead of each re-querying Postgres.
+
+Layout on disk:
+    <path>/meta.json              lookup tables (addresses, market ids, labels)
+    <path>/<column>.npy           one file per column in COLUMNS / WHALE_COLUMNS / MARKET_COLUMNS
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+# Per-trade columns (all sorted by timestamp)
+COLUMNS = (
+    'timestamps',     # int64, epoch nanoseconds
+    'whale_idx',      # int32, index into whale_addresses
+    'market_idx',     # int32, index into market_ids
+    'token_idx',      # int32, index into token_ids
+    'outcome_idx',    # int16, index into outcome_labels (trade outcome, e.g. YES/NO)
+    'category_idx',   # int16, index into categories
+    'prices',         # float64
+    'sizes',          # float64, shares
+    'amounts',        # float64, USD
+    'sides',          # int8, +1 BUY / -1 SELL
+    'outcomes',       # int8, 1 = traded outcome won, 0 = lost, -1 = unresolved
+    'realized_pnl',   # float64, NaN when unknown
+)
+
+# Per-whale columns (indexed by whale_idx)
+WHALE_COLUMNS = (
+    'whale_quality',
+    'whale_win_rate',
+    'whale_total_pnl',
+    'whale_total_trades',
+)
+
+# Per-market columns (indexed by market_idx)
+MARKET_COLUMNS = (
+    'market_resolution_ns',   # int64, epoch ns, -1 when unresolved
+    'market_outcome_idx',     # int16, index into outcome_labels, -1 when unresolved
+)
+
+UNRESOLVED = -1
+_NO_TIMESTAMP = -1
+
+_TRADES_SQL = """
+    SELECT t.timestamp, t.trader_address, t.market_id, t.token_id, t.outcome,
+           t.category, t.market_title, t.side, t.price, t.size, t.amount,
+           t.realized_pnl
+    FROM trades t
+    WHERE t.is_whale_trade = TRUE
+      AND (:start_date IS NULL OR t.timestamp >= :start_date)
+      AND (:end_date IS NULL OR t.timestamp <= :end_date)
+    ORDER BY t.timestamp ASC
+"""
+
+_WHALES_SQL = """
+    SELECT address, pseudonym, quality_score, win_rate, total_pnl, total_trades
+    FROM whales
+"""
+
+_RESOLUTIONS_SQL = """
+    SELECT market_id, resolution_date, outcome
+    FROM market_resolutions
+    WHERE resolved = TRUE
+"""
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _to_ns(ts: Optional[datetime]) -> int:
+    """Convert a datetime to epoch nanoseconds (naive = UTC, aware converted to UTC)."""
+    if ts is None:
+        return _NO_TIMESTAMP
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return int(np.datetime64(ts, 'ns').astype(np.int64))
+
+
+def _from_ns(ns: int) -> Optional[datetime]:
+    """Convert epoch nanoseconds back to a naive UTC datetime."""
+    if ns == _NO_TIMESTAMP:
+        return None
+    seconds, remainder = divmod(int(ns), 1_000_000_000)
+    return _EPOCH + timedelta(seconds=seconds, microseconds=remainder // 1000)
+
+
+class _Interner:
+    """Map repeated strings to dense integer codes."""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def code(self, value: Optional[str]) -> int:
+        value = value if value is not None else ''
+        idx = self._index.get(value)
+        if idx is None:
+            idx = len(self.values)
+            self._index[value] = idx
+            self.values.append(value)
+        return idx
+
+
+@dataclass
+class BacktestDataset:
+    """
+    Immutable columnar snapshot of historical whale trades.
+
+    Per-trade arrays are aligned and sorted by ``timestamps``. Whale and market
+    attributes are stored once and referenced through ``whale_idx`` /
+    ``market_idx`` so that a million trades do not carry a million copies of
+    the same whale record.
+    """
+    columns: Dict[str, np.ndarray]
+    whale_addresses: List[str]
+    whale_pseudonyms: List[str]
+    market_ids: List[str]
+    market_titles: List[str]
+    token_ids: List[str]
+    outcome_labels: List[str]
+    categories: List[str]
+
+    def __len__(self) -> int:
+        return int(self.columns['timestamps'].shape[0])
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        columns = self.__dict__.get('columns')
+        if columns is not None and name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    # ==================== Construction ====================
+
+    @classmethod
+    def from_records(
+        cls,
+        trades: Iterable[Dict],
+        whales: Iterable[Dict],
+        resolutions: Optional[Iterable[Dict]] = None
+    ) -> 'BacktestDataset':
+        """
+        Build a dataset from row dicts.
+
+        Args:
+            trades: Rows with timestamp, trader_address, market_id, token_id, outcome,
+                    category, market_title, side, price, size, amount, realized_pnl
+            whales: Rows with address, pseudonym, quality_score, win_rate, total_pnl, total_trades
+            resolutions: Rows with market_id, resolution_date, outcome (resolved markets only)
+
+        Returns:
+            BacktestDataset sorted by trade timestamp
+        """
+        whale_codes = _Interner()
+        market_codes = _Interner()
+        token_codes = _Interner()
+        outcome_codes = _Interner()
+        category_codes = _Interner()
+
+        whale_rows: Dict[str, Dict] = {w['address']: w for w in whales}
+        resolution_rows: Dict[str, Dict] = {r['market_id']: r for r in (resolutions or [])}
+
+        market_titles: Dict[int, str] = {}
+        cols: Dict[str, list] = {name: [] for name in COLUMNS}
+
+        for t in trades:
+            whale = t['trader_address']
+            if whale not in whale_rows:
+                continue  # Trade from an untracked wallet
+
+            market_idx = market_codes.code(t['market_id'])
+            market_titles.setdefault(market_idx, t.get('market_title') or 'Unknown')
+            trade_outcome = (t.get('outcome') or '').upper()
+
+            resolution = resolution_rows.get(t['market_id'])
+            if resolution is None or not resolution.get('outcome') or not trade_outcome:
+                did_win = UNRESOLVED
+            else:
+                did_win = int(resolution['outcome'].upper() == trade_outcome)
+
+            pnl = t.get('realized_pnl')
+
+            cols['timestamps'].append(_to_ns(t['timestamp']))
+            cols['whale_idx'].append(whale_codes.code(whale))
+            cols['market_idx'].append(market_idx)
+            cols['token_idx'].append(token_codes.code(t.get('token_id')))
+            cols['outcome_idx'].append(outcome_codes.code(trade_outcome or 'Unknown'))
+            cols['category_idx'].append(category_codes.code(t.get('category') or 'UNKNOWN'))
+            cols['prices'].append(float(t['price']))
+            cols['sizes'].append(float(t['size']))
+            cols['amounts'].append(float(t.get('amount') or float(t['price']) * float(t['size'])))
+            cols['sides'].append(1 if (t.get('side') or 'BUY').upper() == 'BUY' else -1)
+            cols['outcomes'].append(did_win)
+            cols['realized_pnl'].append(float(pnl) if pnl is not None else np.nan)
+
+        dtypes = {
+            'timestamps': np.int64, 'whale_idx': np.int32, 'market_idx': np.int32,
+            'token_idx': np.int32, 'outcome_idx': np.int16, 'category_idx': np.int16,
+            'prices': np.float64, 'sizes': np.float64, 'amounts': np.float64,
+            'sides': np.int8, 'outcomes': np.int8, 'realized_pnl': np.float64,
+        }
+        columns = {name: np.asarray(values, dtype=dtypes[name]) for name, values in cols.items()}
+
+        # Stable sort so equal timestamps keep their query order
+        order = np.argsort(columns['timestamps'], kind='stable')
+        columns = {name: arr[order] for name, arr in columns.items()}
+
+        # Whale attributes
+        n_whales = len(whale_codes.values)
+        whale_quality = np.zeros(n_whales)
+        whale_win_rate = np.zeros(n_whales)
+        whale_total_pnl = np.zeros(n_whales)
+        whale_total_trades = np.zeros(n_whales, dtype=np.int64)
+        pseudonyms = []
+        for i, address in enumerate(whale_codes.values):
+            row = whale_rows[address]
+            whale_quality[i] = float(row.get('quality_score') or 0)
+            whale_win_rate[i] = float(row.get('win_rate') or 50.0)
+            whale_total_pnl[i] = float(row.get('total_pnl') or 0)
+            whale_total_trades[i] = int(row.get('total_trades') or 1)
+            pseudonyms.append(row.get('pseudonym') or address[:10])
+
+        columns['whale_quality'] = whale_quality
+        columns['whale_win_rate'] = whale_win_rate
+        columns['whale_total_pnl'] = whale_total_pnl
+        columns['whale_total_trades'] = whale_total_trades
+
+        # Market attributes
+        n_markets = len(market_codes.values)
+        resolution_ns = np.full(n_markets, _NO_TIMESTAMP, dtype=np.int64)
+        market_outcome = np.full(n_markets, UNRESOLVED, dtype=np.int16)
+        for i, market_id in enumerate(market_codes.values):
+            resolution = resolution_rows.get(market_id)
+            if resolution is None:
+                continue
+            resolution_ns[i] = _to_ns(resolution.get('resolution_date'))
+            if resolution.get('outcome'):
+                market_outcome[i] = outcome_codes.code(resolution['outcome'].upper())
+
+        columns['market_resolution_ns'] = resolution_ns
+        columns['market_outcome_idx'] = market_outcome
+
+        return cls(
+            columns=columns,
+            whale_addresses=whale_codes.values,
+            whale_pseudonyms=pseudonyms,
+            market_ids=market_codes.values,
+            market_titles=[market_titles[i] for i in range(n_markets)],
+            token_ids=token_codes.values,
+            outcome_labels=outcome_codes.values,
+            categories=category_codes.values,
+        )
+
+    @classmethod
+    def from_database(
+        cls,
+        engine,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> 'BacktestDataset':
+        """
+        Build a dataset with one query per table.
+
+        Args:
+            engine: SQLAlchemy engine (or connection URL)
+            start_date: Optional lower bound on trade timestamp
+            end_date: Optional upper bound on trade timestamp
+
+        Returns:
+            BacktestDataset
+        """
+        from sqlalchemy import create_engine, text
+
+        if isinstance(engine, str):
+            engine = create_engine(engine)
+
+        params = {'start_date': start_date, 'end_date': end_date}
+        with engine.connect() as conn:
+            trades = [dict(r._mapping) for r in conn.execute(text(_TRADES_SQL), params)]
+            whales = [dict(r._mapping) for r in conn.execute(text(_WHALES_SQL))]
+            try:
+                resolutions = [dict(r._mapping) for r in conn.execute(text(_RESOLUTIONS_SQL))]
+            except Exception:
+                # market_resolutions is created by a later migration
+                resolutions = []
+
+        return cls.from_records(trades, whales, resolutions)
+
+    # ==================== Persistence ====================
+
+    def save(self, path: str) -> None:
+        """
+        Write every column as a ``.npy`` file plus ``meta.json``.
+
+        Args:
+            path: Target directory (created if missing)
+        """
+        os.makedirs(path, exist_ok=True)
+        for name, arr in self.columns.items():
+            np.save(os.path.join(path, f'{name}.npy'), np.ascontiguousarray(arr))
+
+        meta = {
+            'num_trades': len(self),
+            'whale_addresses': self.whale_addresses,
+            'whale_pseudonyms': self.whale_pseudonyms,
+            'market_ids': self.market_ids,
+            'market_titles': self.market_titles,
+            'token_ids': self.token_ids,
+            'outcome_labels': self.outcome_labels,
+            'categories': self.categories,
+        }
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'BacktestDataset':
+        """
+        Open a dataset written by ``save``.
+
+        Args:
+            path: Dataset directory
+            mmap: Memory-map columns read-only (zero-copy, shared between processes)
+
+        Returns:
+            BacktestDataset backed by the files in ``path``
+        """
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+
+        mode = 'r' if mmap else None
+        columns = {
+            name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mode)
+            for name in COLUMNS + WHALE_COLUMNS + MARKET_COLUMNS
+        }
+
+        return cls(
+            columns=columns,
+            whale_addresses=meta['whale_addresses'],
+            whale_pseudonyms=meta['whale_pseudonyms'],
+            market_ids=meta['market_ids'],
+            market_titles=meta['market_titles'],
+            token_ids=meta['token_ids'],
+            outcome_labels=meta['outcome_labels'],
+            categories=meta['categories'],
+        )
+
+    # ==================== Views ====================
+
+    def _with_columns(self, columns: Dict[str, np.ndarray]) -> 'BacktestDataset':
+        return BacktestDataset(
+            columns=columns,
+            whale_addresses=self.whale_addresses,
+            whale_pseudonyms=self.whale_pseudonyms,
+            market_ids=self.market_ids,
+            market_titles=self.market_titles,
+            token_ids=self.token_ids,
+            outcome_labels=self.outcome_labels,
+            categories=self.categories,
+        )
+
+    def slice(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> 'BacktestDataset':
+        """
+        Time-range view via binary search (no copy for memory-mapped columns).
+
+        Args:
+            start_date: Inclusive lower bound
+            end_date: Inclusive upper bound
+
+        Returns:
+            BacktestDataset sharing the underlying buffers
+        """
+        ts = self.columns['timestamps']
+        lo = 0 if start_date is None else int(np.searchsorted(ts, _to_ns(start_date), side='left'))
+        hi = len(self) if end_date is None else int(np.searchsorted(ts, _to_ns(end_date), side='right'))
+
+        columns = dict(self.columns)
+        for name in COLUMNS:
+            columns[name] = self.columns[name][lo:hi]
+        return self._with_columns(columns)
+
+    def select_whales(self, addresses: Iterable[str]) -> 'BacktestDataset':
+        """Restrict the dataset to trades from the given whales (copies the trade columns)."""
+        index = {a: i for i, a in enumerate(self.whale_addresses)}
+        wanted = np.array([index[a] for a in addresses if a in index], dtype=np.int32)
+        mask = np.isin(self.columns['whale_idx'], wanted)
+
+        columns = dict(self.columns)
+        for name in COLUMNS:
+            columns[name] = self.columns[name][mask]
+        return self._with_columns(columns)
+
+    def trade_whale_quality(self) -> np.ndarray:
+        """Whale quality score broadcast to every trade."""
+        return self.columns['whale_quality'][self.columns['whale_idx']]
+
+    def trade_whale_win_rate(self) -> np.ndarray:
+        """Whale historical win rate (percent) broadcast to every trade."""
+        return self.columns['whale_win_rate'][self.columns['whale_idx']]
+
+    # ==================== Adapters for existing engines ====================
+
+    def to_trade_dicts(self) -> List[Dict]:
+        """
+        Trade dicts in the format returned by
+        ``src.services.backtester.Backtester.get_historical_whale_trades``.
+        """
+        from decimal import Decimal
+
+        c = self.columns
+        result = []
+        for i in range(len(self)):
+            w = int(c['whale_idx'][i])
+            m = int(c['market_idx'][i])
+            total_trades = int(c['whale_total_trades'][w]) or 1
+            total_pnl = float(c['whale_total_pnl'][w])
+            outcome = int(c['outcomes'][i])
+
+            result.append({
+                'timestamp': _from_ns(int(c['timestamps'][i])),
+                'whale_address': self.whale_addresses[w],
+                'whale_pseudonym': self.whale_pseudonyms[w],
+                'whale_quality': float(c['whale_quality'][w]),
+                'whale_win_rate': float(c['whale_win_rate'][w]),
+                'whale_avg_pnl_per_trade': total_pnl / total_trades,
+                'whale_total_pnl': total_pnl,
+                'whale_total_trades': total_trades,
+                'market_id': self.market_ids[m],
+                'token_id': self.token_ids[int(c['token_idx'][i])],
+                'market_title': self.market_titles[m],
+                'side': 'BUY' if c['sides'][i] > 0 else 'SELL',
+                'outcome': self.outcome_labels[int(c['outcome_idx'][i])],
+                'price': Decimal(str(float(c['prices'][i]))),
+                'size': Decimal(str(float(c['sizes'][i]))),
+                'amount': Decimal(str(float(c['amounts'][i]))),
+                'resolved_win': None if outcome == UNRESOLVED else bool(outcome),
+            })
+        return result
+
+    def to_whale_trades_db(self, min_trades: int = 0) -> Dict[str, List[Dict]]:
+        """
+        Per-whale trade lists in the format consumed by
+        ``libs.backtesting.backtest_engine.WalkForwardBacktester.run``.
+        """
+        c = self.columns
+        grouped: Dict[str, List[Dict]] = {}
+        for i in range(len(self)):
+            pnl = float(c['realized_pnl'][i])
+            grouped.setdefault(self.whale_addresses[int(c['whale_idx'][i])], []).append({
+                'timestamp': _from_ns(int(c['timestamps'][i])),
+                'market_id': self.market_ids[int(c['market_idx'][i])],
+                'category': self.categories[int(c['category_idx'][i])],
+                'side': 'BUY' if c['sides'][i] > 0 else 'SELL',
+                'price': float(c['prices'][i]),
+                'size': float(c['sizes'][i]),
+                'pnl': 0.0 if np.isnan(pnl) else pnl,
+            })
+        return {addr: trades for addr, trades in grouped.items() if len(trades) >= min_trades}
+
+    def to_market_outcomes(self) -> Dict[str, Tuple[datetime, str, float]]:
+        """
+        Resolved markets as ``market_id -> (resolution_date, outcome, final_price)``,
+        the format consumed by ``WalkForwardBacktester.run``.
+        """
+        c = self.columns
+        outcomes = {}
+        for m, market_id in enumerate(self.market_ids):
+            outcome_idx = int(c['market_outcome_idx'][m])
+            resolved_at = _from_ns(int(c['market_resolution_ns'][m]))
+            if outcome_idx == UNRESOLVED or resolved_at is None:
+                continue
+            label = self.outcome_labels[outcome_idx]
+            final_price = {'YES': 1.0, 'NO': 0.0}.get(label, 0.5)
+            outcomes[market_id] = (resolved_at, label, final_price)
+        return outcomes
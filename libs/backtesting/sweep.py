@@ -0,0 +1,221 @@
+"""
+Vectorized Parameter Sweep Kernel
+Evaluates many copy-trading parameter sets against one trade stream in a single pass.
+
+The per-trade copy rule of ``src.services.backtester.Backtester`` is
+path-dependent only through the account balance, and each trade's P&L is
+proportional to the position size:
+
+    pnl_i = position_i * trade_return_i
+
+so the trade stream can be walked once while every parameter set advances
+in lock-step along a batch dimension. ``Backtester`` stays the reference
+implementation; ``tests/test_backtest_sweep.py`` checks the two agree.
+"""
+
+from dataclasses import dataclass
+from itertools import product
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+
+@dataclass
+class SweepResult:
+    """Per-parameter-set results, each array has leading dimension K."""
+    min_whale_quality: np.ndarray
+    position_size_pct: np.ndarray
+    max_position_usd: np.ndarray
+
+    ending_balance: np.ndarray
+    total_pnl: np.ndarray
+    total_pnl_pct: np.ndarray
+    total_trades: np.ndarray
+    winning_trades: np.ndarray
+    losing_trades: np.ndarray
+    win_rate: np.ndarray
+
+    # Backtester definition: max balance - min balance over the run
+    max_drawdown: np.ndarray
+    max_drawdown_pct: np.ndarray
+    # Peak-to-trough drawdown (fraction of running peak)
+    peak_drawdown_pct: np.ndarray
+    sharpe_ratio: np.ndarray
+
+    # [K, T] balance after each trade in the stream (None if not recorded)
+    balance_curves: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return int(self.ending_balance.shape[0])
+
+    def best(self, metric: str = 'sharpe_ratio') -> int:
+        """Index of the parameter set with the highest value of ``metric``."""
+        return int(np.argmax(getattr(self, metric)))
+
+    def to_records(self) -> List[Dict]:
+        """One dict per parameter set (without balance curves)."""
+        records = []
+        for k in range(len(self)):
+            records.append({
+                'min_whale_quality': float(self.min_whale_quality[k]),
+                'position_size_pct': float(self.position_size_pct[k]),
+                'max_position_usd': float(self.max_position_usd[k]),
+                'ending_balance': float(self.ending_balance[k]),
+                'total_pnl': float(self.total_pnl[k]),
+                'total_pnl_pct': float(self.total_pnl_pct[k]),
+                'total_trades': int(self.total_trades[k]),
+                'winning_trades': int(self.winning_trades[k]),
+                'losing_trades': int(self.losing_trades[k]),
+                'win_rate': float(self.win_rate[k]),
+                'max_drawdown': float(self.max_drawdown[k]),
+                'max_drawdown_pct': float(self.max_drawdown_pct[k]),
+                'peak_drawdown_pct': float(self.peak_drawdown_pct[k]),
+                'sharpe_ratio': float(self.sharpe_ratio[k]),
+            })
+        return records
+
+
+def parameter_grid(
+    min_whale_quality: Iterable[float],
+    position_size_pct: Iterable[float],
+    max_position_usd: Iterable[float]
+) -> Dict[str, np.ndarray]:
+    """
+    Cartesian product of parameter values as aligned arrays.
+
+    Returns:
+        Dict with keys min_whale_quality, position_size_pct, max_position_usd
+    """
+    combos = np.array(list(product(min_whale_quality, position_size_pct, max_position_usd)), dtype=np.float64)
+    if combos.size == 0:
+        combos = combos.reshape(0, 3)
+    return {
+        'min_whale_quality': combos[:, 0],
+        'position_size_pct': combos[:, 1],
+        'max_position_usd': combos[:, 2],
+    }
+
+
+def run_sweep(
+    trade_returns: Sequence[float],
+    whale_quality: Sequence[float],
+    min_whale_quality: Sequence[float],
+    position_size_pct: Sequence[float],
+    max_position_usd: Sequence[float],
+    day_index: Sequence[int],
+    starting_balance: float = 1000.0,
+    max_balance_fraction: float = 0.10,
+    day_by_copy_order: bool = True,
+    record_curves: bool = True
+) -> SweepResult:
+    """
+    Run K parameter sets over T trades.
+
+    Args:
+        trade_returns: [T] P&L per $1 of position for each trade (fees included)
+        whale_quality: [T] quality score (0-100) of the whale behind each trade
+        min_whale_quality: [K] minimum whale quality to copy
+        position_size_pct: [K] fraction of balance per trade before quality scaling
+        max_position_usd: [K] absolute cap per position
+        day_index: [T] integer day bucket used for daily P&L / Sharpe
+        starting_balance: Initial balance for every parameter set
+        max_balance_fraction: Hard cap on position as a fraction of balance
+        day_by_copy_order: If True the n-th *copied* trade lands in day_index[n]
+                           (Backtester's synthetic timeline); otherwise trade i
+                           lands in day_index[i]
+        record_curves: Keep the [K, T] balance curve matrix
+
+    Returns:
+        SweepResult
+    """
+    returns = np.asarray(trade_returns, dtype=np.float64)
+    quality = np.asarray(whale_quality, dtype=np.float64)
+    days = np.asarray(day_index, dtype=np.int64)
+    min_q = np.asarray(min_whale_quality, dtype=np.float64)
+    pct = np.asarray(position_size_pct, dtype=np.float64)
+    cap = np.asarray(max_position_usd, dtype=np.float64)
+
+    n_trades = returns.shape[0]
+    n_sets = min_q.shape[0]
+    if quality.shape[0] != n_trades or days.shape[0] != n_trades:
+        raise ValueError("trade_returns, whale_quality and day_index must have the same length")
+    if pct.shape[0] != n_sets or cap.shape[0] != n_sets:
+        raise ValueError("parameter arrays must have the same length")
+
+    n_days = int(days.max()) + 1 if n_trades else 0
+
+    balance = np.full(n_sets, float(starting_balance))
+    max_balance = balance.copy()
+    min_balance = balance.copy()
+    running_peak = balance.copy()
+    peak_drawdown = np.zeros(n_sets)
+    copied = np.zeros(n_sets, dtype=np.int64)
+    wins = np.zeros(n_sets, dtype=np.int64)
+    losses = np.zeros(n_sets, dtype=np.int64)
+    daily_pnl = np.zeros((n_sets, n_days))
+    day_active = np.zeros((n_sets, n_days), dtype=bool)
+    curves = np.empty((n_sets, n_trades)) if record_curves else None
+
+    # Quality scaling is per trade, the rest is per parameter set
+    scaled_pct = pct[None, :] * (quality[:, None] / 100.0) if n_trades else None
+
+    for i in range(n_trades):
+        # Backtester.should_copy_trade: quality filter and non-negative balance
+        active = (quality[i] >= min_q) & (balance >= 0)
+        if active.any():
+            position = np.minimum(np.minimum(balance * scaled_pct[i], cap), balance * max_balance_fraction)
+            pnl = np.where(active, position * returns[i], 0.0)
+            balance = balance + pnl
+
+            idx = np.flatnonzero(active)
+            day = days[copied[idx]] if day_by_copy_order else days[i]
+            daily_pnl[idx, day] += pnl[idx]
+            day_active[idx, day] = True
+
+            copied[idx] += 1
+            wins[idx] += pnl[idx] > 0
+            losses[idx] += pnl[idx] < 0
+
+            np.maximum(max_balance, balance, out=max_balance)
+            np.minimum(min_balance, balance, out=min_balance)
+            np.maximum(running_peak, balance, out=running_peak)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                dd = np.where(running_peak > 0, (running_peak - balance) / running_peak, 0.0)
+            np.maximum(peak_drawdown, dd, out=peak_drawdown)
+
+        if curves is not None:
+            curves[:, i] = balance
+
+    total_pnl = balance - starting_balance
+    with np.errstate(divide='ignore', invalid='ignore'):
+        win_rate = np.where(copied > 0, wins / np.maximum(copied, 1) * 100.0, 0.0)
+        max_drawdown = max_balance - min_balance
+        max_drawdown_pct = np.where(max_balance > 0, max_drawdown / max_balance * 100.0, 0.0)
+
+    # Sharpe over days that had at least one copied trade (as in Backtester)
+    n_active_days = day_active.sum(axis=1)
+    daily_returns = daily_pnl / starting_balance
+    safe_n = np.maximum(n_active_days, 1)
+    mean = np.where(day_active, daily_returns, 0.0).sum(axis=1) / safe_n
+    var = np.where(day_active, (daily_returns - mean[:, None]) ** 2, 0.0).sum(axis=1) / safe_n
+    std = np.sqrt(var)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where((n_active_days > 1) & (std > 0), mean / std * np.sqrt(252), 0.0)
+
+    return SweepResult(
+        min_whale_quality=min_q,
+        position_size_pct=pct,
+        max_position_usd=cap,
+        ending_balance=balance,
+        total_pnl=total_pnl,
+        total_pnl_pct=total_pnl / starting_balance * 100.0,
+        total_trades=copied,
+        winning_trades=wins,
+        losing_trades=losses,
+        win_rate=win_rate,
+        max_drawdown=max_drawdown,
+        max_drawdown_pct=max_drawdown_pct,
+        peak_drawdown_pct=peak_drawdown * 100.0,
+        sharpe_ratio=sharpe,
+        balance_curves=curves,
+    )
@@ -23,6 +23,8 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass
 from collections import defaultdict
 
+from libs.analytics.streaming_moments import EWMAMoments, RunningMoments
+
 
 @dataclass
 class PositionSizeResult:
@@ -45,12 +47,36 @@ class PositionSizeResult:
     reason: str   # Explanation
 
 
+@dataclass
+class BatchPositionSizes:
+    """Vectorized sizing result; element i corresponds to signal i."""
+    fractions: np.ndarray  # Final fraction of NAV (0 where rejected)
+    dollar_sizes: np.ndarray
+
+    base_kelly: np.ndarray
+    adjusted_kelly: np.ndarray
+
+    k_conf: np.ndarray
+    k_vol: np.ndarray
+    k_corr: np.ndarray
+    k_dd: float
+
+    capped: np.ndarray  # Hit the per-position cap
+    portfolio_scale: float  # Applied to all positions to respect the total cap (1.0 = not binding)
+
+    def __len__(self) -> int:
+        return len(self.fractions)
+
+
 class EWMAVolatilityEstimator:
     """
     Exponentially Weighted Moving Average volatility estimator.
 
     Research parameter: λ = 0.94
     Higher λ = more weight on recent observations
+
+    Backed by a streaming EWMAMoments, so each return is an O(1) update
+    and the state can be persisted with to_dict()/from_dict().
     """
 
     def __init__(self, lambda_param: float = 0.94):
@@ -59,9 +85,13 @@ class EWMAVolatilityEstimator:
             lambda_param: EWMA decay parameter (0.94 from research)
         """
         self.lambda_param = lambda_param
-        self.variance_ewma = None
+        self.moments: Optional[EWMAMoments] = None
         self.last_update = None
 
+    @property
+    def variance_ewma(self) -> Optional[float]:
+        return self.moments.square_variance if self.moments is not None else None
+
     def update(self, returns: List[float]) -> None:
         """
         Update EWMA variance estimate with new returns.
@@ -73,28 +103,46 @@ class EWMAVolatilityEstimator:
             return
 
         # Initialize with sample variance if first time
-        if self.variance_ewma is None:
-            self.variance_ewma = np.var(returns) if len(returns) > 1 else 0.01
-
-        # Update EWMA variance
-        for ret in returns:
-            self.variance_ewma = (
-                self.lambda_param * self.variance_ewma +
-                (1 - self.lambda_param) * ret**2
-            )
+        if self.moments is None:
+            initial = RunningMoments.from_values(returns).variance() if len(returns) > 1 else 0.01
+            self.moments = EWMAMoments(self.lambda_param, initial_variance=initial)
+
+        self.moments.update_many(returns)
+        self.last_update = datetime.now()
 
+    def update_one(self, ret: float) -> None:
+        """O(1) update with a single return (seeds the default variance if first)."""
+        if self.moments is None:
+            self.moments = EWMAMoments(self.lambda_param, initial_variance=0.01)
+        self.moments.update(ret)
         self.last_update = datetime.now()
 
     def get_volatility(self) -> float:
         """Get current volatility estimate (standard deviation)."""
-        if self.variance_ewma is None:
+        if self.moments is None:
             return 0.1  # Default if not initialized
 
-        return np.sqrt(self.variance_ewma)
+        return self.moments.volatility
 
     def get_variance(self) -> float:
         """Get current variance estimate."""
-        return self.variance_ewma if self.variance_ewma is not None else 0.01
+        return self.moments.square_variance if self.moments is not None else 0.01
+
+    def to_dict(self) -> Dict:
+        return {
+            'lambda_param': self.lambda_param,
+            'moments': self.moments.to_dict() if self.moments is not None else None,
+            'last_update': self.last_update.isoformat() if self.last_update else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "EWMAVolatilityEstimator":
+        estimator = cls(lambda_param=data['lambda_param'])
+        if data.get('moments'):
+            estimator.moments = EWMAMoments.from_dict(data['moments'])
+        if data.get('last_update'):
+            estimator.last_update = datetime.fromisoformat(data['last_update'])
+        return estimator
 
 
 class AdaptiveKellyPositionSizer:
@@ -206,20 +254,8 @@ class AdaptiveKellyPositionSizer:
         Returns:
             Volatility multiplier (0.5-1.2)
         """
-        # Get or create volatility estimator for this market
-        if market_id not in self.volatility_estimators:
-            self.volatility_estimators[market_id] = EWMAVolatilityEstimator(
-                lambda_param=self.ewma_lambda
-            )
-
-        estimator = self.volatility_estimators[market_id]
-
-        # Update with recent returns if provided
-        if recent_returns:
-            estimator.update(recent_returns)
-
-        # Get current volatility estimate
-        market_vol = estimator.get_volatility()
+        # Update (if returns provided) and read this market's EWMA estimate
+        market_vol = self._market_volatility(market_id, recent_returns)
 
         # Calculate adjustment factor
         k_vol = 1.0 / (1.0 + 5.0 * market_vol)
@@ -385,16 +421,137 @@ class AdaptiveKellyPositionSizer:
             reason=reason
         )
 
+    def _market_volatility(
+        self,
+        market_id: str,
+        recent_returns: Optional[List[float]] = None
+    ) -> float:
+        """Update and read the per-market EWMA volatility (same state as the scalar path)."""
+        if market_id not in self.volatility_estimators:
+            self.volatility_estimators[market_id] = EWMAVolatilityEstimator(
+                lambda_param=self.ewma_lambda
+            )
+
+        estimator = self.volatility_estimators[market_id]
+        if recent_returns:
+            estimator.update(recent_returns)
+
+        return estimator.get_volatility()
+
+    def calculate_position_sizes(
+        self,
+        win_probabilities: np.ndarray,
+        win_payoffs: np.ndarray,
+        whale_quality_scores: np.ndarray,
+        market_ids: List[str],
+        nav: float,
+        recent_returns: Optional[List[Optional[List[float]]]] = None,
+        portfolio_correlations: Optional[np.ndarray] = None,
+        current_drawdown: float = 0.0,
+        max_total_fraction: Optional[float] = None
+    ) -> BatchPositionSizes:
+        """
+        Size a burst of signals in one NumPy pass.
+
+        Applies the same formula, cap and floor as calculate_position_size,
+        element by element, so with max_total_fraction=None every size is
+        identical to the scalar result. Only the per-market volatility
+        lookup loops in Python, because the EWMA estimators are stateful.
+
+        Args:
+            win_probabilities: Estimated win probabilities (0-1)
+            win_payoffs: Win payoff ratios
+            whale_quality_scores: WQS per signal (0-100)
+            market_ids: Market identifier per signal for volatility tracking
+            nav: Net asset value shared by all signals
+            recent_returns: Optional recent returns per signal (None entries allowed)
+            portfolio_correlations: Correlation of each signal with the portfolio
+            current_drawdown: Current portfolio drawdown (0-1)
+            max_total_fraction: Cap on the combined batch allocation (fraction of NAV);
+                if exceeded, all positions are scaled down proportionally and any
+                that fall below the floor are dropped
+
+        Returns:
+            BatchPositionSizes with per-signal arrays
+        """
+        p = np.asarray(win_probabilities, dtype=float)
+        b = np.asarray(win_payoffs, dtype=float)
+        wqs = np.asarray(whale_quality_scores, dtype=float)
+        n = len(p)
+        if portfolio_correlations is None:
+            rho = np.zeros(n)
+        else:
+            rho = np.asarray(portfolio_correlations, dtype=float)
+
+        # 1. Base Kelly: (p*b - q) / b, zero outside the valid domain
+        valid = (p > 0) & (p < 1) & (b > 0)
+        safe_b = np.where(valid, b, 1.0)
+        base_kelly = np.where(valid, (p * safe_b - (1 - p)) / safe_b, 0.0)
+        positive = base_kelly > 0
+
+        # 2. Adjustment factors (neutral where the edge is negative, as in the scalar path)
+        k_conf = np.where(positive, 0.4 + 0.6 * (np.clip(wqs, 0, 100) / 100.0), 1.0)
+        k_corr = np.where(positive, np.maximum(0.3, 1.0 - rho ** 2), 1.0)
+        k_dd = self._calculate_drawdown_adjustment(current_drawdown)
+
+        market_vol = np.zeros(n)
+        for i in np.flatnonzero(positive):
+            returns = recent_returns[i] if recent_returns is not None else None
+            market_vol[i] = self._market_volatility(market_ids[i], returns)
+        k_vol = np.where(positive, np.clip(1.0 / (1.0 + 5.0 * market_vol), 0.5, 1.2), 1.0)
+
+        # 3-4. Adjusted fraction
+        kelly_multiplier = 0.5 if self.use_half_kelly else 1.0
+        adjusted = np.where(
+            positive,
+            kelly_multiplier * base_kelly * k_conf * k_vol * k_corr * k_dd,
+            0.0
+        )
+
+        # 5. Per-position cap
+        capped = adjusted > self.max_position_fraction
+        adjusted = np.where(capped, self.max_position_fraction, adjusted)
+
+        # 6. Floor
+        fractions = np.where(adjusted >= self.min_position_fraction, adjusted, 0.0)
+        capped &= fractions > 0
+
+        # Shared portfolio cap across the batch
+        portfolio_scale = 1.0
+        total = fractions.sum()
+        if max_total_fraction is not None and total > max_total_fraction:
+            portfolio_scale = max_total_fraction / total
+            fractions = fractions * portfolio_scale
+            fractions = np.where(fractions >= self.min_position_fraction, fractions, 0.0)
+            # Scaled positions sit below the per-position cap
+            capped = np.zeros(n, dtype=bool)
+
+        return BatchPositionSizes(
+            fractions=fractions,
+            dollar_sizes=fractions * nav,
+            base_kelly=base_kelly,
+            adjusted_kelly=adjusted,
+            k_conf=k_conf,
+            k_vol=k_vol,
+            k_corr=k_corr,
+            k_dd=k_dd,
+            capped=capped,
+            portfolio_scale=portfolio_scale
+        )
+
     def calculate_batch_positions(
         self,
         signals: List[Dict],
         nav: float,
-        current_drawdown: float = 0.0
+        current_drawdown: float = 0.0,
+        max_total_fraction: Optional[float] = None
     ) -> List[Tuple[Dict, PositionSizeResult]]:
         """
         Calculate position sizes for multiple signals simultaneously.
 
-        Useful for portfolio construction and rebalancing.
+        Useful for portfolio construction and rebalancing. Runs the
+        vectorized calculate_position_sizes and unpacks the arrays into
+        per-signal PositionSizeResult objects.
 
         Args:
             signals: List of signal dicts with keys:
@@ -406,24 +563,76 @@ class AdaptiveKellyPositionSizer:
                 - portfolio_correlation: float (optional)
             nav: Net asset value
             current_drawdown: Current portfolio drawdown
+            max_total_fraction: Optional cap on the combined allocation (fraction of NAV)
 
         Returns:
             List of (signal, PositionSizeResult) tuples
         """
+        if not signals:
+            return []
+
+        batch = self.calculate_position_sizes(
+            win_probabilities=[s['win_probability'] for s in signals],
+            win_payoffs=[s['win_payoff'] for s in signals],
+            whale_quality_scores=[s['whale_quality_score'] for s in signals],
+            market_ids=[s['market_id'] for s in signals],
+            nav=nav,
+            recent_returns=[s.get('recent_returns') for s in signals],
+            portfolio_correlations=[s.get('portfolio_correlation', 0.0) for s in signals],
+            current_drawdown=current_drawdown,
+            max_total_fraction=max_total_fraction
+        )
+
+        # Plain floats once per array; per-element numpy indexing dominates otherwise
+        columns = zip(
+            signals,
+            batch.base_kelly.tolist(),
+            batch.adjusted_kelly.tolist(),
+            batch.fractions.tolist(),
+            batch.dollar_sizes.tolist(),
+            batch.k_conf.tolist(),
+            batch.k_vol.tolist(),
+            batch.k_corr.tolist(),
+            batch.capped.tolist()
+        )
+
         results = []
+        for signal, base_kelly, adjusted_kelly, fraction, dollar_size, k_conf, k_vol, k_corr, capped in columns:
+            if base_kelly <= 0:
+                result = PositionSizeResult(
+                    fraction=0.0, dollar_size=0.0, base_kelly=base_kelly, adjusted_kelly=0.0,
+                    k_conf=1.0, k_vol=1.0, k_corr=1.0, k_dd=1.0, capped=False,
+                    reason="Negative or zero edge (Kelly <= 0)"
+                )
+                results.append((signal, result))
+                continue
+
+            if fraction == 0.0:
+                if adjusted_kelly >= self.min_position_fraction:
+                    reason = f"Dropped by portfolio cap (scaled by {batch.portfolio_scale:.2f})"
+                elif adjusted_kelly > 0:
+                    reason = f"Position too small ({adjusted_kelly:.1%} < {self.min_position_fraction:.1%})"
+                else:
+                    reason = "All adjustments resulted in zero position"
+            elif capped:
+                reason = f"Capped at {self.max_position_fraction:.1%} NAV (base Kelly: {base_kelly:.1%})"
+            else:
+                reason = f"Sized at {adjusted_kelly:.1%} NAV (base Kelly: {base_kelly:.1%})"
+                if batch.portfolio_scale < 1.0:
+                    reason += f", scaled by {batch.portfolio_scale:.2f} for portfolio cap"
 
-        for signal in signals:
-            result = self.calculate_position_size(
-                win_probability=signal['win_probability'],
-                win_payoff=signal['win_payoff'],
-                whale_quality_score=signal['whale_quality_score'],
-                market_id=signal['market_id'],
-                nav=nav,
-                recent_returns=signal.get('recent_returns'),
-                portfolio_correlation=signal.get('portfolio_correlation', 0.0),
-                current_drawdown=current_drawdown
+            result = PositionSizeResult(
+                fraction=fraction,
+                dollar_size=dollar_size,
+                base_kelly=base_kelly,
+                adjusted_kelly=adjusted_kelly,
+                k_conf=k_conf,
+                k_vol=k_vol,
+                k_corr=k_corr,
+                k_dd=batch.k_dd,
+                capped=capped,
+                reason=reason
             )
-
             results.append((signal, result))
 
         return results
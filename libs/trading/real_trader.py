@@ -30,6 +30,7 @@ from libs.trading.bet_weighting import (
     PortfolioState, BetWeight
 )
 from libs.common.models import Position
+from src.realtime.change_feed import get_change_feed
 from sqlalchemy.orm import Session
 import uuid
 
@@ -306,6 +307,7 @@ class RealTradingEngine:
                         )
                         session.add(db_position)
                         session.commit()
+                        get_change_feed().publish_threadsafe("positions", db_position.position_id)
                         logger.info(f"✅ Position saved to database: {db_position.position_id}")
                 except Exception as e:
                     logger.error(f"Failed to save position to database: {e}")
@@ -373,6 +375,7 @@ class RealTradingEngine:
                     )
                     session.add(db_position)
                     session.commit()
+                    get_change_feed().publish_threadsafe("positions", db_position.position_id)
                     logger.info(f"✅ Position saved to database: {db_position.position_id}")
             except Exception as e:
                 logger.error(f"Failed to save position to database: {e}")
@@ -22,8 +22,11 @@ from typing import Dict, List, Optional, Tuple, Set
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from collections import defaultdict
+from functools import lru_cache
 from scipy import stats
 
+from libs.analytics.streaming_moments import RunningMoments, SampleMoments
+
 
 @dataclass
 class RiskMetrics:
@@ -75,6 +78,12 @@ class StopLoss:
     last_updated: datetime
 
 
+@lru_cache(maxsize=32)
+def _normal_quantile(p: float) -> float:
+    """Standard normal quantile; confidence levels repeat, so cache the ppf."""
+    return float(stats.norm.ppf(p))
+
+
 class CornishFisherVaR:
     """
     Modified Value-at-Risk using Cornish-Fisher expansion.
@@ -101,14 +110,36 @@ class CornishFisherVaR:
         if len(returns) < 10:
             return 0.0, 0.0, 0.0, 0.0
 
+        return CornishFisherVaR.calculate_mvar_from_moments(
+            RunningMoments.from_values(returns), confidence_level
+        )
+
+    @staticmethod
+    def calculate_mvar_from_moments(
+        moments: SampleMoments,
+        confidence_level: float = 0.95
+    ) -> Tuple[float, float, float, float]:
+        """
+        Modified VaR from streaming return moments (no pass over the returns).
+
+        Args:
+            moments: Moments of the return series (RunningMoments/RollingMoments)
+            confidence_level: Confidence level (0.95 = 95%)
+
+        Returns:
+            Tuple of (VaR, mVaR, skewness, kurtosis)
+        """
+        if moments.n < 10:
+            return 0.0, 0.0, 0.0, 0.0
+
         # Calculate moments
-        mean = np.mean(returns)
-        std = np.std(returns, ddof=1)
-        skew = stats.skew(returns)
-        kurt = stats.kurtosis(returns, fisher=True)  # Excess kurtosis
+        mean = moments.mean
+        std = moments.std(ddof=1)
+        skew = moments.skewness
+        kurt = moments.excess_kurtosis
 
         # Standard normal quantile
-        z = stats.norm.ppf(1 - confidence_level)
+        z = _normal_quantile(1 - confidence_level)
 
         # Cornish-Fisher adjustment
         z_cf = (
@@ -486,7 +517,8 @@ class RiskManager:
         self,
         portfolio_returns: np.ndarray,
         positions: List[Dict],
-        nav: float
+        nav: float,
+        return_moments: Optional[SampleMoments] = None
     ) -> RiskMetrics:
         """
         Calculate comprehensive portfolio risk metrics.
@@ -495,14 +527,21 @@ class RiskManager:
             portfolio_returns: Historical portfolio returns
             positions: List of current positions
             nav: Net asset value
+            return_moments: Streaming moments of portfolio_returns, if the
+                caller maintains them (skips re-deriving mean/std/skew/kurtosis)
 
         Returns:
             RiskMetrics object
         """
         # VaR metrics
-        var_95, mvar_95, skew, kurt = self.var_calculator.calculate_mvar(
-            portfolio_returns, confidence_level=0.95
-        )
+        if return_moments is not None:
+            var_95, mvar_95, skew, kurt = self.var_calculator.calculate_mvar_from_moments(
+                return_moments, confidence_level=0.95
+            )
+        else:
+            var_95, mvar_95, skew, kurt = self.var_calculator.calculate_mvar(
+                portfolio_returns, confidence_level=0.95
+            )
         cvar_95 = self.var_calculator.calculate_cvar(
             portfolio_returns, confidence_level=0.95
         )
@@ -0,0 +1,98 @@
+"""
+Benchmark RealTimeAnomalyDetector Baseline Latency
+
+Streams synthetic trades into a single market and reports per-trade
+process_trade_event latency per block of trades. The recursive EWMA
+baseline should stay flat as the market accumulates history; the exact
+recompute mode is timed on a shorter stream for comparison.
+
+Usage:
+    python3 scripts/benchmark_anomaly_detector.py
+    python3 scripts/benchmark_anomaly_detector.py --trades 200000 --blocks 5
+"""
+
+import sys
+import os
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analytics.realtime_anomaly_detector import (
+    AnomalyDetectorConfig,
+    RealTimeAnomalyDetector,
+    TradeEvent,
+)
+
+
+def generate_events(n_trades: int, seed: int = 42):
+    """Trade events for one market with log-normal USD sizes"""
+    rng = np.random.default_rng(seed)
+    values = rng.lognormal(6.5, 1.0, n_trades)
+    start = datetime(2025, 1, 1)
+    return [
+        TradeEvent(
+            trade_id=f"t{n}",
+            market_id="market_bench",
+            market_topic="POLITICS",
+            trader_address=f"0x{n % 5000:040x}",
+            side="BUY" if n % 2 else "SELL",
+            size=float(value) / 0.5,
+            price=0.5,
+            usd_value=float(value),
+            timestamp=start + timedelta(milliseconds=n * 250),
+        )
+        for n, value in enumerate(values)
+    ]
+
+
+def run(label: str, config: AnomalyDetectorConfig, events, n_blocks: int):
+    """Print latency percentiles for each consecutive block of trades"""
+    detector = RealTimeAnomalyDetector(config)
+    block_size = max(1, len(events) // n_blocks)
+    latencies = np.empty(len(events))
+
+    for n, event in enumerate(events):
+        start = time.perf_counter()
+        detector.process_trade_event(event)
+        latencies[n] = (time.perf_counter() - start) * 1e6
+
+    print(f"\n{label}")
+    print(f"  {'Trades seen':>14}{'p50 (us)':>12}{'p99 (us)':>12}{'max (us)':>12}")
+    for block in range(n_blocks):
+        chunk = latencies[block * block_size:(block + 1) * block_size]
+        if not len(chunk):
+            break
+        print(
+            f"  {(block + 1) * block_size:>14,}"
+            f"{np.percentile(chunk, 50):>12.1f}"
+            f"{np.percentile(chunk, 99):>12.1f}"
+            f"{chunk.max():>12.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark anomaly detector baseline latency')
+    parser.add_argument('--trades', type=int, default=1_000_000, help='Trades streamed into one market')
+    parser.add_argument('--exact-trades', type=int, default=20_000, help='Trades for the exact recompute run')
+    parser.add_argument('--blocks', type=int, default=10, help='Number of latency blocks to report')
+    args = parser.parse_args()
+
+    print(f"Generating {args.trades:,} trade events...")
+    events = generate_events(args.trades)
+
+    run("Recursive EWMA", AnomalyDetectorConfig(), events, args.blocks)
+    run(
+        "Exact recompute (validation mode)",
+        AnomalyDetectorConfig(ewma_exact_recompute=True),
+        events[:args.exact_trades],
+        args.blocks,
+    )
+
+
+if __name__ == "__main__":
+    main()
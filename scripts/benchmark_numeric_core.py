@@ -0,0 +1,166 @@
+"""
+Benchmark Decimal vs float64 Analytics Paths
+
+Generates a synthetic closed-trade history and times each analytics module
+with its Decimal reference path and with the numeric_core fast path.
+
+Usage:
+    python3 scripts/benchmark_numeric_core.py
+    python3 scripts/benchmark_numeric_core.py --trades 100000 --whales 50 --markets 200
+"""
+
+import sys
+import os
+import asyncio
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Callable, Dict, List
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analytics import performance_metrics_engine as perf
+from src.analytics import edge_detection_system as edge
+from src.analytics import cusum_edge_decay_detector as cusum
+from src.analytics import whale_lifecycle_tracker as lifecycle
+from src.analytics import trade_attribution_analyzer as attribution
+from src.analytics.trade_store import TradeStore
+
+
+def generate_trades(n_trades: int, n_whales: int, n_markets: int, seed: int = 42) -> List[Dict]:
+    """Closed trades spread over the last 180 days"""
+    rng = random.Random(seed)
+    now = datetime.now()
+    topics = ["POLITICS", "CRYPTO", "SPORTS", "ECONOMICS"]
+
+    trades = []
+    for n in range(n_trades):
+        exit_time = now - timedelta(seconds=rng.uniform(0, 180 * 86400))
+        size = Decimal(rng.randint(50, 5000))
+        pnl_pct = Decimal(str(round(rng.gauss(0.5, 8.0), 3)))
+        trades.append({
+            "trade_id": f"t{n}",
+            "whale_address": f"0xwhale{rng.randrange(n_whales):04d}",
+            "market_id": f"market_{rng.randrange(n_markets)}",
+            "market_topic": rng.choice(topics),
+            "side": "BUY",
+            "entry_price": Decimal("0.50"),
+            "exit_price": Decimal("0.52"),
+            "position_size_usd": size,
+            "entry_time": exit_time - timedelta(hours=rng.uniform(1, 72)),
+            "exit_time": exit_time,
+            "pnl_usd": (size * pnl_pct / Decimal("100")).quantize(Decimal("0.01")),
+            "pnl_pct": pnl_pct,
+            "is_open": False,
+            "fees_paid_usd": Decimal("1"),
+            "slippage_pct": Decimal("0.1"),
+        })
+    trades.sort(key=lambda t: t["exit_time"])
+    return trades
+
+
+def build(trade_cls, rows: List[Dict]) -> List:
+    """Instantiate a module's Trade dataclass from generic rows"""
+    fields = trade_cls.__dataclass_fields__
+    return [trade_cls(**{k: v for k, v in row.items() if k in fields}) for row in rows]
+
+
+def timed(label: str, fn: Callable) -> float:
+    start = time.perf_counter()
+    asyncio.run(fn())
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<16} {elapsed:>9.3f}s")
+    return elapsed
+
+
+def run_pair(name: str, make: Callable[[bool], Callable]) -> Dict:
+    """
+    Time the Decimal and numeric variants of one workload.
+
+    The numeric path is timed twice on the same instance: the first call
+    builds the float64 columns, later calls only sync new trades.
+    """
+    print(f"\n{name}")
+    decimal_s = timed("decimal", make(False))
+    run = make(True)
+    cold_s = timed("numeric (cold)", run)
+    warm_s = timed("numeric (warm)", run)
+    print(f"  speedup          {decimal_s / cold_s:>8.1f}x cold, {decimal_s / warm_s:.1f}x warm")
+    return {"name": name, "decimal_s": decimal_s, "cold_s": cold_s, "warm_s": warm_s}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Decimal vs float64 analytics')
+    parser.add_argument('--trades', type=int, default=1_000_000, help='Number of synthetic trades')
+    parser.add_argument('--whales', type=int, default=10, help='Number of distinct whales')
+    parser.add_argument('--markets', type=int, default=10, help='Number of distinct markets')
+    args = parser.parse_args()
+
+    print(f"Generating {args.trades:,} trades ({args.whales} whales, {args.markets} markets)...")
+    rows = generate_trades(args.trades, args.whales, args.markets)
+
+    perf_trades = build(perf.Trade, rows)
+    # Decimal and numeric runs of a module share one store; only the numeric
+    # path builds its columns
+    edge_store = TradeStore.from_trades(build(edge.Trade, rows))
+    cusum_store = TradeStore.from_trades(build(cusum.Trade, rows))
+    lifecycle_store = TradeStore.from_trades(build(lifecycle.Trade, rows))
+    attribution_trades = build(attribution.Trade, rows)
+
+    engine = perf.PerformanceMetricsEngine(perf.PerformanceConfig(max_trade_history=args.trades))
+    for trade in perf_trades:
+        engine.add_trade(trade)
+
+    def performance(numeric: bool):
+        async def run():
+            await engine.recompute_metrics(perf.TimeWindow.ALL_TIME, numeric=numeric)
+        return run
+
+    def edges(numeric: bool):
+        system = edge.EdgeDetectionSystem(edge.EdgeConfig(use_numeric_core=numeric), trade_store=edge_store)
+        return system.calculate_all_edges
+
+    def cusum_update(numeric: bool):
+        detector = cusum.CUSUMEdgeDecayDetector(cusum.CUSUMConfig(use_numeric_core=numeric), trade_store=cusum_store)
+        return detector.update_all_cusum
+
+    def lifecycles(numeric: bool):
+        tracker = lifecycle.WhaleLifecycleTracker(
+            lifecycle.LifecycleConfig(use_numeric_core=numeric), trade_store=lifecycle_store
+        )
+        return tracker.update_all_lifecycles
+
+    def attribution_by_whale(numeric: bool):
+        analyzer = attribution.TradeAttributionAnalyzer(attribution.AttributionConfig(use_numeric_core=numeric))
+        for trade in attribution_trades:
+            analyzer.add_trade(trade)
+
+        async def run():
+            await analyzer.analyze_by_dimension(attribution.AttributionDimension.WHALE)
+        return run
+
+    results = [
+        run_pair("PerformanceMetricsEngine.recompute_metrics (ALL_TIME)", performance),
+        run_pair("EdgeDetectionSystem.calculate_all_edges", edges),
+        run_pair("CUSUMEdgeDecayDetector.update_all_cusum", cusum_update),
+        run_pair("WhaleLifecycleTracker.update_all_lifecycles", lifecycles),
+        run_pair("TradeAttributionAnalyzer.analyze_by_dimension (whale)", attribution_by_whale),
+    ]
+
+    print(f"\n{'='*80}")
+    print(f"{'Workload':<55}{'Cold':>12}{'Warm':>12}")
+    print("-" * 80)
+    for result in results:
+        print(
+            f"{result['name'][:54]:<55}"
+            f"{result['decimal_s'] / result['cold_s']:>11.1f}x"
+            f"{result['decimal_s'] / result['warm_s']:>11.1f}x"
+        )
+    print(f"{'='*80}\n")
+
+
+if __name__ == "__main__":
+    main()
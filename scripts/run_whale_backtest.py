@@ -6,6 +6,8 @@ backtest to validate the production framework.
 
 Usage:
     python3 scripts/run_whale_backtest.py --start 2024-01-01 --end 2024-12-31
+    python3 scripts/run_whale_backtest.py --build-dataset data/backtest_dataset
+    python3 scripts/run_whale_backtest.py --dataset data/backtest_dataset --start 2024-01-01
 """
 
 import sys
@@ -24,6 +26,7 @@ from libs.backtesting.backtest_engine import (
     BacktestConfig,
     print_backtest_report
 )
+from libs.backtesting.dataset import BacktestDataset
 from api.db import get_db_session
 from api.models import Whale, Trade as DBTrade
 
@@ -185,7 +188,8 @@ async def run_backtest(
     initial_capital: float = 100000.0,
     min_wqs: float = 75.0,
     use_pipeline: bool = True,
-    use_adaptive_sizing: bool = True
+    use_adaptive_sizing: bool = True,
+    dataset_path: str = None
 ):
     """
     Run comprehensive backtest with real whale data.
@@ -197,6 +201,7 @@ async def run_backtest(
         min_wqs: Minimum WQS for whale inclusion
         use_pipeline: Use 3-stage signal pipeline
         use_adaptive_sizing: Use adaptive Kelly sizing
+        dataset_path: Saved BacktestDataset directory to read instead of the database
     """
     print("="*80)
     print("WHALE COPY-TRADING BACKTEST")
@@ -210,12 +215,19 @@ async def run_backtest(
     print()
 
     # Load data
-    whale_trades_db = await load_whale_trades_from_db(
-        start_date,
-        end_date,
-        min_trades=50,
-        min_volume=100000.0
-    )
+    if dataset_path:
+        print(f"Mapping backtest dataset from {dataset_path}...")
+        dataset = BacktestDataset.load(dataset_path).slice(start_date, end_date)
+        whale_trades_db = dataset.to_whale_trades_db(min_trades=10)
+        market_outcomes = dataset.to_market_outcomes()
+    else:
+        whale_trades_db = await load_whale_trades_from_db(
+            start_date,
+            end_date,
+            min_trades=50,
+            min_volume=100000.0
+        )
+        market_outcomes = {}
 
     if not whale_trades_db:
         print("❌ No qualified whales found in database!")
@@ -223,7 +235,8 @@ async def run_backtest(
         return
 
     # Load or simulate market outcomes
-    market_outcomes = simulate_market_outcomes_from_trades(whale_trades_db)
+    if not market_outcomes:
+        market_outcomes = simulate_market_outcomes_from_trades(whale_trades_db)
 
     # Create backtest config
     config = BacktestConfig(
@@ -316,8 +329,29 @@ def main():
         help='Disable adaptive Kelly sizing'
     )
 
+    parser.add_argument(
+        '--dataset',
+        type=str,
+        default=None,
+        help='Read trades from a saved BacktestDataset directory (memory-mapped)'
+    )
+
+    parser.add_argument(
+        '--build-dataset',
+        type=str,
+        default=None,
+        help='Build a BacktestDataset from the database, save it to this directory and exit'
+    )
+
     args = parser.parse_args()
 
+    if args.build_dataset:
+        from src.config import settings
+        dataset = BacktestDataset.from_database(settings.DATABASE_URL)
+        dataset.save(args.build_dataset)
+        print(f"✅ Saved {len(dataset)} trades to {args.build_dataset}")
+        return
+
     # Parse dates
     start_date = datetime.strptime(args.start, '%Y-%m-%d')
     end_date = datetime.strptime(args.end, '%Y-%m-%d')
@@ -329,7 +363,8 @@ def main():
         initial_capital=args.capital,
         min_wqs=args.min_wqs,
         use_pipeline=not args.no_pipeline,
-        use_adaptive_sizing=not args.no_adaptive_sizing
+        use_adaptive_sizing=not args.no_adaptive_sizing,
+        dataset_path=args.dataset
     ))
 
 
@@ -27,6 +27,15 @@ async def get_whales() -> List[Dict]:
         async with session.get(f"{API_BASE}/api/whales?limit=100") as resp:
             return await resp.json()
 
+async def wait_for_backtest(session: aiohttp.ClientSession, job_id: str, poll_interval: float = 1.0) -> Dict:
+    """Poll a submitted backtest job until it finishes"""
+    while True:
+        async with session.get(f"{API_BASE}/api/backtest/jobs/{job_id}") as resp:
+            job = await resp.json()
+        if job.get('status') in ('done', 'failed') or 'status' not in job:
+            return job
+        await asyncio.sleep(poll_interval)
+
 async def run_strategy_backtest(session: aiohttp.ClientSession, strategy: Dict, whale_addresses: List[str]) -> Dict:
     """Run backtest for a strategy"""
 
@@ -63,14 +72,18 @@ async def run_strategy_backtest(session: aiohttp.ClientSession, strategy: Dict,
             json=backtest_params,
             timeout=aiohttp.ClientTimeout(total=60)
         ) as resp:
-            result = await resp.json()
-            return {
-                'strategy_id': strategy['id'],
-                'strategy_name': strategy['name'],
-                'success': result.get('success', False),
-                'results': result.get('results', {}),
-                'error': result.get('error')
-            }
+            submitted = await resp.json()
+        if not submitted.get('success'):
+            result = submitted
+        else:
+            result = await wait_for_backtest(session, submitted['job_id'])
+        return {
+            'strategy_id': strategy['id'],
+            'strategy_name': strategy['name'],
+            'success': result.get('success', False),
+            'results': result.get('results') or {},
+            'error': result.get('error')
+        }
     except Exception as e:
         return {
             'strategy_id': strategy['id'],
@@ -62,13 +62,11 @@ from .realtime_analytics_dashboard import (
 )
 from .edge_detection_system import (
     EdgeDetectionSystem,
-    EdgeConfig,
-    Trade as EdgeTrade
+    EdgeConfig
 )
 from .cusum_edge_decay_detector import (
     CUSUMEdgeDecayDetector,
-    CUSUMConfig,
-    Trade as CUSUMTrade
+    CUSUMConfig
 )
 from .market_efficiency_analyzer import (
     MarketEfficiencyAnalyzer,
@@ -77,8 +75,12 @@ from .market_efficiency_analyzer import (
 )
 from .whale_lifecycle_tracker import (
     WhaleLifecycleTracker,
-    LifecycleConfig,
-    Trade as LifeTrade
+    LifecycleConfig
+)
+from .trade_store import (
+    DirtySet,
+    TradeStore,
+    TradeRecord
 )
 from .adaptive_threshold_manager import (
     AdaptiveThresholdManager,
@@ -111,6 +113,13 @@ class AnalyticsIntegrationConfig:
     reports_update_interval_seconds: int = 3600
     dashboard_update_interval_seconds: int = 5
 
+    # Shared trade store (edge, CUSUM, lifecycle)
+    trade_retention_days: Optional[int] = None  # Keep full history if None
+
+    # Incremental updates: loops recompute only entities with new trades,
+    # plus a full pass at this interval so rolling windows stay current
+    full_refresh_interval_seconds: int = 3600
+
 
 class AnalyticsIntegration:
     """
@@ -139,6 +148,12 @@ class AnalyticsIntegration:
         self.lifecycle_tracker: Optional[WhaleLifecycleTracker] = None
         self.adaptive_thresholds: Optional[AdaptiveThresholdManager] = None
 
+        # One indexed trade history read by edge, CUSUM and lifecycle
+        self.trade_store = TradeStore(retention_days=config.trade_retention_days)
+
+        # Per-module dirty whales/markets, marked by on_trade
+        self.dirty_sets: Dict[str, DirtySet] = {}
+
         # State
         self.is_running: bool = False
         self.background_tasks: List[asyncio.Task] = []
@@ -161,7 +176,7 @@ class AnalyticsIntegration:
         # Attribution Analyzer
         if self.config.enable_attribution:
             attr_config = AttributionConfig()
-            self.attribution_analyzer = TradeAttributionAnalyzer(attr_config)
+            self.attribution_analyzer = TradeAttributionAnalyzer(attr_config, dirty=self._track("attribution"))
             logger.info("✓ Trade Attribution Analyzer initialized")
 
         # Benchmarking System
@@ -169,7 +184,7 @@ class AnalyticsIntegration:
             bench_config = BenchmarkConfig(
                 starting_capital=self.config.starting_capital_usd
             )
-            self.benchmarking = BenchmarkingSystem(bench_config)
+            self.benchmarking = BenchmarkingSystem(bench_config, dirty=self._track("benchmarking"))
             logger.info("✓ Benchmarking System initialized")
 
         # Reporting Engine
@@ -192,25 +207,31 @@ class AnalyticsIntegration:
         # Edge Detection
         if self.config.enable_edge_detection:
             edge_config = EdgeConfig()
-            self.edge_detection = EdgeDetectionSystem(edge_config)
+            self.edge_detection = EdgeDetectionSystem(
+                edge_config, trade_store=self.trade_store, dirty=self._track("edge_detection")
+            )
             logger.info("✓ Edge Detection System initialized")
 
         # CUSUM Decay Detector
         if self.config.enable_cusum_decay:
             cusum_config = CUSUMConfig()
-            self.cusum_decay = CUSUMEdgeDecayDetector(cusum_config)
+            self.cusum_decay = CUSUMEdgeDecayDetector(
+                cusum_config, trade_store=self.trade_store, dirty=self._track("cusum_decay")
+            )
             logger.info("✓ CUSUM Edge Decay Detector initialized")
 
         # Market Efficiency Analyzer
         if self.config.enable_market_efficiency:
             eff_config = EfficiencyConfig()
-            self.market_efficiency = MarketEfficiencyAnalyzer(eff_config)
+            self.market_efficiency = MarketEfficiencyAnalyzer(eff_config, dirty=self._track("market_efficiency"))
             logger.info("✓ Market Efficiency Analyzer initialized")
 
         # Whale Lifecycle Tracker
         if self.config.enable_lifecycle_tracking:
             life_config = LifecycleConfig()
-            self.lifecycle_tracker = WhaleLifecycleTracker(life_config)
+            self.lifecycle_tracker = WhaleLifecycleTracker(
+                life_config, trade_store=self.trade_store, dirty=self._track("lifecycle_tracker")
+            )
             logger.info("✓ Whale Lifecycle Tracker initialized")
 
         # Adaptive Threshold Manager
@@ -221,6 +242,12 @@ class AnalyticsIntegration:
 
         logger.info("All analytics modules initialized successfully")
 
+    def _track(self, module_name: str) -> DirtySet:
+        """Create the dirty set a module drains on each update tick"""
+        dirty = DirtySet(full_refresh_seconds=self.config.full_refresh_interval_seconds)
+        self.dirty_sets[module_name] = dirty
+        return dirty
+
     async def start(self):
         """Start all analytics modules"""
         if self.is_running:
@@ -327,6 +354,10 @@ class AnalyticsIntegration:
         exit_time = trade_data.get('exit_time')
         exit_price = Decimal(str(trade_data.get('exit_price', 0))) if trade_data.get('exit_price') else None
 
+        # Mark the whale and market for the next incremental update
+        for dirty in self.dirty_sets.values():
+            dirty.mark(whale_address, market_id)
+
         # Feed to Performance Metrics
         if self.performance_metrics:
             perf_trade = PerfTrade(
@@ -400,31 +431,19 @@ class AnalyticsIntegration:
             )
             self.dashboard.add_trade(dash_trade)
 
-        # Feed to Edge Detection
-        if self.edge_detection:
-            edge_trade = EdgeTrade(
+        # Feed to the shared store read by Edge Detection, CUSUM and Lifecycle
+        if self.edge_detection or self.cusum_decay or self.lifecycle_tracker:
+            self.trade_store.append(TradeRecord(
                 trade_id=trade_id,
                 whale_address=whale_address,
                 market_id=market_id,
                 entry_time=entry_time,
                 exit_time=exit_time,
                 pnl_usd=pnl_usd,
-                is_open=is_open
-            )
-            self.edge_detection.add_trade(edge_trade)
-
-        # Feed to CUSUM Decay Detector
-        if self.cusum_decay:
-            cusum_trade = CUSUMTrade(
-                trade_id=trade_id,
-                whale_address=whale_address,
-                market_id=market_id,
-                entry_time=entry_time,
-                exit_time=exit_time,
-                pnl_usd=pnl_usd,
-                is_open=is_open
-            )
-            self.cusum_decay.add_trade(cusum_trade)
+                is_open=is_open,
+                market_topic=trade_data.get('topic', 'unknown'),
+                position_size_usd=size * entry_price
+            ))
 
         # Feed to Market Efficiency Analyzer
         if self.market_efficiency:
@@ -441,19 +460,6 @@ class AnalyticsIntegration:
             )
             self.market_efficiency.add_trade(eff_trade)
 
-        # Feed to Lifecycle Tracker
-        if self.lifecycle_tracker:
-            life_trade = LifeTrade(
-                trade_id=trade_id,
-                whale_address=whale_address,
-                market_id=market_id,
-                entry_time=entry_time,
-                exit_time=exit_time,
-                pnl_usd=pnl_usd,
-                is_open=is_open
-            )
-            self.lifecycle_tracker.add_trade(life_trade)
-
         # Feed to Adaptive Thresholds
         if self.adaptive_thresholds:
             thresh_trade = ThreshTrade(
@@ -21,6 +21,8 @@ from enum import Enum
 from typing import Dict, List, Optional, Tuple
 import json
 
+from src.analytics.trade_store import DirtySet
+
 logger = logging.getLogger(__name__)
 
 
@@ -130,8 +132,9 @@ class BenchmarkingSystem:
     - Statistical significance
     """
 
-    def __init__(self, config: BenchmarkConfig):
+    def __init__(self, config: BenchmarkConfig, dirty: Optional[DirtySet] = None):
         self.config = config
+        self.dirty = dirty  # New-trade tracking (recalculate every tick if None)
 
         # State
         self.trades: List[Trade] = []
@@ -176,13 +179,16 @@ class BenchmarkingSystem:
         """Background loop for benchmark updates"""
         while self.is_running:
             try:
-                # Calculate all benchmarks
-                for benchmark_type in BenchmarkType:
-                    result = await self.calculate_benchmark(benchmark_type)
-                    self.benchmark_results[benchmark_type] = result
-
-                # Calculate alpha sources
-                self.alpha_sources = await self.identify_alpha_sources()
+                # Benchmarks aggregate every trade; skip ticks without new trades
+                changes = self.dirty.drain() if self.dirty is not None else None
+                if changes is None or any(changes):
+                    # Calculate all benchmarks
+                    for benchmark_type in BenchmarkType:
+                        result = await self.calculate_benchmark(benchmark_type)
+                        self.benchmark_results[benchmark_type] = result
+
+                    # Calculate alpha sources
+                    self.alpha_sources = await self.identify_alpha_sources()
 
                 # Log summary
                 buy_hold = self.benchmark_results.get(BenchmarkType.BUY_AND_HOLD)
@@ -22,9 +22,12 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from decimal import Decimal
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 import json
 
+from src.analytics.numeric_core import group_stats, to_decimal
+from src.analytics.trade_store import DirtySet, TradeStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,6 +56,9 @@ class CUSUMConfig:
     # Update frequency
     update_interval_seconds: int = 300
 
+    # Compute per-whale edges on float64 columns (numeric_core)
+    use_numeric_core: bool = True
+
 
 @dataclass
 class Trade:
@@ -118,11 +124,13 @@ class CUSUMEdgeDecayDetector:
     When S- > H, edge decay is detected.
     """
 
-    def __init__(self, config: CUSUMConfig):
+    def __init__(self, config: CUSUMConfig, trade_store: Optional[TradeStore] = None,
+                 dirty: Optional[DirtySet] = None):
         self.config = config
+        self.dirty = dirty  # Whales with new trades (every whale each tick if None)
 
         # State
-        self.trades: List[Trade] = []
+        self.store = trade_store if trade_store is not None else TradeStore()  # May be shared
         self.cusum_states: Dict[str, CUSUMState] = {}
 
         # Background task
@@ -131,6 +139,11 @@ class CUSUMEdgeDecayDetector:
 
         logger.info("CUSUMEdgeDecayDetector initialized")
 
+    @property
+    def trades(self) -> List[Trade]:
+        """Trade history (read-only view of the store)"""
+        return self.store.trades
+
     async def start(self):
         """Start detector"""
         if self.is_running:
@@ -155,7 +168,8 @@ class CUSUMEdgeDecayDetector:
         """Background update loop"""
         while self.is_running:
             try:
-                await self.update_all_cusum()
+                changes = self.dirty.drain() if self.dirty is not None else None
+                await self.update_all_cusum(None if changes is None else changes[0])
                 logger.info(f"CUSUM update complete - {len(self.cusum_states)} entities monitored")
                 await asyncio.sleep(self.config.update_interval_seconds)
             except Exception as e:
@@ -164,14 +178,39 @@ class CUSUMEdgeDecayDetector:
 
     def add_trade(self, trade: Trade):
         """Add trade"""
-        self.trades.append(trade)
+        self.store.append(trade)
 
-    async def update_all_cusum(self):
-        """Update CUSUM for all whales"""
-        whales = set(t.whale_address for t in self.trades if not t.is_open)
+    async def update_all_cusum(self, whales: Optional[Iterable[str]] = None):
+        """
+        Update CUSUM for whales.
 
-        for whale in whales:
-            state = await self.update_cusum(whale, "whale")
+        Args:
+            whales: Whales to update (all if None)
+        """
+        wanted = None if whales is None else set(whales)
+        if wanted is not None and not wanted:
+            return
+
+        if self.config.use_numeric_core:
+            # Only the dirty whales' rows are read (all whales on a full pass)
+            cols, codes, labels, _ = self.store.entity_columns("whale", wanted)
+            stats = group_stats(codes, len(labels), cols.pnl, mask=cols.closed)
+            edges = {
+                whale: (to_decimal(stats.edge[i]), int(stats.count[i]))
+                for i, whale in enumerate(labels) if stats.count[i] > 0
+            }
+        else:
+            candidates = self.store.whales() if wanted is None else wanted
+            edges = {whale: None for whale in candidates if self.store.has_closed(whale)}
+
+        for whale, precomputed in edges.items():
+            prev_state = self.cusum_states.get(whale)
+            if precomputed:
+                state = await self.update_cusum(whale, "whale", *precomputed)
+            else:
+                state = await self.update_cusum(whale, "whale")
+            if state is prev_state:
+                continue
             self.cusum_states[whale] = state
 
             # Log regime changes
@@ -188,23 +227,40 @@ class CUSUMEdgeDecayDetector:
                     f"(Edge decay detected: S- = {state.S_minus:.3f})"
                 )
 
-    async def update_cusum(self, entity_id: str, entity_type: str) -> CUSUMState:
-        """Update CUSUM state"""
+    async def update_cusum(self, entity_id: str, entity_type: str,
+                           current_edge: Optional[Decimal] = None,
+                           trade_count: Optional[int] = None) -> CUSUMState:
+        """
+        Update CUSUM state.
+
+        Args:
+            entity_id: Whale address or market ID
+            entity_type: "whale" or "market"
+            current_edge: Pre-computed edge (skips the trade scan when given
+                          together with trade_count)
+            trade_count: Number of closed trades behind current_edge
+        """
 
         # Get previous state
         prev_state = self.cusum_states.get(entity_id)
 
-        # Get entity trades
-        if entity_type == "whale":
-            trades = [t for t in self.trades if t.whale_address == entity_id and not t.is_open]
-        else:
-            trades = [t for t in self.trades if t.market_id == entity_id and not t.is_open]
+        if current_edge is None or trade_count is None:
+            # Get entity trades
+            if entity_type == "whale":
+                trades = self.store.for_whale(entity_id, closed_only=True)
+            else:
+                trades = self.store.for_market(entity_id, closed_only=True)
 
-        if not trades:
-            return self._create_empty_state(entity_id, entity_type)
+            if not trades:
+                return self._create_empty_state(entity_id, entity_type)
+
+            # Calculate current edge
+            current_edge = self._calculate_edge(trades)
+            trade_count = len(trades)
 
-        # Calculate current edge
-        current_edge = self._calculate_edge(trades)
+        # No new closed trades: the same observation must not be fed twice
+        if prev_state and prev_state.recent_trades == trade_count and prev_state.current_edge == current_edge:
+            return prev_state
 
         # Initialize CUSUM values
         if prev_state:
@@ -277,7 +333,7 @@ class CUSUMEdgeDecayDetector:
             S_minus=S_minus,
             current_edge=current_edge,
             mean_edge=mean_edge,
-            recent_trades=len(trades),
+            recent_trades=trade_count,
             regime_state=regime,
             regime_change_detected=regime_change_detected,
             last_regime_change=last_regime_change,
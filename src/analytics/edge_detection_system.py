@@ -18,9 +18,12 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from decimal import Decimal
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Set
 import json
 
+from src.analytics.numeric_core import group_stats, to_decimal
+from src.analytics.trade_store import DirtySet, TradeStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,6 +56,9 @@ class EdgeConfig:
     auto_disable_negative_edge: bool = True
     alert_edge_below_threshold: bool = True
 
+    # Compute batch statistics on float64 columns (numeric_core)
+    use_numeric_core: bool = True
+
 
 @dataclass
 class Trade:
@@ -127,11 +133,13 @@ class EdgeDetectionSystem:
     - E <= 0: No edge (unprofitable)
     """
 
-    def __init__(self, config: EdgeConfig):
+    def __init__(self, config: EdgeConfig, trade_store: Optional[TradeStore] = None,
+                 dirty: Optional[DirtySet] = None):
         self.config = config
+        self.dirty = dirty  # Entities with new trades (every entity each tick if None)
 
         # State
-        self.trades: List[Trade] = []
+        self.store = trade_store if trade_store is not None else TradeStore()  # May be shared
         self.whale_edges: Dict[str, EdgeMetrics] = {}
         self.market_edges: Dict[str, EdgeMetrics] = {}
 
@@ -145,6 +153,11 @@ class EdgeDetectionSystem:
 
         logger.info("EdgeDetectionSystem initialized")
 
+    @property
+    def trades(self) -> List[Trade]:
+        """Trade history (read-only view of the store)"""
+        return self.store.trades
+
     async def start(self):
         """Start edge detection"""
         if self.is_running:
@@ -169,8 +182,12 @@ class EdgeDetectionSystem:
         """Background update loop"""
         while self.is_running:
             try:
-                # Calculate edge for all whales
-                await self.calculate_all_edges()
+                # Calculate edge for whales and markets with new trades
+                changes = self.dirty.drain() if self.dirty is not None else None
+                if changes is None:
+                    await self.calculate_all_edges()
+                else:
+                    await self.calculate_all_edges(*changes)
 
                 # Check for alerts
                 await self._process_alerts()
@@ -188,18 +205,32 @@ class EdgeDetectionSystem:
 
     def add_trade(self, trade: Trade):
         """Add trade"""
-        self.trades.append(trade)
+        self.store.append(trade)
 
-    async def calculate_all_edges(self):
-        """Calculate edge for all whales and markets"""
+    async def calculate_all_edges(self, whales: Optional[Iterable[str]] = None,
+                                  markets: Optional[Iterable[str]] = None):
+        """
+        Calculate edge for whales and markets.
+
+        Args:
+            whales: Whales to update (all if None)
+            markets: Markets to update (all if None)
+        """
+        if self.config.use_numeric_core:
+            self._calculate_all_edges_numeric(
+                None if whales is None else set(whales),
+                None if markets is None else set(markets)
+            )
+            return
+
+        whales = set(self.store.whales()) if whales is None else set(whales)
+        markets = set(self.store.markets()) if markets is None else set(markets)
 
         # Calculate whale edges
-        whales = set(t.whale_address for t in self.trades)
         for whale in whales:
             self.whale_edges[whale] = await self.calculate_edge(whale, "whale")
 
         # Calculate market edges
-        markets = set(t.market_id for t in self.trades)
         for market in markets:
             self.market_edges[market] = await self.calculate_edge(market, "market")
 
@@ -217,9 +248,9 @@ class EdgeDetectionSystem:
 
         # Filter trades
         if entity_type == "whale":
-            trades = [t for t in self.trades if t.whale_address == entity_id and not t.is_open]
+            trades = self.store.for_whale(entity_id, closed_only=True)
         else:
-            trades = [t for t in self.trades if t.market_id == entity_id and not t.is_open]
+            trades = self.store.for_market(entity_id, closed_only=True)
 
         if not trades:
             return self._create_empty_edge(entity_id, entity_type)
@@ -243,6 +274,68 @@ class EdgeDetectionSystem:
         # Calculate edge: E = (win_rate × avg_win) - (loss_rate × avg_loss)
         edge = (win_rate * avg_win) - (loss_rate * avg_loss)
 
+        # Calculate rolling edges
+        edge_30d = self._calculate_rolling_edge(entity_id, entity_type, 30)
+        edge_7d = self._calculate_rolling_edge(entity_id, entity_type, 7)
+
+        # Total P&L
+        total_pnl = sum(t.pnl_usd for t in trades)
+
+        return self._build_edge_metrics(
+            entity_id, entity_type, edge, total_trades, winning_count, losing_count,
+            win_rate, loss_rate, avg_win, avg_loss, total_pnl, edge_30d, edge_7d
+        )
+
+    def _calculate_all_edges_numeric(self, whales: Optional[Set[str]], markets: Optional[Set[str]]):
+        """
+        Whale and market edges in one vectorized pass.
+
+        A full pass (None) groups the whole store; a dirty set only reads
+        those entities' rows through the store indexes.
+        """
+        for entity_type, target, wanted in (("whale", self.whale_edges, whales),
+                                            ("market", self.market_edges, markets)):
+            if wanted is not None and not wanted:
+                continue
+            cols, codes, labels, _ = self.store.entity_columns(entity_type, wanted)
+            n = len(labels)
+            stats = group_stats(codes, n, cols.pnl, mask=cols.closed)
+            edge_30d = group_stats(codes, n, cols.pnl, mask=cols.exited_since(30)).edge
+            edge_7d = group_stats(codes, n, cols.pnl, mask=cols.exited_since(7)).edge
+
+            for i, entity_id in enumerate(labels):
+                total_trades = int(stats.count[i])
+                if total_trades == 0:
+                    target[entity_id] = self._create_empty_edge(entity_id, entity_type)
+                    continue
+
+                winning_count = int(stats.wins[i])
+                losing_count = int(stats.losses[i])
+                avg_win = to_decimal(stats.win_sum[i] / winning_count) if winning_count else Decimal("0")
+                avg_loss = to_decimal(abs(stats.loss_sum[i]) / losing_count) if losing_count else Decimal("0")
+
+                target[entity_id] = self._build_edge_metrics(
+                    entity_id, entity_type,
+                    edge=to_decimal(stats.edge[i]),
+                    total_trades=total_trades,
+                    winning_count=winning_count,
+                    losing_count=losing_count,
+                    win_rate=Decimal(str(winning_count)) / Decimal(str(total_trades)),
+                    loss_rate=Decimal(str(losing_count)) / Decimal(str(total_trades)),
+                    avg_win=avg_win,
+                    avg_loss=avg_loss,
+                    total_pnl=to_decimal(stats.pnl_sum[i]),
+                    edge_30d=to_decimal(edge_30d[i]),
+                    edge_7d=to_decimal(edge_7d[i])
+                )
+
+    def _build_edge_metrics(self, entity_id: str, entity_type: str, edge: Decimal,
+                            total_trades: int, winning_count: int, losing_count: int,
+                            win_rate: Decimal, loss_rate: Decimal,
+                            avg_win: Decimal, avg_loss: Decimal, total_pnl: Decimal,
+                            edge_30d: Decimal, edge_7d: Decimal) -> EdgeMetrics:
+        """Classify an edge and derive alerts from its components"""
+
         # Determine status
         if edge >= self.config.excellent_edge_threshold:
             status = EdgeStatus.EXCELLENT
@@ -255,10 +348,6 @@ class EdgeDetectionSystem:
         else:
             status = EdgeStatus.NEGATIVE
 
-        # Calculate rolling edges
-        edge_30d = self._calculate_rolling_edge(entity_id, entity_type, 30)
-        edge_7d = self._calculate_rolling_edge(entity_id, entity_type, 7)
-
         # Determine trend
         if edge_7d > edge_30d * Decimal("1.10"):
             trend = "improving"
@@ -267,9 +356,6 @@ class EdgeDetectionSystem:
         else:
             trend = "stable"
 
-        # Total P&L
-        total_pnl = sum(t.pnl_usd for t in trades)
-
         # Expected value per trade (edge in USD)
         ev_per_trade = total_pnl / Decimal(str(total_trades)) if total_trades > 0 else Decimal("0")
 
@@ -326,9 +412,9 @@ class EdgeDetectionSystem:
         cutoff = datetime.now() - timedelta(days=days)
 
         if entity_type == "whale":
-            trades = [t for t in self.trades if t.whale_address == entity_id and not t.is_open and t.exit_time and t.exit_time >= cutoff]
+            trades = self.store.for_whale(entity_id, since=cutoff)
         else:
-            trades = [t for t in self.trades if t.market_id == entity_id and not t.is_open and t.exit_time and t.exit_time >= cutoff]
+            trades = self.store.for_market(entity_id, since=cutoff)
 
         if not trades:
             return Decimal("0")
@@ -16,13 +16,16 @@ Date: 2025
 
 import asyncio
 import logging
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from decimal import Decimal
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 import json
 
+from src.analytics.trade_store import DirtySet
+
 logger = logging.getLogger(__name__)
 
 
@@ -110,11 +113,13 @@ class MarketEfficiencyAnalyzer:
     - Skip highly efficient markets
     """
 
-    def __init__(self, config: EfficiencyConfig):
+    def __init__(self, config: EfficiencyConfig, dirty: Optional[DirtySet] = None):
         self.config = config
+        self.dirty = dirty  # Markets with new trades (every market each tick if None)
 
         # State
         self.trades: List[Trade] = []
+        self._by_market: Dict[str, List[Trade]] = defaultdict(list)
         self.market_metrics: Dict[str, MarketEfficiencyMetrics] = {}
 
         # Background task
@@ -147,7 +152,8 @@ class MarketEfficiencyAnalyzer:
         """Background update loop"""
         while self.is_running:
             try:
-                await self.analyze_all_markets()
+                changes = self.dirty.drain() if self.dirty is not None else None
+                await self.analyze_all_markets(None if changes is None else changes[1])
                 logger.info(f"Market efficiency analysis complete - {len(self.market_metrics)} markets analyzed")
                 await asyncio.sleep(self.config.update_interval_seconds)
             except Exception as e:
@@ -157,10 +163,21 @@ class MarketEfficiencyAnalyzer:
     def add_trade(self, trade: Trade):
         """Add trade"""
         self.trades.append(trade)
+        self._by_market[trade.market_id].append(trade)
+
+    def _closed_trades(self, market_id: str) -> List[Trade]:
+        return [t for t in self._by_market.get(market_id, ()) if not t.is_open]
+
+    async def analyze_all_markets(self, markets: Optional[Iterable[str]] = None):
+        """
+        Analyze efficiency for markets.
 
-    async def analyze_all_markets(self):
-        """Analyze efficiency for all markets"""
-        markets = set(t.market_id for t in self.trades if not t.is_open)
+        Args:
+            markets: Markets to analyze (all with closed trades if None)
+        """
+        candidates = self._by_market if markets is None else set(markets)
+        # Only markets with closed trades, for a full pass and a dirty set alike
+        markets = [m for m in candidates if self._closed_trades(m)]
 
         for market_id in markets:
             metrics = await self.analyze_market(market_id)
@@ -170,7 +187,7 @@ class MarketEfficiencyAnalyzer:
         """Analyze efficiency for a specific market"""
 
         # Get market trades
-        market_trades = [t for t in self.trades if t.market_id == market_id and not t.is_open]
+        market_trades = self._closed_trades(market_id)
 
         if not market_trades:
             return self._create_empty_metrics(market_id)
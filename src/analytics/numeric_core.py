@@ -0,0 +1,416 @@
+"""
+Numeric Core for Trade Analytics
+
+Float64 column storage and vectorized statistics shared by the analytics
+modules (performance metrics, edge detection, CUSUM, lifecycle, attribution).
+
+Trades are loaded once into NumPy columns; statistics are computed on those
+columns and converted back to Decimal only at the boundary, for the money and
+ledger fields that the result dataclasses expose. The Decimal implementations
+in each module remain the reference path.
+
+Author: Whale Copy Trading System
+Date: 2025
+"""
+
+from dataclasses import dataclass, fields, replace
+from decimal import Decimal
+from operator import attrgetter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+US_PER_DAY = 86_400_000_000
+
+
+def to_decimal(value) -> Decimal:
+    """Convert a float64 result to Decimal (non-finite values become 0)"""
+    value = float(value)
+    if not np.isfinite(value):
+        return Decimal("0")
+    return Decimal(repr(value))
+
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_US = timedelta(microseconds=1)
+_NAT_INT = np.iinfo(np.int64).min
+
+
+@dataclass
+class TradeColumns:
+    """
+    Columnar view of a list of trade records.
+
+    Works with any of the per-module Trade dataclasses: fields a module's
+    Trade does not carry are filled with NaN / empty labels.
+    """
+    pnl: np.ndarray
+    pnl_pct: np.ndarray
+    size_usd: np.ndarray
+    entry_time: np.ndarray  # datetime64[us]
+    exit_time: np.ndarray   # datetime64[us], NaT while open
+    is_open: np.ndarray
+
+    whale_codes: np.ndarray
+    whales: List[str]
+    market_codes: np.ndarray
+    markets: List[str]
+    topic_codes: np.ndarray
+    topics: List[str]
+
+    @classmethod
+    def from_trades(cls, trades: List) -> "TradeColumns":
+        return TradeColumnStore().sync(trades)
+
+    def __len__(self) -> int:
+        return int(self.pnl.shape[0])
+
+    @property
+    def closed(self) -> np.ndarray:
+        """Mask of closed trades"""
+        return ~self.is_open
+
+    def exited_since(self, days: float, now: Optional[datetime] = None) -> np.ndarray:
+        """Mask of closed trades with exit_time >= now - days"""
+        cutoff = np.datetime64((now or datetime.now()) - timedelta(days=days), "us")
+        # NaT compares False, so trades without an exit time drop out
+        return self.closed & (self.exit_time >= cutoff)
+
+    def take(self, rows: np.ndarray) -> "TradeColumns":
+        """Columns for the given row indices; labels and codes stay global"""
+        return replace(self, **{
+            f.name: getattr(self, f.name)[rows]
+            for f in fields(self) if isinstance(getattr(self, f.name), np.ndarray)
+        })
+
+    def codes(self, dimension: str) -> Tuple[np.ndarray, List[str]]:
+        """Group codes and labels for "whale", "market" or "topic" """
+        if dimension == "whale":
+            return self.whale_codes, self.whales
+        if dimension == "market":
+            return self.market_codes, self.markets
+        if dimension == "topic":
+            return self.topic_codes, self.topics
+        raise ValueError(f"Unknown dimension: {dimension}")
+
+
+class TradeColumnStore:
+    """
+    Append-only column buffers kept in step with a module's trade list.
+
+    sync() ingests only the trades appended since the last call, so a module
+    that re-analyses its history every update interval converts each trade
+    to floats once. Buffers grow by doubling and columns are views of them,
+    so a sync costs O(new trades), not O(history). Replacing or shrinking
+    the list triggers a rebuild.
+    """
+
+    _FIELDS = {
+        "pnl": np.float64, "pnl_pct": np.float64, "size_usd": np.float64,
+        "entry_time": np.int64, "exit_time": np.int64, "is_open": bool,
+        "whale_codes": np.int64, "market_codes": np.int64, "topic_codes": np.int64,
+    }
+
+    def __init__(self):
+        self._source_id: Optional[int] = None
+        self._reset()
+
+    def _reset(self):
+        self._rows = 0
+        self._buffers: Dict[str, np.ndarray] = {
+            name: np.empty(0, dtype=dtype) for name, dtype in self._FIELDS.items()
+        }
+        self._labels: Dict[str, Dict] = {"whale": {}, "market": {}, "topic": {}}
+        self._label_lists: Dict[str, List[str]] = {"whale": [], "market": [], "topic": []}
+        self._columns: Optional[TradeColumns] = None
+
+    def sync(self, trades: List) -> TradeColumns:
+        if id(trades) != self._source_id or len(trades) < self._rows:
+            self._source_id = id(trades)
+            self._reset()
+
+        if len(trades) > self._rows:
+            self._append(trades[self._rows:])
+            self._rows = len(trades)
+            self._columns = None
+
+        if self._columns is None:
+            self._columns = self._materialize()
+        return self._columns
+
+    def _append(self, trades: List):
+        n = len(trades)
+        # Module Trade dataclasses are homogeneous: probe optional fields once
+        sample = trades[0]
+
+        def floats(attr: str) -> List[float]:
+            if not hasattr(sample, attr):
+                return [float("nan")] * n
+            return list(map(float, map(attrgetter(attr), trades)))
+
+        def times(attr: str) -> List[int]:
+            if not hasattr(sample, attr):
+                return [_NAT_INT] * n
+            values = map(attrgetter(attr), trades)
+            return [(v - _EPOCH) // _ONE_US if v is not None else _NAT_INT for v in values]
+
+        def labels(attr: str, dimension: str) -> List[int]:
+            index, names = self._labels[dimension], self._label_lists[dimension]
+            values = list(map(attrgetter(attr), trades)) if hasattr(sample, attr) else [""] * n
+            for value in dict.fromkeys(values):
+                if value not in index:
+                    index[value] = len(names)
+                    names.append(value)
+            return list(map(index.__getitem__, values))
+
+        # Column-at-a-time with C-level map() is markedly faster than a row loop
+        self._write({
+            "pnl": floats("pnl_usd"),
+            "pnl_pct": floats("pnl_pct"),
+            "size_usd": floats("position_size_usd"),
+            "entry_time": times("entry_time"),
+            "exit_time": times("exit_time"),
+            "is_open": list(map(bool, map(attrgetter("is_open"), trades))),
+            "whale_codes": labels("whale_address", "whale"),
+            "market_codes": labels("market_id", "market"),
+            "topic_codes": labels("market_topic", "topic"),
+        }, n)
+
+    def _write(self, values: Dict[str, list], n: int):
+        start, end = self._rows, self._rows + n
+        for name, column in values.items():
+            buffer = self._buffers[name]
+            if end > len(buffer):
+                grown = np.empty(max(end, 2 * len(buffer), 1024), dtype=buffer.dtype)
+                grown[:start] = buffer[:start]
+                self._buffers[name] = buffer = grown
+            buffer[start:end] = column
+
+    def _materialize(self) -> TradeColumns:
+        # Views over the buffers: rows already handed out are never rewritten,
+        # and label lists only grow, so earlier TradeColumns stay valid
+        b = {name: buffer[:self._rows] for name, buffer in self._buffers.items()}
+        return TradeColumns(
+            pnl=b["pnl"],
+            pnl_pct=b["pnl_pct"],
+            size_usd=b["size_usd"],
+            entry_time=b["entry_time"].view("datetime64[us]"),
+            exit_time=b["exit_time"].view("datetime64[us]"),
+            is_open=b["is_open"],
+            whale_codes=b["whale_codes"],
+            whales=self._label_lists["whale"],
+            market_codes=b["market_codes"],
+            markets=self._label_lists["market"],
+            topic_codes=b["topic_codes"],
+            topics=self._label_lists["topic"],
+        )
+
+
+# ==================== Per-group statistics ====================
+
+@dataclass
+class GroupStats:
+    """Win/loss aggregates per group (arrays of length n_groups)"""
+    count: np.ndarray
+    wins: np.ndarray
+    losses: np.ndarray
+    win_sum: np.ndarray
+    loss_sum: np.ndarray  # Sum of losing P&L (negative)
+    pnl_sum: np.ndarray
+    pct_sum: np.ndarray
+    pct_std: np.ndarray   # Population std of pnl_pct
+    volume: np.ndarray
+
+    @property
+    def edge(self) -> np.ndarray:
+        """
+        E = win_rate * avg_win - loss_rate * |avg_loss|
+
+        which reduces to the mean P&L per trade.
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.count > 0, self.pnl_sum / np.maximum(self.count, 1), 0.0)
+
+
+def group_stats(codes: np.ndarray, n_groups: int, pnl: np.ndarray,
+                mask: Optional[np.ndarray] = None,
+                pnl_pct: Optional[np.ndarray] = None,
+                volume: Optional[np.ndarray] = None) -> GroupStats:
+    """
+    Aggregate P&L per group with np.bincount.
+
+    Args:
+        codes: [N] group code per trade
+        n_groups: Number of groups
+        pnl: [N] P&L per trade
+        mask: [N] trades to include (all if None)
+        pnl_pct: [N] per-trade return for sum / std (optional)
+        volume: [N] position size for the volume total (optional)
+    """
+    if mask is not None:
+        codes, pnl = codes[mask], pnl[mask]
+        pnl_pct = pnl_pct[mask] if pnl_pct is not None else None
+        volume = volume[mask] if volume is not None else None
+
+    def total(weights=None):
+        return np.bincount(codes, weights=weights, minlength=n_groups)[:n_groups]
+
+    win = pnl > 0
+    loss = pnl < 0
+    count = total().astype(np.int64)
+
+    if pnl_pct is not None:
+        pct_sum = total(pnl_pct)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.where(count > 0, pct_sum / np.maximum(count, 1), 0.0)
+            pct_std = np.sqrt(total((pnl_pct - mean[codes]) ** 2) / np.maximum(count, 1))
+    else:
+        pct_sum = np.zeros(n_groups)
+        pct_std = np.zeros(n_groups)
+
+    return GroupStats(
+        count=count,
+        wins=total(win.astype(np.float64)).astype(np.int64),
+        losses=total(loss.astype(np.float64)).astype(np.int64),
+        win_sum=total(np.where(win, pnl, 0.0)),
+        loss_sum=total(np.where(loss, pnl, 0.0)),
+        pnl_sum=total(pnl),
+        pct_sum=pct_sum,
+        pct_std=pct_std,
+        volume=total(volume) if volume is not None else np.zeros(n_groups),
+    )
+
+
+def edge(pnl: np.ndarray) -> float:
+    """Edge of a single trade set (mean P&L, 0 if empty)"""
+    return float(pnl.mean()) if pnl.size else 0.0
+
+
+# ==================== Equity-curve statistics ====================
+
+def order_by_exit(exit_time: np.ndarray) -> np.ndarray:
+    """Stable sort order by exit time (NaT last), matching sorted(key=exit_time)"""
+    return np.argsort(exit_time, kind="stable")
+
+
+def period_returns(exit_time: np.ndarray, pnl: np.ndarray, starting_equity: float,
+                   unit: str = "D") -> np.ndarray:
+    """
+    Returns per calendar period on a compounding equity curve.
+
+    Args:
+        exit_time: [N] exit times sorted ascending, no NaT
+        pnl: [N] P&L in the same order
+        starting_equity: Equity before the first trade
+        unit: NumPy datetime unit for the period ("D" daily, "M" monthly)
+
+    Returns:
+        Period P&L / equity at the start of the period, for periods that
+        started with positive equity
+    """
+    if pnl.size == 0:
+        return np.empty(0)
+
+    periods = exit_time.astype(f"datetime64[{unit}]")
+    starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+    period_pnl = np.add.reduceat(pnl, starts)
+    opening = starting_equity + np.r_[0.0, np.cumsum(period_pnl)[:-1]]
+
+    positive = opening > 0
+    return period_pnl[positive] / opening[positive]
+
+
+def drawdown(exit_time: np.ndarray, pnl: np.ndarray, starting_equity: float) -> Dict:
+    """
+    Peak-to-trough drawdown over trades sorted by exit time.
+
+    Mirrors the per-trade loop in PerformanceMetricsEngine: a trade that
+    does not set a new equity high counts as underwater, and the episode
+    start is the first such trade after the last high.
+    """
+    result = {
+        "max_drawdown_pct": 0.0,
+        "max_drawdown_usd": 0.0,
+        "recovery_days": None,
+        "time_underwater_days": 0,
+    }
+    n = pnl.size
+    if n == 0:
+        return result
+
+    equity = starting_equity + np.cumsum(pnl)
+    peak_before = np.maximum.accumulate(np.r_[starting_equity, equity])[:-1]
+    new_high = equity > peak_before
+    peak_after = np.maximum(peak_before, equity)
+
+    underwater = ~new_high
+    if underwater.any():
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dd_pct = np.where(underwater, (peak_after - equity) / peak_after * 100.0, -np.inf)
+        i = int(np.argmax(dd_pct))
+        if dd_pct[i] > 0:
+            result["max_drawdown_pct"] = float(dd_pct[i])
+            result["max_drawdown_usd"] = float(peak_after[i] - equity[i])
+
+    # Start of the underwater episode each trade belongs to
+    index = np.arange(n)
+    last_high = np.maximum.accumulate(np.where(new_high, index, -1))
+    episode_start = last_high + 1
+
+    times = exit_time.astype(np.int64)
+    if underwater.any():
+        j = int(np.flatnonzero(underwater)[-1])
+        result["time_underwater_days"] = int((times[j] - times[episode_start[j]]) // US_PER_DAY)
+
+    # First new high that ends an underwater episode; only reported while
+    # the series is still underwater at the end
+    recoveries = np.flatnonzero(new_high[1:] & underwater[:-1]) + 1
+    if recoveries.size and underwater[-1]:
+        start = episode_start[-1]
+        result["recovery_days"] = int((times[recoveries[0]] - times[start]) // US_PER_DAY)
+
+    return result
+
+
+def streaks(pnl: np.ndarray) -> Dict:
+    """Win/loss streaks; break-even trades neither extend nor reset a streak"""
+    signs = np.sign(pnl)
+    signs = signs[signs != 0]
+    result = {"current_win_streak": 0, "current_loss_streak": 0, "max_win_streak": 0, "max_loss_streak": 0}
+    if signs.size == 0:
+        return result
+
+    starts = np.flatnonzero(np.r_[True, signs[1:] != signs[:-1]])
+    lengths = np.diff(np.r_[starts, signs.size])
+    run_signs = signs[starts]
+
+    if (run_signs > 0).any():
+        result["max_win_streak"] = int(lengths[run_signs > 0].max())
+    if (run_signs < 0).any():
+        result["max_loss_streak"] = int(lengths[run_signs < 0].max())
+    if run_signs[-1] > 0:
+        result["current_win_streak"] = int(lengths[-1])
+    else:
+        result["current_loss_streak"] = int(lengths[-1])
+    return result
+
+
+def win_loss(pnl: np.ndarray, pnl_pct: np.ndarray, duration_hours: np.ndarray) -> Dict:
+    """Win/loss aggregates for one trade set (floats)"""
+    win = pnl > 0
+    loss = pnl < 0
+    n_win = int(win.sum())
+    n_loss = int(loss.sum())
+    return {
+        "total_trades": int(pnl.size),
+        "winning_trades": n_win,
+        "losing_trades": n_loss,
+        "gross_profit": float(pnl[win].sum()),
+        "gross_loss": float(pnl[loss].sum()),
+        "avg_win_usd": float(pnl[win].mean()) if n_win else 0.0,
+        "avg_loss_usd": float(pnl[loss].mean()) if n_loss else 0.0,
+        "avg_win_pct": float(pnl_pct[win].mean()) if n_win else 0.0,
+        "avg_loss_pct": float(pnl_pct[loss].mean()) if n_loss else 0.0,
+        "avg_duration_hours": float(duration_hours.mean()) if duration_hours.size else 0.0,
+    }
@@ -17,7 +17,9 @@ Date: 2025
 """
 
 import asyncio
+import bisect
 import logging
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from decimal import Decimal
@@ -26,6 +28,11 @@ from typing import Dict, List, Optional, Tuple
 import json
 import math
 
+import numpy as np
+
+from src.analytics import numeric_core
+from src.analytics.numeric_core import TradeColumns, to_decimal
+
 logger = logging.getLogger(__name__)
 
 
@@ -69,6 +76,9 @@ class PerformanceConfig:
     # Performance update frequency
     update_interval_seconds: int = 60  # Update metrics every 60 seconds
 
+    # Raw trades kept for inspection / full recompute (metrics use day buckets)
+    max_trade_history: int = 10000
+
     # Database paths (for persistence)
     trades_db_path: str = "/Users/ronitchhibber/Desktop/Whale.Trader-v0.1/data/trades.db"
     metrics_db_path: str = "/Users/ronitchhibber/Desktop/Whale.Trader-v0.1/data/performance_metrics.db"
@@ -174,6 +184,294 @@ class PerformanceSnapshot:
     daily_return_pct: Decimal
 
 
+# Window lengths in days (ALL_TIME has no expiry)
+WINDOW_DAYS: Dict[TimeWindow, int] = {
+    TimeWindow.DAILY: 1,
+    TimeWindow.WEEKLY: 7,
+    TimeWindow.MONTHLY: 30,
+    TimeWindow.QUARTERLY: 90,
+    TimeWindow.YEARLY: 365,
+}
+
+
+class _Totals:
+    """Additive trade accumulators (can be added to and subtracted from)"""
+
+    __slots__ = (
+        "trades", "wins", "losses", "pnl", "gross_profit", "gross_loss",
+        "win_pct_sum", "loss_pct_sum", "duration_hours", "duration_count",
+    )
+
+    def __init__(self):
+        self.trades = 0
+        self.wins = 0
+        self.losses = 0
+        self.pnl = Decimal("0")
+        self.gross_profit = Decimal("0")
+        self.gross_loss = Decimal("0")  # Sum of losing P&L (negative)
+        self.win_pct_sum = Decimal("0")
+        self.loss_pct_sum = Decimal("0")
+        self.duration_hours = 0.0
+        self.duration_count = 0
+
+    def add_trade(self, trade: Trade):
+        self.trades += 1
+        self.pnl += trade.pnl_usd
+        if trade.pnl_usd > 0:
+            self.wins += 1
+            self.gross_profit += trade.pnl_usd
+            self.win_pct_sum += trade.pnl_pct
+        elif trade.pnl_usd < 0:
+            self.losses += 1
+            self.gross_loss += trade.pnl_usd
+            self.loss_pct_sum += trade.pnl_pct
+        if trade.exit_time:
+            self.duration_hours += (trade.exit_time - trade.entry_time).total_seconds() / 3600
+            self.duration_count += 1
+
+    def merge(self, other: "_Totals", sign: int = 1):
+        self.trades += sign * other.trades
+        self.wins += sign * other.wins
+        self.losses += sign * other.losses
+        self.pnl += sign * other.pnl
+        self.gross_profit += sign * other.gross_profit
+        self.gross_loss += sign * other.gross_loss
+        self.win_pct_sum += sign * other.win_pct_sum
+        self.loss_pct_sum += sign * other.loss_pct_sum
+        self.duration_hours += sign * other.duration_hours
+        self.duration_count += sign * other.duration_count
+
+
+class _DayBucket:
+    """
+    All closed trades for one exit day, summarised so that consecutive
+    buckets can be combined without revisiting individual trades.
+
+    The equity path is kept relative to the bucket's opening equity as one
+    segment per new intra-day high: [high, high_time, low, after_time,
+    last_time], where low is the lowest point after the high and the times
+    are the first and last trades that followed it. The first segment
+    starts at the opening equity (high 0, no high trade). Streak state
+    keeps the leading and trailing runs plus the longest runs inside.
+    """
+
+    __slots__ = (
+        "day", "totals", "first_entry", "last_exit", "segments",
+        "n_signed", "first_sign", "lead_len", "last_sign", "trail_len",
+        "max_win_run", "max_loss_run",
+    )
+
+    def __init__(self, day):
+        self.day = day
+        self.totals = _Totals()
+        self.first_entry: Optional[datetime] = None
+        self.last_exit: Optional[datetime] = None
+        self.segments: List[list] = [[Decimal("0"), None, None, None, None]]
+
+        self.n_signed = 0
+        self.first_sign = 0
+        self.lead_len = 0
+        self.last_sign = 0
+        self.trail_len = 0
+        self.max_win_run = 0
+        self.max_loss_run = 0
+
+    def add_trade(self, trade: Trade):
+        # Equity path relative to the start of the day
+        cumulative = self.totals.pnl + trade.pnl_usd
+        segment = self.segments[-1]
+        if cumulative > segment[0]:
+            self.segments.append([cumulative, trade.exit_time, None, None, trade.exit_time])
+        else:
+            if segment[3] is None:
+                segment[2] = cumulative
+                segment[3] = trade.exit_time
+            elif cumulative < segment[2]:
+                segment[2] = cumulative
+            segment[4] = trade.exit_time
+
+        self.totals.add_trade(trade)
+
+        if self.first_entry is None or trade.entry_time < self.first_entry:
+            self.first_entry = trade.entry_time
+        if self.last_exit is None or trade.exit_time > self.last_exit:
+            self.last_exit = trade.exit_time
+
+        # Streaks (break-even trades neither extend nor reset a streak)
+        sign = 1 if trade.pnl_usd > 0 else -1 if trade.pnl_usd < 0 else 0
+        if sign == 0:
+            return
+        if self.n_signed == 0:
+            self.first_sign = self.last_sign = sign
+            self.lead_len = self.trail_len = 1
+        elif sign == self.last_sign:
+            self.trail_len += 1
+            if self.lead_len == self.n_signed:
+                self.lead_len += 1
+        else:
+            self.last_sign = sign
+            self.trail_len = 1
+        self.n_signed += 1
+
+        if sign > 0:
+            self.max_win_run = max(self.max_win_run, self.trail_len)
+        else:
+            self.max_loss_run = max(self.max_loss_run, self.trail_len)
+
+
+class _PathScan:
+    """
+    Ordered fold over day buckets: equity curve, daily/monthly returns,
+    drawdown and streak state. Feeding buckets oldest first gives the same
+    results as the full recompute over their trades.
+    """
+
+    __slots__ = (
+        "equity", "peak", "daily_returns", "monthly_returns",
+        "month_key", "month_pnl", "month_start_equity",
+        "max_drawdown_pct", "max_drawdown_usd", "drawdown_start", "recovery_time", "underwater_days",
+        "streak_sign", "streak_len", "max_win_streak", "max_loss_streak",
+        "first_entry", "last_exit",
+    )
+
+    def __init__(self, starting_equity: Decimal):
+        self.equity = starting_equity
+        self.peak = starting_equity
+        self.daily_returns: List[Decimal] = []
+        self.monthly_returns: List[Decimal] = []
+
+        self.month_key = None
+        self.month_pnl = Decimal("0")
+        self.month_start_equity = starting_equity
+
+        self.max_drawdown_pct = Decimal("0")
+        self.max_drawdown_usd = Decimal("0")
+        self.drawdown_start: Optional[datetime] = None
+        self.recovery_time: Optional[datetime] = None
+        self.underwater_days = 0
+
+        self.streak_sign = 0
+        self.streak_len = 0
+        self.max_win_streak = 0
+        self.max_loss_streak = 0
+
+        self.first_entry: Optional[datetime] = None
+        self.last_exit: Optional[datetime] = None
+
+    def copy(self) -> "_PathScan":
+        scan = _PathScan.__new__(_PathScan)
+        for name in self.__slots__:
+            setattr(scan, name, getattr(self, name))
+        scan.daily_returns = list(self.daily_returns)
+        scan.monthly_returns = list(self.monthly_returns)
+        return scan
+
+    def add_bucket(self, bucket: _DayBucket):
+        pnl = bucket.totals.pnl
+        equity = self.equity
+
+        # Daily / monthly returns
+        if equity > 0:
+            self.daily_returns.append(pnl / equity)
+        key = (bucket.day.year, bucket.day.month)
+        if key != self.month_key:
+            self._close_month()
+            self.month_key = key
+            self.month_pnl = Decimal("0")
+            self.month_start_equity = equity
+        self.month_pnl += pnl
+
+        # Drawdown: each segment either sets a new peak at its high or is
+        # underwater from its high down to its low
+        for index, (high, high_time, low, after_time, last_time) in enumerate(bucket.segments):
+            if index:
+                if equity + high > self.peak:
+                    if self.drawdown_start and not self.recovery_time:
+                        self.recovery_time = high_time
+                    self.peak = equity + high
+                    self.drawdown_start = None
+                else:
+                    self._underwater(equity + high, high_time, high_time)
+            if after_time is not None:
+                self._underwater(equity + low, after_time, last_time)
+
+        self.equity = equity + pnl
+
+        if self.first_entry is None or bucket.first_entry < self.first_entry:
+            self.first_entry = bucket.first_entry
+        if self.last_exit is None or bucket.last_exit > self.last_exit:
+            self.last_exit = bucket.last_exit
+
+        # Streaks
+        if bucket.n_signed:
+            self.max_win_streak = max(self.max_win_streak, bucket.max_win_run)
+            self.max_loss_streak = max(self.max_loss_streak, bucket.max_loss_run)
+            if bucket.first_sign == self.streak_sign:
+                run = self.streak_len + bucket.lead_len
+                if self.streak_sign > 0:
+                    self.max_win_streak = max(self.max_win_streak, run)
+                else:
+                    self.max_loss_streak = max(self.max_loss_streak, run)
+                if bucket.lead_len == bucket.n_signed:
+                    self.streak_len = run
+                else:
+                    self.streak_sign, self.streak_len = bucket.last_sign, bucket.trail_len
+            else:
+                self.streak_sign, self.streak_len = bucket.last_sign, bucket.trail_len
+
+    def _underwater(self, trough: Decimal, first_time: datetime, last_time: datetime):
+        if not self.drawdown_start:
+            self.drawdown_start = first_time
+        self.underwater_days = (last_time - self.drawdown_start).days
+
+        if self.peak > 0:
+            drawdown_pct = (self.peak - trough) / self.peak * Decimal("100")
+            if drawdown_pct > self.max_drawdown_pct:
+                self.max_drawdown_pct = drawdown_pct
+                self.max_drawdown_usd = self.peak - trough
+
+    def _close_month(self):
+        if self.month_key is not None and self.month_start_equity > 0:
+            self.monthly_returns.append(self.month_pnl / self.month_start_equity)
+
+    def finish(self) -> Tuple[List[Decimal], List[Decimal], Dict, Dict]:
+        """Daily returns, monthly returns, drawdown and streak metrics"""
+        monthly_returns = list(self.monthly_returns)
+        if self.month_key is not None and self.month_start_equity > 0:
+            monthly_returns.append(self.month_pnl / self.month_start_equity)
+
+        recovery_days = None
+        if self.recovery_time and self.drawdown_start:
+            recovery_days = (self.recovery_time - self.drawdown_start).days
+
+        drawdown_metrics = {
+            "max_drawdown_pct": self.max_drawdown_pct,
+            "max_drawdown_usd": self.max_drawdown_usd,
+            "recovery_days": recovery_days,
+            "time_underwater_days": self.underwater_days
+        }
+        streak_metrics = {
+            "current_win_streak": self.streak_len if self.streak_sign > 0 else 0,
+            "current_loss_streak": self.streak_len if self.streak_sign < 0 else 0,
+            "max_win_streak": self.max_win_streak,
+            "max_loss_streak": self.max_loss_streak
+        }
+        return self.daily_returns, monthly_returns, drawdown_metrics, streak_metrics
+
+
+class _WindowState:
+    """Running totals for one TimeWindow over the shared day buckets"""
+
+    __slots__ = ("window", "start_day", "totals", "cached", "cached_key")
+
+    def __init__(self, window: TimeWindow):
+        self.window = window
+        self.start_day = None  # None = no expiry (ALL_TIME)
+        self.totals = _Totals()
+        self.cached: Optional[PerformanceMetrics] = None
+        self.cached_key: Optional[Tuple] = None
+
+
 class PerformanceMetricsEngine:
     """
     Advanced performance metrics calculation engine.
@@ -189,13 +487,28 @@ class PerformanceMetricsEngine:
     def __init__(self, config: PerformanceConfig):
         self.config = config
 
-        # State
-        self.trades: List[Trade] = []
-        self.snapshots: List[PerformanceSnapshot] = []
+        # State (raw history is bounded; metrics come from the day buckets)
+        self.trades: deque = deque(maxlen=config.max_trade_history)
+        self.snapshots: deque = deque(maxlen=config.max_trade_history)
         self.current_equity: Decimal = Decimal("100000")  # Starting capital
         self.starting_equity: Decimal = Decimal("100000")
         self.peak_equity: Decimal = Decimal("100000")
 
+        # Incremental state: closed trades bucketed by exit day
+        self._buckets: Dict = {}
+        self._days: List = []  # Sorted bucket days
+        self._undated = _Totals()  # Closed trades without an exit time (ALL_TIME only)
+        self._pruned = _PathScan(self.starting_equity)  # ALL_TIME fold over expired buckets
+        self._pruned_before = None  # Buckets before this day have been folded into _pruned
+        self._version: int = 0
+        self._windows: Dict[TimeWindow, _WindowState] = {}
+        today = datetime.now().date()
+        for window in TimeWindow:
+            state = _WindowState(window)
+            if window in WINDOW_DAYS:
+                state.start_day = today - timedelta(days=WINDOW_DAYS[window])
+            self._windows[window] = state
+
         # Cached metrics
         self.current_metrics: Optional[PerformanceMetrics] = None
         self.metrics_by_window: Dict[TimeWindow, PerformanceMetrics] = {}
@@ -234,7 +547,7 @@ class PerformanceMetricsEngine:
         """Background loop to update metrics"""
         while self.is_running:
             try:
-                # Calculate metrics for all time windows
+                # Read metrics for all time windows (cached until new trades arrive)
                 for window in TimeWindow:
                     metrics = await self.calculate_metrics(window)
                     self.metrics_by_window[window] = metrics
@@ -259,11 +572,25 @@ class PerformanceMetricsEngine:
                 await asyncio.sleep(10)
 
     def add_trade(self, trade: Trade):
-        """Add a trade to the performance history"""
+        """
+        Add a trade to the performance history.
+
+        Closed trades update their exit-day bucket and the running totals of
+        every window that covers that day, so the cost is O(1) per trade.
+        Buckets older than the longest window are folded into the ALL_TIME
+        path state and dropped, so memory stays bounded.
+        """
         self.trades.append(trade)
 
         # Update equity
         if not trade.is_open:
+            self._version += 1
+            if trade.exit_time:
+                self._add_to_bucket(trade)
+            else:
+                self._undated.add_trade(trade)
+                self._windows[TimeWindow.ALL_TIME].totals.add_trade(trade)
+
             self.current_equity += trade.pnl_usd
 
             # Update peak equity
@@ -285,9 +612,70 @@ class PerformanceMetricsEngine:
 
         logger.debug(f"Added trade {trade.trade_id} to performance history")
 
+    def _add_to_bucket(self, trade: Trade):
+        """Add a closed trade to its exit-day bucket and covering windows"""
+        day = trade.exit_time.date()
+        if self._pruned_before is not None and day < self._pruned_before:
+            # Its day was already folded away; count it like an undated trade
+            self._undated.add_trade(trade)
+            self._windows[TimeWindow.ALL_TIME].totals.add_trade(trade)
+            return
+
+        bucket = self._buckets.get(day)
+        if bucket is None:
+            bucket = _DayBucket(day)
+            self._buckets[day] = bucket
+            if not self._days or day > self._days[-1]:
+                self._days.append(day)
+            else:
+                bisect.insort(self._days, day)
+
+        bucket.add_trade(trade)
+
+        for state in self._windows.values():
+            self._advance_window(state)
+            if state.start_day is None or day >= state.start_day:
+                state.totals.add_trade(trade)
+
+        self._prune_buckets()
+
+    def _prune_buckets(self):
+        """Fold buckets older than every window into the ALL_TIME prefix"""
+        horizon = min(
+            state.start_day for state in self._windows.values() if state.start_day is not None
+        )
+        # The newest bucket stays open so an in-order backfill of old days
+        # still lands in its own bucket
+        expired = min(bisect.bisect_left(self._days, horizon), len(self._days) - 1)
+        if expired <= 0:
+            return
+
+        for day in self._days[:expired]:
+            self._pruned.add_bucket(self._buckets.pop(day))
+        del self._days[:expired]
+        self._pruned_before = self._days[0]
+
+    def _advance_window(self, state: _WindowState, now: Optional[datetime] = None):
+        """Expire day buckets that have slid out of a window"""
+        if state.window not in WINDOW_DAYS:
+            return
+
+        new_start = ((now or datetime.now()) - timedelta(days=WINDOW_DAYS[state.window])).date()
+        if new_start <= state.start_day:
+            return
+
+        lo = bisect.bisect_left(self._days, state.start_day)
+        hi = bisect.bisect_left(self._days, new_start)
+        for day in self._days[lo:hi]:
+            state.totals.merge(self._buckets[day].totals, sign=-1)
+        state.start_day = new_start
+
     async def calculate_metrics(self, time_window: TimeWindow) -> PerformanceMetrics:
         """
-        Calculate comprehensive performance metrics for a given time window.
+        Get performance metrics for a given time window.
+
+        Reads the window's running totals and combines its day buckets; the
+        result is cached until another trade closes or the window slides.
 
         Args:
             time_window: Time period to analyze (daily, weekly, monthly, etc.)
@@ -295,39 +683,203 @@ class PerformanceMetricsEngine:
         Returns:
             PerformanceMetrics object with all calculated metrics
         """
+        state = self._windows[time_window]
+        self._advance_window(state)
+
+        cache_key = (self._version, state.start_day)
+        if state.cached is not None and state.cached_key == cache_key:
+            return state.cached
+
+        metrics = self._compose_metrics(state)
+        state.cached = metrics
+        state.cached_key = cache_key
+        return metrics
+
+    def _compose_metrics(self, state: _WindowState) -> PerformanceMetrics:
+        """Build PerformanceMetrics from window totals and day buckets"""
+        time_window = state.window
+        totals = state.totals
+
+        if totals.trades == 0:
+            return self._create_empty_metrics(time_window)
+
+        # Single ordered pass over the window's day buckets; ALL_TIME resumes
+        # from the fold over buckets pruned past the longest window
+        if state.start_day is None:
+            scan = self._pruned.copy()
+            lo = 0
+        else:
+            scan = _PathScan(self.starting_equity)
+            lo = bisect.bisect_left(self._days, state.start_day)
+        for day in self._days[lo:]:
+            scan.add_bucket(self._buckets[day])
+        daily_returns, monthly_returns, drawdown_metrics, streak_metrics = scan.finish()
+        drawdown_metrics["current_drawdown_pct"] = (
+            (self.peak_equity - self.current_equity) / self.peak_equity
+        ) * Decimal("100")
+
+        # Returns
+        cumulative_pnl = totals.pnl
+        total_return_pct = (cumulative_pnl / self.starting_equity) * Decimal("100")
+        if time_window == TimeWindow.ALL_TIME:
+            if scan.first_entry is not None:
+                days = max((scan.last_exit - scan.first_entry).days, 1)
+            else:
+                days = 1
+        else:
+            days = WINDOW_DAYS[time_window]
+        annualized_return_pct = self._annualize(total_return_pct, Decimal(str(days)) / Decimal("365"))
+
+        # Win/loss
+        win_loss_metrics = self._win_loss_from_totals(totals)
+
+        return self._build_metrics(
+            time_window=time_window,
+            num_trades=totals.trades,
+            total_return_pct=total_return_pct,
+            annualized_return_pct=annualized_return_pct,
+            cumulative_pnl=cumulative_pnl,
+            win_loss_metrics=win_loss_metrics,
+            daily_returns=daily_returns,
+            monthly_returns=monthly_returns,
+            drawdown_metrics=drawdown_metrics,
+            streak_metrics=streak_metrics
+        )
+
+    async def recompute_metrics(self, time_window: TimeWindow, numeric: bool = False) -> PerformanceMetrics:
+        """
+        Recalculate metrics from the retained raw trades (full scan).
+
+        Only exact while the history has not exceeded max_trade_history;
+        intended for validating the incremental path.
+
+        Args:
+            time_window: Time period to analyze
+            numeric: Compute per-trade statistics on float64 columns
+                     (numeric_core) instead of Decimal
+        """
         # Filter trades by time window
         trades = self._filter_trades_by_window(time_window)
 
         if not trades:
             return self._create_empty_metrics(time_window)
 
+        if numeric:
+            return self._numeric_metrics(trades, time_window)
+
         # Calculate return metrics
         total_return_pct, annualized_return_pct, cumulative_pnl = self._calculate_returns(trades, time_window)
 
-        # Calculate win/loss metrics
-        win_loss_metrics = self._calculate_win_loss_metrics(trades)
+        return self._build_metrics(
+            time_window=time_window,
+            num_trades=len(trades),
+            total_return_pct=total_return_pct,
+            annualized_return_pct=annualized_return_pct,
+            cumulative_pnl=cumulative_pnl,
+            win_loss_metrics=self._calculate_win_loss_metrics(trades),
+            daily_returns=self._calculate_daily_returns(trades),
+            monthly_returns=self._calculate_monthly_returns(trades),
+            drawdown_metrics=self._calculate_drawdown_metrics(trades),
+            streak_metrics=self._calculate_streak_metrics(trades)
+        )
 
-        # Calculate risk-adjusted metrics
-        sharpe = self._calculate_sharpe_ratio(trades, annualized_return_pct, time_window)
-        sortino = self._calculate_sortino_ratio(trades, annualized_return_pct, time_window)
-        calmar = self._calculate_calmar_ratio(annualized_return_pct, trades)
-        information = self._calculate_information_ratio(trades, time_window)
-        omega = self._calculate_omega_ratio(trades)
+    def _numeric_metrics(self, trades: List[Trade], time_window: TimeWindow) -> PerformanceMetrics:
+        """Full recompute on float64 columns; Decimal only for the results"""
+        cols = TradeColumns.from_trades(trades)
+        start = float(self.starting_equity)
 
-        # Calculate drawdown metrics
-        drawdown_metrics = self._calculate_drawdown_metrics(trades)
+        order = numeric_core.order_by_exit(cols.exit_time)
+        order = order[~np.isnat(cols.exit_time[order])]
+        exit_sorted = cols.exit_time[order]
+        pnl_sorted = cols.pnl[order]
+
+        # Returns
+        cumulative_pnl = to_decimal(cols.pnl.sum())
+        total_return_pct = (cumulative_pnl / self.starting_equity) * Decimal("100")
+        if time_window == TimeWindow.ALL_TIME:
+            span = (exit_sorted[-1] - cols.entry_time.min()) if exit_sorted.size else np.timedelta64(0, "us")
+            days = max(int(span.astype(np.int64) // numeric_core.US_PER_DAY), 1)
+        else:
+            days = WINDOW_DAYS.get(time_window, 365)
+        annualized_return_pct = self._annualize(total_return_pct, Decimal(str(days)) / Decimal("365"))
+
+        # Win/loss
+        dated = ~np.isnat(cols.exit_time)
+        durations = (cols.exit_time[dated] - cols.entry_time[dated]).astype(np.int64) / 3.6e9
+        stats = numeric_core.win_loss(cols.pnl, cols.pnl_pct, durations)
+        gross_profit = to_decimal(stats["gross_profit"])
+        gross_loss = abs(to_decimal(stats["gross_loss"]))
+        avg_win_usd = to_decimal(stats["avg_win_usd"])
+        avg_loss_usd = to_decimal(stats["avg_loss_usd"])
+        win_loss_metrics = {
+            "total_trades": stats["total_trades"],
+            "winning_trades": stats["winning_trades"],
+            "losing_trades": stats["losing_trades"],
+            "win_rate_pct": (
+                Decimal(str(stats["winning_trades"])) / Decimal(str(stats["total_trades"])) * Decimal("100")
+            ),
+            "profit_factor": gross_profit / gross_loss if gross_loss > 0 else Decimal("999"),
+            "payoff_ratio": abs(avg_win_usd / avg_loss_usd) if avg_loss_usd != 0 else Decimal("999"),
+            "avg_win_usd": avg_win_usd,
+            "avg_loss_usd": avg_loss_usd,
+            "avg_win_pct": to_decimal(stats["avg_win_pct"]),
+            "avg_loss_pct": to_decimal(stats["avg_loss_pct"]),
+            "avg_duration_hours": to_decimal(stats["avg_duration_hours"])
+        }
+
+        # Equity curve
+        drawdown = numeric_core.drawdown(exit_sorted, pnl_sorted, start)
+        drawdown_metrics = {
+            "max_drawdown_pct": to_decimal(drawdown["max_drawdown_pct"]),
+            "max_drawdown_usd": to_decimal(drawdown["max_drawdown_usd"]),
+            "current_drawdown_pct": ((self.peak_equity - self.current_equity) / self.peak_equity) * Decimal("100"),
+            "recovery_days": drawdown["recovery_days"],
+            "time_underwater_days": drawdown["time_underwater_days"]
+        }
+
+        # Streaks run over exit order, open-ended trades last
+        streak_metrics = numeric_core.streaks(cols.pnl[numeric_core.order_by_exit(cols.exit_time)])
+
+        return self._build_metrics(
+            time_window=time_window,
+            num_trades=len(trades),
+            total_return_pct=total_return_pct,
+            annualized_return_pct=annualized_return_pct,
+            cumulative_pnl=cumulative_pnl,
+            win_loss_metrics=win_loss_metrics,
+            daily_returns=[to_decimal(r) for r in numeric_core.period_returns(exit_sorted, pnl_sorted, start, "D")],
+            monthly_returns=[to_decimal(r) for r in numeric_core.period_returns(exit_sorted, pnl_sorted, start, "M")],
+            drawdown_metrics=drawdown_metrics,
+            streak_metrics=streak_metrics
+        )
+
+    def _build_metrics(self,
+                       time_window: TimeWindow,
+                       num_trades: int,
+                       total_return_pct: Decimal,
+                       annualized_return_pct: Decimal,
+                       cumulative_pnl: Decimal,
+                       win_loss_metrics: Dict,
+                       daily_returns: List[Decimal],
+                       monthly_returns: List[Decimal],
+                       drawdown_metrics: Dict,
+                       streak_metrics: Dict) -> PerformanceMetrics:
+        """Assemble PerformanceMetrics from pre-aggregated inputs"""
+        # Calculate risk-adjusted metrics
+        sharpe = self._sharpe_from_returns(daily_returns, annualized_return_pct)
+        sortino = self._sortino_from_returns(daily_returns, annualized_return_pct)
+        calmar = self._calmar_from_drawdown(annualized_return_pct, drawdown_metrics["max_drawdown_pct"])
+        information = self._calculate_information_ratio([], time_window)
+        omega = self._omega_from_returns(daily_returns)
 
         # Calculate volatility metrics
-        volatility_metrics = self._calculate_volatility_metrics(trades, time_window)
+        volatility_metrics = self._volatility_from_returns(daily_returns)
 
         # Calculate consistency metrics
-        consistency_metrics = self._calculate_consistency_metrics(trades)
-
-        # Calculate streak metrics
-        streak_metrics = self._calculate_streak_metrics(trades)
+        consistency_metrics = self._consistency_from_returns(daily_returns, monthly_returns)
 
         # Check statistical significance
-        is_significant, confidence = self._check_statistical_significance(trades)
+        is_significant, confidence = self._significance_from_returns(num_trades, daily_returns)
 
         metrics = PerformanceMetrics(
             calculation_time=datetime.now(),
@@ -387,7 +939,7 @@ class PerformanceMetricsEngine:
             # Quality
             is_statistically_significant=is_significant,
             confidence_level_pct=confidence,
-            min_trades_met=len(trades) >= self.config.min_trades_for_significance
+            min_trades_met=num_trades >= self.config.min_trades_for_significance
         )
 
         return metrics
@@ -434,29 +986,22 @@ class PerformanceMetricsEngine:
             days = (last_trade.exit_time - first_trade.entry_time).days
             if days < 1:
                 days = 1
-
-            years = Decimal(str(days)) / Decimal("365")
         else:
             # Use window duration
-            window_days = {
-                TimeWindow.DAILY: 1,
-                TimeWindow.WEEKLY: 7,
-                TimeWindow.MONTHLY: 30,
-                TimeWindow.QUARTERLY: 90,
-                TimeWindow.YEARLY: 365
-            }
-            days = window_days.get(time_window, 365)
-            years = Decimal(str(days)) / Decimal("365")
+            days = WINDOW_DAYS.get(time_window, 365)
+
+        years = Decimal(str(days)) / Decimal("365")
+        annualized_return_pct = self._annualize(total_return_pct, years)
+
+        return total_return_pct, annualized_return_pct, cumulative_pnl
 
+    def _annualize(self, total_return_pct: Decimal, years: Decimal) -> Decimal:
+        """Annualized return = (1 + total_return)^(1/years) - 1"""
         if years > 0:
-            # Annualized return = (1 + total_return)^(1/years) - 1
-            annualized_return_pct = (
+            return (
                 (Decimal("1") + total_return_pct / Decimal("100")) ** (Decimal("1") / years) - Decimal("1")
             ) * Decimal("100")
-        else:
-            annualized_return_pct = total_return_pct
-
-        return total_return_pct, annualized_return_pct, cumulative_pnl
+        return total_return_pct
 
     def _calculate_win_loss_metrics(self, trades: List[Trade]) -> Dict:
         """Calculate win/loss metrics"""
@@ -512,20 +1057,59 @@ class PerformanceMetricsEngine:
             "avg_duration_hours": avg_duration_hours
         }
 
+    def _win_loss_from_totals(self, totals: _Totals) -> Dict:
+        """Win/loss metrics from running totals (same definitions as above)"""
+        if totals.trades == 0:
+            return self._empty_win_loss_metrics()
+
+        num_winning = totals.wins
+        num_losing = totals.losses
+
+        win_rate_pct = (Decimal(str(num_winning)) / Decimal(str(totals.trades))) * Decimal("100")
+
+        avg_win_usd = totals.gross_profit / Decimal(str(num_winning)) if num_winning > 0 else Decimal("0")
+        avg_loss_usd = totals.gross_loss / Decimal(str(num_losing)) if num_losing > 0 else Decimal("0")
+
+        avg_win_pct = totals.win_pct_sum / Decimal(str(num_winning)) if num_winning > 0 else Decimal("0")
+        avg_loss_pct = totals.loss_pct_sum / Decimal(str(num_losing)) if num_losing > 0 else Decimal("0")
+
+        gross_loss = abs(totals.gross_loss)
+        profit_factor = totals.gross_profit / gross_loss if gross_loss > 0 else Decimal("999")
+
+        payoff_ratio = abs(avg_win_usd / avg_loss_usd) if avg_loss_usd != 0 else Decimal("999")
+
+        avg_duration_hours = (
+            Decimal(str(totals.duration_hours / totals.duration_count)) if totals.duration_count else Decimal("0")
+        )
+
+        return {
+            "total_trades": totals.trades,
+            "winning_trades": num_winning,
+            "losing_trades": num_losing,
+            "win_rate_pct": win_rate_pct,
+            "profit_factor": profit_factor,
+            "payoff_ratio": payoff_ratio,
+            "avg_win_usd": avg_win_usd,
+            "avg_loss_usd": avg_loss_usd,
+            "avg_win_pct": avg_win_pct,
+            "avg_loss_pct": avg_loss_pct,
+            "avg_duration_hours": avg_duration_hours
+        }
+
     def _calculate_sharpe_ratio(self, trades: List[Trade], annualized_return_pct: Decimal,
                                 time_window: TimeWindow) -> Decimal:
+        """Calculate Sharpe ratio from a list of trades"""
+        if not trades:
+            return Decimal("0")
+        return self._sharpe_from_returns(self._calculate_daily_returns(trades), annualized_return_pct)
+
+    def _sharpe_from_returns(self, daily_returns: List[Decimal], annualized_return_pct: Decimal) -> Decimal:
         """
         Calculate Sharpe ratio: (Return - RiskFree) / Volatility
 
         Sharpe ratio measures risk-adjusted returns. Higher is better.
         >2.0 is excellent, >1.0 is good, <1.0 is poor.
         """
-        if not trades:
-            return Decimal("0")
-
-        # Get daily returns
-        daily_returns = self._calculate_daily_returns(trades)
-
         if not daily_returns:
             return Decimal("0")
 
@@ -548,18 +1132,18 @@ class PerformanceMetricsEngine:
 
     def _calculate_sortino_ratio(self, trades: List[Trade], annualized_return_pct: Decimal,
                                  time_window: TimeWindow) -> Decimal:
+        """Calculate Sortino ratio from a list of trades"""
+        if not trades:
+            return Decimal("0")
+        return self._sortino_from_returns(self._calculate_daily_returns(trades), annualized_return_pct)
+
+    def _sortino_from_returns(self, daily_returns: List[Decimal], annualized_return_pct: Decimal) -> Decimal:
         """
         Calculate Sortino ratio: (Return - RiskFree) / DownsideDeviation
 
         Similar to Sharpe but only penalizes downside volatility.
         Better measure for asymmetric returns.
         """
-        if not trades:
-            return Decimal("0")
-
-        # Get daily returns
-        daily_returns = self._calculate_daily_returns(trades)
-
         if not daily_returns:
             return Decimal("0")
 
@@ -586,18 +1170,20 @@ class PerformanceMetricsEngine:
         return sortino_ratio
 
     def _calculate_calmar_ratio(self, annualized_return_pct: Decimal, trades: List[Trade]) -> Decimal:
+        """Calculate Calmar ratio from a list of trades"""
+        if not trades:
+            return Decimal("0")
+
+        drawdown_metrics = self._calculate_drawdown_metrics(trades)
+        return self._calmar_from_drawdown(annualized_return_pct, drawdown_metrics["max_drawdown_pct"])
+
+    def _calmar_from_drawdown(self, annualized_return_pct: Decimal, max_drawdown_pct: Decimal) -> Decimal:
         """
         Calculate Calmar ratio: AnnualizedReturn / MaxDrawdown
 
         Measures return relative to worst drawdown. Higher is better.
         >3.0 is excellent, >1.0 is good.
         """
-        if not trades:
-            return Decimal("0")
-
-        drawdown_metrics = self._calculate_drawdown_metrics(trades)
-        max_drawdown_pct = drawdown_metrics["max_drawdown_pct"]
-
         if max_drawdown_pct == 0:
             return Decimal("999")
 
@@ -616,17 +1202,18 @@ class PerformanceMetricsEngine:
         return Decimal("0")
 
     def _calculate_omega_ratio(self, trades: List[Trade], threshold: Decimal = Decimal("0")) -> Decimal:
+        """Calculate Omega ratio from a list of trades"""
+        if not trades:
+            return Decimal("0")
+        return self._omega_from_returns(self._calculate_daily_returns(trades), threshold)
+
+    def _omega_from_returns(self, daily_returns: List[Decimal], threshold: Decimal = Decimal("0")) -> Decimal:
         """
         Calculate Omega ratio: Probability-weighted gains / losses
 
         Ratio of gains above threshold to losses below threshold.
         >1.0 means gains outweigh losses.
         """
-        if not trades:
-            return Decimal("0")
-
-        daily_returns = self._calculate_daily_returns(trades)
-
         if not daily_returns:
             return Decimal("0")
 
@@ -712,9 +1299,11 @@ class PerformanceMetricsEngine:
         }
 
     def _calculate_volatility_metrics(self, trades: List[Trade], time_window: TimeWindow) -> Dict:
-        """Calculate volatility metrics"""
-        daily_returns = self._calculate_daily_returns(trades)
+        """Calculate volatility metrics from a list of trades"""
+        return self._volatility_from_returns(self._calculate_daily_returns(trades))
 
+    def _volatility_from_returns(self, daily_returns: List[Decimal]) -> Dict:
+        """Calculate volatility metrics"""
         if not daily_returns:
             return {
                 "daily_volatility_pct": Decimal("0"),
@@ -746,9 +1335,14 @@ class PerformanceMetricsEngine:
         }
 
     def _calculate_consistency_metrics(self, trades: List[Trade]) -> Dict:
-        """Calculate consistency metrics"""
-        daily_returns = self._calculate_daily_returns(trades)
+        """Calculate consistency metrics from a list of trades"""
+        return self._consistency_from_returns(
+            self._calculate_daily_returns(trades),
+            self._calculate_monthly_returns(trades)
+        )
 
+    def _consistency_from_returns(self, daily_returns: List[Decimal], monthly_returns: List[Decimal]) -> Dict:
+        """Calculate consistency metrics"""
         if not daily_returns:
             return {
                 "best_day_return_pct": Decimal("0"),
@@ -766,7 +1360,6 @@ class PerformanceMetricsEngine:
         positive_days_pct = (Decimal(str(positive_days)) / Decimal(str(len(daily_returns)))) * Decimal("100")
 
         # Monthly consistency (std dev of monthly returns)
-        monthly_returns = self._calculate_monthly_returns(trades)
         if len(monthly_returns) > 1:
             mean_monthly = sum(monthly_returns) / Decimal(str(len(monthly_returns)))
             monthly_variance = sum((r - mean_monthly) ** 2 for r in monthly_returns) / Decimal(str(len(monthly_returns)))
@@ -899,13 +1492,17 @@ class PerformanceMetricsEngine:
         return monthly_returns
 
     def _check_statistical_significance(self, trades: List[Trade]) -> Tuple[bool, Decimal]:
-        """Check if results are statistically significant"""
+        """Check significance for a list of trades"""
         if len(trades) < self.config.min_trades_for_significance:
             return False, Decimal("0")
+        return self._significance_from_returns(len(trades), self._calculate_daily_returns(trades))
 
-        # Use t-test to check if mean return is significantly different from 0
-        daily_returns = self._calculate_daily_returns(trades)
+    def _significance_from_returns(self, num_trades: int, daily_returns: List[Decimal]) -> Tuple[bool, Decimal]:
+        """Check if results are statistically significant"""
+        if num_trades < self.config.min_trades_for_significance:
+            return False, Decimal("0")
 
+        # Use t-test to check if mean return is significantly different from 0
         if not daily_returns or len(daily_returns) < 2:
             return False, Decimal("0")
 
@@ -32,6 +32,8 @@ from typing import Deque, Dict, List, Optional, Tuple
 import time
 import numpy as np
 
+from src.monitoring.latency import tracer
+
 logger = logging.getLogger(__name__)
 
 
@@ -96,6 +98,7 @@ class AnomalyDetectorConfig:
     # EWMA parameters
     ewma_span: int = 60  # 60-minute exponential window
     ewma_adjust: bool = True  # Adjust for early periods
+    ewma_exact_recompute: bool = False  # Recompute baseline from history (validation only)
 
     # Z-score threshold
     z_score_threshold: float = 3.0  # 99.7% confidence
@@ -116,6 +119,52 @@ class AnomalyDetectorConfig:
     max_processing_latency_ms: float = 200.0  # 200ms budget
 
 
+@dataclass
+class EWMAState:
+    """
+    Recursive EWMA mean/variance for one market.
+
+    Updated in O(1) per trade. With adjust=True the weights match the
+    normalized (1-alpha)^k weighting used by the exact recompute; with
+    adjust=False the first value seeds the mean.
+    """
+    mean: float = 0.0
+    variance: float = 0.0
+    weight: float = 0.0  # Sum of decayed weights (adjust=True)
+    count: int = 0
+
+    def update(self, value: float, alpha: float, adjust: bool) -> Tuple[float, float]:
+        """
+        Fold one observation into the state.
+
+        Args:
+            value: New observation
+            alpha: Smoothing factor, 2 / (span + 1)
+            adjust: If True, normalize by the decayed weight sum
+
+        Returns:
+            Tuple of (ewma_mean, ewma_std)
+        """
+        self.count += 1
+        if self.count == 1:
+            self.mean = value
+            self.variance = 0.0
+            self.weight = 1.0
+            return (value, 0.0)
+
+        if adjust:
+            self.weight = 1.0 + (1.0 - alpha) * self.weight
+            step = 1.0 / self.weight
+        else:
+            step = alpha
+
+        diff = value - self.mean
+        self.mean += step * diff
+        self.variance = (1.0 - step) * (self.variance + step * diff * diff)
+
+        return (self.mean, self.variance ** 0.5 if self.variance > 0 else 0.0)
+
+
 class RealTimeAnomalyDetector:
     """
     Real-time anomaly detection engine using EWMA Z-scores.
@@ -144,6 +193,10 @@ class RealTimeAnomalyDetector:
         # EWMA state: market_id -> (ewma_mean, ewma_std)
         self.market_ewma: Dict[str, Tuple[float, float]] = {}
 
+        # Recursive EWMA accumulators: market_id -> EWMAState
+        self.market_ewma_state: Dict[str, EWMAState] = defaultdict(EWMAState)
+        self._ewma_alpha = 2.0 / (self.config.ewma_span + 1)
+
         # Alert cooldown state: (market_id, trader_address) -> deque of alert timestamps
         self.cooldown_state: Dict[Tuple[str, str], Deque[datetime]] = defaultdict(
             lambda: deque(maxlen=self.config.max_alerts_before_cooldown)
@@ -170,6 +223,10 @@ class RealTimeAnomalyDetector:
         - Mean trade size
         - Standard deviation of trade size
 
+        The baseline is a recursive per-market state, so the cost per trade
+        is constant regardless of history length. Set ewma_exact_recompute
+        to rebuild it from the retained history instead (validation only).
+
         Reference: Section 9.2, "EWMA Z-Scores"
 
         Args:
@@ -183,29 +240,27 @@ class RealTimeAnomalyDetector:
         # Add to history
         self.market_trade_history[market_id].append((trade_timestamp, trade_usd_value))
 
-        # Extract values for EWMA calculation
-        trade_values = [val for _, val in self.market_trade_history[market_id]]
-
-        if len(trade_values) < 2:
-            # Insufficient data
-            return (trade_usd_value, 0.0)
-
-        # Compute EWMA mean
-        ewma_mean = self._ewma(
-            trade_values,
-            span=self.config.ewma_span,
-            adjust=self.config.ewma_adjust
+        # O(1) recursive update
+        ewma_mean, ewma_std = self.market_ewma_state[market_id].update(
+            trade_usd_value,
+            self._ewma_alpha,
+            self.config.ewma_adjust
         )
 
-        # Compute EWMA standard deviation
-        # Use exponentially weighted variance
-        deviations = [(val - ewma_mean)**2 for val in trade_values]
-        ewma_variance = self._ewma(
-            deviations,
-            span=self.config.ewma_span,
-            adjust=self.config.ewma_adjust
-        )
-        ewma_std = np.sqrt(ewma_variance) if ewma_variance > 0 else 0.0
+        if self.config.ewma_exact_recompute:
+            # Validation mode: rebuild the baseline from the retained history
+            trade_values = [val for _, val in self.market_trade_history[market_id]]
+            exact_mean, exact_std = self._ewma(
+                trade_values,
+                span=self.config.ewma_span,
+                adjust=self.config.ewma_adjust
+            )
+            if not np.isclose(exact_mean, ewma_mean, rtol=1e-6) or not np.isclose(exact_std, ewma_std, rtol=1e-6):
+                logger.debug(
+                    f"EWMA drift for {market_id}: recursive=({ewma_mean:.4f}, {ewma_std:.4f}) "
+                    f"exact=({exact_mean:.4f}, {exact_std:.4f})"
+                )
+            ewma_mean, ewma_std = exact_mean, exact_std
 
         # Update state
         self.market_ewma[market_id] = (ewma_mean, ewma_std)
@@ -217,13 +272,17 @@ class RealTimeAnomalyDetector:
         values: List[float],
         span: int,
         adjust: bool = True
-    ) -> float:
+    ) -> Tuple[float, float]:
         """
-        Calculate Exponentially Weighted Moving Average.
+        Calculate Exponentially Weighted mean and standard deviation from scratch.
 
-        EWMA formula:
+        Reference implementation for EWMAState:
         - α = 2 / (span + 1)
-        - EWMA_t = α * value_t + (1 - α) * EWMA_{t-1}
+        - adjust=True: weights (1 - α)^k, normalized by their sum
+        - adjust=False: EWMA_t = α * value_t + (1 - α) * EWMA_{t-1}
+
+        Only the retained history is used, so results match the recursive
+        state once the dropped trades' weights have decayed away.
 
         Args:
             values: List of values (time-ordered)
@@ -231,23 +290,22 @@ class RealTimeAnomalyDetector:
             adjust: If True, adjust for early periods
 
         Returns:
-            EWMA value
+            Tuple of (ewma_mean, ewma_std)
         """
         if not values:
-            return 0.0
+            return (0.0, 0.0)
 
         alpha = 2.0 / (span + 1)
-        ewma = values[0]
+        x = np.asarray(values, dtype=np.float64)
+        weights = (1 - alpha) ** np.arange(len(x) - 1, -1, -1, dtype=np.float64)
+        if not adjust:
+            weights[1:] *= alpha
 
-        for i, value in enumerate(values[1:], start=1):
-            if adjust:
-                # Adjust for bias in early periods
-                weight = 1 - (1 - alpha)**i
-                ewma = (alpha * value + (1 - alpha) * ewma) / weight
-            else:
-                ewma = alpha * value + (1 - alpha) * ewma
+        weights /= weights.sum()
+        mean = float(np.dot(weights, x))
+        variance = float(np.dot(weights, (x - mean) ** 2))
 
-        return ewma
+        return (mean, float(np.sqrt(variance)) if variance > 0 else 0.0)
 
     def calculate_z_score(
         self,
@@ -393,6 +451,7 @@ class RealTimeAnomalyDetector:
             # Alert suppressed
             end_time = time.perf_counter()
             self.processing_times.append((end_time - start_time) * 1000)
+            tracer.record_ms("anomaly_detection", (end_time - start_time) * 1000)
             return None
 
         # Determine if anomaly
@@ -447,6 +506,7 @@ class RealTimeAnomalyDetector:
         end_time = time.perf_counter()
         latency_ms = (end_time - start_time) * 1000
         self.processing_times.append(latency_ms)
+        tracer.record_ms("anomaly_detection", latency_ms)
 
         if latency_ms > self.config.max_processing_latency_ms:
             logger.warning(f"High processing latency: {latency_ms:.1f}ms (threshold: {self.config.max_processing_latency_ms}ms)")
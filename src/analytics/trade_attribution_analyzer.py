@@ -23,6 +23,9 @@ from enum import Enum
 from typing import Dict, List, Optional, Tuple
 import json
 
+from src.analytics.numeric_core import TradeColumnStore, group_stats, to_decimal
+from src.analytics.trade_store import DirtySet
+
 logger = logging.getLogger(__name__)
 
 
@@ -63,6 +66,9 @@ class AttributionConfig:
     top_n_performers: int = 10
     top_n_markets: int = 20
 
+    # Compute whale/market/topic attribution on float64 columns (numeric_core)
+    use_numeric_core: bool = True
+
     # Database paths
     trades_db_path: str = "/Users/ronitchhibber/Desktop/Whale.Trader-v0.1/data/trades.db"
 
@@ -190,12 +196,14 @@ class TradeAttributionAnalyzer:
     - Market conditions (how do we perform in different environments?)
     """
 
-    def __init__(self, config: AttributionConfig):
+    def __init__(self, config: AttributionConfig, dirty: Optional[DirtySet] = None):
         self.config = config
+        self.dirty = dirty  # New-trade tracking (analyze every tick if None)
 
         # State
         self.trades: List[Trade] = []
         self.total_pnl: Decimal = Decimal("0")
+        self._columns = TradeColumnStore()  # Float64 view of self.trades
 
         # Cached attribution results
         self.attribution_by_whale: List[AttributionResult] = []
@@ -245,8 +253,11 @@ class TradeAttributionAnalyzer:
         """Background loop to update attribution analysis"""
         while self.is_running:
             try:
-                # Perform full attribution analysis
-                await self.analyze_all()
+                # Rankings span every segment, so any new trade triggers a full
+                # pass; ticks without new trades are skipped
+                changes = self.dirty.drain() if self.dirty is not None else None
+                if changes is None or any(changes):
+                    await self.analyze_all()
 
                 # Log summary
                 logger.info(
@@ -305,21 +316,30 @@ class TradeAttributionAnalyzer:
             List of attribution results, sorted by P&L (descending)
         """
 
-        # Filter trades
-        trades = self._filter_recent_trades()
+        numeric_dimensions = {
+            AttributionDimension.WHALE: "whale",
+            AttributionDimension.MARKET: "market",
+            AttributionDimension.TOPIC: "topic",
+        }
 
-        if not trades:
-            return []
+        if self.config.use_numeric_core and dimension in numeric_dimensions:
+            results = self._calculate_attribution_numeric(dimension, numeric_dimensions[dimension])
+        else:
+            # Filter trades
+            trades = self._filter_recent_trades()
 
-        # Group trades by dimension
-        trades_by_segment = self._group_trades_by_dimension(trades, dimension)
+            if not trades:
+                return []
 
-        # Calculate attribution for each segment
-        results: List[AttributionResult] = []
+            # Group trades by dimension
+            trades_by_segment = self._group_trades_by_dimension(trades, dimension)
 
-        for segment, segment_trades in trades_by_segment.items():
-            result = self._calculate_attribution(dimension, segment, segment_trades)
-            results.append(result)
+            # Calculate attribution for each segment
+            results: List[AttributionResult] = []
+
+            for segment, segment_trades in trades_by_segment.items():
+                result = self._calculate_attribution(dimension, segment, segment_trades)
+                results.append(result)
 
         # Sort by P&L (descending)
         results.sort(key=lambda r: r.total_pnl_usd, reverse=True)
@@ -368,7 +388,6 @@ class TradeAttributionAnalyzer:
 
         # P&L metrics
         total_pnl = sum(t.pnl_usd for t in trades if not t.is_open)
-        contribution_pct = (total_pnl / self.total_pnl * Decimal("100")) if self.total_pnl != 0 else Decimal("0")
 
         # Trade counts
         closed_trades = [t for t in trades if not t.is_open]
@@ -376,12 +395,6 @@ class TradeAttributionAnalyzer:
         winning_trades = len([t for t in closed_trades if t.pnl_usd > 0])
         losing_trades = len([t for t in closed_trades if t.pnl_usd < 0])
 
-        # Win rate
-        win_rate_pct = (Decimal(str(winning_trades)) / Decimal(str(total_trades)) * Decimal("100")) if total_trades > 0 else Decimal("0")
-
-        # Average P&L
-        avg_pnl = total_pnl / Decimal(str(total_trades)) if total_trades > 0 else Decimal("0")
-
         # Average win/loss
         winning_pnl = [t.pnl_usd for t in closed_trades if t.pnl_usd > 0]
         losing_pnl = [t.pnl_usd for t in closed_trades if t.pnl_usd < 0]
@@ -389,13 +402,9 @@ class TradeAttributionAnalyzer:
         avg_win = sum(winning_pnl) / Decimal(str(len(winning_pnl))) if winning_pnl else Decimal("0")
         avg_loss = sum(losing_pnl) / Decimal(str(len(losing_pnl))) if losing_pnl else Decimal("0")
 
-        # Profit factor
+        # Gross profit/loss
         gross_profit = sum(winning_pnl)
         gross_loss = abs(sum(losing_pnl))
-        profit_factor = gross_profit / gross_loss if gross_loss > 0 else Decimal("999")
-
-        # Payoff ratio
-        payoff_ratio = abs(avg_win / avg_loss) if avg_loss != 0 else Decimal("999")
 
         # Sharpe ratio (simplified)
         if total_trades > 2:
@@ -410,6 +419,79 @@ class TradeAttributionAnalyzer:
         # Volume
         total_volume = sum(t.position_size_usd for t in trades)
 
+        # Calculate total P&L %
+        total_pnl_pct = sum(t.pnl_pct for t in closed_trades) if closed_trades else Decimal("0")
+
+        return self._build_attribution(
+            dimension, segment, total_pnl, total_pnl_pct, total_trades, winning_trades, losing_trades,
+            avg_win, avg_loss, gross_profit, gross_loss, sharpe_ratio, total_volume
+        )
+
+    def _calculate_attribution_numeric(self, dimension: AttributionDimension,
+                                       key: str) -> List[AttributionResult]:
+        """Attribution for every segment of a dimension in one vectorized pass"""
+        cols = self._columns.sync(self.trades)
+        codes, segments = cols.codes(key)
+
+        # Same trades as _filter_recent_trades()
+        recent = cols.exited_since(self.config.analysis_lookback_days)
+        stats = group_stats(
+            codes, len(segments), cols.pnl, mask=recent, pnl_pct=cols.pnl_pct, volume=cols.size_usd
+        )
+
+        results: List[AttributionResult] = []
+        for i, segment in enumerate(segments):
+            total_trades = int(stats.count[i])
+            if total_trades == 0:
+                continue
+            winning_trades = int(stats.wins[i])
+            losing_trades = int(stats.losses[i])
+
+            if total_trades > 2:
+                mean_return = stats.pct_sum[i] / total_trades
+                std_dev = stats.pct_std[i]
+                sharpe_ratio = to_decimal(mean_return / std_dev) if std_dev > 0 else Decimal("0")
+            else:
+                sharpe_ratio = Decimal("0")
+
+            results.append(self._build_attribution(
+                dimension, segment,
+                total_pnl=to_decimal(stats.pnl_sum[i]),
+                total_pnl_pct=to_decimal(stats.pct_sum[i]),
+                total_trades=total_trades,
+                winning_trades=winning_trades,
+                losing_trades=losing_trades,
+                avg_win=to_decimal(stats.win_sum[i] / winning_trades) if winning_trades else Decimal("0"),
+                avg_loss=to_decimal(stats.loss_sum[i] / losing_trades) if losing_trades else Decimal("0"),
+                gross_profit=to_decimal(stats.win_sum[i]),
+                gross_loss=to_decimal(abs(stats.loss_sum[i])),
+                sharpe_ratio=sharpe_ratio,
+                total_volume=to_decimal(stats.volume[i])
+            ))
+
+        return results
+
+    def _build_attribution(self, dimension: AttributionDimension, segment: str,
+                           total_pnl: Decimal, total_pnl_pct: Decimal,
+                           total_trades: int, winning_trades: int, losing_trades: int,
+                           avg_win: Decimal, avg_loss: Decimal,
+                           gross_profit: Decimal, gross_loss: Decimal,
+                           sharpe_ratio: Decimal, total_volume: Decimal) -> AttributionResult:
+        """Derive ratios, significance and confidence from segment aggregates"""
+        contribution_pct = (total_pnl / self.total_pnl * Decimal("100")) if self.total_pnl != 0 else Decimal("0")
+
+        # Win rate
+        win_rate_pct = (Decimal(str(winning_trades)) / Decimal(str(total_trades)) * Decimal("100")) if total_trades > 0 else Decimal("0")
+
+        # Average P&L
+        avg_pnl = total_pnl / Decimal(str(total_trades)) if total_trades > 0 else Decimal("0")
+
+        # Profit factor
+        profit_factor = gross_profit / gross_loss if gross_loss > 0 else Decimal("999")
+
+        # Payoff ratio
+        payoff_ratio = abs(avg_win / avg_loss) if avg_loss != 0 else Decimal("999")
+
         # Significance
         is_significant = (
             total_trades >= self.config.min_trades_for_significance and
@@ -430,9 +512,6 @@ class TradeAttributionAnalyzer:
         else:
             confidence = Decimal("50")
 
-        # Calculate total P&L %
-        total_pnl_pct = sum(t.pnl_pct for t in closed_trades) if closed_trades else Decimal("0")
-
         return AttributionResult(
             dimension=dimension,
             segment=segment,
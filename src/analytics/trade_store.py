@@ -0,0 +1,255 @@
+"""
+Shared Trade Store for Analytics Modules
+
+Append-only trade history with per-whale and per-market secondary indexes,
+shared by the edge detection, CUSUM and lifecycle modules.
+
+Without it each module keeps its own copy of every trade and scans the whole
+list once per whale and once per market on every update tick. With it the
+history is held once, entity lookups read an index, and the float64 columns
+used by the numeric paths are built once for all modules.
+
+Trades are also bucketed into time-partitioned segments (by exit time, or
+entry time while open) so that an optional retention window can drop whole
+old segments without scanning the history.
+
+DirtySet tracks which whales and markets received trades since a module's
+last update tick, so periodic loops can recompute only those entities.
+
+Author: Whale Copy Trading System
+Date: 2025
+"""
+
+import itertools
+import logging
+import time
+from bisect import bisect_left, insort
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.analytics.numeric_core import TradeColumns, TradeColumnStore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TradeRecord:
+    """
+    Canonical trade row.
+
+    Carries the union of the fields read by the edge, CUSUM and lifecycle
+    modules, so one record can stand in for each module's Trade.
+    """
+    trade_id: str
+    whale_address: str
+    market_id: str
+    entry_time: datetime
+    exit_time: Optional[datetime]
+    pnl_usd: Decimal
+    is_open: bool
+    market_topic: str = ""
+    position_size_usd: Decimal = Decimal("0")
+
+
+class TradeStore:
+    """
+    Append-only trade history with secondary indexes.
+
+    Any object with whale_address, entry_time, exit_time, pnl_usd and
+    is_open can be stored (TradeRecord or a module's own Trade); market_id
+    is indexed when present.
+    """
+
+    def __init__(self, segment_days: int = 1, retention_days: Optional[int] = None):
+        """
+        Args:
+            segment_days: Width of each time partition
+            retention_days: Drop segments older than this (keep everything if None)
+        """
+        self.segment_days = segment_days
+        self.retention_days = retention_days
+        self._columns = TradeColumnStore()
+        self._reset()
+
+    def _reset(self):
+        self.trades: List = []
+        self._by_whale: Dict[str, List[int]] = defaultdict(list)
+        self._by_market: Dict[str, List[int]] = defaultdict(list)
+        self._segments: Dict[int, List[int]] = {}
+        self._segment_keys: List[int] = []
+
+    @classmethod
+    def from_trades(cls, trades: Iterable, **kwargs) -> "TradeStore":
+        store = cls(**kwargs)
+        store.extend(trades)
+        return store
+
+    def __len__(self) -> int:
+        return len(self.trades)
+
+    # ==================== Writes ====================
+
+    def append(self, trade):
+        """Add a trade and index it"""
+        row = len(self.trades)
+        self.trades.append(trade)
+
+        self._by_whale[trade.whale_address].append(row)
+        market_id = getattr(trade, "market_id", None)
+        if market_id is not None:
+            self._by_market[market_id].append(row)
+
+        key = self._segment_key(trade)
+        if key in self._segments:
+            self._segments[key].append(row)
+        else:
+            self._segments[key] = [row]
+            insort(self._segment_keys, key)
+            if self.retention_days is not None:
+                self._expire()
+
+    def extend(self, trades: Iterable):
+        for trade in trades:
+            self.append(trade)
+
+    def _segment_key(self, trade) -> int:
+        timestamp = trade.exit_time or trade.entry_time
+        return timestamp.toordinal() // self.segment_days
+
+    def _expire(self):
+        """Drop segments that fall entirely outside the retention window"""
+        cutoff = self._segment_keys[-1] - self.retention_days // self.segment_days
+        stale = bisect_left(self._segment_keys, cutoff)
+        if stale == 0:
+            return
+
+        keep = sorted(
+            row for key in self._segment_keys[stale:] for row in self._segments[key]
+        )
+        trades = [self.trades[row] for row in keep]
+        self._reset()
+        self.extend(trades)
+        logger.info(f"TradeStore retention: dropped {stale} segment(s), {len(trades)} trades kept")
+
+    # ==================== Views ====================
+
+    def whales(self) -> List[str]:
+        return list(self._by_whale)
+
+    def markets(self) -> List[str]:
+        return list(self._by_market)
+
+    def for_whale(self, whale_address: str, closed_only: bool = False,
+                  since: Optional[datetime] = None) -> List:
+        """Trades for one whale in insertion order"""
+        return self._select(self._by_whale.get(whale_address, ()), closed_only, since)
+
+    def for_market(self, market_id: str, closed_only: bool = False,
+                   since: Optional[datetime] = None) -> List:
+        """Trades for one market in insertion order"""
+        return self._select(self._by_market.get(market_id, ()), closed_only, since)
+
+    def _select(self, rows: Iterable[int], closed_only: bool, since: Optional[datetime]) -> List:
+        trades = [self.trades[row] for row in rows]
+        if since is not None:
+            # A time filter implies closed trades with a known exit time
+            return [t for t in trades if not t.is_open and t.exit_time and t.exit_time >= since]
+        if closed_only:
+            return [t for t in trades if not t.is_open]
+        return trades
+
+    def has_closed(self, whale_address: str) -> bool:
+        return any(not self.trades[row].is_open for row in self._by_whale.get(whale_address, ()))
+
+    def first_seen(self, whale_address: str) -> Optional[datetime]:
+        """Entry time of the first stored trade for a whale"""
+        rows = self._by_whale.get(whale_address)
+        return self.trades[rows[0]].entry_time if rows else None
+
+    def columns(self) -> TradeColumns:
+        """Float64 columns over the stored trades, shared by every reader"""
+        return self._columns.sync(self.trades)
+
+    def entity_columns(self, dimension: str, ids: Optional[Iterable[str]] = None
+                       ) -> Tuple[TradeColumns, np.ndarray, List[str], Optional[np.ndarray]]:
+        """
+        Columns grouped by whale or market, for per-entity statistics.
+
+        Args:
+            dimension: "whale" or "market"
+            ids: Only read these entities' rows, via the indexes, so the
+                 cost follows their trades rather than the whole history
+                 (every entity if None)
+
+        Returns:
+            (columns, codes, labels, rows): codes index labels, one per
+            column row; rows maps column rows back to store rows (None
+            when the columns are the whole store). Ids without trades
+            are left out of labels.
+        """
+        cols = self.columns()
+        if ids is None:
+            codes, labels = cols.codes(dimension)
+            return cols, codes, labels, None
+
+        if dimension == "whale":
+            index = self._by_whale
+        elif dimension == "market":
+            index = self._by_market
+        else:
+            raise ValueError(f"Unknown dimension: {dimension}")
+
+        labels, chunks = [], []
+        for entity_id in ids:
+            entity_rows = index.get(entity_id)
+            if entity_rows:
+                labels.append(entity_id)
+                chunks.append(entity_rows)
+        sizes = [len(chunk) for chunk in chunks]
+        rows = np.fromiter(itertools.chain.from_iterable(chunks), dtype=np.int64, count=sum(sizes))
+        codes = np.repeat(np.arange(len(labels), dtype=np.int64), sizes)
+        return cols.take(rows), codes, labels, rows
+
+
+class DirtySet:
+    """
+    Whales and markets with new trades since a module's last update tick.
+
+    AnalyticsIntegration keeps one per module and marks it from on_trade;
+    the module drains it once per tick. Rolling windows keep moving while
+    nothing trades, so drain() asks for a full pass every
+    full_refresh_seconds (and on the first tick).
+    """
+
+    def __init__(self, full_refresh_seconds: float = 3600.0):
+        self.full_refresh_seconds = full_refresh_seconds
+        self.whales: Set[str] = set()
+        self.markets: Set[str] = set()
+        self._last_full: Optional[float] = None
+
+    def mark(self, whale_address: str, market_id: Optional[str] = None):
+        self.whales.add(whale_address)
+        if market_id is not None:
+            self.markets.add(market_id)
+
+    def drain(self) -> Optional[Tuple[Set[str], Set[str]]]:
+        """
+        Take the dirty entities and reset.
+
+        Returns:
+            (whales, markets) marked since the last drain, or None when a
+            full pass over every entity is due
+        """
+        whales, markets = self.whales, self.markets
+        self.whales, self.markets = set(), set()
+
+        now = time.monotonic()
+        if self._last_full is None or now - self._last_full >= self.full_refresh_seconds:
+            self._last_full = now
+            return None
+        return whales, markets
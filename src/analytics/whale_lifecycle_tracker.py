@@ -23,9 +23,14 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from decimal import Decimal
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 import json
 
+import numpy as np
+
+from src.analytics.numeric_core import group_stats, to_decimal
+from src.analytics.trade_store import DirtySet, TradeStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -57,6 +62,9 @@ class LifecycleConfig:
     # Update frequency
     update_interval_seconds: int = 300
 
+    # Compute per-whale edges on float64 columns (numeric_core)
+    use_numeric_core: bool = True
+
 
 @dataclass
 class Trade:
@@ -131,11 +139,13 @@ class WhaleLifecycleTracker:
     - Identify typical lifecycle patterns
     """
 
-    def __init__(self, config: LifecycleConfig):
+    def __init__(self, config: LifecycleConfig, trade_store: Optional[TradeStore] = None,
+                 dirty: Optional[DirtySet] = None):
         self.config = config
+        self.dirty = dirty  # Whales with new trades (every whale each tick if None)
 
         # State
-        self.trades: List[Trade] = []
+        self.store = trade_store if trade_store is not None else TradeStore()  # May be shared
         self.whale_states: Dict[str, WhaleLifecycleState] = {}
         self.whale_discovery_dates: Dict[str, datetime] = {}
 
@@ -145,6 +155,11 @@ class WhaleLifecycleTracker:
 
         logger.info("WhaleLifecycleTracker initialized")
 
+    @property
+    def trades(self) -> List[Trade]:
+        """Trade history (read-only view of the store)"""
+        return self.store.trades
+
     async def start(self):
         """Start tracker"""
         if self.is_running:
@@ -169,7 +184,8 @@ class WhaleLifecycleTracker:
         """Background update loop"""
         while self.is_running:
             try:
-                await self.update_all_lifecycles()
+                changes = self.dirty.drain() if self.dirty is not None else None
+                await self.update_all_lifecycles(None if changes is None else changes[0])
                 logger.info(f"Lifecycle update complete - {len(self.whale_states)} whales tracked")
                 await asyncio.sleep(self.config.update_interval_seconds)
             except Exception as e:
@@ -178,58 +194,142 @@ class WhaleLifecycleTracker:
 
     def add_trade(self, trade: Trade):
         """Add trade and auto-discover whale"""
-        self.trades.append(trade)
+        self.store.append(trade)
 
         # Auto-discover whale
         if trade.whale_address not in self.whale_discovery_dates:
             self.whale_discovery_dates[trade.whale_address] = trade.entry_time
             logger.info(f"New whale discovered: {trade.whale_address[:10]}...")
 
-    async def update_all_lifecycles(self):
-        """Update lifecycle for all whales"""
-        whales = set(t.whale_address for t in self.trades)
+    async def update_all_lifecycles(self, whales: Optional[Iterable[str]] = None):
+        """
+        Update lifecycle for whales.
+
+        Args:
+            whales: Whales to update (all if None)
+        """
+        wanted = None if whales is None else set(whales)
+        if wanted is not None and not wanted:
+            return
+
+        if self.config.use_numeric_core:
+            inputs = self._lifecycle_inputs_numeric(wanted)
+        else:
+            inputs = {whale: None for whale in (self.store.whales() if wanted is None else wanted)}
 
-        for whale in whales:
-            state = await self.update_lifecycle(whale)
+        for whale, precomputed in inputs.items():
+            prev_state = self.whale_states.get(whale)
+            state = await self.update_lifecycle(whale, precomputed)
             self.whale_states[whale] = state
 
             # Log phase transitions
-            prev_state = self.whale_states.get(whale)
             if prev_state and prev_state.current_phase != state.current_phase:
                 logger.info(
                     f"PHASE TRANSITION - Whale {whale[:10]}...: "
                     f"{prev_state.current_phase.value} → {state.current_phase.value}"
                 )
 
-    async def update_lifecycle(self, whale_address: str) -> WhaleLifecycleState:
-        """Update lifecycle state for a whale"""
+    def _lifecycle_inputs_numeric(self, wanted: Optional[Set[str]]) -> Dict[str, Optional[Dict]]:
+        """
+        Per-whale trade statistics in one vectorized pass.
+
+        Reads only the wanted whales' rows through the store index (the
+        whole store when None).
+        """
+        cols, codes, whales, rows = self.store.entity_columns("whale", wanted)
+        n = len(whales)
+
+        closed = cols.closed
+        lifetime = group_stats(codes, n, cols.pnl, mask=closed)
+        recent = group_stats(codes, n, cols.pnl, mask=cols.exited_since(30))
+        week = group_stats(codes, n, cols.pnl, mask=cols.exited_since(7))
+
+        # First closed trade per whale (insertion order)
+        first = np.full(n, len(cols), dtype=np.int64)
+        np.minimum.at(first, codes[closed], np.flatnonzero(closed))
+
+        if rows is not None:
+            first = rows[np.minimum(first, len(rows) - 1)]
+
+        inputs: Dict[str, Optional[Dict]] = {}
+        for i, whale in enumerate(whales):
+            if lifetime.count[i] == 0:
+                inputs[whale] = None
+                continue
+            inputs[whale] = {
+                "first_entry": self.trades[first[i]].entry_time,
+                "lifetime_trades": int(lifetime.count[i]),
+                "lifetime_edge": to_decimal(lifetime.edge[i]),
+                "lifetime_pnl": to_decimal(lifetime.pnl_sum[i]),
+                "recent_trades": int(recent.count[i]),
+                "recent_edge": to_decimal(recent.edge[i]),
+                "recent_pnl": to_decimal(recent.pnl_sum[i]),
+                "week_edge": to_decimal(week.edge[i]),
+            }
+        return inputs
+
+    def _lifecycle_inputs(self, whale_address: str) -> Optional[Dict]:
+        """Trade statistics for one whale (Decimal path)"""
 
         # Get whale trades
-        whale_trades = [t for t in self.trades if t.whale_address == whale_address and not t.is_open]
+        whale_trades = self.store.for_whale(whale_address, closed_only=True)
 
         if not whale_trades:
+            return None
+
+        # Recent metrics (30 days)
+        cutoff_30d = datetime.now() - timedelta(days=30)
+        recent_trades_list = [t for t in whale_trades if t.exit_time and t.exit_time >= cutoff_30d]
+
+        # Edge trend
+        cutoff_7d = datetime.now() - timedelta(days=7)
+        week_trades = [t for t in whale_trades if t.exit_time and t.exit_time >= cutoff_7d]
+
+        return {
+            "first_entry": whale_trades[0].entry_time,
+            "lifetime_trades": len(whale_trades),
+            "lifetime_edge": self._calculate_edge(whale_trades),
+            "lifetime_pnl": sum(t.pnl_usd for t in whale_trades),
+            "recent_trades": len(recent_trades_list),
+            "recent_edge": self._calculate_edge(recent_trades_list) if recent_trades_list else Decimal("0"),
+            "recent_pnl": sum(t.pnl_usd for t in recent_trades_list),
+            "week_edge": self._calculate_edge(week_trades) if week_trades else Decimal("0"),
+        }
+
+    async def update_lifecycle(self, whale_address: str,
+                               precomputed: Optional[Dict] = None) -> WhaleLifecycleState:
+        """
+        Update lifecycle state for a whale.
+
+        Args:
+            whale_address: Whale to update
+            precomputed: Trade statistics from _lifecycle_inputs_numeric
+                         (computed from the trade list when omitted)
+        """
+        inputs = precomputed or self._lifecycle_inputs(whale_address)
+
+        if not inputs:
             return self._create_empty_state(whale_address)
 
         # Discovery date
-        discovery_date = self.whale_discovery_dates.get(whale_address, whale_trades[0].entry_time)
+        # Trades fed through a shared store skip add_trade, so fall back to the store
+        discovery_date = self.whale_discovery_dates.get(
+            whale_address, self.store.first_seen(whale_address) or inputs["first_entry"]
+        )
         days_since_discovery = (datetime.now() - discovery_date).days
 
         # Calculate metrics
-        lifetime_trades = len(whale_trades)
-        lifetime_edge = self._calculate_edge(whale_trades)
-        lifetime_pnl = sum(t.pnl_usd for t in whale_trades)
+        lifetime_trades = inputs["lifetime_trades"]
+        lifetime_edge = inputs["lifetime_edge"]
+        lifetime_pnl = inputs["lifetime_pnl"]
 
         # Recent metrics (30 days)
-        cutoff_30d = datetime.now() - timedelta(days=30)
-        recent_trades_list = [t for t in whale_trades if t.exit_time and t.exit_time >= cutoff_30d]
-        recent_trades_count = len(recent_trades_list)
-        recent_edge = self._calculate_edge(recent_trades_list) if recent_trades_list else Decimal("0")
-        recent_pnl = sum(t.pnl_usd for t in recent_trades_list)
+        recent_trades_count = inputs["recent_trades"]
+        recent_edge = inputs["recent_edge"]
+        recent_pnl = inputs["recent_pnl"]
 
         # Edge trend
-        cutoff_7d = datetime.now() - timedelta(days=7)
-        week_trades = [t for t in whale_trades if t.exit_time and t.exit_time >= cutoff_7d]
-        week_edge = self._calculate_edge(week_trades) if week_trades else Decimal("0")
+        week_edge = inputs["week_edge"]
 
         if week_edge > recent_edge * Decimal("1.10"):
             edge_trend = "improving"
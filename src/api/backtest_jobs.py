@@ -0,0 +1,420 @@
+"""
+Backtest Job Runner
+Backtests as background jobs in a process pool, with progress and paged results
+
+/api/backtest/run used to call Backtester.run_backtest() inside the async
+handler, blocking the event loop (websockets included) for the whole run,
+and returned every simulated trade in one response. Jobs instead:
+
+- are answered with a job id as soon as they are submitted
+- run in a process pool, at most max_workers at a time; later jobs queue
+- report progress through the backtester's progress_callback, relayed
+  from the workers to the event loop and on to listeners (websocket
+  broadcast) and watchers (SSE streams)
+- keep their results in memory, bounded to max_jobs (oldest finished
+  jobs are evicted); the trade list is paged instead of returned whole
+- are deduplicated: submitting the same parameters while a job for them
+  is queued, running or finished less than result_ttl ago returns that job
+
+Usage:
+    runner = BacktestJobRunner(max_workers=2)
+    runner.start()
+
+    job, deduplicated = runner.submit({"starting_balance": 1000.0, "days_back": 30})
+    async for state in runner.watch(job.job_id):   # conflated progress
+        ...
+    page = runner.get_trades(job.job_id, offset=0, limit=100)
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import multiprocessing
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus:
+    """Backtest job states"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass
+class BacktestJob:
+    """One submitted backtest and, once finished, its results"""
+    job_id: str
+    key: str
+    params: Dict
+    status: str = JobStatus.QUEUED
+    progress: Dict = field(default_factory=dict)
+    result: Optional[Dict] = None  # Everything but the trade list
+    trades: List[Dict] = field(default_factory=list)
+    error: Optional[str] = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    watchers: Set[asyncio.Event] = field(default_factory=set, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.DONE, JobStatus.FAILED)
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        data = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "params": self.params,
+            "progress": self.progress,
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "total_trades": len(self.trades),
+        }
+        if include_result:
+            data["results"] = self.result
+        return data
+
+
+def config_key(params: Dict) -> str:
+    """Stable hash of backtest parameters for deduplication"""
+    canonical = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+# ==================== Worker Side ====================
+
+_progress_queue = None
+
+
+def _init_worker(queue):
+    global _progress_queue
+    _progress_queue = queue
+
+
+def report_progress(job_id: str, step: int, percent: int, message: str, trade_num: int = 0, total_trades: int = 0):
+    """progress_callback for Backtester.run_backtest, relayed to the API process"""
+    if _progress_queue is not None:
+        _progress_queue.put((job_id, {
+            "step": step,
+            "percent": percent,
+            "message": message,
+            "trade_num": trade_num,
+            "total_trades": total_trades,
+        }))
+
+
+def format_backtest_result(result) -> Dict:
+    """BacktestResult as JSON-ready dicts"""
+    return {
+        "performance": {
+            "starting_balance": float(result.starting_balance),
+            "ending_balance": float(result.ending_balance),
+            "total_pnl": float(result.total_pnl),
+            "total_pnl_pct": float(result.total_pnl_pct),
+        },
+        "statistics": {
+            "total_trades": result.total_trades,
+            "winning_trades": result.winning_trades,
+            "losing_trades": result.losing_trades,
+            "win_rate": result.win_rate,
+        },
+        "risk_metrics": {
+            "max_drawdown": float(result.max_drawdown),
+            "max_drawdown_pct": float(result.max_drawdown_pct),
+            "sharpe_ratio": result.sharpe_ratio,
+        },
+        "period": {
+            "start_date": result.start_date.isoformat() if result.start_date else None,
+            "end_date": result.end_date.isoformat() if result.end_date else None,
+            "days": result.days,
+        },
+        "daily_pnl": {
+            date: float(pnl) for date, pnl in result.daily_pnl.items()
+        },
+        "balance_history": result.balance_history,
+        "whale_performance": {
+            addr: {
+                "pseudonym": perf["pseudonym"],
+                "trades": perf["trades"],
+                "wins": perf["wins"],
+                "win_rate": (perf["wins"] / perf["trades"] * 100) if perf["trades"] > 0 else 0,
+                "total_pnl": float(perf["total_pnl"]),
+                "quality": perf["quality"]
+            }
+            for addr, perf in result.whale_performance.items()
+        },
+        "all_trades": [
+            {
+                "timestamp": trade.timestamp.isoformat(),
+                "whale_pseudonym": trade.whale_pseudonym,
+                "whale_quality": trade.whale_quality,
+                "market_title": trade.market_title,
+                "side": trade.side,
+                "outcome": trade.outcome,
+                "price": float(trade.price),
+                "position_size": float(trade.position_size),
+                "realized_pnl": float(trade.realized_pnl)
+            }
+            for trade in result.trades
+        ]
+    }
+
+
+def run_backtest_job(job_id: str, params: Dict) -> Dict:
+    """Run one backtest in a worker process (the default run_fn)"""
+    from src.services.backtester import Backtester, BacktestConfig
+
+    config = BacktestConfig(
+        starting_balance=Decimal(str(params["starting_balance"])),
+        max_position_usd=Decimal(str(params["max_position_usd"])),
+        max_daily_loss=Decimal(str(params["max_daily_loss"])),
+        min_whale_quality=params["min_whale_quality"],
+        position_size_pct=Decimal(str(params["position_size_pct"])),
+        start_date=datetime.utcnow() - timedelta(days=params["days_back"]),
+        whale_addresses=params.get("whale_addresses")
+    )
+    result = Backtester(config).run_backtest(progress_callback=functools.partial(report_progress, job_id))
+    return format_backtest_result(result)
+
+
+# ==================== Runner ====================
+
+class BacktestJobRunner:
+    """
+    Submits backtests to a worker pool and tracks their progress and results
+
+    Args:
+        run_fn: Picklable callable(job_id, params) -> result dict with an
+            "all_trades" list; report progress with report_progress(job_id, ...)
+        max_workers: Backtests running at once
+        max_jobs: Jobs kept in memory; the oldest finished ones are evicted
+        result_ttl: Seconds a finished job answers identical submissions
+        use_processes: Run in a process pool (threads when False, for tests)
+    """
+
+    def __init__(
+        self,
+        run_fn: Callable[[str, Dict], Dict] = run_backtest_job,
+        max_workers: int = 2,
+        max_jobs: int = 50,
+        result_ttl: float = 600.0,
+        use_processes: bool = True
+    ):
+        self.run_fn = run_fn
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self.result_ttl = result_ttl
+        self.use_processes = use_processes
+
+        self.jobs: "OrderedDict[str, BacktestJob]" = OrderedDict()
+        self._by_key: Dict[str, str] = {}
+        self.listeners: List[Callable[[BacktestJob], None]] = []
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._executor: Optional[Executor] = None
+        self._progress = None
+        self._relay: Optional[threading.Thread] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Stats
+        self.submitted = 0
+        self.deduplicated = 0
+        self.completed = 0
+        self.failed = 0
+
+    # ==================== Lifecycle ====================
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Create the worker pool and progress relay; idempotent"""
+        if self.loop is not None:
+            return
+        self.loop = loop or asyncio.get_running_loop()
+        self._slots = asyncio.Semaphore(self.max_workers)
+        if self.use_processes:
+            # spawn: forking the threaded API process is unsafe
+            context = multiprocessing.get_context("spawn")
+            self._progress = context.Queue()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=context,
+                initializer=_init_worker, initargs=(self._progress,)
+            )
+        else:
+            self._progress = multiprocessing.Queue()
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="backtest",
+                initializer=_init_worker, initargs=(self._progress,)
+            )
+        self._relay = threading.Thread(target=self._relay_progress, name="backtest-progress", daemon=True)
+        self._relay.start()
+
+    def stop(self):
+        """Shut the pool down; queued and running backtests are cancelled"""
+        if self.loop is None:
+            return
+        for task in self._tasks:
+            task.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._progress.put(None)
+        self._relay.join(timeout=5)
+        self.loop = None
+
+    def _relay_progress(self):
+        queue, loop = self._progress, self.loop
+        while True:
+            item = queue.get()
+            if item is None:
+                return
+            if loop.is_closed():
+                return
+            loop.call_soon_threadsafe(self._on_progress, *item)
+
+    # ==================== Submission ====================
+
+    def submit(self, params: Dict) -> Tuple[BacktestJob, bool]:
+        """
+        Queue a backtest; returns (job, deduplicated)
+
+        An identical submission returns the existing job while it is queued
+        or running, or finished successfully less than result_ttl ago.
+        """
+        self.start()
+        key = config_key(params)
+        existing = self.jobs.get(self._by_key.get(key, ""))
+        if existing is not None and self._reusable(existing):
+            self.deduplicated += 1
+            return existing, True
+
+        job = BacktestJob(job_id=uuid.uuid4().hex[:12], key=key, params=params)
+        self.jobs[job.job_id] = job
+        self._by_key[key] = job.job_id
+        self.submitted += 1
+        self._evict()
+        # The loop only keeps weak references to tasks
+        task = self.loop.create_task(self._run(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job, False
+
+    def _reusable(self, job: BacktestJob) -> bool:
+        if job.status == JobStatus.FAILED:
+            return False
+        return not job.finished or time.time() - job.finished_at < self.result_ttl
+
+    async def _run(self, job: BacktestJob):
+        async with self._slots:
+            job.status = JobStatus.RUNNING
+            job.started_at = time.time()
+            self._notify(job)
+            try:
+                result = await self.loop.run_in_executor(self._executor, self.run_fn, job.job_id, job.params)
+            except Exception as e:
+                logger.error(f"Backtest job {job.job_id} failed: {e}")
+                job.status = JobStatus.FAILED
+                job.error = str(e)
+                self.failed += 1
+            else:
+                job.trades = result.pop("all_trades", [])
+                job.result = result
+                job.status = JobStatus.DONE
+                self.completed += 1
+            job.finished_at = time.time()
+            self._notify(job)
+
+    def _evict(self):
+        excess = len(self.jobs) - self.max_jobs
+        if excess <= 0:
+            return
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.finished][:excess]:
+            job = self.jobs.pop(job_id)
+            if self._by_key.get(job.key) == job_id:
+                del self._by_key[job.key]
+
+    # ==================== Progress ====================
+
+    def add_listener(self, callback: Callable[[BacktestJob], None]):
+        """Call callback(job) on every progress update and state change"""
+        self.listeners.append(callback)
+
+    def _on_progress(self, job_id: str, progress: Dict):
+        job = self.jobs.get(job_id)
+        if job is None or job.finished:
+            return
+        job.progress = progress
+        self._notify(job)
+
+    def _notify(self, job: BacktestJob):
+        for event in job.watchers:
+            event.set()
+        for callback in self.listeners:
+            try:
+                callback(job)
+            except Exception as e:
+                logger.error(f"Backtest job listener error: {e}")
+
+    async def watch(self, job_id: str) -> AsyncIterator[Dict]:
+        """Yield the job's state now and after each change, until it finishes"""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return
+        changed = asyncio.Event()
+        job.watchers.add(changed)
+        try:
+            while True:
+                # Updates that arrive while the consumer is busy collapse
+                # into the latest state
+                changed.clear()
+                yield job.to_dict(include_result=job.finished)
+                if job.finished:
+                    return
+                await changed.wait()
+        finally:
+            job.watchers.discard(changed)
+
+    # ==================== Results ====================
+
+    def get(self, job_id: str) -> Optional[BacktestJob]:
+        return self.jobs.get(job_id)
+
+    def list_jobs(self) -> List[Dict]:
+        return [job.to_dict(include_result=False) for job in reversed(self.jobs.values())]
+
+    def get_trades(self, job_id: str, offset: int = 0, limit: int = 100) -> Optional[Dict]:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        return {
+            "job_id": job_id,
+            "offset": offset,
+            "limit": limit,
+            "total": len(job.trades),
+            "trades": job.trades[offset:offset + limit],
+        }
+
+    def get_stats(self) -> Dict:
+        statuses: Dict[str, int] = {}
+        for job in self.jobs.values():
+            statuses[job.status] = statuses.get(job.status, 0) + 1
+        return {
+            "max_workers": self.max_workers,
+            "jobs": statuses,
+            "submitted": self.submitted,
+            "deduplicated": self.deduplicated,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
@@ -0,0 +1,138 @@
+"""
+API Database Access
+Async SQLAlchemy engine on asyncpg with per-request sessions for the API
+
+Endpoints used to open a synchronous Session(engine) inside async
+handlers, so every psycopg2 query ran on the event loop and one slow
+query stalled all concurrent requests. Database wraps an AsyncEngine:
+
+- the pool is sized from DB_POOL_SIZE / DB_MAX_OVERFLOW (src/config.py),
+  with pre-ping, recycling and a bounded wait for a free connection
+- every connection gets a server-side statement_timeout, and asyncpg a
+  matching client-side command_timeout, so a runaway query fails instead
+  of holding a pool slot
+- sessions are handed out per request through a FastAPI dependency, or
+  with `async with database.repositories()` outside a request
+
+Usage:
+    database = Database(settings.DATABASE_URL)
+
+    @app.get("/api/whales")
+    async def get_whales(repos: Repositories = Depends(database.get_repositories)):
+        return await repos.whales.qualified()
+"""
+
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from src.api.repositories import Repositories
+
+logger = logging.getLogger(__name__)
+
+
+def async_database_url(url: str) -> str:
+    """Point a postgresql:// (psycopg2) URL at the asyncpg driver"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "postgresql" and parsed.get_driver_name() != "asyncpg":
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    return parsed.render_as_string(hide_password=False)
+
+
+class Database:
+    """
+    Async engine, session factory and request-scoped sessions
+
+    Args:
+        url: Database URL; postgresql:// URLs are switched to asyncpg
+        pool_size: Connections kept open
+        max_overflow: Extra connections allowed under burst load
+        pool_timeout: Seconds to wait for a free connection before failing
+        statement_timeout: Seconds before the server cancels a statement
+        pool_recycle: Seconds after which a connection is replaced
+    """
+
+    def __init__(
+        self,
+        url: str,
+        pool_size: int = 10,
+        max_overflow: int = 20,
+        pool_timeout: float = 10.0,
+        statement_timeout: float = 15.0,
+        pool_recycle: int = 1800,
+        echo: bool = False
+    ):
+        self.url = async_database_url(url)
+        self.statement_timeout = statement_timeout
+        self.engine: AsyncEngine = create_async_engine(
+            self.url,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=True,
+            echo=echo,
+            connect_args=self.connect_args(),
+        )
+        self.sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    def connect_args(self) -> Dict:
+        if make_url(self.url).get_driver_name() != "asyncpg":
+            return {}
+        return {
+            # Client side: asyncpg gives up slightly after the server would
+            "command_timeout": self.statement_timeout + 1.0,
+            "server_settings": {
+                "statement_timeout": str(int(self.statement_timeout * 1000)),
+                "application_name": "whale-tracker-api",
+            },
+        }
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        async with self.sessionmaker() as session:
+            yield session
+
+    @asynccontextmanager
+    async def repositories(self) -> AsyncIterator[Repositories]:
+        """Repositories on a fresh session, for code outside a request"""
+        async with self.sessionmaker() as session:
+            yield Repositories(session)
+
+    async def get_repositories(self) -> AsyncIterator[Repositories]:
+        """FastAPI dependency: repositories on a session closed after the response"""
+        async with self.sessionmaker() as session:
+            yield Repositories(session)
+
+    async def dispose(self):
+        await self.engine.dispose()
+
+    def get_stats(self) -> Dict:
+        pool = self.engine.pool
+        return {
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "statement_timeout_s": self.statement_timeout,
+        }
+
+
+_database: Optional[Database] = None
+
+
+def get_database() -> Database:
+    """Process-wide database configured from src.config settings"""
+    global _database
+    if _database is None:
+        from src.config import settings
+        _database = Database(
+            settings.DATABASE_URL,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            statement_timeout=settings.DB_STATEMENT_TIMEOUT,
+        )
+    return _database
@@ -0,0 +1,147 @@
+"""
+API Repositories
+Async queries behind the dashboard API, one class per table
+
+Each repository wraps the AsyncSession of the current request (see
+src/api/db.py) and returns ORM objects or plain aggregates; turning them
+into response rows stays in api/main.py.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from libs.common.models import Position, Trade, TradingConfig, Whale
+
+
+def qualified_whale_conditions() -> tuple:
+    """Criteria for whales shown on the dashboard"""
+    return (
+        Whale.quality_score >= 70.0,
+        Whale.total_trades >= 20,
+        Whale.total_volume >= 10000,
+        Whale.win_rate >= 52.0,
+        Whale.sharpe_ratio >= 0.8
+    )
+
+
+class WhaleRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def qualified(self) -> List[Whale]:
+        """Qualified whales, highest quality first"""
+        result = await self.session.execute(
+            select(Whale)
+            .where(*qualified_whale_conditions())
+            .order_by(desc(Whale.quality_score))
+        )
+        return list(result.scalars().all())
+
+    async def get(self, address: str, qualified_only: bool = False) -> Optional[Whale]:
+        conditions = qualified_whale_conditions() if qualified_only else ()
+        result = await self.session.execute(
+            select(Whale).where(Whale.address == address, *conditions)
+        )
+        return result.scalar_one_or_none()
+
+
+class TradeRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def recent_by_traders(self, addresses: Iterable[str], limit: int) -> List[Trade]:
+        """Newest trades by any of the addresses"""
+        result = await self.session.execute(
+            select(Trade)
+            .where(Trade.trader_address.in_(list(addresses)))
+            .order_by(desc(Trade.timestamp))
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get(self, trade_id: str) -> Optional[Trade]:
+        result = await self.session.execute(select(Trade).where(Trade.trade_id == trade_id))
+        return result.scalar_one_or_none()
+
+    async def counts_since(self, addresses: Iterable[str], since: datetime) -> Dict[str, int]:
+        """Trades per address since a time, in one grouped query"""
+        addresses = list(addresses)
+        if not addresses:
+            return {}
+        result = await self.session.execute(
+            select(Trade.trader_address, func.count())
+            .where(Trade.trader_address.in_(addresses), Trade.timestamp >= since)
+            .group_by(Trade.trader_address)
+        )
+        return dict(result.all())
+
+    async def totals_since(self, since: datetime) -> Tuple[int, float]:
+        """(trade count, volume) across all traders since a time"""
+        result = await self.session.execute(
+            select(func.count(), func.sum(Trade.amount)).where(Trade.timestamp >= since)
+        )
+        count, volume = result.one()
+        return count or 0, float(volume) if volume else 0.0
+
+    async def average_amount(self, address: str) -> Optional[float]:
+        result = await self.session.execute(
+            select(func.avg(Trade.amount)).where(Trade.trader_address == address)
+        )
+        average = result.scalar()
+        return float(average) if average else None
+
+
+class PositionRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def open_positions(self, limit: Optional[int] = None) -> List[Position]:
+        """Open positions, newest first"""
+        query = select(Position).where(Position.status == 'OPEN').order_by(desc(Position.opened_at))
+        if limit is not None:
+            query = query.limit(limit)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def get_open(self, position_id: str) -> Optional[Position]:
+        result = await self.session.execute(
+            select(Position).where(Position.position_id == position_id, Position.status == 'OPEN')
+        )
+        return result.scalar_one_or_none()
+
+
+class TradingConfigRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(self) -> Optional[TradingConfig]:
+        result = await self.session.execute(select(TradingConfig).where(TradingConfig.id == 1))
+        return result.scalar_one_or_none()
+
+    async def set_copy_trading(self, enabled: bool, modified_by: str) -> Optional[TradingConfig]:
+        """Flip the kill switch; None if the config row is missing"""
+        config = await self.get()
+        if config is None:
+            return None
+        config.copy_trading_enabled = enabled
+        config.modified_by = modified_by
+        await self.session.commit()
+        return config
+
+
+class Repositories:
+    """All repositories on one session"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.whales = WhaleRepository(session)
+        self.trades = TradeRepository(session)
+        self.positions = PositionRepository(session)
+        self.trading_config = TradingConfigRepository(session)
+
+    async def release(self):
+        """Return the connection to the pool early; loaded objects stay readable"""
+        await self.session.close()
@@ -0,0 +1,199 @@
+"""
+API Response Cache
+Keyed async memoization with TTL, single-flight misses and tag invalidation
+
+Read-heavy endpoints (summary stats, qualified whales) recomputed identical
+results for every caller within seconds. AsyncTTLCache memoizes coroutine
+results by key:
+
+- entries expire after a TTL
+- concurrent misses for the same key share one computation (single-flight)
+- entries carry tags ("whales", "trades", ...) and invalidate_tags() drops
+  every entry with a tag; a computation that started before an
+  invalidation still answers its callers but is not stored
+
+Cached values are shared between callers and must be treated as read-only.
+
+Usage:
+    cache = AsyncTTLCache(default_ttl=30)
+
+    @app.get("/api/whales")
+    @cached(cache, ttl=30, tags=("whales",))
+    async def get_whales(): ...
+
+    cache.invalidate_tags("whales")             # after a write
+    cache.invalidate_tags_threadsafe("whales")  # from a worker thread
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    expires_at: float
+    tags: Tuple[str, ...]
+
+
+class AsyncTTLCache:
+    """TTL cache for coroutine results with single-flight and tag invalidation"""
+
+    def __init__(self, default_ttl: float = 30.0, max_entries: int = 1024):
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._generations: Dict[str, int] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Bind to the event loop so other threads can invalidate"""
+        self.loop = loop or asyncio.get_running_loop()
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = ()
+    ) -> Any:
+        """
+        Return the cached value for key, computing it on a miss
+
+        Args:
+            key: Cache key
+            compute: Zero-argument coroutine function producing the value
+            ttl: Seconds to keep the value (default_ttl if None)
+            tags: Invalidation tags for the entry
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > time.monotonic():
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            # The computation runs in its own task, so a caller that goes
+            # away (client disconnect) doesn't cancel it for the others
+            task = asyncio.get_running_loop().create_task(self._compute(key, compute, ttl, tuple(tags)))
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._compute_done, key))
+        return await asyncio.shield(task)
+
+    async def _compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[float],
+        tags: Tuple[str, ...]
+    ) -> Any:
+        generation = self._generation(tags)
+        value = await compute()
+        if self._generation(tags) == generation:
+            self._store(key, value, ttl, tags)
+        return value
+
+    def _compute_done(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark retrieved so an error nobody else awaited isn't logged
+        if not task.cancelled():
+            task.exception()
+
+    def _store(self, key: Hashable, value: Any, ttl: Optional[float], tags: Tuple[str, ...]):
+        ttl = self.default_ttl if ttl is None else ttl
+        self._entries[key] = CacheEntry(value, time.monotonic() + ttl, tags)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _generation(self, tags: Tuple[str, ...]) -> Tuple[int, ...]:
+        return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    # ==================== Invalidation ====================
+
+    def invalidate(self, key: Hashable) -> bool:
+        return self._entries.pop(key, None) is not None
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """Drop every entry carrying any of the tags; returns entries dropped"""
+        tags = set(tags)
+        for tag in tags:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+        stale = [key for key, entry in self._entries.items() if tags.intersection(entry.tags)]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += 1
+        return len(stale)
+
+    def invalidate_tags_threadsafe(self, *tags: str):
+        """invalidate_tags() from a worker thread; no-op when not started"""
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self.invalidate_tags, *tags)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
+
+
+def cached(
+    cache: AsyncTTLCache,
+    ttl: Optional[float] = None,
+    tags: Iterable[str] = (),
+    key: Optional[Callable[..., Hashable]] = None
+):
+    """
+    Memoize an async function in a cache
+
+    The default key is the function name plus its arguments, which must be
+    hashable. functools.wraps keeps the signature for FastAPI.
+    """
+    tags = tuple(tags)
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs) if key else (
+                func.__qualname__, args, tuple(sorted(kwargs.items()))
+            )
+            return await cache.get_or_compute(
+                cache_key, lambda: func(*args, **kwargs), ttl=ttl, tags=tags
+            )
+        wrapper.cache = cache
+        return wrapper
+    return decorator
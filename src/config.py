@@ -21,6 +21,8 @@ class Settings(BaseSettings):
     )
     DB_POOL_SIZE: int = Field(default=10)
     DB_MAX_OVERFLOW: int = Field(default=20)
+    DB_POOL_TIMEOUT: float = Field(default=10.0, description="Seconds to wait for a pooled connection")
+    DB_STATEMENT_TIMEOUT: float = Field(default=15.0, description="Seconds before a query is cancelled")
 
     # Redis
     REDIS_URL: str = Field(default="redis://localhost:6379/0")
@@ -6,6 +6,7 @@ Integrates all advanced features from the research document
 import asyncio
 import json
 import logging
+import time
 import numpy as np
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
@@ -23,6 +24,9 @@ from position_sizing.adaptive_kelly import AdaptiveKellyCalculator
 from risk_management.cornish_fisher_var import CornishFisherVaR
 from market_analysis.regime_detection import RegimeDetector, MarketRegime
 from analytics.performance_attribution import PerformanceAttribution
+from src.monitoring.latency import (
+    tracer, DETECTION, SIGNAL_EVALUATION, SIZING, RISK_CHECK, ORDER_PLACEMENT
+)
 
 # Configure logging
 logging.basicConfig(
@@ -189,40 +193,46 @@ class AdvancedCopyTradingEngine:
 
             for whale in whales:
                 # Get new trades from whale
+                detect_start = time.perf_counter_ns()
                 new_trades = self.position_tracker.monitor_whale(whale.address)
+                detect_ns = time.perf_counter_ns() - detect_start
+                tracer.record(DETECTION, detect_ns)
 
                 if new_trades:
                     for trade_data in new_trades:
-                        trades_evaluated += 1
-
-                        # 2. Run through 3-stage signal filtering
-                        should_copy, reason, metadata = await self._evaluate_signal(
-                            trade_data, whale, session
-                        )
+                        # Trace the trade from the start of the poll that found it
+                        with tracer.trace(str(trade_data.get('id', '')), start_ns=detect_start) as trace:
+                            trace.add(DETECTION, detect_ns)
+                            trades_evaluated += 1
 
-                        if should_copy:
-                            # 3. Calculate position size with Adaptive Kelly
-                            position_size = await self._calculate_position_size(
+                            # 2. Run through 3-stage signal filtering
+                            should_copy, reason, metadata = await self._evaluate_signal(
                                 trade_data, whale, session
                             )
 
-                            # 4. Check risk limits with Cornish-Fisher mVaR
-                            if await self._check_risk_limits(position_size, session):
-                                # 5. Execute copy trade
-                                await self._execute_advanced_copy(
-                                    trade_data, whale, position_size, session
+                            if should_copy:
+                                # 3. Calculate position size with Adaptive Kelly
+                                position_size = await self._calculate_position_size(
+                                    trade_data, whale, session
                                 )
-                                trades_copied += 1
-                                logger.info(f"✅ Trade copied with advanced logic")
+
+                                # 4. Check risk limits with Cornish-Fisher mVaR
+                                if await self._check_risk_limits(position_size, session):
+                                    # 5. Execute copy trade
+                                    await self._execute_advanced_copy(
+                                        trade_data, whale, position_size, session
+                                    )
+                                    trades_copied += 1
+                                    logger.info(f"✅ Trade copied with advanced logic")
+                                else:
+                                    logger.info(f"⚠️ Trade rejected by risk limits")
                             else:
-                                logger.info(f"⚠️ Trade rejected by risk limits")
-                        else:
-                            # Track filter rejections
-                            stage_failed = metadata.get('stage_failed', 0)
-                            if stage_failed > 0:
-                                stage_key = f'stage{stage_failed}'
-                                self.performance_metrics['filter_stage_rejections'][stage_key] += 1
-                            logger.info(f"⏭️ Trade filtered: {reason}")
+                                # Track filter rejections
+                                stage_failed = metadata.get('stage_failed', 0)
+                                if stage_failed > 0:
+                                    stage_key = f'stage{stage_failed}'
+                                    self.performance_metrics['filter_stage_rejections'][stage_key] += 1
+                                logger.info(f"⏭️ Trade filtered: {reason}")
 
             # Update performance metrics
             self.performance_metrics['trades_evaluated'] += trades_evaluated
@@ -302,6 +312,7 @@ class AdvancedCopyTradingEngine:
 
         return metrics
 
+    @tracer.timed(SIGNAL_EVALUATION)
     async def _evaluate_signal(
         self,
         trade_data: Dict,
@@ -351,6 +362,7 @@ class AdvancedCopyTradingEngine:
                 'category': 'unknown'
             }
 
+    @tracer.timed(SIZING)
     async def _calculate_position_size(
         self,
         trade_data: Dict,
@@ -390,6 +402,7 @@ class AdvancedCopyTradingEngine:
 
         return position_size
 
+    @tracer.timed(RISK_CHECK)
     async def _check_risk_limits(self, position_size: float, session: Session) -> bool:
         """Check risk limits using Cornish-Fisher mVaR."""
         # Get portfolio returns history
@@ -439,6 +452,7 @@ class AdvancedCopyTradingEngine:
 
         return regime_info
 
+    @tracer.timed(ORDER_PLACEMENT)
     async def _execute_advanced_copy(
         self,
         trade_data: Dict,
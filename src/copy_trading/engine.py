@@ -6,6 +6,7 @@ Uses position tracking via Gamma API to detect whale activity.
 import asyncio
 import json
 import logging
+import time
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from decimal import Decimal
@@ -14,6 +15,9 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 from libs.common.models import Whale, Trade, Order, Market
 from copy_trading.orderbook_tracker import OrderbookTracker as WhalePositionTracker
+from src.monitoring.latency import (
+    tracer, DETECTION, SIGNAL_EVALUATION, SIZING, RISK_CHECK, ORDER_PLACEMENT
+)
 
 # Analytics integration
 try:
@@ -124,33 +128,40 @@ class CopyTradingEngine:
 
             for whale in whales:
                 # Monitor whale for new trades
+                detect_start = time.perf_counter_ns()
                 new_trades = self.tracker.monitor_whale(whale.address)
+                detect_ns = time.perf_counter_ns() - detect_start
+                tracer.record(DETECTION, detect_ns)
 
                 if new_trades:
                     activity_detected += 1
 
                     for trade in new_trades:
-                        # Log activity
-                        logger.info(f"📈 New trade detected:")
-                        logger.info(f"   Whale: {whale.pseudonym or whale.address[:10]}")
-                        logger.info(f"   Type: {trade['type']}")
-                        logger.info(f"   Market: {trade.get('market_title', 'Unknown')[:50] if trade.get('market_title') else 'Unknown'}")
-                        logger.info(f"   Shares: {trade['shares']:,.2f}")
-                        logger.info(f"   Price: ${trade['price']:.3f}")
-                        logger.info(f"   Amount: ${trade['amount']:,.0f}")
-
-                        # Save trade to database
-                        self.save_whale_trade(trade, whale, session)
-
-                        # Check if we should copy this trade
-                        should_copy, reason = self.should_copy_trade(trade, whale, session)
-
-                        if should_copy:
-                            logger.info(f"✅ Trade meets copy criteria: {reason}")
-                            # Execute the copy trade
-                            await self.execute_copy_trade(trade, whale, session)
-                        else:
-                            logger.info(f"⏭️  Skipping trade: {reason}")
+                        # Trace the trade from the start of the poll that found it
+                        with tracer.trace(str(trade.get('id', '')), start_ns=detect_start) as trace:
+                            trace.add(DETECTION, detect_ns)
+
+                            # Log activity
+                            logger.info(f"📈 New trade detected:")
+                            logger.info(f"   Whale: {whale.pseudonym or whale.address[:10]}")
+                            logger.info(f"   Type: {trade['type']}")
+                            logger.info(f"   Market: {trade.get('market_title', 'Unknown')[:50] if trade.get('market_title') else 'Unknown'}")
+                            logger.info(f"   Shares: {trade['shares']:,.2f}")
+                            logger.info(f"   Price: ${trade['price']:.3f}")
+                            logger.info(f"   Amount: ${trade['amount']:,.0f}")
+
+                            # Save trade to database
+                            self.save_whale_trade(trade, whale, session)
+
+                            # Check if we should copy this trade
+                            should_copy, reason = self.should_copy_trade(trade, whale, session)
+
+                            if should_copy:
+                                logger.info(f"✅ Trade meets copy criteria: {reason}")
+                                # Execute the copy trade
+                                await self.execute_copy_trade(trade, whale, session)
+                            else:
+                                logger.info(f"⏭️  Skipping trade: {reason}")
 
             if activity_detected > 0:
                 logger.info(f"✅ Detected activity from {activity_detected} whales")
@@ -304,43 +315,45 @@ class CopyTradingEngine:
         Returns (should_copy: bool, reason: str)
         """
 
-        # Check if whale is in our enabled list
-        if not whale.is_copying_enabled:
-            return False, "Whale not enabled for copying"
+        with tracer.span(SIGNAL_EVALUATION):
+            # Check if whale is in our enabled list
+            if not whale.is_copying_enabled:
+                return False, "Whale not enabled for copying"
 
-        # Check position size filters
-        trade_value = float(trade.get('amount', 0))
-        min_size = self.config['trade_filters']['min_whale_position_size_usd']
-        max_size = self.config['trade_filters']['max_whale_position_size_usd']
+            # Check position size filters
+            trade_value = float(trade.get('amount', 0))
+            min_size = self.config['trade_filters']['min_whale_position_size_usd']
+            max_size = self.config['trade_filters']['max_whale_position_size_usd']
 
-        if trade_value < min_size:
-            return False, f"Trade too small (${trade_value:.0f} < ${min_size})"
+            if trade_value < min_size:
+                return False, f"Trade too small (${trade_value:.0f} < ${min_size})"
 
-        if trade_value > max_size:
-            return False, f"Trade too large (${trade_value:.0f} > ${max_size})"
+            if trade_value > max_size:
+                return False, f"Trade too large (${trade_value:.0f} > ${max_size})"
 
-        # Check price filters
-        price = trade.get('price', 0)
-        if price:
-            min_price = self.config['trade_filters']['price_filters']['min_price']
-            max_price = self.config['trade_filters']['price_filters']['max_price']
+            # Check price filters
+            price = trade.get('price', 0)
+            if price:
+                min_price = self.config['trade_filters']['price_filters']['min_price']
+                max_price = self.config['trade_filters']['price_filters']['max_price']
 
-            if price < min_price or price > max_price:
-                return False, f"Price outside range ({price:.3f})"
+                if price < min_price or price > max_price:
+                    return False, f"Price outside range ({price:.3f})"
 
-        # Check global exposure limits
-        total_exposure = self.get_current_exposure(session)
-        max_exposure = self.config['risk_management']['global_limits']['max_total_exposure_usd']
+        with tracer.span(RISK_CHECK):
+            # Check global exposure limits
+            total_exposure = self.get_current_exposure(session)
+            max_exposure = self.config['risk_management']['global_limits']['max_total_exposure_usd']
 
-        if total_exposure >= max_exposure:
-            return False, f"Max exposure reached (${total_exposure:.0f}/${max_exposure})"
+            if total_exposure >= max_exposure:
+                return False, f"Max exposure reached (${total_exposure:.0f}/${max_exposure})"
 
-        # Check max positions
-        open_positions = self.get_open_positions_count(session)
-        max_positions = self.config['risk_management']['global_limits']['max_positions']
+            # Check max positions
+            open_positions = self.get_open_positions_count(session)
+            max_positions = self.config['risk_management']['global_limits']['max_positions']
 
-        if open_positions >= max_positions:
-            return False, f"Max positions reached ({open_positions}/{max_positions})"
+            if open_positions >= max_positions:
+                return False, f"Max positions reached ({open_positions}/{max_positions})"
 
         # All checks passed
         return True, "All checks passed"
@@ -363,23 +376,24 @@ class CopyTradingEngine:
         logger.info(f"🎯 COPYING TRADE from {whale.pseudonym or whale.address[:10]}")
         logger.info("=" * 80)
 
-        # Calculate position size based on whale tier
-        whale_tier = whale.tier or "LARGE"
-        tier_config = self.config['whale_tiers'].get(whale_tier.lower(), {})
+        with tracer.span(SIZING):
+            # Calculate position size based on whale tier
+            whale_tier = whale.tier or "LARGE"
+            tier_config = self.config['whale_tiers'].get(whale_tier.lower(), {})
 
-        copy_percentage = tier_config.get('copy_percentage', 75) / 100
-        max_position = tier_config.get('max_position_size_usd', 500)
+            copy_percentage = tier_config.get('copy_percentage', 75) / 100
+            max_position = tier_config.get('max_position_size_usd', 500)
 
-        # Calculate our position size
-        whale_position_value = float(trade.get('amount', 0))
-        our_position_value = min(whale_position_value * copy_percentage, max_position)
+            # Calculate our position size
+            whale_position_value = float(trade.get('amount', 0))
+            our_position_value = min(whale_position_value * copy_percentage, max_position)
 
-        # Calculate size based on price
-        price = float(trade.get('price', 0))
-        if price > 0:
-            our_size = our_position_value / price
-        else:
-            our_size = 0
+            # Calculate size based on price
+            price = float(trade.get('price', 0))
+            if price > 0:
+                our_size = our_position_value / price
+            else:
+                our_size = 0
 
         side = trade.get('type', 'BUY').upper()
         shares = float(trade.get('shares', 0))
@@ -388,33 +402,34 @@ class CopyTradingEngine:
         logger.info(f"Our trade: {side} {our_size:.2f} @ ${price:.3f} = ${our_position_value:.2f}")
         logger.info(f"Copy ratio: {copy_percentage*100:.0f}% (tier: {whale_tier})")
 
-        # Create order record
-        order = Order(
-            order_id=f"copy_{trade.get('id', '')}_{datetime.utcnow().timestamp()}",
-            market_id=trade.get('market_id', ''),
-            token_id=trade.get('market_id', ''),
-            side=side,
-            order_type="LIMIT",
-            price=price,
-            size=our_size,
-            status="PENDING",
-            source_whale=whale.address,
-            source_trade_id=trade.get('id', ''),
-            copy_ratio=Decimal(str(copy_percentage))
-        )
-
-        session.add(order)
-
-        # Update the saved trade record to mark as followed
-        saved_trade = session.query(Trade).filter_by(
-            trade_id=trade.get('id', '')[:100] if trade.get('id') else ''
-        ).first()
-
-        if saved_trade:
-            saved_trade.followed = True
-            saved_trade.copy_reason = f"Copied from {whale_tier} tier whale"
-
-        session.commit()
+        with tracer.span(ORDER_PLACEMENT):
+            # Create order record
+            order = Order(
+                order_id=f"copy_{trade.get('id', '')}_{datetime.utcnow().timestamp()}",
+                market_id=trade.get('market_id', ''),
+                token_id=trade.get('market_id', ''),
+                side=side,
+                order_type="LIMIT",
+                price=price,
+                size=our_size,
+                status="PENDING",
+                source_whale=whale.address,
+                source_trade_id=trade.get('id', ''),
+                copy_ratio=Decimal(str(copy_percentage))
+            )
+
+            session.add(order)
+
+            # Update the saved trade record to mark as followed
+            saved_trade = session.query(Trade).filter_by(
+                trade_id=trade.get('id', '')[:100] if trade.get('id') else ''
+            ).first()
+
+            if saved_trade:
+                saved_trade.followed = True
+                saved_trade.copy_reason = f"Copied from {whale_tier} tier whale"
+
+            session.commit()
 
         logger.info(f"✅ Order created: {order.order_id}")
         logger.info(f"📊 Status: {order.status}")
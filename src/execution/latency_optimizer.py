@@ -15,6 +15,8 @@ from enum import Enum
 from collections import deque
 import aiohttp
 
+from src.monitoring.latency import tracer
+
 logger = logging.getLogger(__name__)
 
 
@@ -251,6 +253,7 @@ class LatencyOptimizer:
                     error_message=None
                 )
                 self.latency_history.append(metrics)
+                tracer.record_ms("api_fetch", total_time)
 
                 logger.debug(f"Request {request_id}: {total_time:.1f}ms | {url}")
 
@@ -272,6 +275,7 @@ class LatencyOptimizer:
                 error_message=str(e)
             )
             self.latency_history.append(metrics)
+            tracer.record_ms("api_fetch", total_time)
 
             logger.error(f"Request {request_id} failed: {str(e)}")
             raise
@@ -5,15 +5,20 @@ Provides comprehensive system visibility and alerting
 
 import asyncio
 import aiohttp
+import aiohttp.web
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
 from enum import Enum
 import json
 import logging
+import time
 from decimal import Decimal
 import numpy as np
-from collections import deque, defaultdict
+from collections import deque
+
+from src.monitoring.latency import tracer
+from src.monitoring.timeseries import NS_PER_SECOND, TimeSeriesStore
 
 logger = logging.getLogger(__name__)
 
@@ -61,21 +66,15 @@ class MetricsCollector:
     """Collects and aggregates system metrics"""
 
     def __init__(self, history_size: int = 1000):
-        self.metrics: Dict[str, deque] = defaultdict(lambda: deque(maxlen=history_size))
+        # Columnar ring buffers per (name, labels); rollups at 1s / 1m / 1h
+        self.store = TimeSeriesStore(capacity=history_size)
         self.aggregations: Dict[str, Dict] = {}
         self.last_values: Dict[str, float] = {}
 
     def record(self, name: str, value: float, labels: Dict[str, str] = None):
         """Record a metric value"""
-        snapshot = MetricSnapshot(
-            name=name,
-            value=value,
-            timestamp=datetime.now(),
-            labels=labels or {}
-        )
-
         # Store in time series
-        self.metrics[name].append(snapshot)
+        self.store.record(name, value, labels)
         self.last_values[name] = value
 
         # Update aggregations
@@ -100,20 +99,65 @@ class MetricsCollector:
             agg["mean"] = agg["sum"] / agg["count"]
 
     def get_metric(self, name: str, duration: timedelta = None) -> List[MetricSnapshot]:
-        """Get metric history"""
-        if name not in self.metrics:
+        """Get metric history (snapshots are built only for the samples returned)"""
+        start_ns = None
+        if duration:
+            start_ns = time.time_ns() - int(duration.total_seconds() * NS_PER_SECOND)
+
+        return [
+            MetricSnapshot(
+                name=name,
+                value=value,
+                timestamp=datetime.fromtimestamp(ts / NS_PER_SECOND),
+                labels=dict(labels)
+            )
+            for ts, value, labels in self.store.query(name, start_ns=start_ns)
+        ]
+
+    def get_rollup(self, name: str, resolution: str = "1m", duration: timedelta = None,
+                   labels: Dict[str, str] = None) -> List[Dict]:
+        """
+        Get downsampled metric history.
+
+        Args:
+            name: Metric name
+            resolution: "1s", "1m" or "1h"
+            duration: Look-back window (all retained buckets if None)
+            labels: Label set of the series (unlabelled series if None)
+
+        Returns:
+            List of buckets with timestamp, count, mean, min and max
+        """
+        series = self.store.get(name, labels)
+        if series is None:
             return []
 
+        start_ns = None
         if duration:
-            cutoff = datetime.now() - duration
-            return [m for m in self.metrics[name] if m.timestamp >= cutoff]
-
-        return list(self.metrics[name])
+            start_ns = time.time_ns() - int(duration.total_seconds() * NS_PER_SECOND)
+        buckets = series.rollup(resolution, start_ns=start_ns)
+
+        return [
+            {
+                "timestamp": datetime.fromtimestamp(ts / NS_PER_SECOND).isoformat(),
+                "count": count,
+                "mean": total / count,
+                "min": low,
+                "max": high
+            }
+            for ts, count, total, low, high in zip(
+                buckets["ts"], buckets["count"], buckets["sum"], buckets["min"], buckets["max"]
+            )
+        ]
 
     def get_aggregation(self, name: str) -> Dict:
         """Get metric aggregations"""
         return self.aggregations.get(name, {})
 
+    def to_prometheus(self) -> str:
+        """Latest value of every series in Prometheus text exposition format"""
+        return self.store.to_prometheus()
+
 
 class AlertManager:
     """Manages system alerts and notifications"""
@@ -436,6 +480,7 @@ class MonitoringDashboard:
                 }
                 for name in self.metrics.last_values
             },
+            "latency": tracer.snapshot(),
             "active_alerts": [
                 {
                     "id": alert.id,
@@ -534,6 +579,13 @@ class WebDashboardServer:
         data = self.dashboard.get_dashboard_data()
         return aiohttp.web.json_response(data)
 
+    async def handle_prometheus(self, request):
+        """Prometheus scrape endpoint"""
+        return aiohttp.web.Response(
+            text=self.dashboard.metrics.to_prometheus(),
+            headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+        )
+
     async def handle_alerts(self, request):
         """REST endpoint for alerts"""
         alerts = {
@@ -700,6 +752,7 @@ class WebDashboardServer:
         self.app.router.add_get('/', self.handle_index)
         self.app.router.add_get('/ws', self.handle_websocket)
         self.app.router.add_get('/api/metrics', self.handle_metrics)
+        self.app.router.add_get('/metrics', self.handle_prometheus)
         self.app.router.add_get('/api/alerts', self.handle_alerts)
 
         runner = aiohttp.web.AppRunner(self.app)
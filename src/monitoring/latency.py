@@ -0,0 +1,339 @@
+"""
+Hot-Path Latency Tracing for the Copy-Trading Pipeline
+
+Log-bucketed (HDR-style) latency histograms keyed by pipeline stage, with
+a context manager and a decorator for timing code, plus per-trade traces
+that tie the stages of one whale trade together into an end-to-end
+whale-trade -> copy-fill breakdown.
+
+Histograms store counts in log-linear buckets: each power of two is split
+into 32 linear sub-buckets, so any recorded value is reported within ~3%
+and memory stays fixed no matter how many samples arrive. When tracing is
+disabled, span() hands back a shared no-op object and timed() calls
+straight through, so instrumented code pays one attribute check.
+
+Tracing is on unless LATENCY_TRACING_ENABLED is set to false/0; it can be
+toggled at runtime with tracer.enable() / tracer.disable().
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+# Values are clamped to ~18 minutes, far above any pipeline stage
+MAX_VALUE_NS = (1 << 40) - 1
+BUCKET_COUNT = (MAX_VALUE_NS.bit_length() - SUB_BUCKET_BITS + 1) << SUB_BUCKET_BITS
+
+NS_PER_MS = 1_000_000
+
+# Canonical stage names used by the copy-trading engines and executors
+DETECTION = "detection"
+SIGNAL_EVALUATION = "signal_evaluation"
+SIZING = "sizing"
+RISK_CHECK = "risk_check"
+ORDER_PLACEMENT = "order_placement"
+FILL_CONFIRMATION = "fill_confirmation"
+END_TO_END = "end_to_end"
+
+PIPELINE_STAGES = (
+    DETECTION, SIGNAL_EVALUATION, SIZING, RISK_CHECK, ORDER_PLACEMENT, FILL_CONFIRMATION,
+)
+
+
+def bucket_index(value_ns: int) -> int:
+    """Histogram bucket holding a value"""
+    if value_ns < SUB_BUCKETS:
+        return value_ns
+    shift = value_ns.bit_length() - SUB_BUCKET_BITS - 1
+    return ((shift + 1) << SUB_BUCKET_BITS) + (value_ns >> shift) - SUB_BUCKETS
+
+
+def bucket_bounds(index: int) -> tuple:
+    """(lowest, highest) value that maps to a bucket"""
+    if index < SUB_BUCKETS:
+        return index, index
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    low = (SUB_BUCKETS + (index & (SUB_BUCKETS - 1))) << shift
+    return low, low + (1 << shift) - 1
+
+
+class LatencyHistogram:
+    """Fixed-size log-linear histogram of durations in nanoseconds"""
+
+    def __init__(self):
+        self.counts: List[int] = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+
+    def record(self, value_ns: int):
+        if value_ns < 0:
+            value_ns = 0
+        elif value_ns > MAX_VALUE_NS:
+            value_ns = MAX_VALUE_NS
+        self.counts[bucket_index(value_ns)] += 1
+        if not self.count or value_ns < self.min_ns:
+            self.min_ns = value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+        self.count += 1
+        self.total_ns += value_ns
+
+    def merge(self, other: "LatencyHistogram"):
+        if not other.count:
+            return
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.min_ns = other.min_ns if not self.count else min(self.min_ns, other.min_ns)
+        self.max_ns = max(self.max_ns, other.max_ns)
+        self.count += other.count
+        self.total_ns += other.total_ns
+
+    def percentile(self, q: float) -> int:
+        """
+        Value at a percentile (0-100), in nanoseconds.
+
+        Reports the midpoint of the bucket the rank falls in, clamped to the
+        observed min/max; p0 and p100 are the exact min and max.
+        """
+        if not self.count:
+            return 0
+        if q <= 0:
+            return self.min_ns
+        if q >= 100:
+            return self.max_ns
+        rank = -(-self.count * q // 100)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                low, high = bucket_bounds(index)
+                return int(min(max((low + high) // 2, self.min_ns), self.max_ns))
+        return self.max_ns
+
+    def mean_ns(self) -> float:
+        return self.total_ns / self.count if self.count else 0.0
+
+    def snapshot(self) -> Dict:
+        """Summary in milliseconds"""
+        return {
+            "count": self.count,
+            "mean_ms": self.mean_ns() / NS_PER_MS,
+            "min_ms": self.min_ns / NS_PER_MS,
+            "p50_ms": self.percentile(50) / NS_PER_MS,
+            "p90_ms": self.percentile(90) / NS_PER_MS,
+            "p99_ms": self.percentile(99) / NS_PER_MS,
+            "max_ms": self.max_ns / NS_PER_MS,
+        }
+
+
+class _NoopSpan:
+    """Stand-in returned by span() and trace() while tracing is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    def add(self, stage: str, duration_ns: int):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """Times one stage and records it on exit"""
+
+    __slots__ = ("tracer", "stage", "start_ns")
+
+    def __init__(self, tracer: "LatencyTracer", stage: str):
+        self.tracer = tracer
+        self.stage = stage
+        self.start_ns = 0
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.tracer.record(self.stage, time.perf_counter_ns() - self.start_ns)
+        return False
+
+
+class PipelineTrace:
+    """
+    Stage timings for one whale trade on its way to a copy fill.
+
+    While a trace is active (inside `with tracer.trace(...)`), every span
+    recorded in the same task is also added to it, including spans opened
+    deep inside the executors. On exit the whole duration is recorded as
+    the end_to_end stage if the trade got as far as order placement.
+    """
+
+    __slots__ = ("tracer", "trace_id", "start_ns", "end_ns", "stages", "_token")
+
+    def __init__(self, tracer: "LatencyTracer", trace_id: str, start_ns: Optional[int] = None):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.start_ns = start_ns if start_ns is not None else time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+        self.stages: Dict[str, int] = {}
+        self._token = None
+
+    def add(self, stage: str, duration_ns: int):
+        self.stages[stage] = self.stages.get(stage, 0) + duration_ns
+
+    def __enter__(self):
+        self._token = _current_trace.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _current_trace.reset(self._token)
+        self.end_ns = time.perf_counter_ns()
+        self.tracer.finish_trace(self)
+        return False
+
+    def to_dict(self) -> Dict:
+        end_ns = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return {
+            "trace_id": self.trace_id,
+            "total_ms": (end_ns - self.start_ns) / NS_PER_MS,
+            "stages_ms": {stage: ns / NS_PER_MS for stage, ns in self.stages.items()},
+        }
+
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("latency_trace", default=None)
+
+
+class LatencyTracer:
+    """Registry of per-stage histograms and recent pipeline traces"""
+
+    def __init__(self, enabled: bool = True, recent_traces: int = 100):
+        self.enabled = enabled
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.recent: Deque[PipelineTrace] = deque(maxlen=recent_traces)
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self.histograms.clear()
+        self.recent.clear()
+
+    # ==================== Recording ====================
+
+    def record(self, stage: str, duration_ns: int):
+        """Add one duration to a stage (and to the active trace, if any)"""
+        if not self.enabled:
+            return
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = LatencyHistogram()
+        histogram.record(duration_ns)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(stage, duration_ns)
+
+    def record_ms(self, stage: str, duration_ms: float):
+        self.record(stage, int(duration_ms * NS_PER_MS))
+
+    def span(self, stage: str):
+        """Context manager timing the enclosed block as one stage sample"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, stage)
+
+    def timed(self, stage: str) -> Callable:
+        """Decorator timing every call of a function (sync or async)"""
+        def decorator(func: Callable) -> Callable:
+            if asyncio.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    if not self.enabled:
+                        return await func(*args, **kwargs)
+                    start_ns = time.perf_counter_ns()
+                    try:
+                        return await func(*args, **kwargs)
+                    finally:
+                        self.record(stage, time.perf_counter_ns() - start_ns)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start_ns = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(stage, time.perf_counter_ns() - start_ns)
+            return wrapper
+        return decorator
+
+    # ==================== Traces ====================
+
+    def trace(self, trace_id: str, start_ns: Optional[int] = None):
+        """
+        Context manager grouping the stages of one trade.
+
+        Args:
+            trace_id: Identifier shown in the breakdown (e.g. the whale trade id)
+            start_ns: perf_counter_ns() at which the trade was first seen;
+                defaults to now
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+        return PipelineTrace(self, trace_id, start_ns)
+
+    def finish_trace(self, trace: PipelineTrace):
+        """
+        Keep a finished trace's breakdown. Only trades that reached order
+        placement count toward end_to_end, so filtered-out trades do not
+        drag the whale-trade -> copy-fill distribution down.
+        """
+        if not self.enabled:
+            return
+        if ORDER_PLACEMENT in trace.stages:
+            self.record(END_TO_END, trace.end_ns - trace.start_ns)
+        self.recent.append(trace)
+
+    # ==================== Views ====================
+
+    def get_histogram(self, stage: str) -> Optional[LatencyHistogram]:
+        return self.histograms.get(stage)
+
+    def snapshot(self, recent: int = 20) -> Dict:
+        """
+        Per-stage summaries plus the most recent trade breakdowns.
+
+        Pipeline stages come first in pipeline order, then end_to_end, then
+        any other instrumented operations.
+        """
+        order = {stage: n for n, stage in enumerate(PIPELINE_STAGES + (END_TO_END,))}
+        stages = sorted(self.histograms, key=lambda s: (order.get(s, len(order)), s))
+        return {
+            "enabled": self.enabled,
+            "stages": {stage: self.histograms[stage].snapshot() for stage in stages},
+            "recent_traces": [trace.to_dict() for trace in list(self.recent)[-recent:]],
+        }
+
+
+def _env_enabled() -> bool:
+    return os.getenv("LATENCY_TRACING_ENABLED", "true").lower() not in ("0", "false", "no", "off")
+
+
+# Process-wide tracer shared by every instrumented module
+tracer = LatencyTracer(enabled=_env_enabled())
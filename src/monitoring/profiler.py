@@ -0,0 +1,314 @@
+"""
+Sampling Profiler for the API and Background Services
+
+A daemon thread snapshots every thread's Python stack via
+sys._current_frames() at a fixed rate and counts identical stacks. The
+result exports in the collapsed-stack format read by flamegraph.pl,
+speedscope and inferno ("thread;outer;...;leaf count" per line), with the
+thread name as the root frame so each service thread gets its own tower.
+
+Samples are keyed by code objects and only turned into strings on export,
+which keeps a sample to a frame walk and a dict increment. The sampler
+measures its own CPU time and lowers its rate whenever it would cost more
+than max_overhead of one core, so it can be left on in production.
+
+It can be switched at runtime through the admin endpoints in api/main.py
+or by sending SIGUSR2 (see install_signal_toggle).
+"""
+
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Leaf functions where a thread is parked rather than working
+IDLE_LEAVES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("socket.py", "accept"),
+}
+
+StackKey = Tuple[str, Tuple]
+
+
+class SamplingProfiler:
+    """Periodic stack sampler aggregating collapsed stacks"""
+
+    def __init__(self, sample_hz: float = 100.0, max_depth: int = 128,
+                 include_idle: bool = False, max_overhead: float = 0.02):
+        """
+        Args:
+            sample_hz: Target sampling rate
+            max_depth: Frames kept per stack (outermost frames are dropped)
+            include_idle: Keep samples of threads parked in select/wait/get
+            max_overhead: CPU budget as a fraction of one core; the rate is
+                lowered while the sampler exceeds it
+        """
+        self.sample_hz = sample_hz
+        self.max_depth = max_depth
+        self.include_idle = include_idle
+        self.max_overhead = max_overhead
+
+        self.interval = 1.0 / sample_hz
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at: Optional[datetime] = None
+
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._thread_names: Dict[int, str] = {}
+        self._idle_codes: Dict[object, bool] = {}
+        self._cpu_seconds = 0.0
+        self._wall_seconds = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # ==================== Control ====================
+
+    def start(self, sample_hz: Optional[float] = None, reset: bool = False) -> bool:
+        """Start sampling; returns False if already running"""
+        if self.running:
+            return False
+        if sample_hz is not None:
+            self.sample_hz = sample_hz
+        if reset:
+            self.reset()
+        self.interval = 1.0 / self.sample_hz
+        self._stop_event.clear()
+        self.started_at = datetime.utcnow()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="SamplingProfiler")
+        self._thread.start()
+        logger.info(f"Sampling profiler started at {self.sample_hz:.0f} Hz")
+        return True
+
+    def stop(self) -> bool:
+        """Stop sampling, keeping the collected stacks; returns False if not running"""
+        if not self.running:
+            return False
+        self._stop_event.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+        logger.info(f"Sampling profiler stopped after {self.samples} samples")
+        return True
+
+    def toggle(self) -> bool:
+        """Flip the profiler on/off; returns True if it is now running"""
+        if self.running:
+            self.stop()
+            return False
+        self.start()
+        return True
+
+    def reset(self):
+        with self._lock:
+            self.stacks = Counter()
+            self.samples = 0
+        self._cpu_seconds = 0.0
+        self._wall_seconds = 0.0
+
+    # ==================== Sampling ====================
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        self._refresh_thread_names()
+        last_wall, last_cpu = time.perf_counter(), time.thread_time()
+
+        while not self._stop_event.wait(self.interval):
+            self.sample(skip_ident=own_ident)
+
+            now_wall, now_cpu = time.perf_counter(), time.thread_time()
+            self._wall_seconds += now_wall - last_wall
+            self._cpu_seconds += now_cpu - last_cpu
+            last_wall, last_cpu = now_wall, now_cpu
+
+            if self.samples % 100 == 0:
+                self._adjust_rate()
+                self._refresh_thread_names()
+
+    def sample(self, skip_ident: Optional[int] = None):
+        """Take one snapshot of every thread's stack"""
+        frames = sys._current_frames()
+        names = self._thread_names
+        keys = []
+        for ident, frame in frames.items():
+            if ident == skip_ident:
+                continue
+            if not self.include_idle and self._is_idle(frame.f_code):
+                continue
+            codes = []
+            depth = 0
+            while frame is not None and depth < self.max_depth:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+                depth += 1
+            codes.reverse()
+            keys.append((names.get(ident) or self._thread_name(ident), tuple(codes)))
+        del frames
+
+        with self._lock:
+            for key in keys:
+                self.stacks[key] += 1
+            self.samples += 1
+
+    def _is_idle(self, code) -> bool:
+        idle = self._idle_codes.get(code)
+        if idle is None:
+            idle = self._idle_codes[code] = (
+                (os.path.basename(code.co_filename), code.co_name) in IDLE_LEAVES
+            )
+        return idle
+
+    def _thread_name(self, ident: int) -> str:
+        self._refresh_thread_names()
+        return self._thread_names.get(ident, f"thread-{ident}")
+
+    def _refresh_thread_names(self):
+        self._thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+    def _adjust_rate(self):
+        """Halve the rate while over budget; recover toward the target when well under it"""
+        overhead = self.overhead()
+        target = 1.0 / self.sample_hz
+        if overhead > self.max_overhead:
+            self.interval = min(self.interval * 2, 1.0)
+            logger.info(f"Sampling profiler over budget ({overhead:.1%}), interval now {self.interval * 1000:.0f}ms")
+        elif overhead < self.max_overhead / 4 and self.interval > target:
+            self.interval = max(self.interval / 2, target)
+
+    def overhead(self) -> float:
+        """Sampler CPU time as a fraction of elapsed wall time"""
+        return self._cpu_seconds / self._wall_seconds if self._wall_seconds else 0.0
+
+    # ==================== Export ====================
+
+    def collapsed(self, min_count: int = 1) -> str:
+        """Aggregated stacks in collapsed format, heaviest first"""
+        with self._lock:
+            stacks = list(self.stacks.items())
+        labels: Dict[object, str] = {}
+        lines = []
+        for (thread_name, codes), count in sorted(stacks, key=lambda item: -item[1]):
+            if count < min_count:
+                continue
+            frames = [_sanitize(thread_name)]
+            for code in codes:
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = frame_label(code)
+                frames.append(label)
+            lines.append(f"{';'.join(frames)} {count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write_collapsed(self, path: str, reset: bool = False) -> str:
+        """Write the collapsed stacks to path (atomically), optionally clearing them"""
+        text = self.collapsed()
+        if reset:
+            self.reset()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+        return path
+
+    def top(self, n: int = 10) -> List[Dict]:
+        """Functions with the most samples at the top of the stack (self time)"""
+        leaves: Counter = Counter()
+        with self._lock:
+            for (_, codes), count in self.stacks.items():
+                if codes:
+                    leaves[codes[-1]] += count
+        return [
+            {"function": frame_label(code), "samples": count}
+            for code, count in leaves.most_common(n)
+        ]
+
+    def stats(self) -> Dict:
+        return {
+            "running": self.running,
+            "sample_hz": self.sample_hz,
+            "effective_hz": 1.0 / self.interval,
+            "samples": self.samples,
+            "unique_stacks": len(self.stacks),
+            "overhead_pct": self.overhead() * 100,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "top": self.top(),
+        }
+
+
+def frame_label(code) -> str:
+    """'function (dir/file.py:line)' for one code object"""
+    parts = code.co_filename.replace("\\", "/").split("/")
+    location = "/".join(parts[-2:])
+    return _sanitize(f"{code.co_name} ({location}:{code.co_firstlineno})")
+
+
+def _sanitize(label: str) -> str:
+    # ';' separates frames and newlines separate stacks in the collapsed format
+    return label.replace(";", ":").replace("\n", " ")
+
+
+def install_signal_toggle(target: Optional[SamplingProfiler] = None,
+                          signum: Optional[int] = None,
+                          output_dir: str = "logs/profiles") -> bool:
+    """
+    Toggle the profiler on a signal (SIGUSR2 by default).
+
+    Each time the signal stops the profiler, the collected stacks are
+    written to output_dir/profile_<timestamp>.collapsed and cleared.
+    The handler only sets an event; a daemon thread does the stop, write
+    and reset, since the handler interrupts the main thread, which may be
+    holding the profiler lock or running the event loop. Signals arriving
+    while a toggle is still being handled are coalesced into it.
+
+    Returns False where signals are unavailable (Windows, or not called
+    from the main thread).
+    """
+    target = target or profiler
+    if signum is None:
+        signum = getattr(signal, "SIGUSR2", None)
+    if signum is None:
+        return False
+
+    requested = threading.Event()
+
+    def handle(_signum, _frame):
+        requested.set()
+
+    def run():
+        while True:
+            requested.wait()
+            requested.clear()
+            try:
+                if target.toggle():
+                    continue
+                path = os.path.join(output_dir, f"profile_{datetime.utcnow():%Y%m%d_%H%M%S}.collapsed")
+                target.write_collapsed(path, reset=True)
+                logger.info(f"Profile written to {path}")
+            except Exception as e:
+                logger.error(f"Profiler signal toggle failed: {e}")
+
+    try:
+        signal.signal(signum, handle)
+    except ValueError:
+        return False
+    threading.Thread(target=run, daemon=True, name="ProfilerSignalToggle").start()
+    return True
+
+
+# Process-wide profiler shared by the API and the services it hosts
+profiler = SamplingProfiler(sample_hz=float(os.getenv("PROFILER_SAMPLE_HZ", "100")))
@@ -0,0 +1,310 @@
+"""
+Columnar Time-Series Store for Monitoring Metrics
+
+Fixed-capacity ring buffers per metric series, held in parallel typed
+arrays (epoch-ns timestamps in array('q'), values in array('d')) instead of
+one Python object per sample. Range queries binary-search the timestamp
+column; each series also keeps 1s / 1m / 1h rollups (count, sum, min, max)
+that cascade from fine to coarse as buckets close, and the whole store
+renders as Prometheus text exposition.
+"""
+
+import math
+import re
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+NS_PER_SECOND = 1_000_000_000
+
+# (name, bucket width in ns, buckets retained)
+ROLLUP_RESOLUTIONS: Tuple[Tuple[str, int, int], ...] = (
+    ("1s", NS_PER_SECOND, 3600),             # 1 hour
+    ("1m", 60 * NS_PER_SECOND, 1440),        # 1 day
+    ("1h", 3600 * NS_PER_SECOND, 24 * 30),   # 30 days
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    """Canonical, hashable form of a label set"""
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+class RingColumns:
+    """
+    Parallel typed arrays used as one ring buffer.
+
+    Rows are addressed by logical index (0 = oldest). The first column is
+    the sort key (timestamps) and must be appended in non-decreasing order.
+    Arrays grow up to capacity, then wrap.
+    """
+
+    def __init__(self, capacity: int, typecodes: Dict[str, str]):
+        self.capacity = capacity
+        self.columns: Dict[str, array] = {name: array(code) for name, code in typecodes.items()}
+        self._arrays = tuple(self.columns.values())
+        self._key = self._arrays[0]
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def slot(self, index: int) -> int:
+        """Physical slot of a logical index (negative counts from the newest)"""
+        if index < 0:
+            index += self._size
+        return (self._start + index) % self.capacity
+
+    def append(self, row: Tuple):
+        """Add a row, evicting the oldest when full"""
+        if self._size < self.capacity:
+            # Still filling: nothing has wrapped, so slots are appended in order
+            for column, value in zip(self._arrays, row):
+                column.append(value)
+            self._size += 1
+        else:
+            slot = self._start
+            for column, value in zip(self._arrays, row):
+                column[slot] = value
+            self._start = (slot + 1) % self.capacity
+
+    def bisect_left(self, value: int) -> int:
+        """First logical index whose key is >= value"""
+        lo, hi = 0, self._size
+        key, start, capacity = self._key, self._start, self.capacity
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if key[(start + mid) % capacity] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def slice(self, name: str, lo: int, hi: int) -> List:
+        """Values of one column for logical rows [lo, hi)"""
+        column = self.columns[name]
+        if lo >= hi:
+            return []
+        first, last = self.slot(lo), self.slot(hi - 1)
+        if first <= last:
+            return column[first:last + 1].tolist()
+        return column[first:].tolist() + column[:last + 1].tolist()
+
+
+class Rollup:
+    """
+    Downsampled buckets at one resolution.
+
+    The open bucket lives in plain attributes; it is written to the ring
+    when a later bucket starts and then folded into the next coarser
+    resolution, so a sample only touches the finest level.
+    """
+
+    def __init__(self, width_ns: int, buckets: int, parent: Optional["Rollup"] = None):
+        self.width = width_ns
+        self.ring = RingColumns(buckets, {"ts": "q", "count": "q", "sum": "d", "min": "d", "max": "d"})
+        self.parent = parent
+        self.child: Optional["Rollup"] = None
+        if parent is not None:
+            parent.child = self
+        self.bucket = -1
+        self.count = 0
+        self.total = 0.0
+        self.low = math.inf
+        self.high = -math.inf
+
+    def add(self, bucket: int, count: int, total: float, low: float, high: float):
+        """Merge a sample or a closed finer bucket starting at `bucket`"""
+        if bucket != self.bucket:
+            self.close()
+            self.bucket, self.count, self.total, self.low, self.high = bucket, count, total, low, high
+            return
+        self.count += count
+        self.total += total
+        if low < self.low:
+            self.low = low
+        if high > self.high:
+            self.high = high
+
+    def close(self):
+        if not self.count:
+            return
+        row = (self.bucket, self.count, self.total, self.low, self.high)
+        self.ring.append(row)
+        if self.parent is not None:
+            self.parent.add(self.bucket - self.bucket % self.parent.width, *row[1:])
+
+    def open_rows(self) -> List[List]:
+        """Buckets not yet written to the ring, including finer open buckets"""
+        rows = [[self.bucket, self.count, self.total, self.low, self.high]] if self.count else []
+        if self.child is not None:
+            for bucket, count, total, low, high in self.child.open_rows():
+                bucket -= bucket % self.width
+                if rows and rows[-1][0] == bucket:
+                    last = rows[-1]
+                    last[1] += count
+                    last[2] += total
+                    last[3] = min(last[3], low)
+                    last[4] = max(last[4], high)
+                else:
+                    rows.append([bucket, count, total, low, high])
+        return rows
+
+
+class TimeSeries:
+    """Raw samples plus rollups for one (name, labels) series"""
+
+    def __init__(self, capacity: int):
+        self.raw = RingColumns(capacity, {"ts": "q", "value": "d"})
+        self.rollups: Dict[str, Rollup] = {}
+        coarser = None
+        for name, width, buckets in reversed(ROLLUP_RESOLUTIONS):
+            coarser = self.rollups[name] = Rollup(width, buckets, parent=coarser)
+        self._finest = coarser
+        self.last_ts = 0
+        self.last_value = math.nan
+
+    def append(self, timestamp_ns: int, value: float):
+        # Keep the key column sorted even if the wall clock steps back
+        if timestamp_ns < self.last_ts:
+            timestamp_ns = self.last_ts
+        self.last_ts = timestamp_ns
+        self.last_value = value
+        self.raw.append((timestamp_ns, value))
+
+        finest = self._finest
+        bucket = timestamp_ns - timestamp_ns % finest.width
+        if bucket == finest.bucket:
+            finest.count += 1
+            finest.total += value
+            if value < finest.low:
+                finest.low = value
+            if value > finest.high:
+                finest.high = value
+        else:
+            finest.add(bucket, 1, value, value, value)
+
+    def range(self, start_ns: Optional[int] = None,
+              end_ns: Optional[int] = None) -> Tuple[List[int], List[float]]:
+        """Samples with start_ns <= ts < end_ns"""
+        lo = self.raw.bisect_left(start_ns) if start_ns is not None else 0
+        hi = self.raw.bisect_left(end_ns) if end_ns is not None else len(self.raw)
+        return self.raw.slice("ts", lo, hi), self.raw.slice("value", lo, hi)
+
+    def rollup(self, resolution: str, start_ns: Optional[int] = None,
+               end_ns: Optional[int] = None) -> Dict[str, List]:
+        """Buckets at a resolution whose start falls in [start_ns, end_ns)"""
+        level = self.rollups[resolution]
+        ring = level.ring
+        if start_ns is not None:
+            # Include the bucket that contains start_ns
+            start_ns -= start_ns % level.width
+        lo = ring.bisect_left(start_ns) if start_ns is not None else 0
+        hi = ring.bisect_left(end_ns) if end_ns is not None else len(ring)
+        result = {name: ring.slice(name, lo, hi) for name in ring.columns}
+
+        for row in level.open_rows():
+            if (start_ns is None or row[0] >= start_ns) and (end_ns is None or row[0] < end_ns):
+                for name, value in zip(ring.columns, row):
+                    result[name].append(value)
+        return result
+
+
+class TimeSeriesStore:
+    """Metric series keyed by name and label set"""
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self.series: Dict[str, Dict[LabelKey, TimeSeries]] = {}
+
+    def record(self, name: str, value: float, labels: Optional[Dict[str, str]] = None,
+               timestamp_ns: Optional[int] = None):
+        by_labels = self.series.get(name)
+        if by_labels is None:
+            by_labels = self.series[name] = {}
+        key = label_key(labels)
+        series = by_labels.get(key)
+        if series is None:
+            series = by_labels[key] = TimeSeries(self.capacity)
+        series.append(timestamp_ns if timestamp_ns is not None else time.time_ns(), float(value))
+
+    def get(self, name: str, labels: Optional[Dict[str, str]] = None) -> Optional[TimeSeries]:
+        return self.series.get(name, {}).get(label_key(labels))
+
+    def label_sets(self, name: str) -> Iterable[LabelKey]:
+        return self.series.get(name, {}).keys()
+
+    def query(self, name: str, start_ns: Optional[int] = None, end_ns: Optional[int] = None,
+              labels: Optional[Dict[str, str]] = None) -> List[Tuple[int, float, LabelKey]]:
+        """
+        Samples in a time range, oldest first.
+
+        Args:
+            name: Metric name
+            start_ns: Inclusive lower bound (epoch ns)
+            end_ns: Exclusive upper bound (epoch ns)
+            labels: Restrict to one label set (all label sets if None)
+
+        Returns:
+            List of (timestamp_ns, value, label_key)
+        """
+        if labels is not None:
+            keys = [label_key(labels)]
+        else:
+            keys = list(self.label_sets(name))
+
+        samples = []
+        for key in keys:
+            series = self.series.get(name, {}).get(key)
+            if series is None:
+                continue
+            timestamps, values = series.range(start_ns, end_ns)
+            samples.extend(zip(timestamps, values, [key] * len(values)))
+
+        if len(keys) > 1:
+            samples.sort(key=lambda sample: sample[0])
+        return samples
+
+    def to_prometheus(self) -> str:
+        """Latest value of every series in Prometheus text exposition format"""
+        lines = []
+        for name in sorted(self.series):
+            metric = prometheus_name(name)
+            lines.append(f"# TYPE {metric} gauge")
+            for key, series in self.series[name].items():
+                lines.append(
+                    f"{metric}{format_labels(key)} {format_value(series.last_value)} "
+                    f"{series.last_ts // 1_000_000}"
+                )
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_:]")
+
+
+def prometheus_name(name: str) -> str:
+    """Map a dotted metric name onto the Prometheus name charset"""
+    metric = _INVALID_NAME_CHARS.sub("_", name)
+    return f"_{metric}" if metric[:1].isdigit() else metric
+
+
+def escape_label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    pairs = ",".join(f'{prometheus_name(k)}="{escape_label_value(v)}"' for k, v in key)
+    return "{" + pairs + "}"
+
+
+def format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
@@ -110,7 +110,11 @@ class GeneticOptimizer:
                  generations: int = 100,
                  mutation_rate: float = 0.1,
                  crossover_rate: float = 0.7,
-                 elite_size: int = 5):
+                 elite_size: int = 5,
+                 max_concurrency: int = 8,
+                 cache_decimals: int = 6,
+                 convergence_patience: int = 10,
+                 convergence_tolerance: float = 1e-6):
         self.population_size = population_size
         self.generations = generations
         self.mutation_rate = mutation_rate
@@ -118,6 +122,18 @@ class GeneticOptimizer:
         self.elite_size = elite_size
         self.bounds = self._define_bounds()
 
+        # Evaluation settings
+        self.max_concurrency = max(1, max_concurrency)
+        self.cache_decimals = cache_decimals
+        self.convergence_patience = convergence_patience
+        self.convergence_tolerance = convergence_tolerance
+
+        # Fitness memoization (rounded parameter vector -> fitness),
+        # valid for one optimize() run
+        self._fitness_cache: Dict[Tuple[float, ...], float] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
     def _define_bounds(self) -> List[Tuple[float, float]]:
         """Define parameter bounds"""
         return [
@@ -176,23 +192,70 @@ class GeneticOptimizer:
         winner_idx = tournament_indices[np.argmax(tournament_fitness)]
         return population[winner_idx].copy()
 
+    def _cache_key(self, individual: np.ndarray) -> Tuple[float, ...]:
+        """Key an individual on its rounded parameter vector"""
+        return tuple(np.round(individual, self.cache_decimals).tolist())
+
+    def clear_cache(self):
+        """Drop memoized fitness values (e.g. when the fitness data changes)"""
+        self._fitness_cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    async def _evaluate_population(self,
+                                   population: List[np.ndarray],
+                                   fitness_function: Callable) -> List[float]:
+        """
+        Evaluate a batch of individuals concurrently.
+
+        Individuals already scored (elites, duplicate children, repeated
+        perturbations) are served from the cache; the remaining unique
+        vectors are awaited together, bounded by max_concurrency, so the
+        batch takes roughly as long as its slowest backtest.
+        """
+        keys = [self._cache_key(individual) for individual in population]
+
+        pending: Dict[Tuple[float, ...], np.ndarray] = {}
+        for key, individual in zip(keys, population):
+            if key in self._fitness_cache:
+                self.cache_hits += 1
+            elif key not in pending:
+                self.cache_misses += 1
+                pending[key] = individual
+            else:
+                self.cache_hits += 1
+
+        if pending:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            async def evaluate(individual: np.ndarray) -> float:
+                async with semaphore:
+                    return await fitness_function(StrategyParameters.from_vector(individual))
+
+            results = await asyncio.gather(*(evaluate(ind) for ind in pending.values()))
+            for key, fitness in zip(pending.keys(), results):
+                self._fitness_cache[key] = fitness
+
+        return [self._fitness_cache[key] for key in keys]
+
     async def optimize(self, fitness_function: Callable) -> OptimizationResult:
         """Run genetic algorithm optimization"""
+        # Cached scores belong to the previous fitness function and data
+        self.clear_cache()
+
         population = self._initialize_population()
         history = []
         convergence = []
         best_individual = None
         best_fitness = -float('inf')
+        stale_generations = 0
 
         for generation in range(self.generations):
-            # Evaluate fitness
-            fitness_scores = []
-            for individual in population:
-                params = StrategyParameters.from_vector(individual)
-                fitness = await fitness_function(params)
-                fitness_scores.append(fitness)
-
-                # Track best
+            # Evaluate fitness (whole population at once)
+            fitness_scores = await self._evaluate_population(population, fitness_function)
+
+            previous_best = best_fitness
+            for individual, fitness in zip(population, fitness_scores):
                 if fitness > best_fitness:
                     best_fitness = fitness
                     best_individual = individual.copy()
@@ -209,6 +272,16 @@ class GeneticOptimizer:
             if generation % 10 == 0:
                 logger.info(f"Generation {generation}: Best fitness = {best_fitness:.4f}")
 
+            # Early termination once the best fitness has plateaued
+            if best_fitness - previous_best > self.convergence_tolerance:
+                stale_generations = 0
+            else:
+                stale_generations += 1
+            if self.convergence_patience and stale_generations >= self.convergence_patience:
+                logger.info(f"Converged at generation {generation} "
+                            f"(no improvement for {stale_generations} generations)")
+                break
+
             # Create next generation
             new_population = []
 
@@ -260,7 +333,6 @@ class GeneticOptimizer:
                                              best_individual: np.ndarray,
                                              fitness_function: Callable) -> Dict[str, float]:
         """Calculate importance of each parameter"""
-        base_fitness = await fitness_function(StrategyParameters.from_vector(best_individual))
         importance = {}
         param_names = [
             'min_whale_score', 'kelly_fraction', 'max_position_pct',
@@ -269,14 +341,18 @@ class GeneticOptimizer:
             'liquidity_threshold'
         ]
 
-        for i, name in enumerate(param_names):
-            # Perturb parameter
+        # Perturb each parameter and evaluate all variants as one batch
+        batch = [best_individual]
+        for i in range(len(param_names)):
             perturbed = best_individual.copy()
             low, high = self.bounds[i]
             perturbed[i] = np.clip(perturbed[i] * 1.1, low, high)
+            batch.append(perturbed)
 
-            # Calculate fitness change
-            new_fitness = await fitness_function(StrategyParameters.from_vector(perturbed))
+        scores = await self._evaluate_population(batch, fitness_function)
+        base_fitness = scores[0]
+
+        for name, new_fitness in zip(param_names, scores[1:]):
             importance[name] = abs(new_fitness - base_fitness) / abs(base_fitness)
 
         # Normalize
@@ -291,7 +367,7 @@ class GeneticOptimizer:
                                    fitness_function: Callable,
                                    n_samples: int = 20) -> float:
         """Calculate robustness of parameters to noise"""
-        fitness_scores = []
+        samples = []
 
         for _ in range(n_samples):
             # Add small noise to parameters
@@ -300,9 +376,9 @@ class GeneticOptimizer:
                 low, high = self.bounds[i]
                 noise = np.random.normal(0, (high - low) * 0.02)
                 noisy[i] = np.clip(noisy[i] + noise, low, high)
+            samples.append(noisy)
 
-            fitness = await fitness_function(StrategyParameters.from_vector(noisy))
-            fitness_scores.append(fitness)
+        fitness_scores = await self._evaluate_population(samples, fitness_function)
 
         # Robustness is inverse of coefficient of variation
         mean_fitness = np.mean(fitness_scores)
@@ -740,6 +816,7 @@ async def test_optimizer():
 
     print(f"Best score: {genetic_result.best_score:.4f}")
     print(f"Robustness: {genetic_result.robustness_score:.4f}")
+    print(f"Fitness cache: {genetic_opt.cache_hits} hits / {genetic_opt.cache_misses} misses")
     print("\nTop 3 important parameters:")
     for param, importance in sorted(genetic_result.parameter_importance.items(),
                                    key=lambda x: x[1], reverse=True)[:3]:
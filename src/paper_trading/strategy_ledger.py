@@ -0,0 +1,463 @@
+"""
+Strategy Account Ledger
+Persistent, append-only paper trading accounts with incremental aggregates
+
+Each paper strategy (and the standalone paper portfolio) used to keep every
+trade in an unbounded in-memory list that was lost on restart, mutated
+without locking and re-summed on every /api/strategies call. The ledger
+instead:
+
+- appends every account event (reset, open, close) to a SQLite table in
+  WAL mode; nothing is ever updated in place
+- keeps running aggregates per account (cash, realized and unrealized P&L,
+  closed and winning trade counts), so summaries are O(1)
+- aggregates open positions per market/outcome and keeps only a bounded
+  window of recent trades in memory; full history stays in the table
+- rebuilds accounts on open() by replaying entries since each account's
+  last reset
+- serializes mutations of one account with its own asyncio lock, so
+  sizing from the balance and debiting it can't interleave
+
+Usage:
+    ledger = StrategyLedger("data/strategy_ledger.db")
+    await ledger.ensure_account("top_5_whales", initial_balance=10000.0)
+
+    async with ledger.locked("top_5_whales") as account:
+        amount = account.balance * 0.05
+        trade = await ledger.open_position(account, "0xmarket", "YES", amount, 0.42)
+
+    ledger.mark_price("0xmarket", "YES", 0.47)  # unrealized P&L, no I/O
+    ledger.get_account("top_5_whales").summary()
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class EntryKind:
+    """Ledger entry kinds"""
+    RESET = "reset"
+    OPEN = "open"
+    CLOSE = "close"
+
+
+class LedgerError(Exception):
+    """Raised for invalid account operations"""
+
+
+def position_key(market_id: str, side: str) -> str:
+    return f"{market_id}_{side}"
+
+
+@dataclass
+class LedgerPosition:
+    """Open position aggregated over every fill on one market/outcome"""
+    key: str
+    market_id: str
+    side: str
+    shares: float
+    cost_basis: float
+    mark_price: float
+    opened_at: str
+    fills: int = 1
+
+    @property
+    def entry_price(self) -> float:
+        return self.cost_basis / self.shares if self.shares else 0.0
+
+    @property
+    def unrealized_pnl(self) -> float:
+        return self.shares * self.mark_price - self.cost_basis
+
+    def to_dict(self) -> Dict:
+        return {
+            "market_id": self.market_id,
+            "side": self.side,
+            "shares": self.shares,
+            "entry_price": self.entry_price,
+            "cost_basis": self.cost_basis,
+            "mark_price": self.mark_price,
+            "unrealized_pnl": self.unrealized_pnl,
+            "timestamp": self.opened_at,
+            "fills": self.fills,
+            "status": "open",
+        }
+
+
+class StrategyAccount:
+    """
+    In-memory state of one account, rebuilt from its ledger entries
+
+    Only the ledger mutates accounts; read the fields freely.
+    """
+
+    def __init__(self, account_id: str, initial_balance: float, recent_trades: int = 100):
+        self.account_id = account_id
+        self.lock = asyncio.Lock()
+        self.recent_trades: Deque[Dict] = deque(maxlen=recent_trades)
+        self._reset(initial_balance)
+
+    def _reset(self, initial_balance: float):
+        self.initial_balance = initial_balance
+        self.balance = initial_balance
+        self.realized_pnl = 0.0
+        self.unrealized_pnl = 0.0
+        self.open_cost = 0.0
+        self.trade_count = 0
+        self.last_trade_id = 0
+        self.closed_trades = 0
+        self.winning_trades = 0
+        self.positions: Dict[str, LedgerPosition] = {}
+        self.recent_trades.clear()
+
+    # ==================== Entry Application ====================
+
+    def _apply(self, kind: str, payload: Dict):
+        """Apply one entry; shared by live writes and replay"""
+        if kind == EntryKind.RESET:
+            self._reset(payload["initial_balance"])
+        elif kind == EntryKind.OPEN:
+            self._apply_open(payload)
+        elif kind == EntryKind.CLOSE:
+            self._apply_close(payload)
+        else:
+            raise LedgerError(f"Unknown ledger entry kind {kind!r}")
+
+    def _apply_open(self, trade: Dict):
+        amount = trade["amount"]
+        self.balance -= amount
+        self.open_cost += amount
+        self.trade_count += 1
+        self.last_trade_id = trade["id"]
+
+        position = self.positions.get(trade["position_key"])
+        if position is None:
+            position = LedgerPosition(
+                key=trade["position_key"],
+                market_id=trade["market_id"],
+                side=trade["side"],
+                shares=0.0,
+                cost_basis=0.0,
+                mark_price=trade["price"],
+                opened_at=trade["timestamp"],
+                fills=0,
+            )
+            self.positions[position.key] = position
+        before = position.unrealized_pnl
+        position.mark_price = trade["price"]
+        position.shares += trade["shares"]
+        position.cost_basis += amount
+        position.fills += 1
+        self.unrealized_pnl += position.unrealized_pnl - before
+        self.recent_trades.append(trade)
+
+    def _apply_close(self, trade: Dict):
+        position = self.positions.pop(trade["position_key"])
+        self.unrealized_pnl -= position.unrealized_pnl
+        self.open_cost -= position.cost_basis
+        self.balance += trade["proceeds"]
+        self.realized_pnl += trade["pnl"]
+        self.closed_trades += 1
+        self.last_trade_id = trade["id"]
+        if trade["pnl"] > 0:
+            self.winning_trades += 1
+        self.recent_trades.append(trade)
+
+    def _mark(self, key: str, price: float):
+        position = self.positions.get(key)
+        if position is not None:
+            before = position.unrealized_pnl
+            position.mark_price = price
+            self.unrealized_pnl += position.unrealized_pnl - before
+
+    # ==================== Views ====================
+
+    @property
+    def total_value(self) -> float:
+        """Cash plus open positions at their mark price"""
+        return self.balance + self.open_cost + self.unrealized_pnl
+
+    def summary(self) -> Dict:
+        total_pnl = self.realized_pnl + self.unrealized_pnl
+        return {
+            "balance": self.balance,  # Cash only
+            "total_value": self.total_value,
+            "initial_balance": self.initial_balance,
+            "total_trades": self.trade_count,
+            "open_positions": len(self.positions),
+            "closed_trades": self.closed_trades,
+            "winning_trades": self.winning_trades,
+            "realized_pnl": self.realized_pnl,
+            "unrealized_pnl": self.unrealized_pnl,
+            "total_pnl": total_pnl,
+            "win_rate": (self.winning_trades / self.closed_trades * 100) if self.closed_trades else 0,
+            "roi": (total_pnl / self.initial_balance * 100) if self.initial_balance > 0 else 0,
+        }
+
+    def positions_dict(self) -> Dict[str, Dict]:
+        return {key: position.to_dict() for key, position in self.positions.items()}
+
+
+class StrategyLedger:
+    """
+    Append-only account ledger in SQLite (WAL mode)
+
+    Args:
+        path: Database file, created if missing; ":memory:" for tests
+        recent_trades: Trades kept in memory per account
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS ledger_entries (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            account_id TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS ix_ledger_entries_account
+            ON ledger_entries (account_id, seq);
+    """
+
+    def __init__(self, path: str = ":memory:", recent_trades: int = 100):
+        self.path = path
+        self.recent_trades = recent_trades
+        self.accounts: Dict[str, StrategyAccount] = {}
+        self._holders: Dict[str, Set[str]] = {}  # position key -> account ids
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._create_lock = asyncio.Lock()
+
+        # Stats
+        self.entries_written = 0
+        self.entries_replayed = 0
+
+    # ==================== Lifecycle ====================
+
+    def open(self):
+        """Connect, create the schema and replay accounts; idempotent"""
+        if self._conn is not None:
+            return
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(self.SCHEMA)
+        self._conn = conn
+        self._replay()
+
+    def close(self):
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        self.accounts.clear()
+        self._holders.clear()
+
+    def _replay(self):
+        """Rebuild every account from entries since its last reset"""
+        with self._db_lock:
+            rows = self._conn.execute("""
+                SELECT e.account_id, e.kind, e.payload
+                FROM ledger_entries e
+                JOIN (
+                    SELECT account_id, MAX(seq) AS reset_seq
+                    FROM ledger_entries WHERE kind = ?
+                    GROUP BY account_id
+                ) r ON r.account_id = e.account_id AND e.seq >= r.reset_seq
+                ORDER BY e.seq
+            """, (EntryKind.RESET,)).fetchall()
+
+        for account_id, kind, payload in rows:
+            payload = json.loads(payload)
+            account = self.accounts.get(account_id)
+            if account is None:
+                account = StrategyAccount(account_id, payload["initial_balance"], self.recent_trades)
+                self.accounts[account_id] = account
+            self._apply(account, kind, payload)
+        self.entries_replayed += len(rows)
+        if rows:
+            logger.info(f"Strategy ledger replayed {len(rows)} entries for {len(self.accounts)} accounts")
+
+    # ==================== Accounts ====================
+
+    def get_account(self, account_id: str) -> Optional[StrategyAccount]:
+        return self.accounts.get(account_id)
+
+    async def ensure_account(self, account_id: str, initial_balance: float) -> StrategyAccount:
+        """Return the account, creating it with initial_balance if new"""
+        account = self.accounts.get(account_id)
+        if account is not None:
+            return account
+        async with self._create_lock:
+            self.open()
+            account = self.accounts.get(account_id)
+            if account is None:
+                account = StrategyAccount(account_id, initial_balance, self.recent_trades)
+                await self._write(account_id, EntryKind.RESET, {"initial_balance": initial_balance})
+                self.accounts[account_id] = account
+            return account
+
+    @asynccontextmanager
+    async def locked(self, account_id: str) -> AsyncIterator[StrategyAccount]:
+        """Hold the account's lock; mutations must happen inside"""
+        account = self.accounts.get(account_id)
+        if account is None:
+            raise LedgerError(f"Unknown account {account_id!r}")
+        async with account.lock:
+            yield account
+
+    # ==================== Mutations ====================
+
+    async def open_position(
+        self,
+        account: StrategyAccount,
+        market_id: str,
+        side: str,
+        amount: float,
+        price: float,
+        **fields: Any
+    ) -> Dict:
+        """
+        Debit amount and add shares at price to the market/side position
+
+        Extra fields (whale address, outcome, ...) are stored on the trade.
+        Returns the trade record.
+        """
+        self._check_locked(account)
+        if amount <= 0 or price <= 0:
+            raise LedgerError("Amount and price must be positive")
+        if amount > account.balance:
+            raise LedgerError("Insufficient balance")
+
+        trade = {
+            **fields,
+            "id": account.last_trade_id + 1,
+            "strategy_id": account.account_id,
+            "position_key": position_key(market_id, side),
+            "market_id": market_id,
+            "side": side,
+            "amount": amount,
+            "price": price,
+            "entry_price": price,
+            "shares": amount / price,
+            "cost_basis": amount,
+            "timestamp": fields.get("timestamp") or datetime.utcnow().isoformat(),
+            "pnl": 0.0,
+            "status": "open",
+        }
+        await self._append(account, EntryKind.OPEN, trade)
+        return trade
+
+    async def close_position(self, account: StrategyAccount, market_id: str, side: str, price: float) -> Dict:
+        """Sell the whole market/side position at price, realizing its P&L"""
+        self._check_locked(account)
+        key = position_key(market_id, side)
+        position = account.positions.get(key)
+        if position is None:
+            raise LedgerError(f"No open position {key!r}")
+
+        proceeds = position.shares * price
+        trade = {
+            "id": account.last_trade_id + 1,
+            "strategy_id": account.account_id,
+            "position_key": key,
+            "market_id": position.market_id,
+            "side": position.side,
+            "shares": position.shares,
+            "entry_price": position.entry_price,
+            "price": price,
+            "proceeds": proceeds,
+            "pnl": proceeds - position.cost_basis,
+            "timestamp": datetime.utcnow().isoformat(),
+            "status": "closed",
+        }
+        await self._append(account, EntryKind.CLOSE, trade)
+        return trade
+
+    async def reset(self, account: StrategyAccount, initial_balance: Optional[float] = None):
+        """Start the account over; earlier entries stay in the table"""
+        self._check_locked(account)
+        if initial_balance is None:
+            initial_balance = account.initial_balance
+        await self._append(account, EntryKind.RESET, {"initial_balance": initial_balance})
+
+    def mark_price(self, market_id: str, side: str, price: float) -> int:
+        """Revalue open positions on a market/outcome; returns accounts touched"""
+        key = position_key(market_id, side)
+        holders = self._holders.get(key, ())
+        for account_id in holders:
+            self.accounts[account_id]._mark(key, price)
+        return len(holders)
+
+    def _check_locked(self, account: StrategyAccount):
+        if not account.lock.locked():
+            raise LedgerError(f"Account {account.account_id!r} must be mutated under ledger.locked()")
+
+    # ==================== Storage ====================
+
+    async def _append(self, account: StrategyAccount, kind: str, payload: Dict):
+        # Durable first: a failed write leaves memory untouched
+        await self._write(account.account_id, kind, payload)
+        self._apply(account, kind, payload)
+
+    def _apply(self, account: StrategyAccount, kind: str, payload: Dict):
+        before = set(account.positions)
+        account._apply(kind, payload)
+        after = set(account.positions)
+        for key in after - before:
+            self._holders.setdefault(key, set()).add(account.account_id)
+        for key in before - after:
+            holders = self._holders.get(key)
+            if holders is not None:
+                holders.discard(account.account_id)
+                if not holders:
+                    del self._holders[key]
+
+    async def _write(self, account_id: str, kind: str, payload: Dict):
+        self.open()
+        await asyncio.to_thread(self._insert, account_id, kind, json.dumps(payload))
+        self.entries_written += 1
+
+    def _insert(self, account_id: str, kind: str, payload: str):
+        with self._db_lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO ledger_entries (account_id, kind, payload, created_at) VALUES (?, ?, ?, ?)",
+                    (account_id, kind, payload, datetime.utcnow().isoformat())
+                )
+
+    async def history(self, account_id: str, limit: int = 100, before_seq: Optional[int] = None) -> List[Dict]:
+        """Trades from the table, newest first, across resets"""
+        self.open()
+
+        def query():
+            with self._db_lock:
+                return self._conn.execute("""
+                    SELECT seq, payload FROM ledger_entries
+                    WHERE account_id = ? AND kind != ? AND seq < ?
+                    ORDER BY seq DESC LIMIT ?
+                """, (account_id, EntryKind.RESET, before_seq or 2 ** 62, limit)).fetchall()
+
+        return [{**json.loads(payload), "seq": seq} for seq, payload in await asyncio.to_thread(query)]
+
+    def get_stats(self) -> Dict:
+        return {
+            "path": self.path,
+            "accounts": len(self.accounts),
+            "open_positions": sum(len(a.positions) for a in self.accounts.values()),
+            "entries_written": self.entries_written,
+            "entries_replayed": self.entries_replayed,
+        }
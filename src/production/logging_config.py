@@ -14,12 +14,15 @@ Features:
 import logging
 import logging.handlers
 import json
+import time
 import traceback
 from datetime import datetime
 from typing import Dict, Optional, Any
 from pathlib import Path
 from decimal import Decimal
 
+from src.monitoring.latency import tracer
+
 
 class JSONFormatter(logging.Formatter):
     """Format logs as JSON for structured logging"""
@@ -241,19 +244,21 @@ def setup_production_logging(
 # Context manager for timing operations
 
 class timed_operation:
-    """Context manager for timing and logging operations"""
+    """Context manager for timing and logging operations (also feeds the latency tracer)"""
 
     def __init__(self, operation_name: str, logger: Optional[PerformanceLogger] = None):
         self.operation_name = operation_name
         self.logger = logger or PerformanceLogger()
-        self.start_time = None
+        self.start_ns = None
 
     def __enter__(self):
-        self.start_time = datetime.utcnow()
+        self.start_ns = time.perf_counter_ns()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        duration = (datetime.utcnow() - self.start_time).total_seconds() * 1000
+        elapsed_ns = time.perf_counter_ns() - self.start_ns
+        tracer.record(self.operation_name, elapsed_ns)
+        duration = elapsed_ns / 1_000_000
         self.logger.log_operation(
             self.operation_name,
             duration,
@@ -0,0 +1,264 @@
+"""
+WebSocket Fan-Out Broadcaster
+Serialize once, queue per client, never let one slow socket stall the rest
+
+Broadcasting used to await send_json on every client in turn, re-encoding
+the same dict each time, so one slow dashboard tab delayed everyone else and
+dead sockets were never removed. Here:
+
+- each message is encoded once (orjson when installed, json otherwise)
+- every client has a bounded send queue drained by its own writer task
+- a full queue drops its oldest message; messages sent with a coalesce key
+  replace any still-queued message with the same key (latest-wins state)
+- reliable messages (change feed snapshots and deltas) are never dropped:
+  a client whose queue is full of them is evicted instead
+- a failed or timed-out send evicts the client and closes its socket with
+  1013 (try again later), so the dashboard's onclose fires and it reconnects
+
+Usage:
+    manager = WebSocketBroadcaster()
+    await manager.connect(websocket)
+    await manager.broadcast({"type": "trade", ...})
+    await manager.broadcast({"type": "pnl", ...}, coalesce_key="pnl")
+    await manager.send(websocket, {"type": "ack"})  # ordered with broadcasts
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Close code for evicted clients: "try again later", the client reconnects
+EVICTED_CLOSE_CODE = 1013
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def _default(value: Any):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_message(message: Dict) -> str:
+    """Encode a message as JSON text, the format the dashboards parse"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(message, default=_default, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(message, default=_default, separators=(",", ":"))
+
+
+class ClientChannel:
+    """
+    Bounded send queue and writer task for one websocket
+
+    Queued payloads are keyed: coalescing messages share a key so a newer
+    one overwrites the queued one in place, every other message gets a
+    unique key. When full, the oldest droppable payload is dropped; if
+    every queued payload is reliable the client is evicted.
+    """
+
+    def __init__(self, websocket, max_queue: int, send_timeout: float, on_dead):
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self._on_dead = on_dead
+        self._pending: "OrderedDict[Hashable, Tuple[str, bool]]" = OrderedDict()
+        self._ready = asyncio.Event()
+        self._unique = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        self.closed = False
+
+        # Stats
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def start(self):
+        self._task = asyncio.create_task(self._writer())
+
+    def offer(self, payload: str, coalesce_key: Optional[Hashable] = None, reliable: bool = False):
+        """Queue a payload without blocking"""
+        if self.closed:
+            return
+        if coalesce_key is not None:
+            key = ("coalesce", coalesce_key)
+            if key in self._pending:
+                self._pending[key] = (payload, reliable or self._pending[key][1])
+                self.coalesced += 1
+                return
+        else:
+            key = next(self._unique)
+
+        if len(self._pending) >= self.max_queue:
+            droppable = next((k for k, (_, kept) in self._pending.items() if not kept), None)
+            if droppable is None:
+                # Too far behind to catch up without losing state
+                self.closed = True
+                self._on_dead(self.websocket)
+                return
+            del self._pending[droppable]
+            self.dropped += 1
+        self._pending[key] = (payload, reliable)
+        self._ready.set()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    async def _writer(self):
+        try:
+            while not self.closed:
+                await self._ready.wait()
+                self._ready.clear()
+                while self._pending and not self.closed:
+                    _, (payload, _) = self._pending.popitem(last=False)
+                    await asyncio.wait_for(self.websocket.send_text(payload), self.send_timeout)
+                    self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.info(f"Evicting websocket client: {type(e).__name__}: {e}")
+            self._on_dead(self.websocket)
+
+    async def close(self, close_code: Optional[int] = None):
+        """Stop the writer; with a close_code, also close the websocket itself"""
+        self.closed = True
+        self._pending.clear()
+        if self._task and self._task is not asyncio.current_task():
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        if close_code is not None:
+            try:
+                await asyncio.wait_for(self.websocket.close(code=close_code), self.send_timeout)
+            except Exception as e:
+                logger.debug(f"Closing evicted websocket failed: {type(e).__name__}: {e}")
+
+
+class WebSocketBroadcaster:
+    """
+    Connection manager that fans messages out through per-client queues
+
+    broadcast() only encodes and enqueues: it never awaits a socket, so
+    callers are not slowed by the slowest client.
+    """
+
+    def __init__(self, max_queue: int = 256, send_timeout: float = 10.0):
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.channels: Dict[Any, ClientChannel] = {}
+        self._closing: Set[asyncio.Future] = set()
+
+        # Stats
+        self.messages_broadcast = 0
+        self.evicted = 0
+
+    @property
+    def active_connections(self) -> List:
+        return list(self.channels)
+
+    async def connect(self, websocket):
+        await websocket.accept()
+        self.register(websocket)
+
+    def register(self, websocket) -> ClientChannel:
+        """Start a writer for an already-accepted websocket"""
+        channel = ClientChannel(websocket, self.max_queue, self.send_timeout, self._evict)
+        self.channels[websocket] = channel
+        channel.start()
+        return channel
+
+    def disconnect(self, websocket, close_code: Optional[int] = None):
+        channel = self.channels.pop(websocket, None)
+        if channel is not None:
+            channel.closed = True
+            task = asyncio.ensure_future(channel.close(close_code))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    def _evict(self, websocket):
+        if websocket in self.channels:
+            self.evicted += 1
+            self.disconnect(websocket, close_code=EVICTED_CLOSE_CODE)
+
+    async def broadcast(
+        self,
+        message: Dict,
+        coalesce_key: Optional[Hashable] = None,
+        websockets: Optional[Iterable] = None,
+        reliable: bool = False
+    ) -> int:
+        """
+        Queue a message for every connected client
+
+        Args:
+            message: JSON-serializable dict, encoded once
+            coalesce_key: If set, replaces any still-queued message with the
+                same key instead of queueing behind it
+            websockets: Only these clients, instead of all of them
+            reliable: Never drop this message; evict a client that has no
+                room for it instead
+
+        Returns:
+            Number of clients the message was queued for
+        """
+        return self.broadcast_nowait(message, coalesce_key, websockets, reliable)
+
+    def broadcast_nowait(
+        self,
+        message: Dict,
+        coalesce_key: Optional[Hashable] = None,
+        websockets: Optional[Iterable] = None,
+        reliable: bool = False
+    ) -> int:
+        """Synchronous broadcast(), for callers that must not yield between messages"""
+        if websockets is None:
+            channels = list(self.channels.values())
+        else:
+            channels = [self.channels[ws] for ws in websockets if ws in self.channels]
+        if not channels:
+            return 0
+        payload = encode_message(message)
+        for channel in channels:
+            channel.offer(payload, coalesce_key, reliable)
+        self.messages_broadcast += 1
+        return len(channels)
+
+    async def send(self, websocket, message: Dict, coalesce_key: Optional[Hashable] = None):
+        """Queue a message for one client, in order with its broadcasts"""
+        channel = self.channels.get(websocket)
+        if channel is not None:
+            channel.offer(encode_message(message), coalesce_key)
+
+    async def close(self):
+        channels = list(self.channels.values())
+        self.channels.clear()
+        await asyncio.gather(*(channel.close() for channel in channels))
+
+    def get_stats(self) -> Dict:
+        channels = list(self.channels.values())
+        return {
+            "connections": len(channels),
+            "messages_broadcast": self.messages_broadcast,
+            "evicted": self.evicted,
+            "sent": sum(c.sent for c in channels),
+            "dropped": sum(c.dropped for c in channels),
+            "coalesced": sum(c.coalesced for c in channels),
+            "max_queue_depth": max((c.queue_depth for c in channels), default=0),
+            "encoder": "orjson" if ORJSON_AVAILABLE else "json",
+        }
@@ -0,0 +1,382 @@
+"""
+Dashboard Change Feed
+Materialized in-memory views pushed to websocket clients as snapshot + deltas
+
+Every open dashboard used to re-poll /api/whales, /api/trades,
+/api/stats/summary and friends every few seconds, each poll recomputing
+the full result set from Postgres, so database load grew with the number
+of open tabs. Instead:
+
+- each topic ("whales", "trades", ...) keeps its rows in memory, loaded
+  once from the database on first subscription
+- services publish changes by key after they commit; the row is re-read
+  once per change (not once per dashboard) and applied to the view
+- subscribed clients get a snapshot, then typed deltas on the same
+  ordered per-client queue as every other message; both are sent
+  reliable, so a client that falls too far behind is evicted and
+  resubscribes on reconnect rather than silently missing a delta
+- derived topics (e.g. summary stats) are recomputed when a source topic
+  changes, at most once per min_refresh_interval
+- topics with a resync_interval are reloaded and re-snapshotted on a timer
+  while they have subscribers, which picks up writes the feed never heard
+  about and lets time-based values (trades_24h) age out
+
+Messages (JSON over /ws):
+    -> {"action": "subscribe", "topics": ["whales", "trades"]}
+    <- {"type": "snapshot", "topic": "trades", "seq": 41, "rows": [...]}
+    <- {"type": "delta", "topic": "trades", "seq": 42, "op": "upsert",
+        "key": "0xabc", "row": {...}}
+    <- {"type": "delta", "topic": "whales", "seq": 43, "op": "delete", "key": "0xdef"}
+    <- {"type": "snapshot", "topic": "stats", "seq": 44, "data": {...}}
+
+Whole-value topics (no key field, e.g. "stats") only ever send snapshots.
+
+Services running in worker threads (system_manager) call publish_threadsafe,
+which is a no-op when no feed is running in the process. Standalone runners
+(scripts/start_trade_monitor.py, ...) are such processes; their writes
+reach dashboards through the resync timer.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeOp(Enum):
+    UPSERT = "upsert"
+    DELETE = "delete"
+
+
+class TopicView:
+    """
+    Materialized rows for one topic
+
+    Rows are kept in insertion order. With max_rows set (e.g. a recent
+    trades list) the oldest row is evicted once the view is full;
+    newest_first controls the order rows are returned in.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        key_field: Optional[str],
+        load_all: Callable[[], Awaitable[Any]],
+        load_one: Optional[Callable[[Any], Awaitable[Optional[Dict]]]] = None,
+        max_rows: Optional[int] = None,
+        newest_first: bool = False,
+        refresh_on: Iterable[str] = (),
+        min_refresh_interval: float = 1.0,
+        resync_interval: Optional[float] = None,
+    ):
+        self.name = name
+        self.key_field = key_field
+        self.load_all = load_all
+        self.load_one = load_one
+        self.max_rows = max_rows
+        self.newest_first = newest_first
+        self.refresh_on = set(refresh_on)
+        self.min_refresh_interval = min_refresh_interval
+        self.resync_interval = resync_interval
+
+        self.rows: "OrderedDict[Any, Any]" = OrderedDict()
+        self.value: Any = None  # Whole-value topics (no key_field)
+        self.loaded = False
+        self.loading = False
+        self.lock = asyncio.Lock()
+        self.last_refresh = 0.0
+        self.refresh_task: Optional[asyncio.Task] = None
+        self.subscribers: Set = set()
+
+    @property
+    def keyed(self) -> bool:
+        return self.key_field is not None
+
+    def replace(self, loaded: Any):
+        if not self.keyed:
+            self.value = loaded
+            return
+        self.rows.clear()
+        rows = list(loaded or [])
+        for row in (reversed(rows) if self.newest_first else rows):
+            self.upsert(row[self.key_field], row)
+
+    def upsert(self, key, row: Dict):
+        if key in self.rows:
+            self.rows[key] = row
+            return
+        self.rows[key] = row
+        if self.max_rows is not None and len(self.rows) > self.max_rows:
+            self.rows.popitem(last=False)
+
+    def delete(self, key) -> bool:
+        return self.rows.pop(key, None) is not None
+
+    def snapshot(self) -> Any:
+        if not self.keyed:
+            return self.value
+        rows = list(self.rows.values())
+        return rows[::-1] if self.newest_first else rows
+
+
+class ChangeFeed:
+    """Topic registry, change application and client fan-out"""
+
+    def __init__(self, broadcaster=None, resync_check_interval: float = 1.0):
+        self.broadcaster = broadcaster
+        self.resync_check_interval = resync_check_interval
+        self.topics: Dict[str, TopicView] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._resync_task: Optional[asyncio.Task] = None
+        self.listeners: List[Callable[[str, Any], None]] = []
+        self._seq = itertools.count(1)
+        self.seq = 0
+
+        # Stats
+        self.changes_published = 0
+        self.rows_loaded = 0
+        self.full_loads = 0
+        self.resyncs = 0
+        self.task_errors = 0
+
+    def register(self, name: str, key_field: Optional[str], load_all, **kwargs) -> TopicView:
+        """
+        Register a topic
+
+        Args:
+            name: Topic name clients subscribe to
+            key_field: Row field used as the key; None for a whole-value
+                topic that is only ever refreshed
+            load_all: Async callable returning the full row list (or value)
+            load_one: Async callable returning one row by key, or None if
+                the row no longer belongs in the view
+            max_rows, newest_first: Bounded recent-items views
+            refresh_on: Topics whose changes trigger a full reload of this one
+            min_refresh_interval: Minimum seconds between such reloads
+            resync_interval: Reload from the source at least this often while
+                the topic has subscribers; None to rely on published changes
+        """
+        view = TopicView(name, key_field, load_all, **kwargs)
+        self.topics[name] = view
+        return view
+
+    def add_listener(self, callback: Callable[[str, Any], None]):
+        """
+        Call callback(topic, key) on every change, before views reload
+
+        Used to invalidate caches so views and dependents re-read fresh
+        data. key is None for whole-topic refreshes.
+        """
+        self.listeners.append(callback)
+
+    def _notify_listeners(self, topic: str, key):
+        for callback in self.listeners:
+            try:
+                callback(topic, key)
+            except Exception as e:
+                logger.error(f"Change feed listener error: {e}")
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Bind to the event loop so other threads can publish; starts the resync timer"""
+        self.loop = loop or asyncio.get_running_loop()
+        if self._resync_task is None and any(view.resync_interval for view in self.topics.values()):
+            self._resync_task = self.loop.create_task(self._resync_loop())
+
+    def stop(self):
+        self.loop = None
+        if self._resync_task is not None:
+            self._resync_task.cancel()
+            self._resync_task = None
+        for task in list(self._tasks):
+            task.cancel()
+
+    def _spawn(self, coro) -> asyncio.Task:
+        """Run coro in a task that is referenced until done and logged if it fails"""
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.task_errors += 1
+            logger.error(f"Change feed task failed: {task.exception()!r}")
+
+    def _next_seq(self) -> int:
+        self.seq = next(self._seq)
+        return self.seq
+
+    # ==================== Publishing ====================
+
+    async def publish(self, topic: str, key, row: Optional[Dict] = None, op: ChangeOp = ChangeOp.UPSERT):
+        """
+        Apply one change to a topic and push the delta to its subscribers
+
+        Without a row, an upsert re-reads the row with load_one; a None
+        result turns it into a delete.
+        """
+        self._notify_listeners(topic, key)
+        view = self.topics.get(topic)
+        if view is None or not view.keyed:
+            logger.debug(f"Ignoring change for unknown topic {topic}")
+            return
+        self.changes_published += 1
+
+        # While the first load is running the change is applied after it,
+        # so a row committed mid-load is not lost
+        if view.loaded or view.loading:
+            if op == ChangeOp.UPSERT and row is None and view.load_one is not None:
+                row = await view.load_one(key)
+                self.rows_loaded += 1
+                if row is None:
+                    op = ChangeOp.DELETE
+
+            async with view.lock:
+                if op == ChangeOp.DELETE:
+                    if view.delete(key):
+                        self._push_delta(view, op, key)
+                elif row is not None:
+                    view.upsert(key, row)
+                    self._push_delta(view, op, key, row)
+
+        self._schedule_dependents(topic)
+
+    def publish_threadsafe(self, topic: str, key, row: Optional[Dict] = None, op: ChangeOp = ChangeOp.UPSERT):
+        """Publish from a worker thread; no-op without a running feed"""
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(lambda: self._spawn(self.publish(topic, key, row, op)))
+
+    async def refresh(self, topic: str):
+        """Reload a topic from its source and send subscribers a new snapshot"""
+        self._notify_listeners(topic, None)
+        view = self.topics.get(topic)
+        if view is None:
+            return
+        if view.loaded:
+            await self._load(view, force=True)
+            self._push_snapshot(view, view.subscribers)
+        self._schedule_dependents(topic)
+
+    def _schedule_dependents(self, topic: str):
+        for view in self.topics.values():
+            if topic in view.refresh_on and view.loaded and view.refresh_task is None:
+                view.refresh_task = self._spawn(self._debounced_refresh(view))
+
+    async def _debounced_refresh(self, view: TopicView):
+        try:
+            wait = view.last_refresh + view.min_refresh_interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+        finally:
+            view.refresh_task = None
+        await self.refresh(view.name)
+
+    async def _resync_loop(self):
+        """Reload subscribed topics whose last load is older than their resync_interval"""
+        while True:
+            await asyncio.sleep(self.resync_check_interval)
+            now = time.monotonic()
+            for view in list(self.topics.values()):
+                if (
+                    view.resync_interval and view.loaded and view.subscribers
+                    and view.refresh_task is None
+                    and now - view.last_refresh >= view.resync_interval
+                ):
+                    self.resyncs += 1
+                    try:
+                        await self.refresh(view.name)
+                    except Exception as e:
+                        logger.error(f"Resync of {view.name} failed: {e}")
+                        view.last_refresh = now  # Retry after another interval
+
+    async def _load(self, view: TopicView, force: bool = False):
+        view.loading = True
+        try:
+            async with view.lock:
+                if view.loaded and not force:
+                    return
+                loaded = await view.load_all()
+                view.replace(loaded)
+                view.loaded = True
+                view.last_refresh = time.monotonic()
+                self.full_loads += 1
+        finally:
+            view.loading = False
+
+    # ==================== Subscriptions ====================
+
+    async def subscribe(self, websocket, topics: Iterable[str]) -> List[str]:
+        """Send snapshots for topics and start streaming their deltas"""
+        subscribed = []
+        for name in topics:
+            view = self.topics.get(name)
+            if view is None:
+                continue
+            await self._load(view)
+            # Snapshot and registration happen without an await in between,
+            # so the client sees every later delta and none twice
+            async with view.lock:
+                view.subscribers.add(websocket)
+                self._push_snapshot(view, [websocket])
+            subscribed.append(name)
+        return subscribed
+
+    def unsubscribe(self, websocket, topics: Optional[Iterable[str]] = None):
+        names = self.topics if topics is None else topics
+        for name in names:
+            view = self.topics.get(name)
+            if view is not None:
+                view.subscribers.discard(websocket)
+
+    def _push_snapshot(self, view: TopicView, websockets):
+        if not websockets or self.broadcaster is None:
+            return
+        message = {"type": "snapshot", "topic": view.name, "seq": self._next_seq()}
+        message["rows" if view.keyed else "data"] = view.snapshot()
+        self.broadcaster.broadcast_nowait(message, websockets=list(websockets), reliable=True)
+
+    def _push_delta(self, view: TopicView, op: ChangeOp, key, row: Optional[Dict] = None):
+        if not view.subscribers or self.broadcaster is None:
+            return
+        message = {"type": "delta", "topic": view.name, "seq": self._next_seq(), "op": op.value, "key": key}
+        if row is not None:
+            message["row"] = row
+        self.broadcaster.broadcast_nowait(message, websockets=list(view.subscribers), reliable=True)
+
+    def get_stats(self) -> Dict:
+        return {
+            "seq": self.seq,
+            "changes_published": self.changes_published,
+            "rows_loaded": self.rows_loaded,
+            "full_loads": self.full_loads,
+            "resyncs": self.resyncs,
+            "task_errors": self.task_errors,
+            "topics": {
+                name: {
+                    "loaded": view.loaded,
+                    "rows": len(view.rows) if view.keyed else None,
+                    "subscribers": len(view.subscribers),
+                }
+                for name, view in self.topics.items()
+            },
+        }
+
+
+_change_feed: Optional[ChangeFeed] = None
+
+
+def get_change_feed() -> ChangeFeed:
+    """Process-wide change feed shared by the API and in-process services"""
+    global _change_feed
+    if _change_feed is None:
+        _change_feed = ChangeFeed()
+    return _change_feed
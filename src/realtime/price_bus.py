@@ -0,0 +1,415 @@
+"""
+In-Process Price Bus
+One shared source of latest mid/bid/ask per token for every consumer
+
+P&L, SL/TP, paper trading and the API used to poll prices independently,
+each with its own cache, so the same token was fetched several times a
+second and components disagreed about the current price. The bus keeps
+the latest quote per token and:
+
+- ingests websocket price events (handle_ws_event)
+- falls back to REST for tokens whose quote is stale, with at most one
+  request in flight per token no matter how many callers ask (single-flight)
+- pushes changed quotes to subscribers, either callbacks or async
+  iterators that conflate to the latest quote per token
+
+Usage:
+    bus = get_price_bus(client)
+    ws_client.register_handler(EventType.PRICE_UPDATE, bus.handle_ws_event)
+    await bus.start()                        # REST refresh for stale tokens
+
+    quote = await bus.get_quote(token_id)    # cached if fresh, else fetched
+    bus.subscribe([token_id], on_quote)      # async callback(quote)
+    async for quote in bus.stream([token_id]):
+        ...
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PriceQuote:
+    """Latest known price for a token"""
+    token_id: str
+    mid: Decimal
+    bid: Optional[Decimal] = None
+    ask: Optional[Decimal] = None
+    source: str = "ws"  # "ws" or "rest"
+    timestamp: datetime = field(default_factory=datetime.now)
+    received_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def age_seconds(self) -> float:
+        return time.monotonic() - self.received_at
+
+
+def _to_decimal(value) -> Optional[Decimal]:
+    if value is None or value == "":
+        return None
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+# ==================== Subscriptions ====================
+
+class Subscription:
+    """Callback subscription; close() to stop receiving quotes"""
+
+    def __init__(self, bus: "PriceBus", token_ids: Optional[Set[str]],
+                 callback: Callable[[PriceQuote], Awaitable]):
+        self.bus = bus
+        self.token_ids = token_ids
+        self.callback = callback
+
+    async def deliver(self, quote: PriceQuote):
+        await self.callback(quote)
+
+    def close(self):
+        self.bus._unsubscribe(self)
+
+
+class PriceStream(Subscription):
+    """
+    Async iterator over quotes for a token set
+
+    Conflates: if the consumer falls behind, it gets the latest quote per
+    token rather than a backlog, so memory is bounded by the token count.
+    """
+
+    def __init__(self, bus: "PriceBus", token_ids: Optional[Set[str]]):
+        super().__init__(bus, token_ids, self._push)
+        self._pending: Dict[str, PriceQuote] = {}
+        self._ready = asyncio.Event()
+        self.closed = False
+
+    async def _push(self, quote: PriceQuote):
+        # Re-insert so the token moves to the back of the delivery order
+        self._pending.pop(quote.token_id, None)
+        self._pending[quote.token_id] = quote
+        self._ready.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> PriceQuote:
+        while not self._pending:
+            if self.closed:
+                raise StopAsyncIteration
+            self._ready.clear()
+            await self._ready.wait()
+        token_id = next(iter(self._pending))
+        return self._pending.pop(token_id)
+
+    def close(self):
+        super().close()
+        self.closed = True
+        self._ready.set()
+
+
+# ==================== Price Bus ====================
+
+class PriceBus:
+    """
+    Shared latest-price cache with websocket ingest and REST fallback
+
+    Args:
+        client: PolymarketClient (or anything with get_midpoint(token_id))
+        stale_after: Seconds before a quote is considered stale
+        refresh_interval: Seconds between REST refreshes of stale
+            subscribed tokens while started
+    """
+
+    def __init__(self, client=None, stale_after: float = 5.0, refresh_interval: float = 1.0):
+        self.client = client
+        self.stale_after = stale_after
+        self.refresh_interval = refresh_interval
+
+        self.quotes: Dict[str, PriceQuote] = {}
+        self._subscribers: Dict[Optional[str], Set[Subscription]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        self.is_running = False
+        self.refresh_task: Optional[asyncio.Task] = None
+
+        # Stats
+        self.ws_updates = 0
+        self.rest_requests = 0
+        self.rest_errors = 0
+        self.deduplicated_requests = 0
+        self.quotes_published = 0
+
+    # ==================== Lifecycle ====================
+
+    async def start(self):
+        """Start refreshing stale subscribed tokens over REST"""
+        if self.is_running:
+            return
+        self.is_running = True
+        self.refresh_task = asyncio.create_task(self._refresh_loop())
+        logger.info(f"PriceBus started: stale_after={self.stale_after}s")
+
+    async def stop(self):
+        if not self.is_running:
+            return
+        self.is_running = False
+        if self.refresh_task:
+            self.refresh_task.cancel()
+            try:
+                await self.refresh_task
+            except asyncio.CancelledError:
+                pass
+        logger.info(f"PriceBus stopped | {self.get_stats()}")
+
+    async def _refresh_loop(self):
+        while self.is_running:
+            try:
+                stale = [
+                    token_id for token_id in self.subscribed_tokens()
+                    if not self._is_fresh(token_id, self.stale_after)
+                ]
+                if stale:
+                    await self.refresh(stale)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in price refresh loop: {e}", exc_info=True)
+
+            try:
+                await asyncio.sleep(self.refresh_interval)
+            except asyncio.CancelledError:
+                break
+
+    # ==================== Publishing ====================
+
+    async def publish(
+        self,
+        token_id: str,
+        mid=None,
+        bid=None,
+        ask=None,
+        source: str = "ws"
+    ) -> Optional[PriceQuote]:
+        """
+        Record a price and notify subscribers if it changed
+
+        mid defaults to the bid/ask midpoint when only the touch is known.
+        """
+        bid, ask, mid = _to_decimal(bid), _to_decimal(ask), _to_decimal(mid)
+        if mid is None:
+            if bid is None or ask is None:
+                return None
+            mid = (bid + ask) / 2
+
+        previous = self.quotes.get(token_id)
+        quote = PriceQuote(token_id=token_id, mid=mid, bid=bid, ask=ask, source=source)
+        self.quotes[token_id] = quote
+
+        if previous and (previous.mid, previous.bid, previous.ask) == (mid, bid, ask):
+            # Same price re-confirmed: fresher timestamp, nothing to push
+            return quote
+
+        self.quotes_published += 1
+        for subscription in self._subscriptions_for(token_id):
+            try:
+                await subscription.deliver(quote)
+            except Exception as e:
+                logger.error(f"Price subscriber error for {token_id}: {e}")
+        return quote
+
+    async def handle_ws_event(self, event):
+        """PRICE_UPDATE handler for the websocket clients (StreamEvent)"""
+        data = event.data
+        token_id = data.get("asset_id") or data.get("token_id")
+        if not token_id:
+            return
+        self.ws_updates += 1
+        await self.publish(
+            token_id,
+            mid=data.get("price") if data.get("price") is not None else data.get("mid"),
+            bid=data.get("best_bid"),
+            ask=data.get("best_ask"),
+            source="ws"
+        )
+
+    # ==================== Reads ====================
+
+    def latest(self, token_id: str) -> Optional[PriceQuote]:
+        """Latest quote without any fetching, however old"""
+        return self.quotes.get(token_id)
+
+    async def get_quote(self, token_id: str, max_age: Optional[float] = None) -> PriceQuote:
+        """
+        Latest quote, fetched over REST if older than max_age
+
+        Falls back to the last known quote if the fetch fails.
+
+        Raises:
+            LookupError: No quote is known and the fetch failed
+        """
+        max_age = self.stale_after if max_age is None else max_age
+        if self._is_fresh(token_id, max_age):
+            return self.quotes[token_id]
+
+        try:
+            return await self._fetch(token_id)
+        except Exception as e:
+            cached = self.quotes.get(token_id)
+            if cached is not None:
+                logger.warning(f"Price fetch failed for {token_id}, using {cached.age_seconds:.1f}s old quote: {e}")
+                return cached
+            raise LookupError(f"No price available for {token_id}") from e
+
+    async def get_quotes(self, token_ids: Iterable[str], max_age: Optional[float] = None) -> Dict[str, PriceQuote]:
+        """Quotes for several tokens; tokens with no price are omitted"""
+        token_ids = list(dict.fromkeys(token_ids))
+        results = await asyncio.gather(
+            *(self.get_quote(token_id, max_age) for token_id in token_ids),
+            return_exceptions=True
+        )
+        quotes = {}
+        for token_id, result in zip(token_ids, results):
+            if isinstance(result, PriceQuote):
+                quotes[token_id] = result
+            else:
+                logger.error(f"Failed to get price for {token_id}: {result}")
+        return quotes
+
+    async def refresh(self, token_ids: Iterable[str]):
+        """Force a REST fetch for tokens (still one request per token in flight)"""
+        await asyncio.gather(*(self._fetch(token_id) for token_id in token_ids), return_exceptions=True)
+
+    def as_market_data_fn(self, resolve_token: Callable[[str, str], Awaitable[str]]):
+        """
+        Adapter for PaperTradingEngine(market_data_fn=...)
+
+        Args:
+            resolve_token: async (market_id, outcome) -> token_id
+        """
+        async def market_data_fn(market_id: str, outcome: str) -> Optional[float]:
+            token_id = await resolve_token(market_id, outcome)
+            if not token_id:
+                return None
+            return float((await self.get_quote(token_id)).mid)
+        return market_data_fn
+
+    def _is_fresh(self, token_id: str, max_age: float) -> bool:
+        quote = self.quotes.get(token_id)
+        return quote is not None and quote.age_seconds < max_age
+
+    async def _fetch(self, token_id: str) -> PriceQuote:
+        task = self._inflight.get(token_id)
+        if task is not None:
+            self.deduplicated_requests += 1
+        else:
+            # The fetch runs in its own task, so a cancelled caller can't
+            # leave the others waiting on a request that never resolves
+            task = asyncio.get_running_loop().create_task(self._fetch_rest(token_id))
+            self._inflight[token_id] = task
+            task.add_done_callback(functools.partial(self._fetch_done, token_id))
+        return await asyncio.shield(task)
+
+    async def _fetch_rest(self, token_id: str) -> PriceQuote:
+        try:
+            if self.client is None:
+                raise RuntimeError("PriceBus has no REST client")
+            self.rest_requests += 1
+            # The CLOB client is synchronous; keep it off the event loop
+            mid = await asyncio.to_thread(self.client.get_midpoint, token_id)
+            if isinstance(mid, dict):
+                mid = mid.get("mid")
+            quote = await self.publish(token_id, mid=mid, source="rest")
+            if quote is None:
+                raise ValueError(f"Empty midpoint for {token_id}")
+            return quote
+        except Exception:
+            self.rest_errors += 1
+            raise
+
+    def _fetch_done(self, token_id: str, task: asyncio.Task):
+        if self._inflight.get(token_id) is task:
+            del self._inflight[token_id]
+        # Waiters re-raise it; mark retrieved so an unwaited failure isn't logged
+        if not task.cancelled():
+            task.exception()
+
+    # ==================== Subscriptions ====================
+
+    def subscribe(
+        self,
+        token_ids: Optional[Iterable[str]],
+        callback: Callable[[PriceQuote], Awaitable]
+    ) -> Subscription:
+        """
+        Call `callback(quote)` whenever a quote for these tokens changes
+
+        token_ids=None subscribes to every token.
+        """
+        subscription = Subscription(self, set(token_ids) if token_ids is not None else None, callback)
+        self._register(subscription)
+        return subscription
+
+    def stream(self, token_ids: Optional[Iterable[str]] = None) -> PriceStream:
+        """Async iterator of changed quotes for these tokens (None = all)"""
+        stream = PriceStream(self, set(token_ids) if token_ids is not None else None)
+        self._register(stream)
+        return stream
+
+    def subscribed_tokens(self) -> List[str]:
+        return [token_id for token_id in self._subscribers if token_id is not None]
+
+    def _register(self, subscription: Subscription):
+        keys = subscription.token_ids if subscription.token_ids is not None else [None]
+        for key in keys:
+            self._subscribers.setdefault(key, set()).add(subscription)
+
+    def _unsubscribe(self, subscription: Subscription):
+        keys = subscription.token_ids if subscription.token_ids is not None else [None]
+        for key in keys:
+            subscribers = self._subscribers.get(key)
+            if subscribers is None:
+                continue
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[key]
+
+    def _subscriptions_for(self, token_id: str) -> List[Subscription]:
+        return list(self._subscribers.get(token_id, ())) + list(self._subscribers.get(None, ()))
+
+    def get_stats(self) -> Dict:
+        return {
+            "tokens": len(self.quotes),
+            "subscribed_tokens": len(self.subscribed_tokens()),
+            "ws_updates": self.ws_updates,
+            "rest_requests": self.rest_requests,
+            "rest_errors": self.rest_errors,
+            "deduplicated_requests": self.deduplicated_requests,
+            "quotes_published": self.quotes_published,
+        }
+
+
+# ==================== Shared Instance ====================
+
+_price_bus: Optional[PriceBus] = None
+
+
+def get_price_bus(client=None) -> PriceBus:
+    """
+    Process-wide bus shared by all price consumers
+
+    The first call fixes the REST client; later calls return the same bus
+    (and attach `client` if the bus was created without one).
+    """
+    global _price_bus
+    if _price_bus is None:
+        _price_bus = PriceBus(client)
+    elif _price_bus.client is None and client is not None:
+        _price_bus.client = client
+    return _price_bus
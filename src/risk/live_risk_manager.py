@@ -11,6 +11,8 @@ from decimal import Decimal
 import numpy as np
 from enum import Enum
 
+from libs.analytics.streaming_moments import RollingMoments, RunningMoments, SampleMoments
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,10 +55,14 @@ class LiveRiskManager:
     Implements Cornish-Fisher VaR, dynamic Kelly sizing, and circuit breakers
     """
 
+    MAX_TRADE_HISTORY = 1000
+
     def __init__(self, config: Dict = None):
         self.config = config or self._default_config()
         self.positions = {}
         self.trade_history = []
+        # Portfolio returns between recorded trades, updated in O(1) per trade
+        self.return_moments = RollingMoments(window=self.MAX_TRADE_HISTORY - 1)
         self.risk_metrics = None
         self.circuit_breaker_triggered = False
         self.last_risk_check = datetime.now()
@@ -99,13 +105,13 @@ class LiveRiskManager:
         returns = self._calculate_returns()
 
         # Calculate VaR using Cornish-Fisher expansion
-        var_95, cvar_95 = self._cornish_fisher_var(returns)
+        var_95, cvar_95 = self._cornish_fisher_var(returns, moments=self.return_moments)
 
         # Calculate current drawdown
         current_drawdown = self._calculate_drawdown()
 
         # Calculate Sharpe ratio
-        sharpe_ratio = self._calculate_sharpe(returns)
+        sharpe_ratio = self._calculate_sharpe(returns, moments=self.return_moments)
 
         # Calculate Kelly fraction
         kelly_fraction = self._calculate_kelly(returns)
@@ -131,10 +137,18 @@ class LiveRiskManager:
         self.risk_metrics = metrics
         return metrics
 
-    def _cornish_fisher_var(self, returns: np.ndarray, confidence: float = 0.95) -> Tuple[Decimal, Decimal]:
+    def _cornish_fisher_var(
+        self,
+        returns: np.ndarray,
+        confidence: float = 0.95,
+        moments: Optional[SampleMoments] = None
+    ) -> Tuple[Decimal, Decimal]:
         """
         Calculate VaR using Cornish-Fisher expansion
         Accounts for skewness and kurtosis in return distribution
+
+        Moments come from the streaming estimator when given; the returns
+        are only walked for the empirical CVaR tail.
         """
         if len(returns) < 30:
             # Not enough data, use simple percentile
@@ -142,11 +156,14 @@ class LiveRiskManager:
             cvar = np.mean(returns[returns <= var])
             return Decimal(str(abs(var))), Decimal(str(abs(cvar)))
 
-        # Calculate moments
-        mean = np.mean(returns)
-        std = np.std(returns)
-        skew = self._skewness(returns)
-        kurt = self._kurtosis(returns)
+        if moments is None:
+            moments = RunningMoments.from_values(returns)
+
+        # Moments
+        mean = moments.mean
+        std = moments.std()
+        skew = moments.skewness
+        excess_kurt = moments.excess_kurtosis
 
         # Standard normal quantile
         from scipy.stats import norm
@@ -154,7 +171,7 @@ class LiveRiskManager:
 
         # Cornish-Fisher expansion
         cf_z = z + (z**2 - 1) * skew / 6 + \
-               (z**3 - 3*z) * (kurt - 3) / 24 - \
+               (z**3 - 3*z) * excess_kurt / 24 - \
                (2*z**3 - 5*z) * skew**2 / 36
 
         # Calculate VaR
@@ -167,36 +184,9 @@ class LiveRiskManager:
 
         return Decimal(str(abs(var))), Decimal(str(abs(cvar)))
 
-    def _skewness(self, returns: np.ndarray) -> float:
-        """Calculate skewness of returns"""
-        mean = np.mean(returns)
-        std = np.std(returns)
-        if std == 0:
-            return 0
-        return np.mean(((returns - mean) / std) ** 3)
-
-    def _kurtosis(self, returns: np.ndarray) -> float:
-        """Calculate excess kurtosis of returns"""
-        mean = np.mean(returns)
-        std = np.std(returns)
-        if std == 0:
-            return 0
-        return np.mean(((returns - mean) / std) ** 4)
-
     def _calculate_returns(self) -> np.ndarray:
-        """Calculate portfolio returns from trade history"""
-        if len(self.trade_history) < 2:
-            return np.array([])
-
-        returns = []
-        for i in range(1, len(self.trade_history)):
-            prev_value = self.trade_history[i-1]["portfolio_value"]
-            curr_value = self.trade_history[i]["portfolio_value"]
-            if prev_value > 0:
-                ret = float((curr_value - prev_value) / prev_value)
-                returns.append(ret)
-
-        return np.array(returns)
+        """Portfolio returns between consecutive recorded trades (oldest first)"""
+        return self.return_moments.values()
 
     def _calculate_drawdown(self) -> Decimal:
         """Calculate current drawdown from peak"""
@@ -211,14 +201,23 @@ class LiveRiskManager:
             return (peak - current) / peak
         return Decimal(0)
 
-    def _calculate_sharpe(self, returns: np.ndarray, risk_free: float = 0.02) -> float:
+    def _calculate_sharpe(
+        self,
+        returns: np.ndarray,
+        risk_free: float = 0.02,
+        moments: Optional[SampleMoments] = None
+    ) -> float:
         """Calculate Sharpe ratio"""
         if len(returns) < 2:
             return 0.0
 
-        excess_returns = returns - risk_free / 252  # Daily risk-free rate
-        if np.std(excess_returns) > 0:
-            return np.mean(excess_returns) / np.std(excess_returns) * np.sqrt(252)
+        if moments is None:
+            moments = RunningMoments.from_values(returns)
+
+        # Shifting by the daily risk-free rate leaves the std unchanged
+        std = moments.std()
+        if std > 0:
+            return (moments.mean - risk_free / 252) / std * np.sqrt(252)
         return 0.0
 
     def _calculate_kelly(self, returns: np.ndarray) -> float:
@@ -428,14 +427,20 @@ class LiveRiskManager:
 
     def record_trade(self, trade: Dict):
         """Record trade for risk calculations"""
+        if self.trade_history:
+            prev_value = self.trade_history[-1].get("portfolio_value")
+            curr_value = trade.get("portfolio_value")
+            if prev_value and prev_value > 0 and curr_value is not None:
+                self.return_moments.update(float((curr_value - prev_value) / prev_value))
+
         self.trade_history.append({
             **trade,
             "timestamp": datetime.now()
         })
 
         # Keep only recent history (e.g., last 1000 trades)
-        if len(self.trade_history) > 1000:
-            self.trade_history = self.trade_history[-1000:]
+        if len(self.trade_history) > self.MAX_TRADE_HISTORY:
+            self.trade_history = self.trade_history[-self.MAX_TRADE_HISTORY:]
 
     def get_risk_report(self, portfolio_value: Decimal) -> Dict:
         """Generate comprehensive risk report"""
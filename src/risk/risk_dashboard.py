@@ -12,6 +12,8 @@ from datetime import datetime, timedelta
 import numpy as np
 from collections import defaultdict
 
+from libs.analytics.streaming_moments import RollingMoments, RunningMoments
+
 logger = logging.getLogger(__name__)
 
 
@@ -118,6 +120,11 @@ class RiskDashboard:
         self.portfolio_history: List[PortfolioSnapshot] = []
         self.daily_returns: List[Decimal] = []
 
+        # Streaming moments over the last year of returns, and over the
+        # negative returns within it for downside deviation
+        self.return_moments = RollingMoments(window=252)
+        self.downside_moments = RunningMoments()
+
         # Current state
         self.current_positions: Dict = {}
         self.alerts: List[Alert] = []
@@ -159,6 +166,7 @@ class RiskDashboard:
             if prev_value > 0:
                 daily_return = (total_value - prev_value) / prev_value
                 self.daily_returns.append(daily_return)
+                self._update_return_moments(float(daily_return))
 
         # Update peak for drawdown calculation
         if total_value > self.peak_value:
@@ -342,6 +350,14 @@ class RiskDashboard:
 
     # ==================== Private Methods ====================
 
+    def _update_return_moments(self, daily_return: float):
+        """Fold a new return into the window, retiring whatever it evicts"""
+        evicted = self.return_moments.update(daily_return)
+        if daily_return < 0:
+            self.downside_moments.update(daily_return)
+        if evicted is not None and evicted < 0:
+            self.downside_moments.remove(evicted)
+
     def _calculate_var(self) -> Tuple[Decimal, Decimal]:
         """
         Calculate Value at Risk (VaR) at 95% and 99% confidence
@@ -353,7 +369,7 @@ class RiskDashboard:
             # Need minimum 30 days of data
             return Decimal("0"), Decimal("0")
 
-        returns_array = np.array([float(r) for r in self.daily_returns[-252:]])  # Last year
+        returns_array = self.return_moments.values()  # Last year
 
         # Calculate historical VaR (non-parametric)
         var_95 = np.percentile(returns_array, 5)  # 5th percentile
@@ -377,10 +393,8 @@ class RiskDashboard:
         if len(self.daily_returns) < 30:
             return Decimal("0")
 
-        returns_array = np.array([float(r) for r in self.daily_returns[-252:]])
-
-        mean_return = Decimal(str(np.mean(returns_array)))
-        std_dev = Decimal(str(np.std(returns_array)))
+        mean_return = Decimal(str(self.return_moments.mean))
+        std_dev = Decimal(str(self.return_moments.std()))
 
         if std_dev == 0:
             return Decimal("0")
@@ -401,16 +415,13 @@ class RiskDashboard:
         if len(self.daily_returns) < 30:
             return Decimal("0")
 
-        returns_array = np.array([float(r) for r in self.daily_returns[-252:]])
-
-        mean_return = Decimal(str(np.mean(returns_array)))
+        mean_return = Decimal(str(self.return_moments.mean))
 
         # Calculate downside deviation (only negative returns)
-        negative_returns = returns_array[returns_array < 0]
-        if len(negative_returns) == 0:
+        if len(self.downside_moments) == 0:
             return Decimal("999")  # Perfect (no downside)
 
-        downside_std = Decimal(str(np.std(negative_returns)))
+        downside_std = Decimal(str(self.downside_moments.std()))
 
         if downside_std == 0:
             return Decimal("0")
@@ -447,8 +458,7 @@ class RiskDashboard:
         if len(self.daily_returns) < 30:
             return Decimal("0")
 
-        returns_array = np.array([float(r) for r in self.daily_returns[-252:]])
-        volatility = Decimal(str(np.std(returns_array)))
+        volatility = Decimal(str(self.return_moments.std()))
 
         return volatility
 
@@ -18,6 +18,7 @@ from src.trading.production_position_manager import (
     PositionStatus,
     CloseReason
 )
+from src.risk.trigger_index import PriceTrigger, TriggerDirection, TriggerIndex
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +46,11 @@ class RiskControlLimits:
     # Check frequency
     check_interval_seconds: float = 5.0  # Check every 5 seconds
 
+    # Price-driven exits: SL/TP/trailing fire from on_price_update() via the
+    # trigger index, and the timer loop only arms new positions and checks
+    # pre-resolution exits. False restores full-scan polling.
+    price_driven: bool = True
+
 
 class ExitTrigger(Enum):
     """Reasons for position exit"""
@@ -68,6 +74,11 @@ class ExitEvent:
     reason: str
 
 
+# Internal trailing-stop trigger kinds (exits use ExitTrigger values)
+TRAILING_ACTIVATION = "TRAILING_ACTIVATION"
+TRAILING_RATCHET = "TRAILING_RATCHET"
+
+
 @dataclass
 class TrailingStopState:
     """State tracking for trailing stop"""
@@ -114,6 +125,9 @@ class StopLossTakeProfitManager:
         # Exit event history
         self.exit_events: List[ExitEvent] = []
 
+        # Armed price thresholds per token (price-driven mode)
+        self.trigger_index = TriggerIndex()
+
         # Monitoring state
         self.is_running = False
         self.monitor_task: Optional[asyncio.Task] = None
@@ -168,13 +182,18 @@ class StopLossTakeProfitManager:
                     await asyncio.sleep(self.limits.check_interval_seconds)
                     continue
 
-                # Check each position for exit triggers
-                check_tasks = [
-                    self._check_position_triggers(position)
-                    for position in open_positions
-                ]
+                if self.limits.price_driven:
+                    # Price thresholds fire from on_price_update(); only
+                    # arming and time-based exits need the timer
+                    await self._reconcile_positions(open_positions)
+                else:
+                    # Check each position for exit triggers
+                    check_tasks = [
+                        self._check_position_triggers(position)
+                        for position in open_positions
+                    ]
 
-                await asyncio.gather(*check_tasks, return_exceptions=True)
+                    await asyncio.gather(*check_tasks, return_exceptions=True)
 
                 # Log periodic stats
                 if len(self.exit_events) > 0:
@@ -194,6 +213,198 @@ class StopLossTakeProfitManager:
             except asyncio.CancelledError:
                 break
 
+    # ==================== Price-Driven Triggers ====================
+
+    def arm_position(self, position: Position):
+        """
+        Arm stop-loss, take-profit and trailing thresholds for a position
+
+        Thresholds are prices equivalent to the P&L percentage checks in
+        _check_position_triggers. Safe to call repeatedly.
+        """
+        if self.trigger_index.is_armed(position.position_id):
+            return
+
+        position_id = position.position_id
+        token_id = position.token_id
+        entry = position.entry_price
+
+        self.trigger_index.arm(
+            position_id, token_id, ExitTrigger.STOP_LOSS.value, TriggerDirection.BELOW,
+            entry * (Decimal("1") + self.limits.stop_loss_pct)
+        )
+        self.trigger_index.arm(
+            position_id, token_id, ExitTrigger.TAKE_PROFIT.value, TriggerDirection.ABOVE,
+            entry * (Decimal("1") + self.limits.take_profit_pct)
+        )
+
+        if not self.limits.trailing_stop_enabled:
+            return
+
+        trailing_state = self.trailing_stops.get(position_id)
+        if trailing_state and trailing_state.activated:
+            self._arm_trailing_stop(position, trailing_state)
+        else:
+            self.trigger_index.arm(
+                position_id, token_id, TRAILING_ACTIVATION, TriggerDirection.ABOVE,
+                entry * (Decimal("1") + self.limits.trailing_stop_activation_pct)
+            )
+
+    def _arm_trailing_stop(self, position: Position, trailing_state: TrailingStopState):
+        self.trigger_index.arm(
+            position.position_id, position.token_id, ExitTrigger.TRAILING_STOP.value,
+            TriggerDirection.BELOW, trailing_state.current_stop_price
+        )
+        # Fires on a new high so the stop can be moved up
+        self.trigger_index.arm(
+            position.position_id, position.token_id, TRAILING_RATCHET,
+            TriggerDirection.ABOVE, trailing_state.highest_price
+        )
+
+    async def on_price_update(self, token_id: str, price: Decimal) -> List[ExitEvent]:
+        """
+        Fire exits crossed by a new price for a token
+
+        Feed this from RealtimePnLEngine.add_price_listener() or a websocket
+        PRICE_UPDATE handler. Callers should update the position's
+        current_price first, since exits close at position.current_price.
+
+        Returns:
+            Exit events recorded for this update
+        """
+        fired = self.trigger_index.on_price(token_id, price)
+        if not fired:
+            return []
+
+        by_position: Dict[str, List[PriceTrigger]] = {}
+        for trigger in fired:
+            by_position.setdefault(trigger.position_id, []).append(trigger)
+
+        events_before = len(self.exit_events)
+        for position_id, triggers in by_position.items():
+            position = self.position_manager.positions.get(position_id)
+            if position is None or position.status != PositionStatus.OPEN:
+                self.trigger_index.disarm_position(position_id)
+                continue
+            await self._handle_fired_triggers(position, triggers, price)
+
+        return self.exit_events[events_before:]
+
+    async def handle_price_event(self, event):
+        """Websocket PRICE_UPDATE handler (StreamEvent with asset_id/price data)"""
+        token_id = event.data.get("asset_id") or event.data.get("token_id")
+        price = event.data.get("price")
+        if token_id and price is not None:
+            await self.on_price_update(token_id, Decimal(str(price)))
+
+    async def _handle_fired_triggers(
+        self,
+        position: Position,
+        triggers: List[PriceTrigger],
+        price: Decimal
+    ):
+        kinds = {trigger.kind: trigger for trigger in triggers}
+
+        # Same precedence as _check_position_triggers
+        if ExitTrigger.STOP_LOSS.value in kinds:
+            trigger = kinds[ExitTrigger.STOP_LOSS.value]
+            await self._exit_or_rearm(
+                position, ExitTrigger.STOP_LOSS,
+                f"Stop-loss hit: price ${float(price):.4f} <= ${float(trigger.threshold):.4f}"
+            )
+            return
+
+        if ExitTrigger.TAKE_PROFIT.value in kinds:
+            trigger = kinds[ExitTrigger.TAKE_PROFIT.value]
+            await self._exit_or_rearm(
+                position, ExitTrigger.TAKE_PROFIT,
+                f"Take-profit hit: price ${float(price):.4f} >= ${float(trigger.threshold):.4f}"
+            )
+            return
+
+        if TRAILING_ACTIVATION in kinds:
+            trailing_state = TrailingStopState(
+                position_id=position.position_id,
+                activated=True,
+                highest_price=price,
+                current_stop_price=price * (Decimal("1") - self.limits.trailing_stop_distance_pct)
+            )
+            self.trailing_stops[position.position_id] = trailing_state
+            self._arm_trailing_stop(position, trailing_state)
+            logger.info(
+                f"Trailing stop activated for {position.position_id}: "
+                f"stop @ ${float(trailing_state.current_stop_price):.4f}"
+            )
+            return
+
+        trailing_state = self.trailing_stops.get(position.position_id)
+        if trailing_state is None:
+            return
+
+        if ExitTrigger.TRAILING_STOP.value in kinds:
+            await self._exit_or_rearm(
+                position, ExitTrigger.TRAILING_STOP,
+                f"Trailing stop hit: price ${float(price):.4f} "
+                f"<= stop ${float(trailing_state.current_stop_price):.4f}"
+            )
+            return
+
+        if TRAILING_RATCHET in kinds:
+            if price > trailing_state.highest_price:
+                trailing_state.highest_price = price
+                new_stop = price * (Decimal("1") - self.limits.trailing_stop_distance_pct)
+
+                # Only move stop up, never down
+                if new_stop > trailing_state.current_stop_price:
+                    old_stop = trailing_state.current_stop_price
+                    trailing_state.current_stop_price = new_stop
+                    for trigger in self.trigger_index.get_triggers(position.position_id):
+                        if trigger.kind == ExitTrigger.TRAILING_STOP.value:
+                            self.trigger_index.disarm(trigger)
+                    self.trigger_index.arm(
+                        position.position_id, position.token_id, ExitTrigger.TRAILING_STOP.value,
+                        TriggerDirection.BELOW, new_stop
+                    )
+                    logger.info(
+                        f"Trailing stop moved up for {position.position_id}: "
+                        f"${float(old_stop):.4f} → ${float(new_stop):.4f}"
+                    )
+
+            self.trigger_index.arm(
+                position.position_id, position.token_id, TRAILING_RATCHET,
+                TriggerDirection.ABOVE, trailing_state.highest_price
+            )
+
+    async def _exit_or_rearm(self, position: Position, trigger: ExitTrigger, reason: str):
+        """Exit; if the close fails, re-arm so the next price update retries"""
+        self.trigger_index.disarm_position(position.position_id)
+        if not await self._execute_exit(position, trigger, reason):
+            self.arm_position(position)
+
+    async def _reconcile_positions(self, open_positions: List[Position]):
+        """Arm newly opened positions, drop closed ones, check time-based exits"""
+        open_ids = set()
+        for position in open_positions:
+            open_ids.add(position.position_id)
+
+            if self.limits.pre_resolution_exit_enabled:
+                should_exit, reason = self._should_pre_resolution_exit(position)
+                if should_exit:
+                    await self._exit_or_rearm(position, ExitTrigger.PRE_RESOLUTION, reason)
+                    continue
+
+            self.arm_position(position)
+
+        for position_id in list(self.trailing_stops):
+            if position_id not in open_ids:
+                del self.trailing_stops[position_id]
+        stale = [
+            position_id for position_id in self.trigger_index.armed_positions()
+            if position_id not in open_ids
+        ]
+        for position_id in stale:
+            self.trigger_index.disarm_position(position_id)
+
     async def _check_position_triggers(self, position: Position):
         """
         Check if position should be exited based on triggers
@@ -345,6 +556,9 @@ class StopLossTakeProfitManager:
             position: Position to exit
             trigger: Exit trigger reason
             reason: Human-readable reason
+
+        Returns:
+            True if the position was closed
         """
         try:
             # Map trigger to CloseReason
@@ -380,21 +594,25 @@ class StopLossTakeProfitManager:
                 )
                 self.exit_events.append(exit_event)
 
-                # Clean up trailing stop state
+                # Clean up trailing stop state and any armed triggers
                 if position.position_id in self.trailing_stops:
                     del self.trailing_stops[position.position_id]
+                self.trigger_index.disarm_position(position.position_id)
 
                 logger.info(
                     f"Position {position.position_id} auto-closed: "
                     f"{trigger.value} | P&L: ${float(position.realized_pnl):.2f} "
                     f"({float(position.pnl_percentage):.2f}%)"
                 )
-            else:
-                logger.error(f"Failed to close position {position.position_id}")
+                return True
+
+            logger.error(f"Failed to close position {position.position_id}")
 
         except Exception as e:
             logger.error(f"Error executing exit for {position.position_id}: {e}", exc_info=True)
 
+        return False
+
     async def emergency_exit_all(self, reason: str):
         """
         Emergency exit all open positions
@@ -0,0 +1,203 @@
+"""
+Price Trigger Index for Event-Driven Exits
+Sorted per-token stop-loss / take-profit / trailing thresholds
+
+Instead of re-checking every open position on a timer, exit thresholds are
+armed once and kept sorted per token. A price update for a token then
+finds exactly the triggers it crossed with one binary search per side:
+
+    BELOW triggers fire when price <= threshold (stop-losses, trailing stops)
+    ABOVE triggers fire when price >= threshold (take-profits, trailing
+    activation and high-water ratchets)
+
+Fired triggers are one-shot: they are removed from the index and returned
+to the caller, which re-arms them if needed (e.g. moving a trailing stop).
+"""
+
+import bisect
+import itertools
+from dataclasses import dataclass, field
+from decimal import Decimal
+from enum import Enum
+from typing import Dict, List, Optional
+
+
+class TriggerDirection(Enum):
+    """Which side of the threshold fires the trigger"""
+    BELOW = "BELOW"
+    ABOVE = "ABOVE"
+
+
+@dataclass
+class PriceTrigger:
+    """One armed price threshold for a position"""
+    position_id: str
+    token_id: str
+    kind: str
+    direction: TriggerDirection
+    threshold: Decimal
+    metadata: Dict = field(default_factory=dict)
+    seq: int = 0
+
+
+class _SortedTriggers:
+    """Triggers for one token and direction, sorted by (threshold, seq)"""
+
+    __slots__ = ("keys", "triggers")
+
+    def __init__(self):
+        self.keys: List[tuple] = []
+        self.triggers: List[PriceTrigger] = []
+
+    def add(self, trigger: PriceTrigger):
+        key = (trigger.threshold, trigger.seq)
+        i = bisect.bisect_left(self.keys, key)
+        self.keys.insert(i, key)
+        self.triggers.insert(i, trigger)
+
+    def remove(self, trigger: PriceTrigger) -> bool:
+        i = bisect.bisect_left(self.keys, (trigger.threshold, trigger.seq))
+        if i < len(self.triggers) and self.triggers[i] is trigger:
+            del self.keys[i]
+            del self.triggers[i]
+            return True
+        return False
+
+    def pop_at_or_above(self, price: Decimal) -> List[PriceTrigger]:
+        # Every threshold >= price: the tail of the list
+        i = bisect.bisect_left(self.keys, (price,))
+        fired = self.triggers[i:]
+        del self.keys[i:]
+        del self.triggers[i:]
+        return fired
+
+    def pop_at_or_below(self, price: Decimal) -> List[PriceTrigger]:
+        # Every threshold <= price: the head of the list
+        i = bisect.bisect_right(self.keys, (price, float("inf")))
+        fired = self.triggers[:i]
+        del self.keys[:i]
+        del self.triggers[:i]
+        return fired
+
+    def __len__(self) -> int:
+        return len(self.triggers)
+
+
+class TriggerIndex:
+    """
+    Price triggers for all open positions, indexed by token
+
+    Arming, disarming and firing are O(log n) searches plus list
+    insert/delete, and a price update touches only its own token.
+    """
+
+    def __init__(self):
+        self._below: Dict[str, _SortedTriggers] = {}
+        self._above: Dict[str, _SortedTriggers] = {}
+        self._by_position: Dict[str, List[PriceTrigger]] = {}
+        self._seq = itertools.count()
+
+        # Stats
+        self.price_updates = 0
+        self.triggers_fired = 0
+
+    def arm(
+        self,
+        position_id: str,
+        token_id: str,
+        kind: str,
+        direction: TriggerDirection,
+        threshold: Decimal,
+        metadata: Optional[Dict] = None
+    ) -> PriceTrigger:
+        """Arm one threshold for a position"""
+        trigger = PriceTrigger(
+            position_id=position_id,
+            token_id=token_id,
+            kind=kind,
+            direction=direction,
+            threshold=threshold,
+            metadata=metadata or {},
+            seq=next(self._seq)
+        )
+        side = self._below if direction == TriggerDirection.BELOW else self._above
+        side.setdefault(token_id, _SortedTriggers()).add(trigger)
+        self._by_position.setdefault(position_id, []).append(trigger)
+        return trigger
+
+    def disarm(self, trigger: PriceTrigger) -> bool:
+        """Remove one armed trigger; False if it already fired or was removed"""
+        side = self._below if trigger.direction == TriggerDirection.BELOW else self._above
+        book = side.get(trigger.token_id)
+        if book is None or not book.remove(trigger):
+            return False
+        if not book:
+            del side[trigger.token_id]
+        self._forget(trigger)
+        return True
+
+    def disarm_position(self, position_id: str) -> int:
+        """Remove every trigger for a position; returns how many were armed"""
+        triggers = list(self._by_position.get(position_id, ()))
+        return sum(1 for trigger in triggers if self.disarm(trigger))
+
+    def on_price(self, token_id: str, price: Decimal) -> List[PriceTrigger]:
+        """
+        Fire and return every trigger crossed by a price for a token
+
+        Returns:
+            Fired triggers, BELOW side first, each side in threshold order
+        """
+        self.price_updates += 1
+        fired: List[PriceTrigger] = []
+
+        book = self._below.get(token_id)
+        if book:
+            fired.extend(book.pop_at_or_above(price))
+            if not book:
+                del self._below[token_id]
+
+        book = self._above.get(token_id)
+        if book:
+            fired.extend(book.pop_at_or_below(price))
+            if not book:
+                del self._above[token_id]
+
+        for trigger in fired:
+            self._forget(trigger)
+        self.triggers_fired += len(fired)
+        return fired
+
+    def _forget(self, trigger: PriceTrigger):
+        triggers = self._by_position.get(trigger.position_id)
+        if triggers is None:
+            return
+        triggers.remove(trigger)
+        if not triggers:
+            del self._by_position[trigger.position_id]
+
+    # ==================== Introspection ====================
+
+    def is_armed(self, position_id: str) -> bool:
+        return position_id in self._by_position
+
+    def armed_positions(self) -> List[str]:
+        return list(self._by_position)
+
+    def get_triggers(self, position_id: str) -> List[PriceTrigger]:
+        return list(self._by_position.get(position_id, ()))
+
+    def tokens(self) -> List[str]:
+        return sorted(set(self._below) | set(self._above))
+
+    def __len__(self) -> int:
+        return sum(len(triggers) for triggers in self._by_position.values())
+
+    def get_stats(self) -> Dict:
+        return {
+            "armed_triggers": len(self),
+            "armed_positions": len(self._by_position),
+            "tokens": len(self.tokens()),
+            "price_updates": self.price_updates,
+            "triggers_fired": self.triggers_fired,
+        }
@@ -9,6 +9,8 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
 
+from libs.analytics.streaming_moments import EWMAMoments, RunningMoments, SampleMoments
+
 logger = logging.getLogger(__name__)
 
 
@@ -56,19 +58,45 @@ class CornishFisherVaR:
         Returns:
             Dictionary with mVaR and related statistics
         """
-        if len(returns) < self.config['min_observations']:
-            logger.warning(f"Insufficient data: {len(returns)} < {self.config['min_observations']}")
+        returns = np.asarray(returns, dtype=float)
+        return self.calculate_mvar_from_moments(
+            RunningMoments.from_values(returns), confidence_level, returns
+        )
+
+    def calculate_mvar_from_moments(
+        self,
+        moments: SampleMoments,
+        confidence_level: float = 0.95,
+        returns: Optional[np.ndarray] = None
+    ) -> Dict:
+        """
+        Calculate modified VaR from streaming return moments.
+
+        Callers that keep a RunningMoments/RollingMoments of their returns
+        get mVaR without another pass over the data. CVaR is empirical, so
+        it is only computed when the returns themselves are passed.
+
+        Args:
+            moments: Moments of the return series
+            confidence_level: Confidence level (e.g., 0.95 for 95%)
+            returns: Optional return series for CVaR
+
+        Returns:
+            Dictionary with mVaR and related statistics
+        """
+        if moments.n < self.config['min_observations']:
+            logger.warning(f"Insufficient data: {moments.n} < {self.config['min_observations']}")
             return {
                 'mvar': None,
                 'var': None,
                 'message': 'Insufficient data'
             }
 
-        # Calculate moments
-        mean = np.mean(returns)
-        std = np.std(returns, ddof=1)
-        skewness = stats.skew(returns)
-        excess_kurtosis = stats.kurtosis(returns, fisher=True)
+        # Moments
+        mean = moments.mean
+        std = moments.std(ddof=1)
+        skewness = moments.skewness
+        excess_kurtosis = moments.excess_kurtosis
 
         # Calculate standard VaR
         alpha = 1 - confidence_level
@@ -80,12 +108,12 @@ class CornishFisherVaR:
         modified_var = mean + std * z_cf
 
         # Calculate Expected Shortfall (CVaR)
-        cvar = self._calculate_cvar(returns, modified_var)
+        cvar = self._calculate_cvar(returns, modified_var) if returns is not None else None
 
         return {
             'mvar': abs(modified_var),  # Return positive value
             'var': abs(standard_var),
-            'cvar': abs(cvar),
+            'cvar': abs(cvar) if cvar is not None else None,
             'statistics': {
                 'mean': mean,
                 'std': std,
@@ -95,7 +123,7 @@ class CornishFisherVaR:
                 'z_cf': z_cf
             },
             'confidence_level': confidence_level,
-            'observations': len(returns),
+            'observations': moments.n,
             'improvement_over_standard': abs(modified_var) / abs(standard_var) if standard_var != 0 else 1.0
         }
 
@@ -252,18 +280,11 @@ class CornishFisherVaR:
         if len(returns) < 2:
             return 0.02  # Default 2% volatility
 
-        lambda_param = self.config.get('ewma_lambda', 0.94)
-        squared_returns = returns ** 2
-
-        # EWMA calculation
-        weights = np.array([(1 - lambda_param) * lambda_param ** i
-                           for i in range(len(squared_returns) - 1, -1, -1)])
-        weights = weights / np.sum(weights)
+        # Normalized EWMA weights over the whole series, as one streaming pass
+        ewma = EWMAMoments(self.config.get('ewma_lambda', 0.94))
+        ewma.update_many(returns)
 
-        ewma_variance = np.sum(weights * squared_returns)
-        ewma_vol = np.sqrt(ewma_variance)
-
-        return ewma_vol
+        return ewma.volatility
 
     def _calculate_streak(self, returns: np.ndarray) -> int:
         """Calculate current winning/losing streak."""
@@ -433,12 +454,16 @@ class CornishFisherVaR:
         if confidence_levels is None:
             confidence_levels = self.confidence_levels
 
+        returns = np.asarray(returns, dtype=float)
+        # One moment pass shared by the statistics and every confidence level
+        moments = RunningMoments.from_values(returns)
+
         metrics = {
             'basic_statistics': {
-                'mean': np.mean(returns),
-                'std': np.std(returns, ddof=1),
-                'skewness': stats.skew(returns),
-                'kurtosis': stats.kurtosis(returns, fisher=True),
+                'mean': moments.mean,
+                'std': moments.std(ddof=1),
+                'skewness': moments.skewness,
+                'kurtosis': moments.excess_kurtosis,
                 'min': np.min(returns),
                 'max': np.max(returns)
             },
@@ -446,7 +471,7 @@ class CornishFisherVaR:
         }
 
         for confidence in confidence_levels:
-            var_result = self.calculate_mvar(returns, confidence)
+            var_result = self.calculate_mvar_from_moments(moments, confidence, returns)
             metrics['var_metrics'][f'{int(confidence*100)}%'] = {
                 'mvar': var_result.get('mvar'),
                 'standard_var': var_result.get('var'),
@@ -16,6 +16,7 @@ from typing import Optional
 
 from whale_trade_monitor import WhaleTradeMonitor
 from whale_metrics_updater import WhaleMetricsUpdater
+from src.monitoring.profiler import profiler
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -108,7 +109,8 @@ class SystemManager:
             "started_at": self.started_at.isoformat() if self.started_at else None,
             "trade_monitor_active": self.trade_monitor_thread and self.trade_monitor_thread.is_alive() if self.trade_monitor_thread else False,
             "metrics_updater_active": self.metrics_updater_thread and self.metrics_updater_thread.is_alive() if self.metrics_updater_thread else False,
-            "uptime_seconds": (datetime.utcnow() - self.started_at).total_seconds() if self.started_at and self.running else 0
+            "uptime_seconds": (datetime.utcnow() - self.started_at).total_seconds() if self.started_at and self.running else 0,
+            "profiler_running": profiler.running
         }
 
 
@@ -22,6 +22,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 from sqlalchemy import create_engine, func
 from sqlalchemy.orm import sessionmaker
 from libs.common.models import Whale, Trade
+from src.realtime.change_feed import get_change_feed
 
 # Configure logging
 logging.basicConfig(
@@ -146,6 +147,7 @@ class WhaleMetricsUpdater:
                 whale.active_trades = profile.get('openPositions', 0)
 
             session.commit()
+            get_change_feed().publish_threadsafe("whales", whale.address)
 
             logger.debug(
                 f"Updated {whale.pseudonym or whale.address[:10]}: "
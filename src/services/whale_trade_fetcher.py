@@ -16,6 +16,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from libs.common.models import Whale, Trade
+from src.realtime.change_feed import get_change_feed
 
 
 class WhaleTradeFetcher:
@@ -171,6 +172,7 @@ class WhaleTradeFetcher:
 
             session.add(trade)
             session.commit()
+            get_change_feed().publish_threadsafe("trades", trade_id)
             return True
 
         except Exception as e:
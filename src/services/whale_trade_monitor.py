@@ -24,6 +24,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 from sqlalchemy import create_engine, func
 from sqlalchemy.orm import sessionmaker
 from libs.common.models import Whale, Trade
+from src.realtime.change_feed import get_change_feed
 
 # Configure logging
 logging.basicConfig(
@@ -219,6 +220,7 @@ class WhaleTradeMonitor:
                             logger.warning(f"  ✗ Copy trade skipped or failed")
 
             session.commit()
+            get_change_feed().publish_threadsafe("whales", whale.address)
             return True
 
         except Exception as e:
@@ -214,6 +214,42 @@ class BacktestConfig:
     rebalance_frequency_days: int = 1  # Daily rebalancing
 
 
+def historical_trades_from_dataset(dataset) -> List[HistoricalTrade]:
+    """
+    Convert a shared ``libs.backtesting.dataset.BacktestDataset`` into HistoricalTrade records
+
+    Args:
+        dataset: BacktestDataset (in-memory or memory-mapped)
+
+    Returns:
+        List of HistoricalTrade sorted by timestamp
+    """
+    trades = []
+    c = dataset.columns
+    for i, row in enumerate(dataset.to_trade_dicts()):
+        pnl = float(c['realized_pnl'][i])
+        has_pnl = not np.isnan(pnl)
+        trades.append(HistoricalTrade(
+            trade_id=f"{row['market_id']}:{i}",
+            whale_address=row['whale_address'],
+            market_id=row['market_id'],
+            outcome=row['outcome'],
+            side=row['side'],
+            size_shares=row['size'],
+            size_usd=row['amount'],
+            price=row['price'],
+            timestamp=row['timestamp'],
+            market_volume_24h=None,
+            market_liquidity_score=None,
+            final_profit_usd=Decimal(str(pnl)) if has_pnl else None,
+            final_profit_pct=(
+                Decimal(str(pnl)) / row['amount'] * Decimal("100")
+                if has_pnl and row['amount'] > 0 else None
+            )
+        ))
+    return trades
+
+
 # ==================== Backtesting Engine ====================
 
 class BacktestingEngine:
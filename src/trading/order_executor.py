@@ -13,6 +13,7 @@ from enum import Enum
 
 from src.api.polymarket_client import PolymarketClient
 from src.config import settings
+from src.monitoring.latency import tracer, ORDER_PLACEMENT, FILL_CONFIRMATION
 
 logger = logging.getLogger(__name__)
 
@@ -237,6 +238,7 @@ class OrderPlacer:
         self.max_retries = 3
         self.initial_retry_delay = 1  # seconds
 
+    @tracer.timed(ORDER_PLACEMENT)
     async def place_limit_order(
         self,
         token_id: str,
@@ -322,6 +324,7 @@ class OrderPlacer:
             execution_time_ms=int(execution_time)
         )
 
+    @tracer.timed(ORDER_PLACEMENT)
     async def place_market_order(
         self,
         token_id: str,
@@ -418,6 +421,7 @@ class FillConfirmer:
         self.poll_interval = 0.5  # 500ms
         self.default_timeout = 30  # 30 seconds
 
+    @tracer.timed(FILL_CONFIRMATION)
     async def wait_for_fill(
         self,
         order_id: str,
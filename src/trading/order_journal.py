@@ -0,0 +1,469 @@
+"""
+Write-Behind Order Journal
+Batches order lifecycle writes off the execution path, backed by a local WAL
+
+OrderStateMachine used to await one or two pool acquisitions per lifecycle
+step. With a journal, each write is appended to an fsync'd write-ahead log
+and an in-memory queue, and a background task flushes the queue to Postgres
+in a single transaction of executemany() batches on a short interval (or as
+soon as the queue reaches the size trigger).
+
+Durability:
+- append() returns only after the record is fsync'd to the WAL, so a crash
+  before the next flush loses nothing.
+- Each flush commits its highest LSN to order_journal_checkpoints in the
+  same transaction as the data, so replaying the WAL after a crash between
+  commit and WAL cleanup never applies a record twice.
+- The WAL is a directory of segments. A flush rotates to a new segment
+  first and deletes the closed segments once the transaction commits.
+
+Poison records:
+- A failed batch is retried whole. After max_batch_failures failures in a
+  row, the records are written one transaction each instead. Any record
+  Postgres rejects (constraint, data or bad-row errors) is appended to
+  dead-letter.jsonl in the WAL directory and skipped, so one bad record
+  can't block every later flush. Connection errors stop the pass and
+  leave the rest queued.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== Journal Records ====================
+
+class JournalOp:
+    """Record kinds, applied in this order within a flush"""
+    INSERT_ORDER = "insert_order"
+    INSERT_TRANSITION = "insert_transition"
+    UPDATE_ORDER = "update_order"
+
+
+@dataclass
+class JournalRecord:
+    """One pending write; data holds column values ready for asyncpg"""
+    lsn: int
+    op: str
+    data: Dict
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    return str(value)
+
+
+def _decode(obj: Dict):
+    if "__datetime__" in obj and len(obj) == 1:
+        return datetime.fromisoformat(obj["__datetime__"])
+    return obj
+
+
+# ==================== Journal ====================
+
+class OrderJournal:
+    """
+    Write-behind persistence for the orders / order_transitions tables
+
+    Args:
+        db_pool: Database connection pool
+        wal_dir: Directory for WAL segments (created if missing)
+        journal_id: Checkpoint key; one per WAL directory
+        flush_interval: Seconds between background flushes
+        flush_size: Queue length that triggers an immediate flush
+        fsync: fsync every append (disable only for tests/benchmarks)
+        max_batch_failures: Consecutive failed flushes before records are
+            written one at a time and rejected ones dead-lettered
+    """
+
+    ORDER_COLUMNS = (
+        "order_id", "idempotency_key", "token_id", "side", "size", "price",
+        "order_type", "state", "created_at", "retry_count", "max_retries"
+    )
+    TRANSITION_COLUMNS = ("order_id", "from_state", "to_state", "timestamp", "reason", "metadata")
+
+    # Errors that reject the record itself rather than the connection
+    POISON_ERRORS = (
+        asyncpg.DataError, asyncpg.IntegrityConstraintViolationError,
+        KeyError, TypeError, ValueError,
+    )
+
+    def __init__(
+        self,
+        db_pool: asyncpg.Pool,
+        wal_dir: str,
+        journal_id: str = "orders",
+        flush_interval: float = 0.05,
+        flush_size: int = 500,
+        fsync: bool = True,
+        max_batch_failures: int = 3
+    ):
+        self.db = db_pool
+        self.wal_dir = Path(wal_dir)
+        self.journal_id = journal_id
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.fsync = fsync
+        self.max_batch_failures = max_batch_failures
+        self.dead_letter_path = self.wal_dir / "dead-letter.jsonl"
+
+        self.pending: List[JournalRecord] = []
+        self.next_lsn = 1
+        self.checkpoint_lsn = 0
+
+        self._segment = None
+        self._segment_path: Optional[Path] = None
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.is_running = False
+
+        # Stats
+        self.total_flushes = 0
+        self.total_records_flushed = 0
+        self.flush_errors = 0
+        self.consecutive_failures = 0
+        self.dead_letters = 0
+        self.last_error: Optional[str] = None
+
+    # ==================== Lifecycle ====================
+
+    async def start(self) -> int:
+        """
+        Recover and start the background flusher
+
+        Replays any WAL records newer than the database checkpoint, flushes
+        them, then starts flushing new appends.
+
+        Returns:
+            Number of records recovered from the WAL
+        """
+        if self.is_running:
+            logger.warning("OrderJournal already running")
+            return 0
+
+        self.wal_dir.mkdir(parents=True, exist_ok=True)
+        await self._ensure_checkpoint_table()
+        self.checkpoint_lsn = await self._load_checkpoint()
+
+        recovered = self._read_wal()
+        self.pending = [r for r in recovered if r.lsn > self.checkpoint_lsn]
+        last_lsn = max([self.checkpoint_lsn] + [r.lsn for r in recovered])
+        self.next_lsn = last_lsn + 1
+
+        replayed = len(self.pending)
+        self._open_segment()
+        if replayed:
+            logger.info(f"Replaying {replayed} journal records after LSN {self.checkpoint_lsn}")
+            await self.flush()
+        else:
+            # Everything on disk is already committed
+            self._delete_closed_segments()
+
+        self.is_running = True
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        logger.info(f"OrderJournal started: wal={self.wal_dir}, next_lsn={self.next_lsn}")
+        return replayed
+
+    async def stop(self):
+        """Flush everything still queued and stop the flusher"""
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        self._wakeup.set()
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+
+        await self.flush()
+        if self._segment:
+            self._segment.close()
+            self._segment = None
+
+        logger.info(
+            f"OrderJournal stopped | Flushes: {self.total_flushes}, "
+            f"Records: {self.total_records_flushed}, Errors: {self.flush_errors}"
+        )
+
+    # ==================== Appends ====================
+
+    def append(self, op: str, data: Dict) -> JournalRecord:
+        """Durably log one write and queue it for the next flush"""
+        if self._segment is None:
+            raise RuntimeError("OrderJournal not started")
+
+        record = JournalRecord(lsn=self.next_lsn, op=op, data=data)
+        self.next_lsn += 1
+
+        self._segment.write(json.dumps(
+            {"lsn": record.lsn, "op": record.op, "data": record.data}, default=_encode
+        ) + "\n")
+        self._segment.flush()
+        if self.fsync:
+            os.fsync(self._segment.fileno())
+
+        self.pending.append(record)
+        if len(self.pending) >= self.flush_size:
+            self._wakeup.set()
+        return record
+
+    def insert_order(self, row: Dict) -> JournalRecord:
+        return self.append(JournalOp.INSERT_ORDER, row)
+
+    def insert_transition(self, row: Dict) -> JournalRecord:
+        return self.append(JournalOp.INSERT_TRANSITION, row)
+
+    def update_order(self, order_id: str, columns: Dict) -> JournalRecord:
+        return self.append(JournalOp.UPDATE_ORDER, {"order_id": order_id, "columns": columns})
+
+    # ==================== Flushing ====================
+
+    async def flush(self) -> int:
+        """
+        Write all queued records in one transaction
+
+        Returns:
+            Number of records committed (0 if the queue was empty or the
+            write failed; failed records stay queued for the next flush)
+        """
+        async with self._flush_lock:
+            if not self.pending:
+                return 0
+
+            batch = self.pending
+            self.pending = []
+            # New appends go to a fresh segment while this batch is in flight
+            self._open_segment()
+
+            try:
+                await self._write_batch(batch)
+            except Exception as e:
+                self.flush_errors += 1
+                self.consecutive_failures += 1
+                self.last_error = repr(e)
+                logger.error(f"Journal flush of {len(batch)} records failed: {e}")
+                if self.consecutive_failures < self.max_batch_failures:
+                    self.pending = batch + self.pending
+                    return 0
+
+                # The same batch keeps failing; isolate the records that can't be written
+                written, remaining = await self._write_each(batch)
+                self.pending = remaining + self.pending
+                self.total_records_flushed += written
+                if remaining:
+                    return written
+            else:
+                self.checkpoint_lsn = batch[-1].lsn
+                self.total_records_flushed += len(batch)
+                written = len(batch)
+
+            self.consecutive_failures = 0
+            self.last_error = None
+            self._delete_closed_segments()
+            self.total_flushes += 1
+            return written
+
+    async def _write_each(self, batch: List[JournalRecord]) -> Tuple[int, List[JournalRecord]]:
+        """
+        Write records one transaction each, dead-lettering rejected ones
+
+        Returns:
+            (records written, records left to retry after a connection error)
+        """
+        written = 0
+        for index, record in enumerate(batch):
+            try:
+                await self._write_batch([record])
+            except self.POISON_ERRORS as e:
+                self._dead_letter(record, e)
+                continue
+            except Exception as e:
+                logger.error(f"Journal write at LSN {record.lsn} failed, keeping {len(batch) - index} queued: {e}")
+                return written, batch[index:]
+            self.checkpoint_lsn = record.lsn
+            written += 1
+
+        if self.checkpoint_lsn < batch[-1].lsn:
+            # The batch ended with dead letters; move the checkpoint past them
+            try:
+                async with self.db.acquire() as conn:
+                    await self._write_checkpoint(conn, batch[-1].lsn)
+                self.checkpoint_lsn = batch[-1].lsn
+            except Exception as e:
+                # Not fatal: the next write moves it, and a replay only dead-letters them again
+                logger.error(f"Journal checkpoint after dead letters failed: {e}")
+        return written, []
+
+    def _dead_letter(self, record: JournalRecord, error: Exception):
+        self.dead_letters += 1
+        logger.error(f"Dead-lettering journal record LSN {record.lsn} ({record.op}): {error!r}")
+        with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(
+                {"lsn": record.lsn, "op": record.op, "data": record.data, "error": repr(error)},
+                default=_encode
+            ) + "\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+    async def _flush_loop(self):
+        while self.is_running:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def _write_batch(self, batch: List[JournalRecord]):
+        inserts, transitions, updates = self._coalesce(batch)
+
+        async with self.db.acquire() as conn:
+            async with conn.transaction():
+                if inserts:
+                    await conn.executemany(
+                        self._insert_sql("orders", self.ORDER_COLUMNS),
+                        [tuple(row[c] for c in self.ORDER_COLUMNS) for row in inserts]
+                    )
+                if transitions:
+                    await conn.executemany(
+                        self._insert_sql("order_transitions", self.TRANSITION_COLUMNS),
+                        [tuple(row[c] for c in self.TRANSITION_COLUMNS) for row in transitions]
+                    )
+                for columns, rows in updates.items():
+                    await conn.executemany(self._update_sql(columns), rows)
+                await self._write_checkpoint(conn, batch[-1].lsn)
+
+    async def _write_checkpoint(self, conn, lsn: int):
+        await conn.execute("""
+            INSERT INTO order_journal_checkpoints (journal_id, lsn, updated_at)
+            VALUES ($1, $2, $3)
+            ON CONFLICT (journal_id) DO UPDATE
+            SET lsn = EXCLUDED.lsn, updated_at = EXCLUDED.updated_at
+        """, self.journal_id, lsn, datetime.now())
+
+    @staticmethod
+    def _coalesce(batch: List[JournalRecord]) -> Tuple[List[Dict], List[Dict], Dict[Tuple[str, ...], List[tuple]]]:
+        """
+        Split a batch into executemany groups
+
+        Updates to the same order collapse into one row holding the latest
+        value of each column, then rows are grouped by column set so each
+        group is a single UPDATE statement.
+        """
+        inserts: List[Dict] = []
+        transitions: List[Dict] = []
+        merged: Dict[str, Dict] = {}
+
+        for record in batch:
+            if record.op == JournalOp.INSERT_ORDER:
+                inserts.append(record.data)
+            elif record.op == JournalOp.INSERT_TRANSITION:
+                transitions.append(record.data)
+            elif record.op == JournalOp.UPDATE_ORDER:
+                merged.setdefault(record.data["order_id"], {}).update(record.data["columns"])
+            else:
+                logger.error(f"Unknown journal op {record.op!r} at LSN {record.lsn}")
+
+        updates: Dict[Tuple[str, ...], List[tuple]] = {}
+        for order_id, columns in merged.items():
+            key = tuple(sorted(columns))
+            updates.setdefault(key, []).append(tuple(columns[c] for c in key) + (order_id,))
+
+        return inserts, transitions, updates
+
+    @staticmethod
+    def _insert_sql(table: str, columns: Tuple[str, ...]) -> str:
+        placeholders = ", ".join(f"${i}" for i in range(1, len(columns) + 1))
+        return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+    @staticmethod
+    def _update_sql(columns: Tuple[str, ...]) -> str:
+        assignments = ", ".join(f"{c} = ${i}" for i, c in enumerate(columns, start=1))
+        return f"UPDATE orders SET {assignments} WHERE order_id = ${len(columns) + 1}"
+
+    # ==================== Checkpoints ====================
+
+    async def _ensure_checkpoint_table(self):
+        async with self.db.acquire() as conn:
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS order_journal_checkpoints (
+                    journal_id TEXT PRIMARY KEY,
+                    lsn BIGINT NOT NULL,
+                    updated_at TIMESTAMP NOT NULL
+                )
+            """)
+
+    async def _load_checkpoint(self) -> int:
+        async with self.db.acquire() as conn:
+            lsn = await conn.fetchval(
+                "SELECT lsn FROM order_journal_checkpoints WHERE journal_id = $1",
+                self.journal_id
+            )
+        return lsn or 0
+
+    # ==================== WAL Segments ====================
+
+    def _segments(self) -> List[Path]:
+        return sorted(self.wal_dir.glob("segment-*.wal"))
+
+    def _open_segment(self):
+        if self._segment:
+            self._segment.close()
+        self._segment_path = self.wal_dir / f"segment-{self.next_lsn:020d}.wal"
+        self._segment = open(self._segment_path, "a", encoding="utf-8")
+        if self.fsync:
+            # Make the new directory entry itself durable
+            dir_fd = os.open(self.wal_dir, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    def _delete_closed_segments(self):
+        for path in self._segments():
+            if path != self._segment_path:
+                path.unlink()
+
+    def _read_wal(self) -> List[JournalRecord]:
+        records = []
+        for path in self._segments():
+            with open(path, encoding="utf-8") as f:
+                for line_no, line in enumerate(f, start=1):
+                    try:
+                        entry = json.loads(line, object_hook=_decode)
+                    except json.JSONDecodeError:
+                        # A torn final write from a crash mid-append was never acknowledged
+                        logger.warning(f"Skipping unreadable WAL line {path.name}:{line_no}")
+                        continue
+                    records.append(JournalRecord(entry["lsn"], entry["op"], entry["data"]))
+        records.sort(key=lambda r: r.lsn)
+        return records
+
+    def get_stats(self) -> Dict:
+        return {
+            "pending": len(self.pending),
+            "next_lsn": self.next_lsn,
+            "checkpoint_lsn": self.checkpoint_lsn,
+            "total_flushes": self.total_flushes,
+            "total_records_flushed": self.total_records_flushed,
+            "flush_errors": self.flush_errors,
+            "consecutive_failures": self.consecutive_failures,
+            "stuck": self.consecutive_failures >= self.max_batch_failures,
+            "last_error": self.last_error,
+            "dead_letters": self.dead_letters,
+        }
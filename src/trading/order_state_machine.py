@@ -16,6 +16,7 @@ from enum import Enum
 import asyncpg
 
 from src.config import settings
+from src.trading.order_journal import OrderJournal
 
 logger = logging.getLogger(__name__)
 
@@ -127,14 +128,17 @@ class OrderStateMachine:
         OrderState.DEAD_LETTER
     }
 
-    def __init__(self, db_pool: asyncpg.Pool):
+    def __init__(self, db_pool: asyncpg.Pool, journal: Optional[OrderJournal] = None):
         """
         Initialize state machine
 
         Args:
             db_pool: Database connection pool
+            journal: Started write-behind journal; when set, persistence is
+                appended to its WAL and batched instead of awaiting the pool
         """
         self.db = db_pool
+        self.journal = journal
         self.orders: Dict[str, ManagedOrder] = {}
 
     async def create_order(
@@ -426,6 +430,22 @@ class OrderStateMachine:
 
     async def _persist_order(self, order: ManagedOrder):
         """Persist new order to database"""
+        if self.journal:
+            self.journal.insert_order({
+                "order_id": order.order_id,
+                "idempotency_key": order.idempotency_key,
+                "token_id": order.token_id,
+                "side": order.side,
+                "size": float(order.size),
+                "price": float(order.price) if order.price else None,
+                "order_type": order.order_type,
+                "state": order.state.value,
+                "created_at": order.created_at,
+                "retry_count": order.retry_count,
+                "max_retries": order.max_retries,
+            })
+            return
+
         async with self.db.acquire() as conn:
             await conn.execute("""
                 INSERT INTO orders (
@@ -448,6 +468,15 @@ class OrderStateMachine:
 
     async def _update_order_state(self, order: ManagedOrder):
         """Update order state in database"""
+        if self.journal:
+            self.journal.update_order(order.order_id, {
+                "state": order.state.value,
+                "submitted_at": order.submitted_at,
+                "filled_at": order.filled_at,
+                "confirmed_at": order.confirmed_at,
+            })
+            return
+
         async with self.db.acquire() as conn:
             await conn.execute("""
                 UPDATE orders
@@ -463,6 +492,14 @@ class OrderStateMachine:
 
     async def _update_order_fill(self, order: ManagedOrder):
         """Update order fill details in database"""
+        if self.journal:
+            self.journal.update_order(order.order_id, {
+                "filled_size": float(order.filled_size),
+                "remaining_size": float(order.remaining_size),
+                "avg_fill_price": float(order.avg_fill_price) if order.avg_fill_price else None,
+            })
+            return
+
         async with self.db.acquire() as conn:
             await conn.execute("""
                 UPDATE orders
@@ -477,6 +514,10 @@ class OrderStateMachine:
 
     async def _update_exchange_id(self, order: ManagedOrder):
         """Update exchange order ID in database"""
+        if self.journal:
+            self.journal.update_order(order.order_id, {"exchange_order_id": order.exchange_order_id})
+            return
+
         async with self.db.acquire() as conn:
             await conn.execute("""
                 UPDATE orders
@@ -489,6 +530,14 @@ class OrderStateMachine:
 
     async def _update_order_error(self, order: ManagedOrder):
         """Update order error details in database"""
+        if self.journal:
+            self.journal.update_order(order.order_id, {
+                "error_message": order.error_message,
+                "retry_count": order.retry_count,
+                "state": order.state.value,
+            })
+            return
+
         async with self.db.acquire() as conn:
             await conn.execute("""
                 UPDATE orders
@@ -503,6 +552,17 @@ class OrderStateMachine:
 
     async def _persist_transition(self, transition: OrderStateTransition):
         """Persist state transition to database"""
+        if self.journal:
+            self.journal.insert_transition({
+                "order_id": transition.order_id,
+                "from_state": transition.from_state.value,
+                "to_state": transition.to_state.value,
+                "timestamp": transition.timestamp,
+                "reason": transition.reason,
+                "metadata": transition.metadata,
+            })
+            return
+
         async with self.db.acquire() as conn:
             await conn.execute("""
                 INSERT INTO order_transitions (
@@ -536,8 +596,10 @@ async def main():
         database=settings.DATABASE_NAME
     )
 
-    # Initialize state machine
-    state_machine = OrderStateMachine(db_pool)
+    # Initialize state machine with write-behind persistence
+    journal = OrderJournal(db_pool, wal_dir="data/wal/orders")
+    await journal.start()
+    state_machine = OrderStateMachine(db_pool, journal=journal)
 
     # Example: Create and manage an order lifecycle
     order = await state_machine.create_order(
@@ -575,6 +637,7 @@ async def main():
     for t in order.transitions:
         print(f"  {t.from_state.value} → {t.to_state.value}: {t.reason}")
 
+    await journal.stop()
     await db_pool.close()
 
 
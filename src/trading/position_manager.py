@@ -6,7 +6,7 @@ Handles position tracking, real-time P&L calculation, and stop-loss/take-profit
 import asyncio
 import logging
 from decimal import Decimal
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -16,6 +16,8 @@ from sqlalchemy.orm import Session
 from src.database.models import Position, Order
 from src.api.polymarket_client import PolymarketClient
 from src.config import settings
+from src.realtime.price_bus import PriceBus, get_price_bus
+from src.risk.trigger_index import TriggerDirection, TriggerIndex
 
 logger = logging.getLogger(__name__)
 
@@ -330,7 +332,8 @@ class PnLCalculator:
     def __init__(
         self,
         client: Optional[PolymarketClient] = None,
-        position_tracker: Optional[PositionTracker] = None
+        position_tracker: Optional[PositionTracker] = None,
+        price_bus: Optional[PriceBus] = None
     ):
         """
         Initialize P&L calculator
@@ -338,10 +341,12 @@ class PnLCalculator:
         Args:
             client: PolymarketClient for fetching prices
             position_tracker: PositionTracker for accessing positions
+            price_bus: Price bus to read through; defaults to the process-wide
+                get_price_bus(), so consumers share quotes and requests
         """
         self.client = client or PolymarketClient()
         self.tracker = position_tracker or PositionTracker()
-        self.price_cache: Dict[str, Tuple[Decimal, datetime]] = {}
+        self.price_bus = price_bus or get_price_bus(self.client)
         self.cache_ttl = timedelta(seconds=1)  # 1-second cache
 
     async def fetch_current_price(self, token_id: str) -> Decimal:
@@ -354,29 +359,13 @@ class PnLCalculator:
         Returns:
             Current price
         """
-        now = datetime.now()
-
-        # Check cache
-        if token_id in self.price_cache:
-            cached_price, cached_time = self.price_cache[token_id]
-            if now - cached_time < self.cache_ttl:
-                return cached_price
-
-        # Fetch from API
+        # Bus returns its quote if fresh, else fetches (or the last known quote on failure)
         try:
-            price = self.client.get_midpoint(token_id)
-            price_decimal = Decimal(str(price))
-
-            # Update cache
-            self.price_cache[token_id] = (price_decimal, now)
-
-            return price_decimal
+            quote = await self.price_bus.get_quote(token_id, max_age=self.cache_ttl.total_seconds())
+            return quote.mid
 
         except Exception as e:
             logger.error(f"Failed to fetch price for {token_id}: {e}")
-            # Return cached price if available
-            if token_id in self.price_cache:
-                return self.price_cache[token_id][0]
             return Decimal(0)
 
     async def fetch_current_prices(self, token_ids: List[str]) -> Dict[str, Decimal]:
@@ -389,12 +378,11 @@ class PnLCalculator:
         Returns:
             Dict mapping token_id to price
         """
-        tasks = [self.fetch_current_price(token_id) for token_id in token_ids]
-        prices = await asyncio.gather(*tasks, return_exceptions=True)
+        quotes = await self.price_bus.get_quotes(token_ids, max_age=self.cache_ttl.total_seconds())
 
         return {
-            token_id: price if isinstance(price, Decimal) else Decimal(0)
-            for token_id, price in zip(token_ids, prices)
+            token_id: quotes[token_id].mid if token_id in quotes else Decimal(0)
+            for token_id in token_ids
         }
 
     async def calculate_position_pnl(
@@ -518,6 +506,11 @@ class StopLossTakeProfitManager:
     """
     Automated position exit management
     Monitors positions and triggers exits based on P&L thresholds
+
+    Stop-loss / take-profit prices are armed in a per-token TriggerIndex, so
+    on_price_update() evaluates only the positions whose threshold a price
+    crossed. check_all_positions() remains for polling callers and fetches
+    one price per token rather than per position.
     """
 
     def __init__(
@@ -541,6 +534,92 @@ class StopLossTakeProfitManager:
         self.stop_loss_pct = Decimal(str(stop_loss_pct))
         self.take_profit_pct = Decimal(str(take_profit_pct))
 
+        # Armed thresholds and the positions they belong to
+        self.trigger_index = TriggerIndex()
+        self.armed_positions: Dict[str, Position] = {}
+
+    def arm_position(self, position: Position) -> None:
+        """
+        Arm (or re-arm) a position's stop-loss and take-profit prices
+
+        YES positions stop out when price falls to the stop and take profit
+        when it rises to the target; NO positions are mirrored, matching
+        PnLCalculator.calculate_position_pnl.
+        """
+        self.trigger_index.disarm_position(position.position_id)
+        is_yes = position.outcome == "YES"
+
+        if position.stop_loss_price:
+            self.trigger_index.arm(
+                position.position_id, position.token_id, "stop_loss",
+                TriggerDirection.BELOW if is_yes else TriggerDirection.ABOVE,
+                position.stop_loss_price
+            )
+        if position.take_profit_price:
+            self.trigger_index.arm(
+                position.position_id, position.token_id, "take_profit",
+                TriggerDirection.ABOVE if is_yes else TriggerDirection.BELOW,
+                position.take_profit_price
+            )
+
+        self.armed_positions[position.position_id] = position
+
+    def disarm_position(self, position_id: str) -> None:
+        """Stop watching a position (e.g. after it is closed)"""
+        self.trigger_index.disarm_position(position_id)
+        self.armed_positions.pop(position_id, None)
+
+    async def on_price_update(self, token_id: str, price: Decimal) -> List[ExitSignal]:
+        """
+        Exit signals for armed positions whose thresholds this price crossed
+
+        Positions that signal are disarmed; re-arm them if the exit fails.
+
+        Args:
+            token_id: Token the price is for
+            price: New market price
+
+        Returns:
+            List of ExitSignals (stop-loss takes precedence over take-profit)
+        """
+        fired = self.trigger_index.on_price(token_id, price)
+        if not fired:
+            return []
+
+        kinds_by_position: Dict[str, set] = {}
+        for trigger in fired:
+            kinds_by_position.setdefault(trigger.position_id, set()).add(trigger.kind)
+
+        exit_signals = []
+        for position_id, kinds in kinds_by_position.items():
+            position = self.armed_positions.get(position_id)
+            self.disarm_position(position_id)
+            if position is None:
+                continue
+
+            pnl_metrics = await self.pnl_calc.calculate_position_pnl(position, price)
+            signal = self._exit_signal(position, pnl_metrics, "stop_loss" if "stop_loss" in kinds else "take_profit")
+            exit_signals.append(signal)
+
+        return exit_signals
+
+    def _exit_signal(self, position: Position, pnl_metrics: PnLMetrics, reason: str) -> ExitSignal:
+        if reason == "stop_loss":
+            logger.warning(f"🛑 Stop-loss hit for {position.position_id[:12]}...: {pnl_metrics.pnl_pct:.1f}%")
+            trigger_price = position.stop_loss_price
+        else:
+            logger.info(f"🎯 Take-profit hit for {position.position_id[:12]}...: {pnl_metrics.pnl_pct:.1f}%")
+            trigger_price = position.take_profit_price
+
+        return ExitSignal(
+            position_id=position.position_id,
+            reason=reason,
+            current_price=pnl_metrics.current_price,
+            trigger_price=trigger_price,
+            pnl=pnl_metrics.unrealized_pnl,
+            pnl_pct=pnl_metrics.pnl_pct
+        )
+
     async def check_exit_triggers(self, position: Position) -> Optional[ExitSignal]:
         """
         Check if position should be exited
@@ -556,29 +635,11 @@ class StopLossTakeProfitManager:
 
         # Check stop-loss
         if pnl_metrics.stop_loss_hit:
-            logger.warning(f"🛑 Stop-loss hit for {position.position_id[:12]}...: {pnl_metrics.pnl_pct:.1f}%")
-
-            return ExitSignal(
-                position_id=position.position_id,
-                reason="stop_loss",
-                current_price=pnl_metrics.current_price,
-                trigger_price=position.stop_loss_price,
-                pnl=pnl_metrics.unrealized_pnl,
-                pnl_pct=pnl_metrics.pnl_pct
-            )
+            return self._exit_signal(position, pnl_metrics, "stop_loss")
 
         # Check take-profit
         if pnl_metrics.profit_target_hit:
-            logger.info(f"🎯 Take-profit hit for {position.position_id[:12]}...: {pnl_metrics.pnl_pct:.1f}%")
-
-            return ExitSignal(
-                position_id=position.position_id,
-                reason="take_profit",
-                current_price=pnl_metrics.current_price,
-                trigger_price=position.take_profit_price,
-                pnl=pnl_metrics.unrealized_pnl,
-                pnl_pct=pnl_metrics.pnl_pct
-            )
+            return self._exit_signal(position, pnl_metrics, "take_profit")
 
         return None
 
@@ -590,12 +651,24 @@ class StopLossTakeProfitManager:
             List of ExitSignals for positions that should be closed
         """
         positions = self.tracker.get_open_positions()
-        exit_signals = []
 
+        # Re-arm from the database so closed positions and edited thresholds are picked up
+        open_ids = {position.position_id for position in positions}
+        for position_id in list(self.armed_positions):
+            if position_id not in open_ids:
+                self.disarm_position(position_id)
         for position in positions:
-            signal = await self.check_exit_triggers(position)
-            if signal:
-                exit_signals.append(signal)
+            self.arm_position(position)
+
+        # One price per token, however many positions share it
+        token_ids = list(dict.fromkeys(position.token_id for position in positions))
+        prices = await self.pnl_calc.fetch_current_prices(token_ids)
+
+        exit_signals = []
+        for token_id, price in prices.items():
+            # fetch_current_price reports failures as 0; don't stop out on them
+            if price > 0:
+                exit_signals.extend(await self.on_price_update(token_id, price))
 
         return exit_signals
 
@@ -614,6 +687,11 @@ class StopLossTakeProfitManager:
                 session.commit()
                 logger.info(f"Set stop-loss for {position_id[:12]}... at {stop_loss_price}")
 
+        armed = self.armed_positions.get(position_id)
+        if armed is not None:
+            armed.stop_loss_price = stop_loss_price
+            self.arm_position(armed)
+
     def set_take_profit(self, position_id: str, take_profit_price: Decimal) -> None:
         """
         Set custom take-profit price for a position
@@ -629,6 +707,11 @@ class StopLossTakeProfitManager:
                 session.commit()
                 logger.info(f"Set take-profit for {position_id[:12]}... at {take_profit_price}")
 
+        armed = self.armed_positions.get(position_id)
+        if armed is not None:
+            armed.take_profit_price = take_profit_price
+            self.arm_position(armed)
+
 
 # ==================== Example Usage ====================
 
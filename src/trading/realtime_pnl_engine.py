@@ -7,12 +7,14 @@ Continuously updates all open positions with live market prices
 import asyncio
 import logging
 from decimal import Decimal
-from typing import Dict, List, Optional, Set
+from typing import Awaitable, Callable, Dict, List, Optional, Set
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 
 from src.api.polymarket_client import PolymarketClient
+from src.realtime.price_bus import PriceBus, get_price_bus
 from src.trading.production_position_manager import ProductionPositionManager, Position
+from src.monitoring.latency import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -54,7 +56,8 @@ class RealtimePnLEngine:
         self,
         position_manager: ProductionPositionManager,
         client: Optional[PolymarketClient] = None,
-        update_interval: float = 1.0  # 1 second
+        update_interval: float = 1.0,  # 1 second
+        price_bus: Optional[PriceBus] = None
     ):
         """
         Initialize real-time P&L engine
@@ -63,10 +66,13 @@ class RealtimePnLEngine:
             position_manager: Position manager to update
             client: Polymarket API client for price fetching
             update_interval: Price update interval in seconds (default: 1s)
+            price_bus: Price bus to read through; defaults to the process-wide
+                get_price_bus(), so consumers share quotes and requests
         """
         self.position_manager = position_manager
         self.client = client or PolymarketClient()
         self.update_interval = update_interval
+        self.price_bus = price_bus or get_price_bus(self.client)
 
         # Engine state
         self.is_running = False
@@ -86,10 +92,26 @@ class RealtimePnLEngine:
         self.pnl_history: Dict[str, List[PnLSnapshot]] = {}
         self.max_history_length = 1000
 
+        # Notified with (token_id, price) after positions are re-priced,
+        # e.g. StopLossTakeProfitManager.on_price_update
+        self.price_listeners: List[Callable[[str, Decimal], Awaitable]] = []
+
         logger.info(
             f"RealtimePnLEngine initialized: update_interval={update_interval}s"
         )
 
+    def add_price_listener(self, listener: Callable[[str, Decimal], Awaitable]):
+        """Register an async callback for every token price this engine applies"""
+        self.price_listeners.append(listener)
+
+    async def _notify_price_listeners(self, price_updates: Dict[str, PriceUpdate]):
+        for token_id, price_update in price_updates.items():
+            for listener in self.price_listeners:
+                try:
+                    await listener(token_id, price_update.price)
+                except Exception as e:
+                    logger.error(f"Price listener error for {token_id}: {e}")
+
     async def start(self):
         """Start the real-time P&L update loop"""
         if self.is_running:
@@ -160,10 +182,15 @@ class RealtimePnLEngine:
                 if update_tasks:
                     await asyncio.gather(*update_tasks, return_exceptions=True)
 
+                # Positions carry the new prices; let exit triggers react now
+                if self.price_listeners:
+                    await self._notify_price_listeners(price_updates)
+
                 # Update performance metrics
                 self.total_updates += 1
                 self.last_update_time = datetime.now()
                 latency_ms = (self.last_update_time - start_time).total_seconds() * 1000
+                tracer.record_ms("pnl_update", latency_ms)
 
                 # Exponential moving average for latency
                 alpha = 0.1
@@ -199,7 +226,11 @@ class RealtimePnLEngine:
         token_ids: List[str]
     ) -> Dict[str, PriceUpdate]:
         """
-        Fetch prices for multiple tokens concurrently
+        Get prices for multiple tokens from the price bus
+
+        Quotes younger than price_cache_ttl come straight from the bus
+        (typically kept fresh by the websocket); older ones are fetched
+        concurrently, one request per token however many consumers ask.
 
         Args:
             token_ids: List of token IDs to fetch
@@ -207,66 +238,22 @@ class RealtimePnLEngine:
         Returns:
             Dict mapping token_id to PriceUpdate
         """
-        # Check cache first
-        now = datetime.now()
-        cached_prices = {}
-        tokens_to_fetch = []
+        quotes = await self.price_bus.get_quotes(token_ids, max_age=self.price_cache_ttl)
 
-        for token_id in token_ids:
+        price_updates = {}
+        for token_id, quote in quotes.items():
             cached = self.latest_prices.get(token_id)
-            if cached and (now - cached.timestamp).total_seconds() < self.price_cache_ttl:
-                cached_prices[token_id] = cached
-            else:
-                tokens_to_fetch.append(token_id)
-
-        # Fetch uncached prices concurrently
-        if tokens_to_fetch:
-            fetch_tasks = [
-                self._fetch_single_price(token_id)
-                for token_id in tokens_to_fetch
-            ]
-
-            results = await asyncio.gather(*fetch_tasks, return_exceptions=True)
-
-            for token_id, result in zip(tokens_to_fetch, results):
-                if isinstance(result, PriceUpdate):
-                    self.latest_prices[token_id] = result
-                    cached_prices[token_id] = result
-                elif isinstance(result, Exception):
-                    logger.error(f"Failed to fetch price for {token_id}: {result}")
-
-        return cached_prices
-
-    async def _fetch_single_price(self, token_id: str) -> Optional[PriceUpdate]:
-        """
-        Fetch price for a single token
-
-        Args:
-            token_id: Token ID
-
-        Returns:
-            PriceUpdate if successful, None otherwise
-        """
-        try:
-            # Fetch from Polymarket API
-            price_data = await self.client.get_price(token_id)
-
-            if not price_data:
-                return None
-
-            price = Decimal(str(price_data.get("price", 0)))
-
-            return PriceUpdate(
+            if cached and cached.timestamp == quote.timestamp:
+                price_updates[token_id] = cached
+                continue
+            price_updates[token_id] = PriceUpdate(
                 token_id=token_id,
-                price=price,
-                timestamp=datetime.now(),
-                volume_24h=Decimal(str(price_data.get("volume_24h", 0))) if price_data.get("volume_24h") else None,
-                last_trade_time=price_data.get("last_trade_time")
+                price=quote.mid,
+                timestamp=quote.timestamp
             )
+            self.latest_prices[token_id] = price_updates[token_id]
 
-        except Exception as e:
-            logger.error(f"Error fetching price for {token_id}: {e}")
-            return None
+        return price_updates
 
     async def _update_position_pnl(
         self,
@@ -18,6 +18,7 @@ from src.filters.three_stage_filter import ThreeStageFilter
 from src.position_sizing.adaptive_kelly import AdaptiveKellySizer
 from src.risk.live_risk_manager import LiveRiskManager, RiskLevel
 from src.realtime.websocket_client import PolymarketWebSocketClient, RealTimeTradeMonitor, EventType, StreamEvent
+from src.realtime.price_bus import get_price_bus
 from src.database.connection import get_connection
 from src.inefficiencies.arbitrage_detector import ArbitrageDetector
 
@@ -116,6 +117,9 @@ class UnifiedTradingExecutor:
             self.ws_client.register_handler(EventType.WHALE_TRADE, self._handle_whale_trade)
             self.ws_client.register_handler(EventType.ORDER_FILLED, self._handle_order_filled)
 
+            # Streamed prices feed the shared bus every price consumer reads
+            self.ws_client.register_handler(EventType.PRICE_UPDATE, get_price_bus().handle_ws_event)
+
         # Calculate initial risk metrics
         self.risk_manager.calculate_risk_metrics(self.portfolio_value)
 
@@ -0,0 +1,122 @@
+"""
+Unit tests for the async API database layer
+Tests engine configuration, per-request sessions and repository queries
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.api.db import Database, async_database_url
+from src.api.repositories import PositionRepository, Repositories, TradeRepository
+
+
+# ==================== Fixtures ====================
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+    def one(self):
+        return self.rows[0]
+
+    def scalars(self):
+        return self
+
+
+class RecordingSession:
+    """Stands in for AsyncSession; records the statements executed"""
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return FakeResult(self.rows)
+
+    def sql(self, index=-1) -> str:
+        return str(self.statements[index].compile(dialect=postgresql.dialect()))
+
+
+@pytest.fixture
+async def database():
+    database = Database(
+        "postgresql://trader:secret@db:5432/polymarket_trader",
+        pool_size=7, max_overflow=3, pool_timeout=2.5, statement_timeout=4.0
+    )
+    yield database
+    await database.dispose()
+
+
+# ==================== Engine ====================
+
+class TestEngine:
+    """Pool sizing and timeouts come from the constructor (src.config in production)"""
+
+    def test_async_driver_url(self):
+        assert async_database_url("postgresql://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+        assert async_database_url("postgresql+psycopg2://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+        assert async_database_url("sqlite+aiosqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+
+    @pytest.mark.asyncio
+    async def test_pool_is_sized(self, database):
+        pool = database.engine.pool
+        assert pool.size() == 7
+        assert pool._max_overflow == 3
+        assert pool._timeout == 2.5
+        assert database.get_stats()["checked_out"] == 0
+
+    @pytest.mark.asyncio
+    async def test_statement_timeouts(self, database):
+        args = database.connect_args()
+        assert args["server_settings"]["statement_timeout"] == "4000"
+        assert args["command_timeout"] > database.statement_timeout
+
+    @pytest.mark.asyncio
+    async def test_dependency_yields_repositories_per_request(self, database):
+        dependency = database.get_repositories()
+        repos = await dependency.__anext__()
+        assert isinstance(repos, Repositories)
+        other = database.get_repositories()
+        assert (await other.__anext__()).session is not repos.session
+        for gen in (dependency, other):
+            with pytest.raises(StopAsyncIteration):
+                await gen.__anext__()
+
+
+# ==================== Repositories ====================
+
+class TestRepositories:
+    """Queries run on the request's session"""
+
+    @pytest.mark.asyncio
+    async def test_totals_since_is_one_query(self):
+        session = RecordingSession(rows=[(12, 3456.5)])
+        assert await TradeRepository(session).totals_since(datetime(2024, 1, 1)) == (12, 3456.5)
+        assert len(session.statements) == 1
+        assert "count(*)" in session.sql() and "sum(trades.amount)" in session.sql()
+
+    @pytest.mark.asyncio
+    async def test_totals_since_empty_window(self):
+        session = RecordingSession(rows=[(0, None)])
+        assert await TradeRepository(session).totals_since(datetime(2024, 1, 1)) == (0, 0.0)
+
+    @pytest.mark.asyncio
+    async def test_counts_since_skips_empty_input(self):
+        session = RecordingSession()
+        assert await TradeRepository(session).counts_since([], datetime(2024, 1, 1)) == {}
+        assert session.statements == []
+
+    @pytest.mark.asyncio
+    async def test_open_positions_limit_is_optional(self):
+        session = RecordingSession()
+        repository = PositionRepository(session)
+        await repository.open_positions(50)
+        await repository.open_positions()
+        assert "LIMIT" in session.sql(0)
+        assert "LIMIT" not in session.sql(1)
@@ -0,0 +1,24 @@
+"""
+Tests for the API concurrent load benchmark
+Covers the simulated before/after apps and result formatting
+"""
+
+import pytest
+
+from benchmarks.api_load import format_results, main, run_simulated
+
+
+class TestSimulatedLoad:
+    """Blocking vs pooled async handlers"""
+
+    @pytest.mark.asyncio
+    async def test_async_app_serves_concurrent_requests_faster(self):
+        blocking, pooled = await run_simulated(clients=20, requests=60, query_ms=5.0, pool_size=10)
+        assert blocking.requests == pooled.requests == 60
+        assert blocking.errors == pooled.errors == 0
+        assert pooled.requests_per_s > 2 * blocking.requests_per_s
+        assert "throughput x" in format_results([blocking, pooled])
+
+    def test_cli_json(self, capsys):
+        assert main(["--clients", "4", "--requests", "8", "--query-ms", "1", "--json"]) == 0
+        assert '"label": "async"' in capsys.readouterr().out
@@ -0,0 +1,183 @@
+"""
+Unit tests for the shared backtest dataset
+Tests record loading, .npy round-trips, time slicing and the engine adapters
+"""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from libs.backtesting.dataset import COLUMNS, BacktestDataset, _from_ns, _to_ns
+
+
+# ==================== Fixtures ====================
+
+START = datetime(2024, 3, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def records():
+    whales = [
+        {"address": "0xaaa", "pseudonym": "Alpha", "quality_score": 82, "win_rate": 61.5,
+         "total_pnl": 1200, "total_trades": 40},
+        {"address": "0xbbb", "pseudonym": None, "quality_score": 71, "win_rate": None,
+         "total_pnl": -50, "total_trades": 0},
+    ]
+    trades = [
+        # Deliberately out of order; one from an untracked wallet
+        {"timestamp": START + timedelta(hours=5), "trader_address": "0xbbb", "market_id": "m2",
+         "token_id": "t2", "outcome": "no", "category": "CRYPTO", "market_title": "BTC",
+         "side": "SELL", "price": 0.40, "size": 50, "amount": 20, "realized_pnl": None},
+        {"timestamp": START, "trader_address": "0xaaa", "market_id": "m1",
+         "token_id": "t1", "outcome": "YES", "category": None, "market_title": "Election",
+         "side": "BUY", "price": 0.55, "size": 100, "amount": None, "realized_pnl": 45.0},
+        {"timestamp": START + timedelta(hours=1), "trader_address": "0xzzz", "market_id": "m1",
+         "token_id": "t1", "outcome": "YES", "side": "BUY", "price": 0.5, "size": 1},
+        {"timestamp": START + timedelta(hours=2), "trader_address": "0xaaa", "market_id": "m3",
+         "token_id": "t3", "outcome": "YES", "category": "SPORTS", "market_title": None,
+         "side": "BUY", "price": 0.25, "size": 40, "amount": 10, "realized_pnl": -10.0},
+    ]
+    resolutions = [
+        {"market_id": "m1", "resolution_date": START + timedelta(days=3), "outcome": "YES"},
+        {"market_id": "m2", "resolution_date": START + timedelta(days=2), "outcome": "YES"},
+    ]
+    return trades, whales, resolutions
+
+
+@pytest.fixture
+def dataset(records):
+    return BacktestDataset.from_records(*records)
+
+
+# ==================== Timestamps ====================
+
+class TestTimestamps:
+    """Epoch-nanosecond conversion"""
+
+    def test_aware_timestamps_are_converted_to_utc(self):
+        eastern = timezone(timedelta(hours=-5))
+        aware = datetime(2024, 3, 1, 7, 0, 0, tzinfo=eastern)
+        assert _to_ns(aware) == _to_ns(datetime(2024, 3, 1, 12, 0, 0))
+        assert _to_ns(aware) == _to_ns(aware.astimezone(timezone.utc))
+
+    def test_round_trip_keeps_microseconds(self):
+        ts = datetime(2024, 3, 1, 12, 0, 0, 123457)
+        assert _from_ns(_to_ns(ts)) == ts
+        # Far enough from the epoch that float seconds would lose the last digit
+        far = datetime(2262, 1, 1, 0, 0, 0, 999999)
+        assert _from_ns(_to_ns(far)) == far
+        assert _from_ns(-1) is None and _to_ns(None) == -1
+
+
+# ==================== Construction ====================
+
+class TestFromRecords:
+    """Columns are aligned, sorted and interned"""
+
+    def test_sorted_and_untracked_wallets_dropped(self, dataset):
+        assert len(dataset) == 3
+        assert np.all(np.diff(dataset.timestamps) >= 0)
+        assert [dataset.whale_addresses[w] for w in dataset.whale_idx] == ["0xaaa", "0xaaa", "0xbbb"]
+        names = dict(zip(dataset.whale_addresses, dataset.whale_pseudonyms))
+        assert names == {"0xaaa": "Alpha", "0xbbb": "0xbbb"}
+
+    def test_outcomes_and_defaults(self, dataset):
+        # m1 resolved YES on a YES trade, m3 unresolved, m2 resolved YES on a NO trade
+        assert dataset.outcomes.tolist() == [1, -1, 0]
+        assert dataset.amounts[0] == pytest.approx(55.0)
+        assert np.isnan(dataset.realized_pnl[2])
+        slot = {address: i for i, address in enumerate(dataset.whale_addresses)}
+        assert dataset.whale_win_rate[slot["0xaaa"]] == 61.5
+        assert dataset.whale_win_rate[slot["0xbbb"]] == 50.0
+        assert dataset.whale_total_trades[slot["0xbbb"]] == 1
+        assert [dataset.categories[c] for c in dataset.category_idx] == ["UNKNOWN", "SPORTS", "CRYPTO"]
+
+
+# ==================== Persistence and Views ====================
+
+class TestPersistence:
+    """save/load round-trip and views"""
+
+    @pytest.mark.parametrize("mmap", [True, False])
+    def test_save_load_round_trip(self, dataset, tmp_path, mmap):
+        dataset.save(str(tmp_path))
+        loaded = BacktestDataset.load(str(tmp_path), mmap=mmap)
+
+        assert isinstance(loaded.timestamps, np.memmap) == mmap
+        for name, arr in dataset.columns.items():
+            np.testing.assert_array_equal(loaded.columns[name], arr)
+            assert loaded.columns[name].dtype == arr.dtype
+        assert loaded.market_titles == dataset.market_titles
+        assert loaded.to_trade_dicts() == dataset.to_trade_dicts()
+
+    def test_slice_is_inclusive_and_shares_buffers(self, dataset, tmp_path):
+        dataset.save(str(tmp_path))
+        loaded = BacktestDataset.load(str(tmp_path))
+
+        window = loaded.slice(START + timedelta(hours=2), START + timedelta(hours=5))
+        assert len(window) == 2
+        assert np.shares_memory(window.prices, loaded.prices)
+        assert len(loaded.slice(end_date=START)) == 1
+        assert len(loaded.slice(start_date=START + timedelta(days=1))) == 0
+        # Per-whale and per-market columns are not sliced
+        assert len(window.whale_quality) == 2
+
+    def test_select_whales(self, dataset):
+        only_b = dataset.select_whales(["0xbbb", "0xunknown"])
+        assert len(only_b) == 1 and only_b.sides.tolist() == [-1]
+
+
+# ==================== Adapters ====================
+
+class TestAdapters:
+    """Formats expected by the existing backtest engines"""
+
+    def test_trade_dicts(self, dataset):
+        first, _, last = dataset.to_trade_dicts()
+        assert first["timestamp"] == START
+        assert first["whale_avg_pnl_per_trade"] == pytest.approx(30.0)
+        assert first["price"] == Decimal("0.55") and first["side"] == "BUY"
+        assert first["resolved_win"] is True
+        assert last["outcome"] == "NO" and last["resolved_win"] is False
+
+    def test_whale_trades_db(self, dataset):
+        grouped = dataset.to_whale_trades_db()
+        assert [t["pnl"] for t in grouped["0xaaa"]] == [45.0, -10.0]
+        assert grouped["0xbbb"][0]["pnl"] == 0.0
+        assert list(dataset.to_whale_trades_db(min_trades=2)) == ["0xaaa"]
+
+    def test_market_outcomes(self, dataset):
+        outcomes = dataset.to_market_outcomes()
+        assert outcomes == {
+            "m1": (START + timedelta(days=3), "YES", 1.0),
+            "m2": (START + timedelta(days=2), "YES", 1.0),
+        }
+
+    def test_columns_cover_schema(self, dataset):
+        assert set(COLUMNS) <= set(dataset.columns)
+        with pytest.raises(AttributeError):
+            dataset.not_a_column
+
+
+class TestBacktesterPnl:
+    """Joined outcomes price exactly like fetched ones"""
+
+    @pytest.mark.parametrize("side", ["BUY", "SELL"])
+    @pytest.mark.parametrize("won", [True, False])
+    def test_resolved_win_matches_fetched_outcome(self, monkeypatch, side, won):
+        from src.services.backtester import Backtester
+
+        backtester = Backtester()
+        trade = {"market_id": "m1", "token_id": "t1", "price": Decimal("0.40"), "side": side}
+        size = Decimal("100")
+
+        monkeypatch.setattr(backtester, "fetch_market_outcome", lambda _: "t1" if won else "t2")
+        fetched = backtester.calculate_trade_pnl(trade, size)
+
+        monkeypatch.setattr(backtester, "fetch_market_outcome", lambda _: pytest.fail("should not fetch"))
+        joined = backtester.calculate_trade_pnl({**trade, "resolved_win": won}, size)
+
+        assert joined == fetched
+        assert joined[1] is True
@@ -0,0 +1,189 @@
+"""
+Unit tests for the backtest job runner
+Tests non-blocking submission, progress relay, deduplication and paged results
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.api.backtest_jobs import BacktestJobRunner, JobStatus, config_key, report_progress
+
+
+# ==================== Fixtures ====================
+
+def fake_backtest(job_id, params):
+    """Reports progress and returns a result shaped like format_backtest_result()"""
+    for percent in (20, 60):
+        report_progress(job_id, 3, percent, f"Processing {percent}%")
+        time.sleep(params.get("delay", 0.02))
+    if params.get("fail"):
+        raise RuntimeError("no historical trades")
+    return {
+        "performance": {"starting_balance": params["starting_balance"]},
+        "all_trades": [{"n": i} for i in range(params.get("trades", 5))],
+    }
+
+
+async def wait_finished(runner, job):
+    async for state in runner.watch(job.job_id):
+        pass
+    return state
+
+
+@pytest.fixture
+async def runner():
+    runner = BacktestJobRunner(fake_backtest, max_workers=2, use_processes=False)
+    runner.start()
+    yield runner
+    runner.stop()
+
+
+# ==================== Submission ====================
+
+class TestSubmission:
+    """Jobs run in the pool, off the event loop"""
+
+    @pytest.mark.asyncio
+    async def test_submit_returns_immediately_and_loop_stays_free(self, runner):
+        job, deduplicated = runner.submit({"starting_balance": 1000.0, "delay": 0.05})
+        assert not deduplicated and job.status == JobStatus.QUEUED
+
+        ticks = 0
+        while not job.finished:
+            await asyncio.sleep(0.005)
+            ticks += 1
+        assert ticks > 5
+        assert job.status == JobStatus.DONE
+        assert job.result == {"performance": {"starting_balance": 1000.0}}
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self, runner):
+        jobs = [runner.submit({"starting_balance": float(i)})[0] for i in range(4)]
+        await asyncio.sleep(0.01)
+        assert [j.status for j in jobs] == [JobStatus.RUNNING] * 2 + [JobStatus.QUEUED] * 2
+
+        for job in jobs:
+            await wait_finished(runner, job)
+        assert runner.get_stats()["completed"] == 4
+
+    @pytest.mark.asyncio
+    async def test_failure_is_recorded(self, runner):
+        job, _ = runner.submit({"starting_balance": 1.0, "fail": True})
+        state = await wait_finished(runner, job)
+        assert state["status"] == JobStatus.FAILED
+        assert state["error"] == "no historical trades"
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_outstanding_jobs(self):
+        runner = BacktestJobRunner(fake_backtest, max_workers=1, use_processes=False)
+        runner.start()
+        for i in range(3):
+            runner.submit({"starting_balance": float(i), "delay": 0.05})
+        tasks = set(runner._tasks)
+        assert len(tasks) == 3
+
+        runner.stop()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert all(task.cancelled() for task in tasks)
+        assert not runner._tasks
+
+
+# ==================== Progress ====================
+
+class TestProgress:
+    """progress_callback updates reach watchers and listeners"""
+
+    @pytest.mark.asyncio
+    async def test_watch_streams_progress_until_done(self, runner):
+        seen = []
+        runner.add_listener(lambda job: seen.append((job.status, job.progress.get("percent"))))
+        job, _ = runner.submit({"starting_balance": 1.0, "delay": 0.05})
+
+        states = [state async for state in runner.watch(job.job_id)]
+        percents = [s["progress"].get("percent") for s in states]
+        assert 20 in percents and 60 in percents
+        assert states[-1]["status"] == JobStatus.DONE
+        assert states[-1]["results"] is not None
+        assert states[0].get("results") is None
+        assert (JobStatus.RUNNING, 60) in seen
+
+
+# ==================== Results ====================
+
+class TestResults:
+    """Deduplication and pagination"""
+
+    @pytest.mark.asyncio
+    async def test_identical_params_share_one_job(self, runner):
+        params = {"starting_balance": 500.0, "whale_addresses": ["0xa", "0xb"]}
+        first, _ = runner.submit(params)
+        second, deduplicated = runner.submit(dict(reversed(list(params.items()))))
+        assert deduplicated and second is first
+
+        await wait_finished(runner, first)
+        third, deduplicated = runner.submit(params)
+        assert deduplicated and third is first
+
+        runner.result_ttl = 0
+        fourth, deduplicated = runner.submit(params)
+        assert not deduplicated and fourth is not first
+        await wait_finished(runner, fourth)
+
+    @pytest.mark.asyncio
+    async def test_failed_jobs_are_not_reused(self, runner):
+        params = {"starting_balance": 1.0, "fail": True}
+        job, _ = runner.submit(params)
+        await wait_finished(runner, job)
+        retry, deduplicated = runner.submit(params)
+        assert not deduplicated and retry is not job
+        await wait_finished(runner, retry)
+
+    @pytest.mark.asyncio
+    async def test_trades_are_paged(self, runner):
+        job, _ = runner.submit({"starting_balance": 1.0, "trades": 25})
+        await wait_finished(runner, job)
+
+        page = runner.get_trades(job.job_id, offset=20, limit=10)
+        assert page["total"] == 25
+        assert [t["n"] for t in page["trades"]] == [20, 21, 22, 23, 24]
+        assert runner.get_trades("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_finished_jobs_are_evicted_first(self):
+        runner = BacktestJobRunner(fake_backtest, max_workers=1, max_jobs=2, use_processes=False)
+        runner.start()
+        done, _ = runner.submit({"starting_balance": 0.0, "delay": 0})
+        await wait_finished(runner, done)
+        running = [runner.submit({"starting_balance": float(i)})[0] for i in (1, 2)]
+
+        assert runner.get(done.job_id) is None
+        assert all(runner.get(j.job_id) for j in running)
+        assert runner.submit({"starting_balance": 0.0, "delay": 0})[1] is False
+        for job in list(runner.jobs.values()):
+            await wait_finished(runner, job)
+        runner.stop()
+
+    def test_config_key_ignores_order(self):
+        assert config_key({"a": 1, "b": [1, 2]}) == config_key({"b": [1, 2], "a": 1})
+        assert config_key({"a": 1}) != config_key({"a": 2})
+
+
+# ==================== Process Pool ====================
+
+class TestProcessPool:
+    """Default mode runs jobs in spawned worker processes"""
+
+    @pytest.mark.asyncio
+    async def test_job_runs_in_worker_process(self):
+        runner = BacktestJobRunner(fake_backtest, max_workers=1)
+        runner.start()
+        job, _ = runner.submit({"starting_balance": 2.0, "trades": 3})
+        states = [state async for state in runner.watch(job.job_id)]
+        runner.stop()
+
+        assert states[-1]["status"] == JobStatus.DONE
+        assert states[-1]["total_trades"] == 3
+        assert any(s["progress"].get("percent") == 60 for s in states)
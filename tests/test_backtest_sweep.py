@@ -0,0 +1,148 @@
+"""
+Equivalence tests for the vectorized parameter sweep kernel
+Checks libs.backtesting.sweep against the reference Decimal Backtester
+"""
+
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from libs.backtesting.dataset import BacktestDataset
+from libs.backtesting.sweep import parameter_grid, run_sweep
+from src.services.backtester import Backtester, BacktestConfig
+
+
+# ==================== Fixtures ====================
+
+@pytest.fixture
+def dataset():
+    """Seeded dataset of resolved whale trades"""
+    rng = random.Random(7)
+    start = datetime(2024, 1, 1)
+
+    whales = [
+        {
+            'address': f"0x{i:040x}",
+            'pseudonym': f"whale_{i}",
+            'quality_score': q,
+            'win_rate': 55.0,
+            'total_pnl': 1000.0,
+            'total_trades': 100,
+        }
+        for i, q in enumerate([45, 60, 72, 88, 95])
+    ]
+    markets = [f"market_{i}" for i in range(12)]
+    resolutions = [
+        {'market_id': m, 'resolution_date': start + timedelta(days=90), 'outcome': rng.choice(['YES', 'NO'])}
+        for m in markets
+    ]
+
+    trades = []
+    for n in range(120):
+        whale = rng.choice(whales)
+        trades.append({
+            'timestamp': start + timedelta(hours=n * 7),
+            'trader_address': whale['address'],
+            'market_id': rng.choice(markets),
+            'token_id': f"token_{n}",
+            'outcome': rng.choice(['YES', 'NO']),
+            'category': 'POLITICS',
+            'market_title': 'Test market',
+            'side': rng.choice(['BUY', 'BUY', 'SELL']),
+            'price': rng.choice([0.2, 0.35, 0.5, 0.65, 0.8]),
+            'size': 100.0,
+            'amount': 50.0,
+            'realized_pnl': None,
+        })
+
+    return BacktestDataset.from_records(trades, whales, resolutions)
+
+
+def run_reference(dataset, min_quality, pct, max_usd):
+    """Run the Decimal engine for one parameter set"""
+    config = BacktestConfig(
+        starting_balance=Decimal('1000.0'),
+        max_position_usd=Decimal(str(max_usd)),
+        min_whale_quality=min_quality,
+        position_size_pct=Decimal(str(pct)),
+    )
+    backtester = Backtester(config, dataset=dataset)
+    with patch('src.services.backtester.time.sleep'):
+        return backtester.run_backtest()
+
+
+# ==================== Tests ====================
+
+class TestSweepEquivalence:
+    """Vectorized kernel must match the reference Backtester"""
+
+    @pytest.mark.parametrize("min_quality,pct,max_usd", [
+        (50, 0.05, 100.0),
+        (70, 0.10, 25.0),
+        (90, 0.02, 500.0),
+        (0, 0.20, 60.0),
+    ])
+    def test_matches_reference_engine(self, dataset, min_quality, pct, max_usd):
+        """Each parameter set in a sweep reproduces run_backtest()"""
+        reference = run_reference(dataset, min_quality, pct, max_usd)
+
+        backtester = Backtester(BacktestConfig(), dataset=dataset)
+        sweep = backtester.run_parameter_sweep([min_quality], [pct], [max_usd])
+
+        assert sweep.total_trades[0] == reference.total_trades
+        assert sweep.winning_trades[0] == reference.winning_trades
+        assert sweep.losing_trades[0] == reference.losing_trades
+        assert sweep.ending_balance[0] == pytest.approx(float(reference.ending_balance), rel=1e-9)
+        assert sweep.max_drawdown[0] == pytest.approx(float(reference.max_drawdown), rel=1e-9, abs=1e-9)
+        assert sweep.sharpe_ratio[0] == pytest.approx(reference.sharpe_ratio, rel=1e-6, abs=1e-9)
+
+    def test_batch_matches_individual_runs(self, dataset):
+        """Sweeping a grid gives the same answer as sweeping one set at a time"""
+        backtester = Backtester(BacktestConfig(), dataset=dataset)
+        grid = ([40, 70, 90], [0.02, 0.05, 0.10], [25.0, 100.0])
+        batch = backtester.run_parameter_sweep(*grid)
+
+        assert len(batch) == 18
+        for k in range(len(batch)):
+            single = backtester.run_parameter_sweep(
+                [batch.min_whale_quality[k]], [batch.position_size_pct[k]], [batch.max_position_usd[k]]
+            )
+            assert batch.ending_balance[k] == pytest.approx(single.ending_balance[0])
+            assert batch.total_trades[k] == single.total_trades[0]
+
+
+class TestRunSweep:
+    """Kernel behaviour independent of the Backtester"""
+
+    def test_no_trades_copied_below_quality(self):
+        """A quality threshold above every whale leaves balance untouched"""
+        result = run_sweep(
+            trade_returns=[0.5, -1.02, 0.3],
+            whale_quality=[60, 60, 60],
+            min_whale_quality=[70],
+            position_size_pct=[0.05],
+            max_position_usd=[100.0],
+            day_index=[0, 1, 2],
+        )
+
+        assert result.total_trades[0] == 0
+        assert result.ending_balance[0] == 1000.0
+        assert result.sharpe_ratio[0] == 0.0
+
+    def test_balance_curves_shape(self):
+        """Balance curves have one row per parameter set and one column per trade"""
+        grid = parameter_grid([0, 50], [0.05, 0.1], [100.0])
+        result = run_sweep(
+            trade_returns=np.full(10, 0.1),
+            whale_quality=np.full(10, 80.0),
+            day_index=np.arange(10),
+            **grid
+        )
+
+        assert result.balance_curves.shape == (4, 10)
+        assert np.all(np.diff(result.balance_curves, axis=1) > 0)
+        assert np.all(result.peak_drawdown_pct == 0)
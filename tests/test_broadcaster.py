@@ -0,0 +1,213 @@
+"""
+Unit tests for the websocket fan-out broadcaster
+Tests per-client queues, slow-client policies and dead socket eviction
+"""
+
+import asyncio
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from src.realtime.broadcaster import EVICTED_CLOSE_CODE, WebSocketBroadcaster, encode_message
+
+
+# ==================== Fixtures ====================
+
+class FakeWebSocket:
+    """Records sent text; can block until released, or fail"""
+
+    def __init__(self, fail: bool = False, blocked: bool = False):
+        self.fail = fail
+        self.accepted = False
+        self.sent = []
+        self.close_code = None
+        self.gate = asyncio.Event()
+        if not blocked:
+            self.gate.set()
+
+    async def accept(self):
+        self.accepted = True
+
+    async def send_text(self, text):
+        await self.gate.wait()
+        if self.fail:
+            raise RuntimeError("socket closed")
+        self.sent.append(json.loads(text))
+
+    async def close(self, code=1000):
+        self.close_code = code
+
+
+async def drain():
+    # Let every writer task empty its queue
+    await asyncio.sleep(0.01)
+
+
+# ==================== Fan-Out ====================
+
+class TestFanOut:
+    """Messages reach every client once"""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_reaches_all_clients(self):
+        manager = WebSocketBroadcaster()
+        clients = [FakeWebSocket() for _ in range(3)]
+        for ws in clients:
+            await manager.connect(ws)
+
+        assert await manager.broadcast({"type": "trade", "id": 1}) == 3
+        await drain()
+
+        assert all(ws.accepted and ws.sent == [{"type": "trade", "id": 1}] for ws in clients)
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_block_others(self):
+        manager = WebSocketBroadcaster()
+        slow, fast = FakeWebSocket(blocked=True), FakeWebSocket()
+        await manager.connect(slow)
+        await manager.connect(fast)
+
+        for i in range(10):
+            await manager.broadcast({"seq": i})
+        await drain()
+
+        assert [m["seq"] for m in fast.sent] == list(range(10))
+        assert slow.sent == []
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_personal_messages_keep_order(self):
+        manager = WebSocketBroadcaster()
+        ws = FakeWebSocket()
+        await manager.connect(ws)
+        await manager.send(ws, {"type": "connected"})
+        await manager.broadcast({"type": "trade"})
+        await manager.send(ws, {"type": "ack"})
+        await drain()
+
+        assert [m["type"] for m in ws.sent] == ["connected", "trade", "ack"]
+        await manager.close()
+
+    def test_encodes_decimals_and_datetimes(self):
+        message = {"price": Decimal("0.55"), "at": datetime(2024, 1, 2, 3, 4, 5)}
+        assert json.loads(encode_message(message)) == {"price": 0.55, "at": "2024-01-02T03:04:05"}
+
+
+# ==================== Slow Clients ====================
+
+class TestBackpressure:
+    """Bounded queues drop oldest and coalesce by key"""
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_oldest(self):
+        manager = WebSocketBroadcaster(max_queue=3)
+        ws = FakeWebSocket(blocked=True)
+        await manager.connect(ws)
+        await drain()
+
+        for i in range(6):
+            await manager.broadcast({"seq": i})
+        assert manager.get_stats()["dropped"] == 3
+
+        ws.gate.set()
+        await drain()
+        assert [m["seq"] for m in ws.sent] == [3, 4, 5]
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_reliable_messages_are_never_dropped(self):
+        manager = WebSocketBroadcaster(max_queue=3)
+        ws = FakeWebSocket(blocked=True)
+        await manager.connect(ws)
+        await drain()
+
+        await manager.broadcast({"seq": 0})
+        await manager.broadcast({"seq": 1}, reliable=True)
+        await manager.broadcast({"seq": 2}, reliable=True)
+        await manager.broadcast({"seq": 3}, reliable=True)
+        assert manager.get_stats()["dropped"] == 1
+        assert manager.active_connections == [ws]
+
+        # No droppable message left to make room: evict rather than lose one
+        await manager.broadcast({"seq": 4}, reliable=True)
+        await drain()
+        assert manager.active_connections == []
+        assert ws.close_code == EVICTED_CLOSE_CODE
+
+    @pytest.mark.asyncio
+    async def test_coalesce_key_keeps_latest_in_place(self):
+        manager = WebSocketBroadcaster()
+        ws = FakeWebSocket(blocked=True)
+        await manager.connect(ws)
+        await drain()
+
+        await manager.broadcast({"type": "pnl", "value": 1}, coalesce_key="pnl")
+        await manager.broadcast({"type": "trade"})
+        await manager.broadcast({"type": "pnl", "value": 2}, coalesce_key="pnl")
+        assert manager.get_stats()["coalesced"] == 1
+
+        ws.gate.set()
+        await drain()
+        assert ws.sent == [{"type": "pnl", "value": 2}, {"type": "trade"}]
+        await manager.close()
+
+
+# ==================== Eviction ====================
+
+class TestEviction:
+    """Dead sockets are removed"""
+
+    @pytest.mark.asyncio
+    async def test_failed_send_evicts_client(self):
+        manager = WebSocketBroadcaster()
+        dead, alive = FakeWebSocket(fail=True), FakeWebSocket()
+        await manager.connect(dead)
+        await manager.connect(alive)
+
+        await manager.broadcast({"seq": 1})
+        await drain()
+        assert manager.active_connections == [alive]
+        assert manager.evicted == 1
+
+        await manager.broadcast({"seq": 2})
+        await drain()
+        assert [m["seq"] for m in alive.sent] == [1, 2]
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_send_timeout_evicts_client(self):
+        manager = WebSocketBroadcaster(send_timeout=0.01)
+        stuck = FakeWebSocket(blocked=True)
+        await manager.connect(stuck)
+        await manager.broadcast({"seq": 1})
+        await asyncio.sleep(0.05)
+        assert manager.active_connections == []
+
+    @pytest.mark.asyncio
+    async def test_evicted_socket_is_closed(self):
+        manager = WebSocketBroadcaster(send_timeout=0.01)
+        dead, stuck, alive = FakeWebSocket(fail=True), FakeWebSocket(blocked=True), FakeWebSocket()
+        for ws in (dead, stuck, alive):
+            await manager.connect(ws)
+
+        await manager.broadcast({"seq": 1})
+        await asyncio.sleep(0.05)
+        # Closed so the client's onclose fires and it reconnects
+        assert dead.close_code == stuck.close_code == EVICTED_CLOSE_CODE
+        assert alive.close_code is None
+
+        manager.disconnect(alive)
+        await drain()
+        assert alive.close_code is None
+
+    @pytest.mark.asyncio
+    async def test_disconnect_is_idempotent(self):
+        manager = WebSocketBroadcaster()
+        ws = FakeWebSocket()
+        await manager.connect(ws)
+        manager.disconnect(ws)
+        manager.disconnect(ws)
+        assert await manager.broadcast({"seq": 1}) == 0
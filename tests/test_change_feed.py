@@ -0,0 +1,310 @@
+"""
+Unit tests for the dashboard change feed
+Tests materialized topic views, snapshot + delta delivery and derived refreshes
+"""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from src.realtime.broadcaster import EVICTED_CLOSE_CODE, WebSocketBroadcaster
+from src.realtime.change_feed import ChangeFeed, ChangeOp
+
+
+# ==================== Fixtures ====================
+
+class FakeWebSocket:
+    def __init__(self, blocked: bool = False):
+        self.sent = []
+        self.close_code = None
+        self.gate = asyncio.Event()
+        if not blocked:
+            self.gate.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        await self.gate.wait()
+        self.sent.append(json.loads(text))
+
+    async def close(self, code=1000):
+        self.close_code = code
+
+
+def client_view(messages):
+    """Rebuild rows the way the dashboard's applyFeedMessage does"""
+    rows = {}
+    for msg in messages:
+        if msg["type"] == "snapshot":
+            rows = {row["id"]: row for row in msg["rows"]}
+        elif msg["op"] == "delete":
+            rows.pop(msg["key"], None)
+        else:
+            rows[msg["key"]] = msg["row"]
+    return rows
+
+
+class FakeTable:
+    """Row source that counts full and single-row reads"""
+
+    def __init__(self, rows):
+        self.rows = {row["id"]: row for row in rows}
+        self.full_reads = 0
+        self.row_reads = 0
+
+    async def load_all(self):
+        self.full_reads += 1
+        return list(self.rows.values())
+
+    async def load_one(self, key):
+        self.row_reads += 1
+        return self.rows.get(key)
+
+
+async def drain():
+    await asyncio.sleep(0.01)
+
+
+async def make_feed(table, clients=2, max_queue=256, **kwargs):
+    manager = WebSocketBroadcaster(max_queue=max_queue)
+    feed = ChangeFeed(manager)
+    feed.register("items", "id", table.load_all, load_one=table.load_one, **kwargs)
+    feed.start()
+    sockets = [FakeWebSocket() for _ in range(clients)]
+    for ws in sockets:
+        await manager.connect(ws)
+    return feed, manager, sockets
+
+
+# ==================== Snapshots and Deltas ====================
+
+class TestSnapshotsAndDeltas:
+    """Clients get one snapshot, then deltas"""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_loads_once_for_all_clients(self):
+        table = FakeTable([{"id": "a", "v": 1}, {"id": "b", "v": 2}])
+        feed, manager, sockets = await make_feed(table, clients=3)
+        for ws in sockets:
+            assert await feed.subscribe(ws, ["items", "unknown"]) == ["items"]
+        await drain()
+
+        assert table.full_reads == 1
+        for ws in sockets:
+            assert ws.sent[0]["type"] == "snapshot"
+            assert [r["id"] for r in ws.sent[0]["rows"]] == ["a", "b"]
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_change_is_read_once_and_pushed_to_subscribers(self):
+        table = FakeTable([{"id": "a", "v": 1}])
+        feed, manager, (subscriber, bystander) = await make_feed(table)
+        await feed.subscribe(subscriber, ["items"])
+
+        table.rows["a"] = {"id": "a", "v": 5}
+        await feed.publish("items", "a")
+        await drain()
+
+        assert table.row_reads == 1
+        delta = subscriber.sent[-1]
+        assert (delta["type"], delta["op"], delta["key"], delta["row"]["v"]) == ("delta", "upsert", "a", 5)
+        assert delta["seq"] > subscriber.sent[0]["seq"]
+        assert bystander.sent == []
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_row_leaving_view_becomes_delete(self):
+        table = FakeTable([{"id": "a"}, {"id": "b"}])
+        feed, manager, (ws, _) = await make_feed(table)
+        await feed.subscribe(ws, ["items"])
+
+        del table.rows["a"]
+        await feed.publish("items", "a")
+        await feed.publish("items", "missing")
+        await drain()
+
+        assert [m.get("op") for m in ws.sent] == [None, "delete"]
+        assert [r["id"] for r in feed.topics["items"].snapshot()] == ["b"]
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_unloaded_topic_costs_no_reads(self):
+        table = FakeTable([{"id": "a"}])
+        feed, manager, _ = await make_feed(table)
+        await feed.publish("items", "a")
+        assert table.full_reads == table.row_reads == 0
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe_stops_deltas(self):
+        table = FakeTable([{"id": "a"}])
+        feed, manager, (ws, _) = await make_feed(table)
+        await feed.subscribe(ws, ["items"])
+        feed.unsubscribe(ws)
+        await feed.publish("items", "a", row={"id": "a", "v": 2})
+        await drain()
+        assert len(ws.sent) == 1
+        await manager.close()
+
+
+# ==================== Lagging Clients ====================
+
+class TestLaggingClients:
+    """Snapshots and deltas are never dropped; laggards resync"""
+
+    @pytest.mark.asyncio
+    async def test_lagging_client_is_evicted_and_resyncs(self):
+        table = FakeTable([{"id": "a", "v": 0}, {"id": "b", "v": 0}])
+        feed, manager, (fast,) = await make_feed(table, clients=1, max_queue=3)
+        slow = FakeWebSocket(blocked=True)
+        await manager.connect(slow)
+        for ws in (fast, slow):
+            await feed.subscribe(ws, ["items"])
+        await drain()
+
+        # Deltas pile up behind the stuck snapshot until the queue is full
+        for v in range(1, 6):
+            table.rows["a"] = {"id": "a", "v": v}
+            await feed.publish("items", "a")
+            await drain()
+        del table.rows["b"]
+        await feed.publish("items", "b")
+        await drain()
+
+        # Instead of silently losing deltas, the slow client is closed ...
+        assert slow.close_code == EVICTED_CLOSE_CODE
+        assert slow not in manager.active_connections
+        assert client_view(fast.sent) == table.rows
+
+        # ... and its reconnect gets a snapshot that matches the view
+        feed.unsubscribe(slow)
+        reconnected = FakeWebSocket()
+        await manager.connect(reconnected)
+        await feed.subscribe(reconnected, ["items"])
+        await drain()
+        assert client_view(reconnected.sent) == table.rows == {"a": {"id": "a", "v": 5}}
+        await manager.close()
+
+
+# ==================== Views ====================
+
+class TestViews:
+    """Bounded recent-items views and derived topics"""
+
+    @pytest.mark.asyncio
+    async def test_recent_items_view_is_bounded_newest_first(self):
+        table = FakeTable([{"id": i} for i in (5, 4, 3)])  # Newest first, like /api/trades
+        feed, manager, _ = await make_feed(table, max_rows=3, newest_first=True)
+        await feed.subscribe(FakeWebSocket(), ["items"])
+
+        await feed.publish("items", 6, row={"id": 6})
+        assert [r["id"] for r in feed.topics["items"].snapshot()] == [6, 5, 4]
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_derived_topic_refresh_is_debounced(self):
+        table = FakeTable([{"id": "a"}])
+        loads = []
+
+        async def load_stats():
+            loads.append(1)
+            return {"count": len(table.rows)}
+
+        feed, manager, (ws, _) = await make_feed(table)
+        feed.register("stats", None, load_stats, refresh_on=["items"], min_refresh_interval=0.05)
+        await feed.subscribe(ws, ["items", "stats"])
+
+        for i in range(5):
+            await feed.publish("items", f"n{i}", row={"id": f"n{i}"})
+        await asyncio.sleep(0.1)
+
+        assert len(loads) == 2
+        stats = [m for m in ws.sent if m["topic"] == "stats"]
+        assert stats[-1]["type"] == "snapshot"
+        assert stats[-1]["data"] == {"count": 1}
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_change_during_initial_load_is_not_lost(self):
+        table = FakeTable([{"id": "a", "v": 1}])
+        release = asyncio.Event()
+        load_all = table.load_all
+
+        async def slow_load_all():
+            rows = await load_all()
+            await release.wait()
+            return rows
+
+        feed = ChangeFeed(WebSocketBroadcaster())
+        feed.register("items", "id", slow_load_all, load_one=table.load_one)
+        subscribe = asyncio.ensure_future(feed.subscribe(FakeWebSocket(), ["items"]))
+        await asyncio.sleep(0)
+
+        table.rows["a"] = {"id": "a", "v": 2}
+        publish = asyncio.ensure_future(feed.publish("items", "a"))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(subscribe, publish)
+
+        assert feed.topics["items"].snapshot() == [{"id": "a", "v": 2}]
+
+    @pytest.mark.asyncio
+    async def test_resync_picks_up_writes_the_feed_never_saw(self):
+        """A write from another process (no publish) reaches clients on the timer"""
+        table = FakeTable([{"id": "a", "v": 1}])
+        manager = WebSocketBroadcaster()
+        feed = ChangeFeed(manager, resync_check_interval=0.01)
+        feed.register("items", "id", table.load_all, load_one=table.load_one, resync_interval=0.03)
+        feed.start()
+        ws = FakeWebSocket()
+        await manager.connect(ws)
+        await feed.subscribe(ws, ["items"])
+
+        table.rows["b"] = {"id": "b", "v": 1}
+        await asyncio.sleep(0.1)
+
+        snapshots = [m for m in ws.sent if m["type"] == "snapshot"]
+        assert len(snapshots) >= 2
+        assert [r["id"] for r in snapshots[-1]["rows"]] == ["a", "b"]
+        assert feed.get_stats()["resyncs"] >= 1
+        feed.stop()
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_background_publish_is_logged(self, caplog):
+        table = FakeTable([{"id": "a"}])
+        feed, manager, (ws, _) = await make_feed(table)
+        await feed.subscribe(ws, ["items"])
+
+        async def broken_load_one(key):
+            raise RuntimeError("db down")
+
+        feed.topics["items"].load_one = broken_load_one
+        feed.publish_threadsafe("items", "a")
+        await drain()
+
+        assert feed.get_stats()["task_errors"] == 1
+        assert "db down" in caplog.text
+        assert not feed._tasks
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_publish_threadsafe_from_worker_thread(self):
+        table = FakeTable([{"id": "a"}])
+        feed, manager, (ws, _) = await make_feed(table)
+        await feed.subscribe(ws, ["items"])
+
+        worker = threading.Thread(
+            target=feed.publish_threadsafe, args=("items", "b"), kwargs={"row": {"id": "b"}}
+        )
+        worker.start()
+        worker.join()
+        await drain()
+
+        assert ws.sent[-1]["key"] == "b"
+        feed.stop()
+        feed.publish_threadsafe("items", "c", row={"id": "c"}, op=ChangeOp.UPSERT)
+        await manager.close()
@@ -0,0 +1,76 @@
+"""
+Tests for the scoring and risk kernel micro-benchmarks
+Covers timing, the run history and the compare command
+"""
+
+import json
+
+from benchmarks import baseline
+from benchmarks.kernels import KERNELS, append_history, load_history, main, measure, run_kernels
+
+
+# ==================== Timing ====================
+
+class TestMeasure:
+    """Warmup, auto-ranging and repetition"""
+
+    def test_measure_counts_calls(self):
+        calls = []
+        stats = measure(lambda: calls.append(1), repeat=3, min_time=0.001, warmup=2)
+
+        assert stats["repeat"] == 3
+        assert stats["number"] >= 1
+        assert stats["min_us"] <= stats["median_us"] <= stats["max_us"]
+        # Warmup and auto-ranging calls are not part of the timed batches
+        assert len(calls) > 2 + 3 * stats["number"]
+
+    def test_every_kernel_runs(self):
+        """Smallest size of each kernel produces a timing"""
+        timings = run_kernels(repeat=1, min_time=0.0, max_size_index=1)
+
+        assert [t.name for t in timings] == [case.name for case in KERNELS]
+        assert all(t.median_us > 0 for t in timings)
+
+
+# ==================== History and Compare ====================
+
+class TestHistory:
+    """History file and regression checks through the CLI"""
+
+    def test_history_roundtrip(self, tmp_path):
+        path = str(tmp_path / "history.jsonl")
+        timings = run_kernels(names=["mvar"], sizes=[250], repeat=1, min_time=0.0)
+        append_history(timings, path)
+        append_history(timings, path)
+
+        history = load_history(path)
+        assert len(history) == 2
+        assert "cornish_fisher_mvar[250]" in history[-1]["results"]
+
+    def test_compare_against_baseline(self, tmp_path, capsys):
+        history = str(tmp_path / "history.jsonl")
+        path = str(tmp_path / "kernels.json")
+        args = ["--history", history, "--baseline", path]
+        run = ["run", "--filter", "bet_weight", "--sizes", "10", "--repeat", "1", "--min-time", "0"]
+
+        assert main(args + ["compare"]) == 1
+        assert main(args + run + ["--save-baseline"]) == 0
+        assert main(args + ["compare", "--threshold", "100"]) == 0
+
+        # A baseline 10x faster than the latest run must flag
+        entry = baseline.load(path)["kernels"]
+        entry["metrics"] = {key: value / 10 for key, value in entry["metrics"].items()}
+        with open(path, "w") as f:
+            json.dump({"kernels": entry}, f)
+        assert main(args + ["compare"]) == 1
+        assert "bet_weight[10]" in capsys.readouterr().out
+
+    def test_compare_against_earlier_run(self, tmp_path):
+        history = str(tmp_path / "history.jsonl")
+        args = ["--history", history, "--baseline", str(tmp_path / "none.json")]
+        run = ["run", "--filter", "kelly", "--sizes", "10", "--repeat", "1", "--min-time", "0"]
+
+        assert main(args + run) == 0
+        assert main(args + ["compare", "--against-run", "-2"]) == 1
+        assert main(args + run) == 0
+        assert main(args + ["compare", "--against-run", "-2", "--threshold", "100"]) == 0
@@ -0,0 +1,154 @@
+"""
+Unit tests for pipeline latency tracing
+Covers the log-bucketed histogram, spans, the timed decorator and per-trade traces
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from src.monitoring.latency import (
+    END_TO_END,
+    ORDER_PLACEMENT,
+    SIGNAL_EVALUATION,
+    SIZING,
+    LatencyHistogram,
+    LatencyTracer,
+    bucket_bounds,
+    bucket_index,
+)
+
+
+# ==================== Histogram ====================
+
+class TestLatencyHistogram:
+    """Log-linear buckets and percentiles"""
+
+    def test_buckets_cover_value(self):
+        """Every value falls inside its bucket's bounds, within ~3%"""
+        for value in [0, 1, 31, 32, 33, 63, 64, 1000, 123_456_789, 2**39 + 17]:
+            low, high = bucket_bounds(bucket_index(value))
+            assert low <= value <= high
+            assert high - low <= max(1, value / 32)
+
+    def test_percentiles_match_exact(self):
+        """Percentiles stay within bucket resolution of the sorted samples"""
+        rng = random.Random(3)
+        values = [int(rng.lognormvariate(15, 1.5)) for _ in range(20_000)]
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        values.sort()
+        for q in (50, 90, 99):
+            exact = values[int(len(values) * q / 100) - 1]
+            assert histogram.percentile(q) == pytest.approx(exact, rel=0.04)
+        assert histogram.percentile(100) == values[-1]
+        assert histogram.percentile(0) == values[0]
+
+    def test_merge(self):
+        """Merging equals recording everything into one histogram"""
+        a, b, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for value in range(0, 10_000, 7):
+            (a if value % 2 else b).record(value)
+            both.record(value)
+        a.merge(b)
+
+        assert a.counts == both.counts
+        assert (a.count, a.min_ns, a.max_ns, a.total_ns) == (both.count, both.min_ns, both.max_ns, both.total_ns)
+
+
+# ==================== Tracer ====================
+
+class TestLatencyTracer:
+    """Spans, decorator and per-trade traces"""
+
+    def test_span_and_timed(self):
+        """Context manager and decorator each record one sample per use"""
+        tracer = LatencyTracer()
+
+        @tracer.timed(SIZING)
+        def size():
+            return 42
+
+        with tracer.span(SIGNAL_EVALUATION):
+            pass
+        assert size() == 42
+        assert size.__name__ == "size"
+
+        assert tracer.get_histogram(SIGNAL_EVALUATION).count == 1
+        assert tracer.get_histogram(SIZING).count == 1
+
+    def test_disabled_records_nothing(self):
+        """Disabled tracer hands out no-op spans and calls straight through"""
+        tracer = LatencyTracer(enabled=False)
+
+        @tracer.timed(SIZING)
+        def size():
+            return 1
+
+        with tracer.span(SIGNAL_EVALUATION):
+            pass
+        with tracer.trace("t1") as trace:
+            trace.add(SIZING, 5)
+        size()
+        tracer.record(SIZING, 10)
+
+        assert tracer.histograms == {}
+        assert len(tracer.recent) == 0
+
+    def test_timed_propagates_exceptions(self):
+        """A failing call is still timed and the exception is not swallowed"""
+        tracer = LatencyTracer()
+
+        @tracer.timed(ORDER_PLACEMENT)
+        def place():
+            raise RuntimeError("rejected")
+
+        with pytest.raises(RuntimeError):
+            place()
+        assert tracer.get_histogram(ORDER_PLACEMENT).count == 1
+
+    @pytest.mark.asyncio
+    async def test_trace_collects_nested_stages(self):
+        """Spans inside a trace (including decorated coroutines) land in its breakdown"""
+        tracer = LatencyTracer()
+
+        @tracer.timed(ORDER_PLACEMENT)
+        async def place():
+            await asyncio.sleep(0.01)
+
+        with tracer.trace("trade-1") as trace:
+            with tracer.span(SIGNAL_EVALUATION):
+                pass
+            await place()
+
+        breakdown = tracer.snapshot()["recent_traces"][-1]
+        assert breakdown["trace_id"] == "trade-1"
+        assert set(breakdown["stages_ms"]) == {SIGNAL_EVALUATION, ORDER_PLACEMENT}
+        assert breakdown["stages_ms"][ORDER_PLACEMENT] >= 10
+        assert breakdown["total_ms"] >= breakdown["stages_ms"][ORDER_PLACEMENT]
+        assert tracer.get_histogram(END_TO_END).count == 1
+        assert trace.end_ns is not None
+
+    def test_filtered_trade_not_counted_end_to_end(self):
+        """Traces that never reach order placement keep a breakdown but skip end_to_end"""
+        tracer = LatencyTracer()
+
+        with tracer.trace("trade-2"):
+            with tracer.span(SIGNAL_EVALUATION):
+                pass
+
+        assert tracer.get_histogram(END_TO_END) is None
+        assert tracer.snapshot()["recent_traces"][-1]["trace_id"] == "trade-2"
+
+    def test_snapshot_orders_pipeline_stages(self):
+        """Pipeline stages come first in pipeline order"""
+        tracer = LatencyTracer()
+        for stage in ("api_fetch", ORDER_PLACEMENT, SIGNAL_EVALUATION):
+            tracer.record(stage, 1_000_000)
+
+        stages = tracer.snapshot()["stages"]
+        assert list(stages) == [SIGNAL_EVALUATION, ORDER_PLACEMENT, "api_fetch"]
+        assert stages[ORDER_PLACEMENT]["p50_ms"] == pytest.approx(1.0, rel=0.04)
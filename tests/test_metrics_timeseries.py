@@ -0,0 +1,129 @@
+"""
+Unit tests for the columnar monitoring time-series store
+Covers ring-buffer queries, rollups, MetricsCollector and Prometheus output
+"""
+
+import random
+from datetime import timedelta
+
+import pytest
+
+from src.monitoring.timeseries import NS_PER_SECOND, TimeSeriesStore
+from src.monitoring.dashboard import MetricsCollector, MonitoringDashboard, WebDashboardServer
+
+
+T0 = 1_700_000_000 * NS_PER_SECOND
+
+
+# ==================== Store ====================
+
+class TestTimeSeriesStore:
+    """Ring buffers, range queries and rollups"""
+
+    def test_range_after_wraparound(self):
+        """Range queries see only retained samples, in time order"""
+        store = TimeSeriesStore(capacity=50)
+        samples = [(T0 + i * NS_PER_SECOND // 4, float(i)) for i in range(180)]
+        for ts, value in samples:
+            store.record("latency", value, timestamp_ns=ts)
+
+        series = store.get("latency")
+        assert list(zip(*series.range())) == samples[-50:]
+        assert list(zip(*series.range(samples[140][0], samples[150][0]))) == samples[140:150]
+        assert series.range(samples[-1][0] + 1) == ([], [])
+
+    def test_rollups(self):
+        """Second buckets aggregate count, sum, min and max"""
+        store = TimeSeriesStore(capacity=10)
+        for i in range(8):
+            store.record("cpu", float(i), timestamp_ns=T0 + i * NS_PER_SECOND // 4)
+
+        buckets = store.get("cpu").rollup("1s")
+        assert buckets["count"] == [4, 4]
+        assert buckets["sum"] == [6.0, 22.0]
+        assert buckets["min"] == [0.0, 4.0]
+        assert buckets["max"] == [3.0, 7.0]
+        # Rollups keep counting after raw samples are evicted
+        assert sum(store.get("cpu").rollup("1m")["count"]) == 8
+
+    @pytest.mark.parametrize("resolution,width", [("1s", NS_PER_SECOND), ("1m", 60 * NS_PER_SECOND)])
+    def test_cascaded_rollups_match_brute_force(self, resolution, width):
+        """Buckets built from closed finer buckets equal a direct aggregation"""
+        rng = random.Random(9)
+        store = TimeSeriesStore(capacity=10)
+        expected = {}
+        ts = T0
+        for _ in range(3000):
+            ts += rng.randint(0, 3 * NS_PER_SECOND)
+            value = rng.random()
+            store.record("queue_depth", value, timestamp_ns=ts)
+            bucket = expected.setdefault(ts - ts % width, [0, 0.0])
+            bucket[0] += 1
+            bucket[1] += value
+
+        buckets = store.get("queue_depth").rollup(resolution)
+        starts = sorted(expected)[-len(buckets["ts"]):]
+
+        assert buckets["ts"] == starts
+        assert buckets["count"] == [expected[b][0] for b in starts]
+        assert buckets["sum"] == pytest.approx([expected[b][1] for b in starts])
+
+    def test_label_sets_are_separate_series(self):
+        """Each label set is its own series; queries merge them by time"""
+        store = TimeSeriesStore()
+        store.record("health", 1.0, {"component": "db"}, timestamp_ns=T0)
+        store.record("health", 0.0, {"component": "api"}, timestamp_ns=T0 + 1)
+
+        assert store.get("health", {"component": "db"}).last_value == 1.0
+        assert [value for _, value, _ in store.query("health")] == [1.0, 0.0]
+
+    def test_prometheus_exposition(self):
+        """Names are sanitized and label values escaped"""
+        store = TimeSeriesStore()
+        store.record("system.cpu_usage", 12.5, timestamp_ns=T0)
+        store.record("component.health", 1, {"name": 'db "primary"'}, timestamp_ns=T0)
+
+        text = store.to_prometheus()
+
+        assert "# TYPE system_cpu_usage gauge\nsystem_cpu_usage 12.5 1700000000000\n" in text
+        assert 'component_health{name="db \\"primary\\""} 1.0 1700000000000' in text
+
+
+# ==================== Collector ====================
+
+class TestMetricsCollector:
+    """MetricsCollector on top of the columnar store"""
+
+    def test_get_metric_duration(self):
+        """Snapshots are returned for the requested window only"""
+        collector = MetricsCollector(history_size=100)
+        for value in range(5):
+            collector.record("trading.total_trades", value)
+
+        recent = collector.get_metric("trading.total_trades", duration=timedelta(minutes=1))
+
+        assert [m.value for m in recent] == [0, 1, 2, 3, 4]
+        assert collector.get_metric("missing") == []
+        assert collector.get_aggregation("trading.total_trades")["max"] == 4
+
+    def test_get_rollup(self):
+        """Rollups report mean per bucket"""
+        collector = MetricsCollector()
+        for value in (2.0, 4.0):
+            collector.record("system.cpu_usage", value)
+
+        buckets = collector.get_rollup("system.cpu_usage", "1h")
+
+        assert sum(b["count"] for b in buckets) == 2
+        assert buckets[-1]["max"] == 4.0
+
+    @pytest.mark.asyncio
+    async def test_prometheus_endpoint(self):
+        """/metrics serves the text exposition format"""
+        dashboard = MonitoringDashboard()
+        dashboard.metrics.record("system.memory_usage", 41.0)
+
+        response = await WebDashboardServer(dashboard).handle_prometheus(None)
+
+        assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert "system_memory_usage 41.0" in response.text
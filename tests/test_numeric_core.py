@@ -0,0 +1,149 @@
+"""
+Unit tests for the float64 analytics core
+Checks numeric_core and the modules' numeric paths against the Decimal reference
+"""
+
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from src.analytics import numeric_core
+from src.analytics.numeric_core import TradeColumnStore, TradeColumns
+from src.analytics.edge_detection_system import EdgeConfig, EdgeDetectionSystem, Trade as EdgeTrade
+from src.analytics.trade_attribution_analyzer import (
+    AttributionConfig,
+    AttributionDimension,
+    TradeAttributionAnalyzer,
+    Trade as AttributionTrade,
+)
+
+
+# ==================== Fixtures ====================
+
+@pytest.fixture
+def rows():
+    """Mixed open/closed trades across a few whales and markets"""
+    rng = random.Random(5)
+    now = datetime.now()
+    rows = []
+    for n in range(400):
+        exit_time = now - timedelta(hours=rng.uniform(0, 24 * 60))
+        is_open = rng.random() < 0.05
+        rows.append({
+            "trade_id": f"t{n}",
+            "whale_address": f"0xwhale{rng.randrange(6)}",
+            "market_id": f"market_{rng.randrange(15)}",
+            "market_topic": rng.choice(["POLITICS", "CRYPTO"]),
+            "side": "BUY",
+            "entry_price": Decimal("0.50"),
+            "exit_price": None,
+            "position_size_usd": Decimal(rng.randint(10, 500)),
+            "entry_time": exit_time - timedelta(hours=4),
+            "exit_time": None if is_open else exit_time,
+            "pnl_usd": Decimal(str(round(rng.uniform(-50, 60), 2))),
+            "pnl_pct": Decimal(str(round(rng.uniform(-5, 6), 3))),
+            "is_open": is_open,
+        })
+    return rows
+
+
+def build(trade_cls, rows):
+    fields = trade_cls.__dataclass_fields__
+    return [trade_cls(**{k: v for k, v in row.items() if k in fields}) for row in rows]
+
+
+def assert_decimal_fields_match(fast, reference):
+    for name, value in vars(reference).items():
+        if isinstance(value, Decimal):
+            assert float(getattr(fast, name)) == pytest.approx(float(value), rel=1e-9, abs=1e-9), name
+
+
+# ==================== Tests ====================
+
+class TestNumericCore:
+    """Column store and vectorized statistics"""
+
+    def test_store_syncs_appended_trades(self, rows):
+        """Only new trades are ingested; the result equals a fresh build"""
+        trades = build(EdgeTrade, rows)
+        store = TradeColumnStore()
+        history = trades[:100]
+
+        store.sync(history)
+        history.extend(trades[100:])
+        cols = store.sync(history)
+        fresh = TradeColumns.from_trades(trades)
+
+        assert len(cols) == len(trades)
+        np.testing.assert_array_equal(cols.pnl, fresh.pnl)
+        np.testing.assert_array_equal(cols.whale_codes, fresh.whale_codes)
+        assert store.sync(history) is cols
+
+    def test_columns_handed_out_stay_valid_as_buffers_grow(self, rows):
+        """Columns are views; later appends never rewrite earlier ones"""
+        trades = build(EdgeTrade, rows)
+        store = TradeColumnStore()
+        history = trades[:10]
+        early = store.sync(history)
+        snapshot = early.pnl.copy()
+
+        for trade in trades[10:]:
+            history.append(trade)
+            store.sync(history)
+
+        np.testing.assert_array_equal(early.pnl, snapshot)
+        np.testing.assert_array_equal(store.sync(history).pnl, TradeColumns.from_trades(trades).pnl)
+
+    def test_streaks_skip_breakeven(self):
+        """Break-even trades neither extend nor reset a streak"""
+        result = numeric_core.streaks(np.array([1.0, 2.0, 0.0, 3.0, -1.0, -2.0, 0.0, 4.0]))
+
+        assert result["max_win_streak"] == 3
+        assert result["max_loss_streak"] == 2
+        assert result["current_win_streak"] == 1
+        assert result["current_loss_streak"] == 0
+
+
+class TestModuleFastPaths:
+    """Numeric paths reproduce the Decimal implementations"""
+
+    @pytest.mark.asyncio
+    async def test_edge_detection_matches_decimal(self, rows):
+        """Whale and market edges agree between the two paths"""
+        systems = []
+        for use_numeric_core in (True, False):
+            system = EdgeDetectionSystem(EdgeConfig(use_numeric_core=use_numeric_core))
+            for trade in build(EdgeTrade, rows):
+                system.add_trade(trade)
+            await system.calculate_all_edges()
+            systems.append(system)
+
+        fast, reference = systems
+        assert fast.whale_edges.keys() == reference.whale_edges.keys()
+        assert fast.market_edges.keys() == reference.market_edges.keys()
+        for entity_id, metrics in reference.whale_edges.items():
+            assert fast.whale_edges[entity_id].edge_status == metrics.edge_status
+            assert_decimal_fields_match(fast.whale_edges[entity_id], metrics)
+        for entity_id, metrics in reference.market_edges.items():
+            assert_decimal_fields_match(fast.market_edges[entity_id], metrics)
+
+    @pytest.mark.asyncio
+    async def test_attribution_matches_decimal(self, rows):
+        """Per-market attribution agrees between the two paths"""
+        results = []
+        for use_numeric_core in (True, False):
+            analyzer = TradeAttributionAnalyzer(AttributionConfig(use_numeric_core=use_numeric_core))
+            for trade in build(AttributionTrade, rows):
+                analyzer.add_trade(trade)
+            results.append({
+                r.segment: r for r in await analyzer.analyze_by_dimension(AttributionDimension.MARKET)
+            })
+
+        fast, reference = results
+        assert fast.keys() == reference.keys()
+        for segment, result in reference.items():
+            assert fast[segment].total_trades == result.total_trades
+            assert_decimal_fields_match(fast[segment], result)
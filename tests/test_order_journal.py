@@ -0,0 +1,284 @@
+"""
+Unit tests for the write-behind order journal
+Tests batching, WAL durability and crash recovery of OrderStateMachine writes
+"""
+
+import shutil
+from contextlib import asynccontextmanager
+from decimal import Decimal
+
+import asyncpg
+import pytest
+
+from src.trading.order_journal import OrderJournal
+from src.trading.order_state_machine import OrderStateMachine, OrderState
+
+
+# ==================== Fixtures ====================
+
+class FakeConnection:
+    """Buffers statements per transaction, like a real transaction would"""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.buffer = None
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.buffer = []
+        try:
+            yield
+        except Exception:
+            self.buffer = None
+            raise
+        self.pool.commit(self.buffer)
+        self.buffer = None
+
+    async def execute(self, sql, *args):
+        if "CREATE TABLE" in sql:
+            return
+        if self.pool.fail:
+            raise ConnectionError("database unavailable")
+        self._record(("execute", sql, args))
+
+    async def executemany(self, sql, rows):
+        if self.pool.fail:
+            raise ConnectionError("database unavailable")
+        rows = list(rows)
+        if sql.startswith("INSERT INTO orders ") and any(row[0] in self.pool.orders for row in rows):
+            raise asyncpg.UniqueViolationError("duplicate key value violates orders_pkey")
+        self._record(("executemany", sql, rows))
+
+    async def fetchval(self, sql, *args):
+        return self.pool.checkpoints.get(args[0])
+
+    def _record(self, statement):
+        if self.buffer is not None:
+            self.buffer.append(statement)
+        else:
+            self.pool.commit([statement])
+
+
+class FakePool:
+    """Records committed statements and applies them to in-memory tables"""
+
+    def __init__(self):
+        self.fail = False
+        self.transactions = []
+        self.orders = {}
+        self.transitions = []
+        self.checkpoints = {}
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield FakeConnection(self)
+
+    def commit(self, statements):
+        self.transactions.append(statements)
+        for kind, sql, args in statements:
+            rows = args if kind == "executemany" else [args]
+            for row in rows:
+                if sql.startswith("INSERT INTO orders "):
+                    self.orders[row[0]] = dict(zip(OrderJournal.ORDER_COLUMNS, row))
+                elif sql.startswith("INSERT INTO order_transitions"):
+                    self.transitions.append(dict(zip(OrderJournal.TRANSITION_COLUMNS, row)))
+                elif sql.startswith("UPDATE orders"):
+                    columns = sql.split("SET ")[1].split(" WHERE")[0].split(", ")
+                    names = [c.split(" = ")[0] for c in columns]
+                    self.orders[row[-1]].update(zip(names, row[:-1]))
+                elif "order_journal_checkpoints" in sql:
+                    self.checkpoints[row[0]] = row[1]
+
+
+@pytest.fixture
+def pool():
+    return FakePool()
+
+
+async def started_journal(pool, wal_dir, **kwargs):
+    # A long interval keeps the background flusher out of the way
+    journal = OrderJournal(pool, str(wal_dir), flush_interval=3600, fsync=False, **kwargs)
+    await journal.start()
+    return journal
+
+
+async def run_lifecycle(machine: OrderStateMachine) -> str:
+    order = await machine.create_order("token_1", "BUY", Decimal("100"), Decimal("0.55"))
+    await machine.transition(order.order_id, OrderState.SUBMITTED, reason="Sent")
+    await machine.transition(order.order_id, OrderState.ACKNOWLEDGED)
+    await machine.set_exchange_id(order.order_id, "exchange_1")
+    await machine.update_fill(order.order_id, Decimal("40"), Decimal("0.55"))
+    await machine.update_fill(order.order_id, Decimal("100"), Decimal("0.56"))
+    return order.order_id
+
+
+# ==================== Batching ====================
+
+class TestWriteBehind:
+    """Lifecycle writes are queued and flushed in one transaction"""
+
+    @pytest.mark.asyncio
+    async def test_lifecycle_flushes_as_single_transaction(self, pool, tmp_path):
+        journal = await started_journal(pool, tmp_path)
+        machine = OrderStateMachine(pool, journal=journal)
+
+        order_id = await run_lifecycle(machine)
+        assert pool.transactions == []
+
+        assert await journal.flush() > 0
+        assert len(pool.transactions) == 1
+
+        row = pool.orders[order_id]
+        assert row["state"] == OrderState.FILLED.value
+        assert row["exchange_order_id"] == "exchange_1"
+        assert row["filled_size"] == 100.0
+        assert row["avg_fill_price"] == 0.56
+        assert [t["to_state"] for t in pool.transitions] == [
+            "SUBMITTED", "ACKNOWLEDGED", "PARTIALLY_FILLED", "FILLED"
+        ]
+        await journal.stop()
+
+    @pytest.mark.asyncio
+    async def test_updates_coalesce_per_order(self, pool, tmp_path):
+        journal = await started_journal(pool, tmp_path)
+        machine = OrderStateMachine(pool, journal=journal)
+        await run_lifecycle(machine)
+        await journal.flush()
+
+        updates = [s for s in pool.transactions[0] if s[1].startswith("UPDATE")]
+        assert sum(len(s[2]) for s in updates) == 1
+        await journal.stop()
+
+    @pytest.mark.asyncio
+    async def test_size_trigger_wakes_flusher(self, pool, tmp_path):
+        journal = await started_journal(pool, tmp_path, flush_size=3)
+        machine = OrderStateMachine(pool, journal=journal)
+        await machine.create_order("token_1", "BUY", Decimal("10"))
+        assert not journal._wakeup.is_set()
+        await machine.create_order("token_2", "BUY", Decimal("10"))
+        await machine.create_order("token_3", "BUY", Decimal("10"))
+        assert journal._wakeup.is_set()
+        await journal.stop()
+        assert len(pool.orders) == 3
+
+
+# ==================== Durability ====================
+
+class TestRecovery:
+    """The WAL survives crashes and failed flushes"""
+
+    @pytest.mark.asyncio
+    async def test_replays_unflushed_records_after_crash(self, pool, tmp_path):
+        journal = await started_journal(pool, tmp_path)
+        order_id = await run_lifecycle(OrderStateMachine(pool, journal=journal))
+        # Crash: nothing flushed, flusher never stopped cleanly
+        journal._flush_task.cancel()
+        assert pool.orders == {}
+
+        recovered = await started_journal(pool, tmp_path)
+        assert pool.orders[order_id]["state"] == OrderState.FILLED.value
+        assert len(pool.transitions) == 4
+        assert recovered.next_lsn == journal.next_lsn
+        await recovered.stop()
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_prevents_double_apply(self, pool, tmp_path):
+        journal = await started_journal(pool, tmp_path)
+        await run_lifecycle(OrderStateMachine(pool, journal=journal))
+        backup = tmp_path.parent / "wal_backup"
+        shutil.copytree(tmp_path, backup)
+
+        await journal.flush()
+        journal._flush_task.cancel()
+        # Crash after commit but before the closed segments were deleted
+        shutil.rmtree(tmp_path)
+        shutil.copytree(backup, tmp_path)
+
+        recovered = await started_journal(pool, tmp_path)
+        assert len(pool.transactions) == 1
+        assert len(pool.transitions) == 4
+        assert list(tmp_path.glob("segment-*.wal")) == [recovered._segment_path]
+        await recovered.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_records(self, pool, tmp_path):
+        journal = await started_journal(pool, tmp_path)
+        machine = OrderStateMachine(pool, journal=journal)
+        await machine.create_order("token_1", "BUY", Decimal("10"))
+
+        pool.fail = True
+        assert await journal.flush() == 0
+        assert len(journal.pending) == 1
+        assert journal.flush_errors == 1
+
+        await machine.create_order("token_2", "BUY", Decimal("10"))
+        pool.fail = False
+        assert await journal.flush() == 2
+        assert len(pool.orders) == 2
+        assert journal.checkpoint_lsn == 2
+        await journal.stop()
+
+    @pytest.mark.asyncio
+    async def test_poison_record_is_dead_lettered(self, pool, tmp_path):
+        journal = await started_journal(pool, tmp_path, max_batch_failures=2)
+        machine = OrderStateMachine(pool, journal=journal)
+        order = await machine.create_order("token_1", "BUY", Decimal("10"))
+        await journal.flush()
+
+        # A duplicate insert fails the whole batch every time
+        duplicate = dict(pool.orders[order.order_id])
+        journal.insert_order(duplicate)
+        await machine.create_order("token_2", "BUY", Decimal("10"))
+        assert await journal.flush() == 0
+        assert journal.get_stats()["consecutive_failures"] == 1
+
+        # Second failure in a row: records go one at a time, the duplicate is set aside
+        assert await journal.flush() == 1
+        assert len(pool.orders) == 2
+        assert journal.pending == []
+        assert journal.checkpoint_lsn == journal.next_lsn - 1
+
+        stats = journal.get_stats()
+        assert stats["dead_letters"] == 1 and not stats["stuck"]
+        lines = journal.dead_letter_path.read_text().splitlines()
+        assert len(lines) == 1 and "UniqueViolationError" in lines[0]
+
+        await machine.create_order("token_3", "BUY", Decimal("10"))
+        assert await journal.flush() == 1
+        await journal.stop()
+
+    @pytest.mark.asyncio
+    async def test_outage_is_reported_as_stuck(self, pool, tmp_path):
+        journal = await started_journal(pool, tmp_path, max_batch_failures=2)
+        await OrderStateMachine(pool, journal=journal).create_order("token_1", "BUY", Decimal("10"))
+
+        pool.fail = True
+        for _ in range(3):
+            assert await journal.flush() == 0
+        stats = journal.get_stats()
+        assert stats["stuck"] and stats["dead_letters"] == 0
+        assert "database unavailable" in stats["last_error"]
+        assert len(journal.pending) == 1
+
+        pool.fail = False
+        assert await journal.flush() == 1
+        assert not journal.get_stats()["stuck"]
+        await journal.stop()
+
+    @pytest.mark.asyncio
+    async def test_torn_final_line_is_skipped(self, pool, tmp_path):
+        journal = await started_journal(pool, tmp_path)
+        await OrderStateMachine(pool, journal=journal).create_order("token_1", "BUY", Decimal("10"))
+        journal._flush_task.cancel()
+        with open(journal._segment_path, "a") as f:
+            f.write('{"lsn": 2, "op": "insert_ord')
+
+        recovered = await started_journal(pool, tmp_path)
+        assert len(pool.orders) == 1
+        await recovered.stop()
+
+    @pytest.mark.asyncio
+    async def test_append_requires_start(self, pool, tmp_path):
+        journal = OrderJournal(pool, str(tmp_path))
+        with pytest.raises(RuntimeError):
+            journal.insert_order({})
@@ -0,0 +1,196 @@
+"""
+Unit tests for the incremental PerformanceMetricsEngine
+Checks the streaming day-bucket path against a full recompute
+"""
+
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from src.analytics.performance_metrics_engine import (
+    PerformanceConfig,
+    PerformanceMetricsEngine,
+    TimeWindow,
+    Trade,
+    WINDOW_DAYS,
+)
+
+
+# ==================== Fixtures ====================
+
+def make_trade(n: int, exit_time: datetime, pnl: Decimal) -> Trade:
+    """Closed trade with a given exit time and P&L"""
+    return Trade(
+        trade_id=f"trade_{n}",
+        whale_address="0xwhale",
+        market_id=f"market_{n % 5}",
+        market_topic="POLITICS",
+        side="BUY",
+        entry_price=Decimal("0.50"),
+        exit_price=Decimal("0.55"),
+        position_size_usd=Decimal("1000"),
+        entry_time=exit_time - timedelta(hours=6),
+        exit_time=exit_time,
+        pnl_usd=pnl,
+        pnl_pct=pnl / Decimal("10"),
+        is_open=False,
+        fees_paid_usd=Decimal("1"),
+        slippage_pct=Decimal("0.1"),
+    )
+
+
+@pytest.fixture
+def daily_trades():
+    """One trade per day over the last 80 days, oldest first"""
+    rng = random.Random(11)
+    # Late in the day so window cutoffs fall on the same day boundary in both paths
+    anchor = datetime.now().replace(hour=23, minute=59, second=0, microsecond=0) - timedelta(days=1)
+    trades = []
+    for n in range(80):
+        exit_time = anchor - timedelta(days=79 - n)
+        pnl = Decimal(str(round(rng.uniform(-900, 1000), 2)))
+        trades.append(make_trade(n, exit_time, pnl))
+    return trades
+
+
+def random_trades(seed: int, days: int = 420):
+    """Several trades a day at random times, oldest first
+
+    Skips the days the window cutoffs fall on: the buckets cut at a day
+    boundary while the full recompute cuts at the current time of day.
+    """
+    rng = random.Random(seed)
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    boundaries = {0, 1, 7, 30, 90, 365}
+    trades = []
+    for offset in range(days, 0, -1):
+        if offset in boundaries:
+            continue
+        day = today - timedelta(days=offset)
+        times = sorted(rng.randrange(86400) for _ in range(rng.choice([0, 1, 2, 3, 5, 8])))
+        for second in times:
+            pnl = Decimal(str(round(rng.uniform(-900, 1000), 2))) if rng.random() > 0.1 else Decimal("0")
+            trades.append(make_trade(len(trades), day + timedelta(seconds=second), pnl))
+    return trades
+
+
+def assert_metrics_match(fast, full):
+    """Compare the fields both paths compute from the same inputs"""
+    for name in (
+        "total_trades", "winning_trades", "losing_trades",
+        "current_win_streak", "current_loss_streak", "max_win_streak", "max_loss_streak",
+        "drawdown_recovery_days", "time_underwater_days",
+        "is_statistically_significant", "min_trades_met",
+    ):
+        assert getattr(fast, name) == getattr(full, name), name
+
+    for name in (
+        "total_return_pct", "annualized_return_pct", "cumulative_pnl_usd",
+        "sharpe_ratio", "sortino_ratio", "calmar_ratio", "omega_ratio",
+        "win_rate_pct", "profit_factor", "payoff_ratio",
+        "avg_win_usd", "avg_loss_usd", "avg_trade_duration_hours",
+        "max_drawdown_pct", "max_drawdown_usd", "current_drawdown_pct",
+        "daily_volatility_pct", "best_day_return_pct", "worst_day_return_pct",
+        "positive_days_pct", "monthly_return_consistency",
+    ):
+        assert float(getattr(fast, name)) == pytest.approx(float(getattr(full, name)), rel=1e-9, abs=1e-9), name
+
+
+# ==================== Tests ====================
+
+class TestIncrementalMetrics:
+    """Streaming path must agree with the full recompute"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("window", [TimeWindow.ALL_TIME, TimeWindow.QUARTERLY, TimeWindow.MONTHLY])
+    async def test_matches_full_recompute(self, daily_trades, window):
+        """Metrics read from day buckets equal a full scan of the trades"""
+        engine = PerformanceMetricsEngine(PerformanceConfig())
+        for trade in daily_trades:
+            engine.add_trade(trade)
+
+        fast = await engine.calculate_metrics(window)
+        full = await engine.recompute_metrics(window)
+
+        assert fast.total_trades > 0
+        assert_metrics_match(fast, full)
+
+    @pytest.mark.asyncio
+    async def test_metrics_cached_until_next_trade(self, daily_trades):
+        """Repeated reads reuse the cached result; a new trade invalidates it"""
+        engine = PerformanceMetricsEngine(PerformanceConfig())
+        for trade in daily_trades[:-1]:
+            engine.add_trade(trade)
+
+        first = await engine.calculate_metrics(TimeWindow.ALL_TIME)
+        assert await engine.calculate_metrics(TimeWindow.ALL_TIME) is first
+
+        engine.add_trade(daily_trades[-1])
+        updated = await engine.calculate_metrics(TimeWindow.ALL_TIME)
+
+        assert updated is not first
+        assert updated.total_trades == first.total_trades + 1
+
+    @pytest.mark.asyncio
+    async def test_window_excludes_old_buckets(self, daily_trades):
+        """Trades older than the window do not count toward it"""
+        engine = PerformanceMetricsEngine(PerformanceConfig())
+        for trade in daily_trades:
+            engine.add_trade(trade)
+
+        weekly = await engine.calculate_metrics(TimeWindow.WEEKLY)
+        all_time = await engine.calculate_metrics(TimeWindow.ALL_TIME)
+
+        assert 0 < weekly.total_trades < all_time.total_trades
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("seed", [1, 2, 3, 4])
+    async def test_multiple_trades_per_day_match_full_recompute(self, seed):
+        """Intra-day paths, break-even trades and pruned buckets agree with a full scan"""
+        trades = random_trades(seed)
+        engine = PerformanceMetricsEngine(PerformanceConfig(max_trade_history=len(trades)))
+        for trade in trades:
+            engine.add_trade(trade)
+
+        for window in (TimeWindow.ALL_TIME, TimeWindow.YEARLY, TimeWindow.QUARTERLY,
+                       TimeWindow.MONTHLY, TimeWindow.WEEKLY):
+            fast = await engine.calculate_metrics(window)
+            full = await engine.recompute_metrics(window)
+            assert fast.total_trades > 0, window
+            assert_metrics_match(fast, full)
+
+    def test_buckets_bounded_by_longest_window(self):
+        """Day buckets older than the longest window are folded away"""
+        trades = random_trades(5, days=800)
+        engine = PerformanceMetricsEngine(PerformanceConfig())
+        for trade in trades:
+            engine.add_trade(trade)
+
+        oldest = (datetime.now() - timedelta(days=max(WINDOW_DAYS.values()))).date()
+        assert len(engine._buckets) == len(engine._days) <= max(WINDOW_DAYS.values()) + 1
+        assert min(engine._days) >= oldest
+        assert engine._windows[TimeWindow.ALL_TIME].totals.trades == len(trades)
+
+    def test_trade_history_is_bounded(self, daily_trades):
+        """Raw history is capped while totals keep every trade"""
+        engine = PerformanceMetricsEngine(PerformanceConfig(max_trade_history=10))
+        for trade in daily_trades:
+            engine.add_trade(trade)
+
+        assert len(engine.trades) == 10
+        assert engine._windows[TimeWindow.ALL_TIME].totals.trades == len(daily_trades)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("window", [TimeWindow.ALL_TIME, TimeWindow.MONTHLY])
+    async def test_numeric_recompute_matches_decimal(self, daily_trades, window):
+        """Float64 numeric core agrees with the Decimal full recompute"""
+        engine = PerformanceMetricsEngine(PerformanceConfig())
+        for trade in daily_trades:
+            engine.add_trade(trade)
+
+        numeric = await engine.recompute_metrics(window, numeric=True)
+        full = await engine.recompute_metrics(window)
+
+        assert_metrics_match(numeric, full)
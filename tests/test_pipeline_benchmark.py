@@ -0,0 +1,145 @@
+"""
+Tests for the end-to-end pipeline benchmark harness
+Covers the synthetic generator, the API stub, a short seeded run and baseline comparison
+"""
+
+import json
+from decimal import Decimal
+
+import pytest
+
+from benchmarks import baseline
+from benchmarks.pipeline import PipelineBenchmark, PipelineConfig, baseline_metrics, main
+from benchmarks.stub_api import StubPolymarketClient
+from benchmarks.synthetic import SyntheticUniverse
+from src.monitoring.latency import END_TO_END, PIPELINE_STAGES, tracer
+from src.trading.order_executor import OrderExecutor, OrderStatus
+
+
+@pytest.fixture(autouse=True)
+def clean_tracer():
+    tracer.reset()
+    yield
+    tracer.reset()
+
+
+# ==================== Synthetic Data ====================
+
+class TestSyntheticUniverse:
+    """Reproducible universe and message stream"""
+
+    def test_same_seed_same_messages(self):
+        """A seed fixes both the universe and the message sequence"""
+        a = SyntheticUniverse.generate(seed=7, n_whales=5, n_markets=10)
+        b = SyntheticUniverse.generate(seed=7, n_whales=5, n_markets=10)
+        assert list(a.whales) == list(b.whales)
+        assert list(a.fill_messages(50)) == list(b.fill_messages(50))
+
+    def test_fill_messages(self):
+        """Whale share and duplicates follow the requested fractions"""
+        universe = SyntheticUniverse.generate(seed=1, n_whales=5, n_markets=10)
+        messages = list(universe.fill_messages(2000, whale_fraction=0.3, duplicate_fraction=0.05))
+        fills = [json.loads(m) for m in messages]
+
+        whale_share = sum(f["taker"] in universe.whales for f in fills) / len(fills)
+        duplicates = len(messages) - len(set(messages))
+        assert 0.25 < whale_share < 0.35
+        assert 50 < duplicates < 150
+        assert all(f["market"] in universe.markets for f in fills)
+
+    def test_order_book_sorted(self):
+        """Bids descend and asks ascend from the mid"""
+        universe = SyntheticUniverse.generate(seed=1, n_whales=1, n_markets=3)
+        market = next(iter(universe.markets.values()))
+        book = universe.order_book(market.token_id)
+        bids = [float(level["price"]) for level in book["bids"]]
+        asks = [float(level["price"]) for level in book["asks"]]
+        assert bids == sorted(bids, reverse=True) and asks == sorted(asks)
+        assert bids[0] < market.mid_price < asks[0]
+
+
+# ==================== API Stub ====================
+
+class TestStubClient:
+    """The real OrderExecutor against the stub"""
+
+    @pytest.mark.asyncio
+    async def test_execute_trade_fills(self):
+        universe = SyntheticUniverse.generate(seed=3, n_whales=1, n_markets=3)
+        market = next(iter(universe.markets.values()))
+        stub = StubPolymarketClient(universe, fill_after_polls=2)
+        executor = OrderExecutor(client=stub)
+        executor.fill_confirmer.poll_interval = 0.001
+
+        result = await executor.execute_trade(
+            token_id=market.token_id,
+            side="BUY",
+            size=Decimal("100"),
+            price=Decimal(str(market.mid_price)),
+            fill_timeout=2,
+        )
+
+        assert result.success
+        assert result.status == OrderStatus.FILLED
+        assert stub.calls["orders"] == 3
+        assert not stub.open_orders
+
+
+# ==================== Pipeline Run ====================
+
+class TestPipelineBenchmark:
+    """Short seeded run through every stage"""
+
+    @pytest.mark.asyncio
+    async def test_run_records_every_stage(self):
+        benchmark = PipelineBenchmark(PipelineConfig(messages=1500))
+        results = await benchmark.run()
+
+        assert results["messages_per_s"] > 0
+        assert results["counts"]["filled"] > 0
+        for stage in PIPELINE_STAGES + (END_TO_END,):
+            assert results["stages"][stage]["count"] > 0, stage
+        stages = results["stages"]
+        assert stages[END_TO_END]["count"] == results["counts"]["filled"]
+        assert stages[END_TO_END]["p50_ms"] <= stages[END_TO_END]["p999_ms"]
+
+        metrics = baseline_metrics(results)
+        assert "messages_per_s" in metrics
+        assert f"{END_TO_END}.p99_ms" in metrics
+
+    def test_cli_save_and_compare(self, tmp_path, capsys):
+        """A saved baseline compares clean against a rerun of the same config"""
+        path = str(tmp_path / "pipeline.json")
+        args = ["--messages", "300", "--repeat", "1", "--baseline", path]
+
+        assert main(args + ["--save-baseline"]) == 0
+        entry = baseline.load(path)["default"]
+        assert entry["config"]["messages"] == 300
+
+        # Inflate the recorded throughput so the rerun reads as a regression
+        entry["metrics"]["messages_per_s"] *= 10
+        with open(path, "w") as f:
+            json.dump({"default": entry}, f)
+        assert main(args + ["--compare"]) == 1
+        assert "messages_per_s" in capsys.readouterr().out
+
+
+# ==================== Baselines ====================
+
+class TestBaseline:
+    """Regression detection"""
+
+    def test_compare_directions(self):
+        before = {"throughput": 1000.0, "p99_ms": 2.0, "p50_ms": 1.0}
+        after = {"throughput": 700.0, "p99_ms": 3.0, "p50_ms": 0.5}
+
+        regressions = baseline.compare(after, before, threshold=0.2, higher_is_better=["throughput"])
+        assert {r.metric for r in regressions} == {"throughput", "p99_ms"}
+
+    def test_min_delta_ignores_tiny_moves(self):
+        regressions = baseline.compare({"p99_ms": 0.02}, {"p99_ms": 0.01}, threshold=0.2, min_delta=0.1)
+        assert regressions == []
+
+    def test_best_of(self):
+        runs = [{"throughput": 900.0, "p99_ms": 2.0}, {"throughput": 1000.0, "p99_ms": 2.5}]
+        assert baseline.best_of(runs, ["throughput"]) == {"throughput": 1000.0, "p99_ms": 2.0}
@@ -0,0 +1,116 @@
+"""
+Unit tests for adaptive Kelly position sizing
+Focuses on the vectorized batch path matching the scalar path
+"""
+
+import numpy as np
+import pytest
+
+from libs.trading.position_sizing import AdaptiveKellyPositionSizer
+
+
+def make_signals(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            'win_probability': float(rng.uniform(0.3, 0.85)),
+            'win_payoff': float(rng.uniform(0.2, 3.0)),
+            'whale_quality_score': float(rng.uniform(40, 100)),
+            # Repeated markets exercise the shared EWMA state
+            'market_id': f"market_{rng.integers(0, n // 3 + 1)}",
+            'recent_returns': list(rng.normal(0, rng.uniform(0.005, 0.2), 5)) if rng.random() < 0.7 else None,
+            'portfolio_correlation': float(rng.uniform(-0.9, 0.9)),
+        }
+        for _ in range(n)
+    ]
+
+
+def scalar_results(signals, nav, drawdown):
+    sizer = AdaptiveKellyPositionSizer()
+    return sizer, [
+        sizer.calculate_position_size(
+            win_probability=s['win_probability'],
+            win_payoff=s['win_payoff'],
+            whale_quality_score=s['whale_quality_score'],
+            market_id=s['market_id'],
+            nav=nav,
+            recent_returns=s['recent_returns'],
+            portfolio_correlation=s['portfolio_correlation'],
+            current_drawdown=drawdown,
+        )
+        for s in signals
+    ]
+
+
+# ==================== Batch vs Scalar ====================
+
+class TestBatchSizing:
+    """calculate_position_sizes / calculate_batch_positions"""
+
+    @pytest.mark.parametrize("drawdown", [0.0, 0.12, 0.5])
+    def test_batch_matches_scalar(self, drawdown):
+        """Every field of every result equals the scalar path"""
+        signals = make_signals(200, seed=int(drawdown * 100))
+        scalar_sizer, expected = scalar_results(signals, 250_000, drawdown)
+
+        batch_sizer = AdaptiveKellyPositionSizer()
+        batch = batch_sizer.calculate_batch_positions(signals, 250_000, current_drawdown=drawdown)
+
+        assert len(batch) == len(expected)
+        for (signal, result), scalar in zip(batch, expected):
+            assert result == scalar
+        # Volatility state evolves identically
+        assert batch_sizer.volatility_estimators.keys() == scalar_sizer.volatility_estimators.keys()
+        for market_id, estimator in scalar_sizer.volatility_estimators.items():
+            assert batch_sizer.volatility_estimators[market_id].variance_ewma == estimator.variance_ewma
+
+    def test_outcomes_covered(self):
+        """The random signals hit negative edge, floor, cap and normal sizing"""
+        _, expected = scalar_results(make_signals(200), 250_000, 0.0)
+        reasons = {r.reason.split(' ')[0] for r in expected}
+        assert {"Negative", "Position", "Capped", "Sized"} <= reasons
+
+    def test_arrays_api(self):
+        sizer = AdaptiveKellyPositionSizer()
+        batch = sizer.calculate_position_sizes(
+            win_probabilities=np.array([0.55, 0.4, 0.9]),
+            win_payoffs=np.array([1.0, 1.0, 2.0]),
+            whale_quality_scores=np.array([90, 90, 95]),
+            market_ids=["a", "b", "c"],
+            nav=100_000,
+        )
+
+        assert len(batch) == 3
+        assert batch.fractions[1] == 0.0
+        assert batch.capped.tolist() == [False, False, True]
+        assert batch.dollar_sizes[2] == pytest.approx(8_000)
+        assert batch.portfolio_scale == 1.0
+        # Negative-edge signals never touch the volatility estimators
+        assert "b" not in sizer.volatility_estimators
+
+    def test_portfolio_cap_scales_batch(self):
+        """A binding total cap scales every position by the same factor"""
+        signals = [
+            {'win_probability': 0.8, 'win_payoff': 1.5, 'whale_quality_score': 95, 'market_id': f"m{i}"}
+            for i in range(10)
+        ]
+        uncapped = AdaptiveKellyPositionSizer().calculate_batch_positions(signals, 100_000)
+        capped = AdaptiveKellyPositionSizer().calculate_batch_positions(signals, 100_000, max_total_fraction=0.4)
+
+        assert sum(r.fraction for _, r in uncapped) == pytest.approx(0.8)
+        assert sum(r.fraction for _, r in capped) == pytest.approx(0.4)
+        assert all(r.fraction == pytest.approx(0.04) and not r.capped for _, r in capped)
+        assert "portfolio cap" in capped[0][1].reason
+
+    def test_portfolio_cap_drops_below_floor(self):
+        signals = [
+            {'win_probability': 0.8, 'win_payoff': 1.5, 'whale_quality_score': 95, 'market_id': f"m{i}"}
+            for i in range(10)
+        ]
+        results = AdaptiveKellyPositionSizer().calculate_batch_positions(signals, 100_000, max_total_fraction=0.05)
+
+        assert all(r.fraction == 0.0 and r.dollar_size == 0.0 for _, r in results)
+        assert results[0][1].reason.startswith("Dropped by portfolio cap")
+
+    def test_empty_batch(self):
+        assert AdaptiveKellyPositionSizer().calculate_batch_positions([], 100_000) == []
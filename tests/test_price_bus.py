@@ -0,0 +1,234 @@
+"""
+Unit tests for the shared in-process price bus
+Tests single-flight REST fallback, websocket ingest and subscriber fan-out
+"""
+
+import asyncio
+import threading
+import time
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+
+import src.realtime.price_bus as price_bus_module
+from src.realtime.price_bus import PriceBus, PriceQuote, get_price_bus
+from src.realtime.websocket_client import EventType, StreamEvent
+from src.trading.position_manager import PnLCalculator
+from src.trading.realtime_pnl_engine import RealtimePnLEngine
+
+
+# ==================== Fixtures ====================
+
+class CountingClient:
+    """Synchronous CLOB-style client that records midpoint requests"""
+
+    def __init__(self, prices, delay: float = 0.0, fail: bool = False):
+        self.prices = prices
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get_midpoint(self, token_id):
+        with self._lock:
+            self.calls.append(token_id)
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("CLOB unavailable")
+        return self.prices[token_id]
+
+
+@pytest.fixture(autouse=True)
+def fresh_process_bus(monkeypatch):
+    """Each test starts without a process-wide bus"""
+    monkeypatch.setattr(price_bus_module, "_price_bus", None)
+
+
+def price_event(token_id, price=None, bid=None, ask=None):
+    data = {"asset_id": token_id}
+    if price is not None:
+        data["price"] = price
+    if bid is not None:
+        data.update(best_bid=bid, best_ask=ask)
+    return StreamEvent(event_type=EventType.PRICE_UPDATE, timestamp=0, data=data)
+
+
+# ==================== REST Fallback ====================
+
+class TestRestFallback:
+    """Quotes are fetched once and shared"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_single_flight(self):
+        client = CountingClient({"tok": 0.42}, delay=0.05)
+        bus = PriceBus(client)
+
+        quotes = await asyncio.gather(*(bus.get_quote("tok") for _ in range(10)))
+
+        assert client.calls == ["tok"]
+        assert bus.deduplicated_requests == 9
+        assert {q.mid for q in quotes} == {Decimal("0.42")}
+
+    @pytest.mark.asyncio
+    async def test_fresh_quote_is_not_refetched(self):
+        client = CountingClient({"tok": 0.42})
+        bus = PriceBus(client, stale_after=60)
+        await bus.get_quote("tok")
+        await bus.get_quote("tok")
+        assert len(client.calls) == 1
+
+        await bus.get_quote("tok", max_age=0)
+        assert len(client.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_falls_back_to_last_quote(self):
+        client = CountingClient({"tok": 0.42})
+        bus = PriceBus(client)
+        await bus.get_quote("tok")
+
+        client.fail = True
+        quote = await bus.get_quote("tok", max_age=0)
+        assert quote.mid == Decimal("0.42")
+        with pytest.raises(LookupError):
+            await bus.get_quote("unknown")
+        assert await bus.get_quotes(["tok", "unknown"], max_age=0) == {"tok": quote}
+
+    @pytest.mark.asyncio
+    async def test_refresh_loop_fetches_stale_subscribed_tokens(self):
+        client = CountingClient({"a": 0.1, "b": 0.2})
+        bus = PriceBus(client, stale_after=0.01, refresh_interval=0.01)
+        bus.subscribe(["a"], Mock())
+        await bus.start()
+        await asyncio.sleep(0.05)
+        await bus.stop()
+
+        assert "a" in client.calls
+        assert "b" not in client.calls
+
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_strand_waiters(self):
+        client = CountingClient({"tok": 0.42}, delay=0.05)
+        bus = PriceBus(client)
+
+        first = asyncio.ensure_future(bus.get_quote("tok"))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(bus.get_quote("tok"))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        quote = await asyncio.wait_for(second, timeout=1)
+        assert quote.mid == Decimal("0.42")
+        assert first.cancelled()
+        assert client.calls == ["tok"]
+        assert not bus._inflight
+
+
+# ==================== Websocket Ingest ====================
+
+class TestPublishing:
+    """Websocket prices reach subscribers"""
+
+    @pytest.mark.asyncio
+    async def test_ws_event_updates_quote_and_notifies(self):
+        bus = PriceBus()
+        received = []
+
+        async def on_quote(quote: PriceQuote):
+            received.append(quote)
+
+        bus.subscribe(["tok"], on_quote)
+        await bus.handle_ws_event(price_event("tok", bid="0.40", ask="0.44"))
+        await bus.handle_ws_event(price_event("tok", bid="0.40", ask="0.44"))
+        await bus.handle_ws_event(price_event("other", price="0.9"))
+
+        assert [q.mid for q in received] == [Decimal("0.42")]
+        assert bus.latest("tok").bid == Decimal("0.40")
+        assert bus.latest("other").source == "ws"
+
+    @pytest.mark.asyncio
+    async def test_wildcard_and_unsubscribe(self):
+        bus = PriceBus()
+        received = []
+
+        async def on_quote(quote):
+            received.append(quote.token_id)
+
+        subscription = bus.subscribe(None, on_quote)
+        await bus.publish("a", mid="0.5")
+        subscription.close()
+        await bus.publish("b", mid="0.5")
+
+        assert received == ["a"]
+        assert bus.subscribed_tokens() == []
+
+    @pytest.mark.asyncio
+    async def test_stream_conflates_to_latest_per_token(self):
+        bus = PriceBus()
+        stream = bus.stream(["a", "b"])
+        for price in ("0.1", "0.2", "0.3"):
+            await bus.publish("a", mid=price)
+        await bus.publish("b", mid="0.7")
+
+        first = await stream.__anext__()
+        second = await stream.__anext__()
+        assert (first.token_id, first.mid) == ("a", Decimal("0.3"))
+        assert (second.token_id, second.mid) == ("b", Decimal("0.7"))
+
+        stream.close()
+        assert [q async for q in stream] == []
+
+    @pytest.mark.asyncio
+    async def test_stream_waits_for_next_quote(self):
+        bus = PriceBus()
+        stream = bus.stream(["a"])
+        waiter = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        await bus.publish("a", mid="0.55")
+        assert (await waiter).mid == Decimal("0.55")
+        stream.close()
+
+
+# ==================== Consumers ====================
+
+class TestSharedConsumers:
+    """P&L consumers share one bus and one request per token"""
+
+    @pytest.mark.asyncio
+    async def test_pnl_calculator_and_engine_share_requests(self):
+        client = CountingClient({"tok": 0.6}, delay=0.02)
+        bus = PriceBus(client)
+        calculator = PnLCalculator(client=client, position_tracker=Mock(), price_bus=bus)
+        engine = RealtimePnLEngine(position_manager=Mock(), client=client, price_bus=bus)
+
+        price, updates = await asyncio.gather(
+            calculator.fetch_current_price("tok"),
+            engine._fetch_prices_concurrent(["tok"]),
+        )
+
+        assert price == Decimal("0.6")
+        assert updates["tok"].price == Decimal("0.6")
+        assert client.calls == ["tok"]
+
+    @pytest.mark.asyncio
+    async def test_consumers_default_to_the_process_bus(self):
+        client = CountingClient({"tok": 0.6}, delay=0.02)
+        calculator = PnLCalculator(client=client, position_tracker=Mock())
+        engine = RealtimePnLEngine(position_manager=Mock(), client=client)
+
+        assert calculator.price_bus is engine.price_bus is get_price_bus()
+        await asyncio.gather(
+            calculator.fetch_current_price("tok"),
+            engine._fetch_prices_concurrent(["tok"]),
+        )
+        assert client.calls == ["tok"]
+
+    @pytest.mark.asyncio
+    async def test_pnl_calculator_reports_missing_prices_as_zero(self):
+        client = CountingClient({"tok": 0.6}, fail=True)
+        calculator = PnLCalculator(client=client, position_tracker=Mock())
+        assert await calculator.fetch_current_prices(["tok"]) == {"tok": Decimal(0)}
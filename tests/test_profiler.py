@@ -0,0 +1,166 @@
+"""
+Unit tests for the sampling profiler
+Covers stack aggregation, collapsed export, runtime toggling and the signal hook
+"""
+
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from src.monitoring.profiler import SamplingProfiler, frame_label, install_signal_toggle
+
+
+# ==================== Helpers ====================
+
+def spin(stop: threading.Event):
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+def wait_for_profile(directory, timeout: float = 2.0):
+    """Profiles are written off the signal handler; poll until one appears"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        files = list(directory.glob("profile_*.collapsed"))
+        if files:
+            return files
+        time.sleep(0.01)
+    return []
+
+
+@pytest.fixture
+def busy_thread():
+    """A named thread burning CPU in spin()"""
+    stop = threading.Event()
+    thread = threading.Thread(target=spin, args=(stop,), name="BusyWorker", daemon=True)
+    thread.start()
+    yield thread
+    stop.set()
+    thread.join()
+
+
+# ==================== Tests ====================
+
+class TestSamplingProfiler:
+    """Sampling, export and control"""
+
+    def test_sample_aggregates_stacks(self, busy_thread):
+        """Manual samples land under the thread name with the busy function on the stack"""
+        profiler = SamplingProfiler()
+        for _ in range(20):
+            profiler.sample()
+            time.sleep(0.001)
+
+        collapsed = profiler.collapsed()
+        busy = [line for line in collapsed.splitlines() if line.startswith("BusyWorker;")]
+        assert profiler.samples == 20
+        assert busy
+        assert any(";spin (" in line for line in busy)
+
+        total = sum(int(line.rsplit(" ", 1)[1]) for line in busy)
+        assert total == 20
+
+    def test_collapsed_format(self, busy_thread):
+        """Each line is 'frame;frame;... count' with the heaviest stack first"""
+        profiler = SamplingProfiler()
+        for _ in range(10):
+            profiler.sample()
+
+        counts = []
+        for line in profiler.collapsed().splitlines():
+            stack, count = line.rsplit(" ", 1)
+            assert "\n" not in stack and stack.count(";") >= 1
+            counts.append(int(count))
+        assert counts == sorted(counts, reverse=True)
+
+    def test_idle_threads_skipped(self):
+        """Threads parked in Event.wait are dropped unless include_idle is set"""
+        stop = threading.Event()
+        thread = threading.Thread(target=stop.wait, name="Parked", daemon=True)
+        thread.start()
+        try:
+            time.sleep(0.01)
+            quiet, verbose = SamplingProfiler(), SamplingProfiler(include_idle=True)
+            quiet.sample()
+            verbose.sample()
+        finally:
+            stop.set()
+            thread.join()
+
+        assert "Parked;" not in quiet.collapsed()
+        assert "Parked;" in verbose.collapsed()
+
+    def test_start_stop_runtime(self, busy_thread):
+        """Background sampling collects while running and stops cleanly"""
+        profiler = SamplingProfiler(sample_hz=200)
+        assert profiler.start()
+        assert not profiler.start()
+        time.sleep(0.2)
+        assert profiler.stop()
+        assert not profiler.running
+
+        samples = profiler.samples
+        assert samples > 5
+        assert "SamplingProfiler;" not in profiler.collapsed()
+        time.sleep(0.05)
+        assert profiler.samples == samples
+
+        stats = profiler.stats()
+        assert stats["overhead_pct"] < 100
+        assert stats["top"]
+
+    def test_frame_label(self):
+        """Labels carry function, short path and first line"""
+        label = frame_label(spin.__code__)
+        assert label.startswith("spin (tests/test_profiler.py:")
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGUSR2"), reason="SIGUSR2 not available")
+    def test_signal_toggle_writes_profile(self, tmp_path, busy_thread):
+        """First signal starts the profiler, second stops it and dumps the stacks"""
+        profiler = SamplingProfiler(sample_hz=200)
+        previous = signal.getsignal(signal.SIGUSR2)
+        try:
+            assert install_signal_toggle(profiler, output_dir=str(tmp_path))
+            os.kill(os.getpid(), signal.SIGUSR2)
+            time.sleep(0.1)
+            assert profiler.running
+            os.kill(os.getpid(), signal.SIGUSR2)
+            files = wait_for_profile(tmp_path)
+        finally:
+            signal.signal(signal.SIGUSR2, previous)
+            profiler.stop()
+
+        assert len(files) == 1
+        assert "BusyWorker;" in files[0].read_text()
+        assert profiler.samples == 0
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGUSR2"), reason="SIGUSR2 not available")
+    def test_signal_during_locked_export_does_not_deadlock(self, tmp_path, busy_thread):
+        """The handler returns at once even if the main thread holds the profiler lock"""
+        profiler = SamplingProfiler(sample_hz=200)
+        previous = signal.getsignal(signal.SIGUSR2)
+        try:
+            assert install_signal_toggle(profiler, output_dir=str(tmp_path))
+            os.kill(os.getpid(), signal.SIGUSR2)
+            time.sleep(0.1)
+
+            # As if the signal landed inside collapsed()/top()/reset()
+            profiler._lock.acquire()
+            watchdog = threading.Timer(2.0, profiler._lock.release)
+            watchdog.start()
+            os.kill(os.getpid(), signal.SIGUSR2)
+            returned_while_locked = watchdog.is_alive()
+            watchdog.cancel()
+            if returned_while_locked:
+                profiler._lock.release()
+
+            files = wait_for_profile(tmp_path)
+        finally:
+            signal.signal(signal.SIGUSR2, previous)
+            profiler.stop()
+
+        assert returned_while_locked
+        assert len(files) == 1
@@ -0,0 +1,85 @@
+"""
+Unit tests for RealTimeAnomalyDetector EWMA baselines
+Checks the recursive per-market state against the exact recompute
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.analytics.realtime_anomaly_detector import (
+    AnomalyDetectorConfig,
+    EWMAState,
+    RealTimeAnomalyDetector,
+    TradeEvent,
+)
+
+
+# ==================== Fixtures ====================
+
+@pytest.fixture
+def trade_values():
+    """Log-normal trade sizes, longer than the retained history"""
+    rng = np.random.default_rng(7)
+    return [float(v) for v in rng.lognormal(6.5, 1.0, 2500)]
+
+
+def make_trade(n: int, usd_value: float) -> TradeEvent:
+    return TradeEvent(
+        trade_id=f"trade_{n}",
+        market_id="market_1",
+        market_topic="POLITICS",
+        trader_address=f"0x{n:040x}",
+        side="BUY",
+        size=usd_value / 0.5,
+        price=0.5,
+        usd_value=usd_value,
+        timestamp=datetime(2025, 1, 1) + timedelta(seconds=n),
+    )
+
+
+# ==================== Tests ====================
+
+class TestEWMABaseline:
+    """Recursive baseline must agree with the exact recompute"""
+
+    @pytest.mark.parametrize("adjust", [True, False])
+    def test_recursive_matches_exact(self, trade_values, adjust):
+        """Both modes produce the same baseline trade by trade"""
+        fast = RealTimeAnomalyDetector(AnomalyDetectorConfig(ewma_adjust=adjust))
+        exact = RealTimeAnomalyDetector(AnomalyDetectorConfig(ewma_adjust=adjust, ewma_exact_recompute=True))
+
+        for n, value in enumerate(trade_values):
+            timestamp = datetime(2025, 1, 1) + timedelta(seconds=n)
+            fast_mean, fast_std = fast.update_market_baseline("market_1", timestamp, value)
+            exact_mean, exact_std = exact.update_market_baseline("market_1", timestamp, value)
+
+            assert fast_mean == pytest.approx(exact_mean, rel=1e-9)
+            assert fast_std == pytest.approx(exact_std, rel=1e-9)
+
+    def test_constant_values_have_zero_std(self):
+        """A flat series has its value as mean and no spread"""
+        state = EWMAState()
+        for _ in range(50):
+            mean, std = state.update(650.0, alpha=2.0 / 61, adjust=True)
+
+        assert mean == pytest.approx(650.0)
+        assert std == pytest.approx(0.0, abs=1e-9)
+
+    def test_first_trade_has_no_spread(self):
+        """A single observation seeds the baseline"""
+        detector = RealTimeAnomalyDetector()
+
+        assert detector.update_market_baseline("market_1", datetime.now(), 1200.0) == (1200.0, 0.0)
+
+    def test_outlier_raises_alert(self):
+        """A trade far above the recursive baseline fires an alert"""
+        detector = RealTimeAnomalyDetector()
+        for n in range(200):
+            detector.process_trade_event(make_trade(n, 650.0 + (n % 7) * 10))
+
+        alert = detector.process_trade_event(make_trade(200, 50000.0))
+
+        assert alert is not None
+        assert alert.z_score >= detector.config.z_score_threshold
@@ -0,0 +1,179 @@
+"""
+Unit tests for the API response cache
+Tests TTL expiry, single-flight misses and tag invalidation
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.api.response_cache import AsyncTTLCache, cached
+from src.realtime.change_feed import ChangeFeed
+
+
+# ==================== Fixtures ====================
+
+class Source:
+    """Slow computation that counts calls"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+        self.value = 1
+
+    async def compute(self):
+        self.calls += 1
+        value = self.value  # Read at query time, like a database
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return value
+
+
+# ==================== Memoization ====================
+
+class TestMemoization:
+    """Hits, expiry and single-flight"""
+
+    @pytest.mark.asyncio
+    async def test_hit_within_ttl_and_recompute_after(self):
+        cache = AsyncTTLCache()
+        source = Source()
+        assert await cache.get_or_compute("k", source.compute, ttl=0.05) == 1
+        assert await cache.get_or_compute("k", source.compute, ttl=0.05) == 1
+        assert source.calls == 1
+
+        await asyncio.sleep(0.06)
+        await cache.get_or_compute("k", source.compute, ttl=0.05)
+        assert source.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_computation(self):
+        cache = AsyncTTLCache()
+        source = Source(delay=0.02)
+        results = await asyncio.gather(*(cache.get_or_compute("k", source.compute) for _ in range(20)))
+        assert results == [1] * 20
+        assert source.calls == 1
+        assert cache.get_stats()["coalesced"] == 19
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_waiters_and_are_not_cached(self):
+        cache = AsyncTTLCache()
+        calls = []
+
+        async def failing():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise ValueError("db down")
+
+        results = await asyncio.gather(
+            *(cache.get_or_compute("k", failing) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(r, ValueError) for r in results)
+        assert len(calls) == 1
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_coalesced_callers(self):
+        cache = AsyncTTLCache()
+        source = Source(delay=0.05)
+
+        first = asyncio.ensure_future(cache.get_or_compute("k", source.compute))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(cache.get_or_compute("k", source.compute))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await asyncio.wait_for(second, timeout=1) == 1
+        assert first.cancelled()
+        assert source.calls == 1
+        # The computation finished for the remaining caller and was cached
+        assert await cache.get_or_compute("k", source.compute) == 1
+        assert source.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_bound(self):
+        cache = AsyncTTLCache(max_entries=2)
+        source = Source()
+        for key in ("a", "b", "a", "c"):
+            await cache.get_or_compute(key, source.compute)
+        assert cache.invalidate("a") and not cache.invalidate("b")
+
+    @pytest.mark.asyncio
+    async def test_decorator_keys_on_arguments(self):
+        cache = AsyncTTLCache()
+        calls = []
+
+        @cached(cache, tags=("whales",))
+        async def lookup(x, scale=1):
+            calls.append((x, scale))
+            return x * scale
+
+        assert await lookup(2) == 2
+        assert await lookup(2) == 2
+        assert await lookup(2, scale=3) == 6
+        assert calls == [(2, 1), (2, 3)]
+        assert lookup.__name__ == "lookup"
+
+
+# ==================== Invalidation ====================
+
+class TestInvalidation:
+    """Tags drop entries and fence in-flight computations"""
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tags(self):
+        cache = AsyncTTLCache()
+        source = Source()
+        await cache.get_or_compute("whales", source.compute, tags=("whales",))
+        await cache.get_or_compute("stats", source.compute, tags=("whales", "trades"))
+        await cache.get_or_compute("other", source.compute, tags=("agents",))
+
+        assert cache.invalidate_tags("trades", "positions") == 1
+        assert cache.invalidate_tags("whales") == 1
+        assert len(cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_result_started_before_invalidation_is_not_stored(self):
+        cache = AsyncTTLCache()
+        source = Source(delay=0.02)
+        pending = asyncio.ensure_future(cache.get_or_compute("k", source.compute, tags=("whales",)))
+        await asyncio.sleep(0.005)
+        cache.invalidate_tags("whales")
+        source.value = 2
+
+        assert await pending == 1
+        assert await cache.get_or_compute("k", source.compute, tags=("whales",)) == 2
+
+    @pytest.mark.asyncio
+    async def test_threadsafe_invalidation(self):
+        cache = AsyncTTLCache()
+        cache.invalidate_tags_threadsafe("whales")  # Not started: no-op
+        cache.start()
+        await cache.get_or_compute("k", Source().compute, tags=("whales",))
+
+        worker = threading.Thread(target=cache.invalidate_tags_threadsafe, args=("whales",))
+        worker.start()
+        worker.join()
+        await asyncio.sleep(0)
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_change_feed_listener_invalidates_before_refresh(self):
+        cache = AsyncTTLCache()
+        source = Source()
+
+        @cached(cache, tags=("whales",))
+        async def load_stats():
+            return {"count": await source.compute()}
+
+        feed = ChangeFeed()
+        feed.register("whales", "address", lambda: asyncio.sleep(0, result=[]))
+        feed.register("stats", None, load_stats, refresh_on=["whales"], min_refresh_interval=0)
+        feed.add_listener(lambda topic, key: cache.invalidate_tags(topic))
+        await feed.subscribe(object(), ["whales", "stats"])
+
+        source.value = 7
+        await feed.publish("whales", "0xabc", row={"address": "0xabc"})
+        await asyncio.sleep(0.01)
+        assert feed.topics["stats"].snapshot() == {"count": 7}
@@ -0,0 +1,169 @@
+"""
+Unit tests for the strategy account ledger
+Tests incremental aggregates, replay after restart and per-account locking
+"""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from src.paper_trading.strategy_ledger import LedgerError, StrategyLedger
+
+
+# ==================== Fixtures ====================
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "ledger.db")
+
+
+async def open_trade(ledger, account_id, market_id="m1", side="YES", amount=100.0, price=0.5):
+    async with ledger.locked(account_id) as account:
+        return await ledger.open_position(account, market_id, side, amount, price)
+
+
+# ==================== Aggregates ====================
+
+class TestAggregates:
+    """Running totals match the trades applied"""
+
+    @pytest.mark.asyncio
+    async def test_open_aggregates_position_and_debits_cash(self):
+        ledger = StrategyLedger()
+        await ledger.ensure_account("s1", 1000.0)
+        await open_trade(ledger, "s1", amount=100.0, price=0.5)
+        trade = await open_trade(ledger, "s1", amount=150.0, price=0.75)
+
+        account = ledger.get_account("s1")
+        position = account.positions["m1_YES"]
+        assert trade["id"] == 2
+        assert position.shares == pytest.approx(400.0)
+        assert position.entry_price == pytest.approx(0.625)
+        assert account.balance == pytest.approx(750.0)
+        # Marked at the last fill: 400 shares * 0.75 - 250 cost
+        assert account.unrealized_pnl == pytest.approx(50.0)
+        assert account.total_value == pytest.approx(1050.0)
+
+    @pytest.mark.asyncio
+    async def test_close_realizes_pnl_and_counts_wins(self):
+        ledger = StrategyLedger()
+        await ledger.ensure_account("s1", 1000.0)
+        await open_trade(ledger, "s1", "m1", amount=100.0, price=0.5)
+        await open_trade(ledger, "s1", "m2", amount=100.0, price=0.5)
+
+        async with ledger.locked("s1") as account:
+            await ledger.close_position(account, "m1", "YES", 0.8)
+            await ledger.close_position(account, "m2", "YES", 0.4)
+
+        summary = ledger.get_account("s1").summary()
+        assert summary["realized_pnl"] == pytest.approx(60.0 - 20.0)
+        assert (summary["closed_trades"], summary["winning_trades"]) == (2, 1)
+        assert summary["win_rate"] == 50.0
+        assert summary["open_positions"] == 0
+        assert summary["balance"] == pytest.approx(1040.0)
+        assert summary["unrealized_pnl"] == pytest.approx(0.0)
+
+    @pytest.mark.asyncio
+    async def test_mark_price_updates_only_holders(self):
+        ledger = StrategyLedger()
+        for account_id in ("a", "b"):
+            await ledger.ensure_account(account_id, 1000.0)
+        await open_trade(ledger, "a", "m1", amount=100.0, price=0.5)
+
+        assert ledger.mark_price("m1", "YES", 0.6) == 1
+        assert ledger.mark_price("m1", "NO", 0.4) == 0
+        assert ledger.get_account("a").unrealized_pnl == pytest.approx(20.0)
+        assert ledger.get_account("b").unrealized_pnl == 0.0
+
+    @pytest.mark.asyncio
+    async def test_recent_trades_window_is_bounded(self):
+        ledger = StrategyLedger(recent_trades=3)
+        await ledger.ensure_account("s1", 1000.0)
+        for i in range(10):
+            await open_trade(ledger, "s1", f"m{i}", amount=10.0)
+
+        account = ledger.get_account("s1")
+        assert [t["id"] for t in account.recent_trades] == [8, 9, 10]
+        assert account.trade_count == 10
+        history = await ledger.history("s1", limit=4)
+        assert [t["id"] for t in history] == [10, 9, 8, 7]
+        older = await ledger.history("s1", limit=4, before_seq=history[-1]["seq"])
+        assert [t["id"] for t in older] == [6, 5, 4, 3]
+
+
+# ==================== Persistence ====================
+
+class TestPersistence:
+    """Append-only storage and replay"""
+
+    @pytest.mark.asyncio
+    async def test_replay_rebuilds_accounts_since_last_reset(self, db_path):
+        ledger = StrategyLedger(db_path)
+        await ledger.ensure_account("s1", 1000.0)
+        await open_trade(ledger, "s1", "old", amount=500.0)
+        async with ledger.locked("s1") as account:
+            await ledger.reset(account, 2000.0)
+        await open_trade(ledger, "s1", "m1", amount=100.0, price=0.25)
+        async with ledger.locked("s1") as account:
+            await ledger.close_position(account, "m1", "YES", 0.5)
+        expected = ledger.get_account("s1").summary()
+        ledger.close()
+
+        restarted = StrategyLedger(db_path)
+        restarted.open()
+        account = restarted.get_account("s1")
+        assert account.summary() == expected
+        assert account.initial_balance == 2000.0
+        assert [t["market_id"] for t in account.recent_trades] == ["m1", "m1"]
+        assert restarted.entries_replayed == 3
+
+        # Entries are only ever appended
+        kinds = [k for (k,) in sqlite3.connect(db_path).execute("SELECT kind FROM ledger_entries ORDER BY seq")]
+        assert kinds == ["reset", "open", "reset", "open", "close"]
+
+    @pytest.mark.asyncio
+    async def test_ensure_account_keeps_existing_state(self, db_path):
+        ledger = StrategyLedger(db_path)
+        await ledger.ensure_account("s1", 1000.0)
+        await open_trade(ledger, "s1")
+        ledger.close()
+
+        restarted = StrategyLedger(db_path)
+        account = await restarted.ensure_account("s1", 5000.0)
+        assert account.balance == pytest.approx(900.0)
+
+
+# ==================== Concurrency ====================
+
+class TestConcurrency:
+    """Per-account locking"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_sizing_never_overspends(self):
+        ledger = StrategyLedger()
+        await ledger.ensure_account("s1", 1000.0)
+
+        async def spend_half():
+            async with ledger.locked("s1") as account:
+                amount = account.balance / 2
+                await asyncio.sleep(0)  # Yield between read and debit
+                return await ledger.open_position(account, "m1", "YES", amount, 0.5)
+
+        trades = await asyncio.gather(*(spend_half() for _ in range(4)))
+        assert [t["amount"] for t in trades] == [500.0, 250.0, 125.0, 62.5]
+        assert ledger.get_account("s1").balance == pytest.approx(62.5)
+
+    @pytest.mark.asyncio
+    async def test_mutations_require_lock_and_balance(self):
+        ledger = StrategyLedger()
+        account = await ledger.ensure_account("s1", 100.0)
+        with pytest.raises(LedgerError):
+            await ledger.open_position(account, "m1", "YES", 10.0, 0.5)
+
+        with pytest.raises(LedgerError):
+            await open_trade(ledger, "s1", amount=200.0)
+        with pytest.raises(LedgerError):
+            async with ledger.locked("missing"):
+                pass
+        assert account.trade_count == 0
@@ -0,0 +1,141 @@
+"""
+Unit tests for the strategy membership index behind /api/strategies/copy-trade
+Tests index parity with per-strategy filtering and constant-cost trade copying
+"""
+
+import copy
+import random
+
+import pytest
+
+import api.main as api
+from src.paper_trading.strategy_ledger import StrategyLedger
+
+
+# ==================== Fixtures ====================
+
+def make_whales(count: int, seed: int = 3):
+    rng = random.Random(seed)
+    whales = [{
+        "address": f"0x{i:040x}",
+        "pseudonym": f"whale_{i}",
+        "tier": rng.choice(["MEGA", "HIGH", "MEDIUM", "LOW"]),
+        "quality_score": round(rng.uniform(70, 100), 2),
+        "win_rate": round(rng.uniform(52, 80), 2),
+        "sharpe_ratio": round(rng.uniform(0.8, 3.5), 2),
+        "total_pnl": round(rng.uniform(-5000, 50000), 2),
+        "total_trades": rng.randint(20, 2000),
+        "total_volume": round(rng.uniform(1e4, 1e7), 2)
+    } for i in range(count)]
+    whales.sort(key=lambda w: w["quality_score"], reverse=True)
+    return api.QualifiedWhales(
+        whales=whales,
+        by_address={w["address"]: w for w in whales},
+        pseudonyms={w["address"]: w["pseudonym"] for w in whales}
+    )
+
+
+@pytest.fixture
+def qualified(monkeypatch):
+    whales = make_whales(200)
+
+    async def fake_qualified_whales():
+        return whales
+
+    api.response_cache.clear()
+    monkeypatch.setattr(api, "get_qualified_whales", fake_qualified_whales)
+    monkeypatch.setattr(api, "strategies", copy.deepcopy(api.strategies))
+    monkeypatch.setattr(api, "ledger", StrategyLedger())
+    yield whales
+    api.response_cache.clear()
+
+
+@pytest.fixture
+def copied(monkeypatch):
+    calls = []
+
+    async def fake_copy(strategy_id, trade_data, whale_data):
+        calls.append((strategy_id, whale_data["address"]))
+        return {"success": True}
+
+    monkeypatch.setattr(api, "copy_trade_to_strategy", fake_copy)
+    return calls
+
+
+# ==================== Index ====================
+
+class TestMembershipIndex:
+    """Index matches per-strategy filtering"""
+
+    @pytest.mark.asyncio
+    async def test_index_matches_filtering(self, qualified):
+        membership = await api.get_strategy_membership()
+        for strategy_id, strategy in api.strategies.items():
+            members = {w["address"] for w in api.filter_whales_by_strategy(strategy, qualified.whales)}
+            indexed = {address for address, ids in membership.items() if strategy_id in ids}
+            assert indexed == members
+
+    @pytest.mark.asyncio
+    async def test_index_is_built_once(self, qualified, monkeypatch):
+        builds = []
+        original = api.filter_whales_by_strategy
+
+        def counting_filter(strategy, whales):
+            builds.append(strategy["id"])
+            return original(strategy, whales)
+
+        monkeypatch.setattr(api, "filter_whales_by_strategy", counting_filter)
+        for _ in range(5):
+            await api.get_strategy_membership()
+        assert len(builds) == len(api.strategies)
+
+        api.response_cache.invalidate_tags("whales")
+        await api.get_strategy_membership()
+        assert len(builds) == 2 * len(api.strategies)
+
+
+# ==================== Copy Trade ====================
+
+class TestCopyTrade:
+    """Trades go to active strategies the whale belongs to"""
+
+    @pytest.mark.asyncio
+    async def test_copies_to_active_matching_strategies(self, qualified, copied):
+        top_whale = qualified.whales[0]["address"]
+        membership = await api.get_strategy_membership()
+        assert membership[top_whale]
+
+        active = membership[top_whale][0]
+        api.strategies[active]["active"] = True
+        result = await api.copy_trade_to_strategies({"trader_address": top_whale, "amount": 100})
+
+        assert result["strategies_copied"] == 1
+        assert copied == [(active, top_whale)]
+
+    @pytest.mark.asyncio
+    async def test_activation_does_not_rebuild_index(self, qualified, copied):
+        before = await api.get_strategy_membership()
+        for strategy_id in api.strategies:
+            await api.activate_strategy(strategy_id)
+        assert await api.get_strategy_membership() is before
+
+    @pytest.mark.asyncio
+    async def test_new_strategy_invalidates_index(self, qualified, copied):
+        await api.get_strategy_membership()
+        response = await api.create_custom_strategy({
+            "name": "Sharpe Only",
+            "description": "High Sharpe whales",
+            "criteria_type": "filter",
+            "min_sharpe": 3.0,
+            "base_position_pct": 2.0,
+            "max_position_pct": 5.0,
+            "initial_balance": 1000.0
+        })
+        membership = await api.get_strategy_membership()
+
+        members = {a for a, ids in membership.items() if response["strategy_id"] in ids}
+        assert members == {
+            w["address"] for w in qualified.whales
+            if w["sharpe_ratio"] >= 3.0 and w["tier"] != "LOW"
+        }
+        assert members
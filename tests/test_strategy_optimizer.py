@@ -0,0 +1,137 @@
+"""
+Unit tests for the genetic strategy optimizer
+Tests fitness memoization, batched evaluation and early termination
+"""
+
+import asyncio
+import random
+
+import numpy as np
+import pytest
+
+from src.optimization.strategy_optimizer import GeneticOptimizer, StrategyOptimizer
+
+
+# ==================== Fixtures ====================
+
+def seed(value: int = 7):
+    random.seed(value)
+    np.random.seed(value)
+
+
+@pytest.fixture(autouse=True)
+def seeded():
+    seed()
+
+
+class CountingFitness:
+    """Scores kelly_fraction, counting calls and peak concurrency"""
+
+    def __init__(self, offset: float = 0.0, delay: float = 0.0):
+        self.offset = offset
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, params) -> float:
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return params.kelly_fraction + self.offset
+
+
+def small_optimizer(**kwargs) -> GeneticOptimizer:
+    defaults = dict(population_size=10, generations=5, elite_size=2, convergence_patience=0)
+    defaults.update(kwargs)
+    return GeneticOptimizer(**defaults)
+
+
+# ==================== Memoization ====================
+
+class TestMemoization:
+    """Rounded parameter vectors are scored once per run"""
+
+    @pytest.mark.asyncio
+    async def test_duplicates_are_cache_hits(self):
+        optimizer = small_optimizer()
+        fitness = CountingFitness()
+        individual = optimizer._initialize_population()[0]
+        nearly_same = individual + 1e-9
+
+        scores = await optimizer._evaluate_population([individual, nearly_same, individual], fitness)
+        assert fitness.calls == 1
+        assert len(set(scores)) == 1
+        assert (optimizer.cache_hits, optimizer.cache_misses) == (2, 1)
+
+        await optimizer._evaluate_population([individual], fitness)
+        assert fitness.calls == 1 and optimizer.cache_hits == 3
+
+    @pytest.mark.asyncio
+    async def test_cache_is_cleared_between_runs(self):
+        optimizer = small_optimizer()
+        first = await optimizer.optimize(CountingFitness(offset=0.0))
+
+        # Same seed, so the second run visits the same vectors
+        seed()
+        second_fitness = CountingFitness(offset=100.0)
+        second = await optimizer.optimize(second_fitness)
+        assert second.best_score > 100.0 > first.best_score
+        assert second_fitness.calls == optimizer.cache_misses > 0
+
+    @pytest.mark.asyncio
+    async def test_strategy_optimizer_rescoring_new_data(self):
+        class Backtester:
+            async def run(self, data, params):
+                return {"total_return": data[0]["return"]}
+
+        optimizer = StrategyOptimizer(Backtester())
+        optimizer.genetic_optimizer = small_optimizer()
+        low = await optimizer.optimize([{"return": 0.0}] * 10, method="genetic")
+        seed()
+        high = await optimizer.optimize([{"return": 10.0}] * 10, method="genetic")
+        assert high["genetic"].best_score - low["genetic"].best_score == pytest.approx(3.0)
+
+
+# ==================== Batched Evaluation ====================
+
+class TestBatchedEvaluation:
+    """A population is awaited together, bounded by max_concurrency"""
+
+    @pytest.mark.asyncio
+    async def test_population_runs_concurrently(self):
+        optimizer = small_optimizer(max_concurrency=4)
+        fitness = CountingFitness(delay=0.01)
+        population = optimizer._initialize_population()
+
+        scores = await optimizer._evaluate_population(population, fitness)
+        assert fitness.calls == 10
+        assert fitness.peak == 4
+        assert scores == [pytest.approx(ind[1]) for ind in population]
+
+
+# ==================== Early Termination ====================
+
+class TestEarlyTermination:
+    """Stops once the best fitness plateaus"""
+
+    @pytest.mark.asyncio
+    async def test_flat_fitness_stops_after_patience(self):
+        async def flat(params):
+            return 1.0
+
+        optimizer = small_optimizer(generations=50, convergence_patience=3)
+        result = await optimizer.optimize(flat)
+        # Generation 0 improves on -inf, then three stale generations
+        assert len(result.optimization_history) == 4
+
+    @pytest.mark.asyncio
+    async def test_disabled_patience_runs_all_generations(self):
+        async def flat(params):
+            return 1.0
+
+        optimizer = small_optimizer(generations=6, convergence_patience=0)
+        result = await optimizer.optimize(flat)
+        assert len(result.optimization_history) == 6
@@ -0,0 +1,200 @@
+"""
+Unit tests for streaming return moments
+Checks the O(1) estimators against full-array numpy/scipy computations
+"""
+
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from libs.analytics.streaming_moments import EWMAMoments, RollingMoments, RunningMoments
+from libs.trading.position_sizing import EWMAVolatilityEstimator
+from src.risk.live_risk_manager import LiveRiskManager
+from src.risk.risk_dashboard import RiskDashboard
+from src.risk_management.cornish_fisher_var import CornishFisherVaR
+
+
+def fat_tailed_returns(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.standard_t(4, size=n) * 0.02 + 0.001
+
+
+def assert_matches(moments, x: np.ndarray):
+    assert len(moments) == len(x)
+    assert moments.mean == pytest.approx(np.mean(x), rel=1e-9, abs=1e-15)
+    assert moments.variance() == pytest.approx(np.var(x), rel=1e-9)
+    assert moments.std(ddof=1) == pytest.approx(np.std(x, ddof=1), rel=1e-9)
+    assert moments.skewness == pytest.approx(stats.skew(x), rel=1e-7, abs=1e-9)
+    assert moments.excess_kurtosis == pytest.approx(stats.kurtosis(x), rel=1e-7, abs=1e-9)
+
+
+# ==================== RunningMoments ====================
+
+class TestRunningMoments:
+    """Exact streaming moments"""
+
+    def test_updates_match_scipy(self):
+        x = fat_tailed_returns(500)
+        moments = RunningMoments()
+        for value in x:
+            moments.update(value)
+        assert_matches(moments, x)
+        assert_matches(RunningMoments.from_values(x), x)
+
+    def test_merge_equals_concatenation(self):
+        x = fat_tailed_returns(600, seed=1)
+        left = RunningMoments.from_values(x[:250])
+        left.merge(RunningMoments.from_values(x[250:]))
+        assert_matches(left, x)
+
+    def test_remove_inverts_update(self):
+        x = fat_tailed_returns(300, seed=2)
+        moments = RunningMoments.from_values(x)
+        for value in x[:100]:
+            moments.remove(value)
+        assert_matches(moments, x[100:])
+
+    def test_degenerate_sample(self):
+        moments = RunningMoments.from_values([0.01] * 10)
+        assert moments.variance() == pytest.approx(0.0, abs=1e-20)
+        assert moments.skewness == 0.0
+        assert moments.excess_kurtosis == 0.0
+
+
+# ==================== RollingMoments ====================
+
+class TestRollingMoments:
+    """Exact moments over a sliding window"""
+
+    def test_window_matches_exact_across_rebuilds(self):
+        x = fat_tailed_returns(1000, seed=3)
+        window = 64
+        moments = RollingMoments(window)
+        for i, value in enumerate(x):
+            evicted = moments.update(value)
+            assert evicted == (x[i - window] if i >= window else None)
+            if i % 97 == 1 or i == len(x) - 1:
+                assert_matches(moments, x[max(0, i + 1 - window):i + 1])
+        np.testing.assert_array_equal(moments.values(), x[-window:])
+
+    def test_exposes_only_window_operations(self):
+        moments = RollingMoments(5)
+        assert not isinstance(moments, RunningMoments)
+        assert not hasattr(moments, "remove")
+        assert not hasattr(moments, "merge")
+
+    def test_invalid_window(self):
+        with pytest.raises(ValueError):
+            RollingMoments(0)
+
+
+# ==================== EWMAMoments ====================
+
+class TestEWMAMoments:
+    """Exponentially weighted moments"""
+
+    def test_matches_normalized_weight_vector(self):
+        x = fat_tailed_returns(200, seed=4)
+        lam = 0.94
+        weights = lam ** np.arange(len(x) - 1, -1, -1)
+        weights /= weights.sum()
+        mean = weights @ x
+
+        streamed = EWMAMoments(lam)
+        for value in x:
+            streamed.update(value)
+        batched = EWMAMoments(lam)
+        batched.update_many(x[:7])
+        batched.update_many(x[7:])
+
+        for moments in (streamed, batched):
+            assert moments.mean == pytest.approx(mean, rel=1e-9)
+            assert moments.square_variance == pytest.approx(weights @ x**2, rel=1e-9)
+            assert moments.variance() == pytest.approx(weights @ (x - mean) ** 2, rel=1e-9)
+
+    def test_seeded_recursion(self):
+        x = fat_tailed_returns(50, seed=5)
+        lam, variance = 0.94, 0.0004
+        expected = variance
+        for value in x:
+            expected = lam * expected + (1 - lam) * value**2
+
+        moments = EWMAMoments(lam, initial_variance=variance)
+        moments.update_many(x)
+        assert moments.square_variance == pytest.approx(expected, rel=1e-12)
+
+    def test_volatility_estimator_round_trip(self):
+        estimator = EWMAVolatilityEstimator()
+        estimator.update(list(fat_tailed_returns(40, seed=6)))
+        restored = EWMAVolatilityEstimator.from_dict(estimator.to_dict())
+        assert restored.get_volatility() == estimator.get_volatility()
+
+
+# ==================== Serialization ====================
+
+class TestSerialization:
+    """to_dict()/from_dict() round-trips"""
+
+    @pytest.mark.parametrize("factory", [
+        RunningMoments,
+        lambda: RollingMoments(30),
+        lambda: EWMAMoments(0.97, initial_variance=0.001),
+    ])
+    def test_round_trip_continues_identically(self, factory):
+        x = fat_tailed_returns(100, seed=7)
+        original = factory()
+        for value in x[:60]:
+            original.update(value)
+        restored = type(original).from_dict(original.to_dict())
+        for value in x[60:]:
+            original.update(value)
+            restored.update(value)
+        assert restored.mean == pytest.approx(original.mean, rel=1e-12)
+        assert restored.variance() == pytest.approx(original.variance(), rel=1e-12)
+        assert restored.skewness == pytest.approx(original.skewness, rel=1e-9)
+
+
+# ==================== Risk Consumers ====================
+
+class TestRiskConsumers:
+    """Risk metrics read from streaming moments match the array versions"""
+
+    def test_cornish_fisher_from_moments(self):
+        x = fat_tailed_returns(250, seed=8)
+        var = CornishFisherVaR()
+        from_array = var.calculate_mvar(x, 0.99)
+        from_moments = var.calculate_mvar_from_moments(RunningMoments.from_values(x), 0.99)
+        assert from_moments['mvar'] == pytest.approx(from_array['mvar'], rel=1e-12)
+        assert from_moments['cvar'] is None
+
+    def test_live_risk_manager_returns_and_sharpe(self):
+        x = fat_tailed_returns(1200, seed=9)
+        values = 100000 * np.cumprod(1 + x)
+        manager = LiveRiskManager()
+        for value in values:
+            manager.record_trade({"portfolio_value": Decimal(str(value))})
+
+        window = values[-LiveRiskManager.MAX_TRADE_HISTORY:]
+        expected = np.diff(window) / window[:-1]
+        returns = manager._calculate_returns()
+        np.testing.assert_allclose(returns, expected, rtol=1e-9)
+
+        excess = expected - 0.02 / 252
+        sharpe = np.mean(excess) / np.std(excess) * np.sqrt(252)
+        assert manager._calculate_sharpe(returns, moments=manager.return_moments) == pytest.approx(sharpe, rel=1e-7)
+
+    def test_dashboard_ratios_match_numpy(self):
+        x = fat_tailed_returns(400, seed=10)
+        values = 100000 * np.cumprod(1 + x)
+        dashboard = RiskDashboard()
+        for value in values:
+            dashboard.update_portfolio(Decimal(str(value)), Decimal("0"), {})
+
+        window = np.array([float(r) for r in dashboard.daily_returns[-252:]])
+        downside = window[window < 0]
+        assert float(dashboard._calculate_volatility()) == pytest.approx(np.std(window), rel=1e-9)
+
+        sortino = (np.mean(window) * 252 - 0.04) / (np.std(downside) * np.sqrt(252))
+        assert float(dashboard._calculate_sortino_ratio()) == pytest.approx(sortino, rel=1e-7)
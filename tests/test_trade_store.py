@@ -0,0 +1,240 @@
+"""
+Unit tests for the shared analytics TradeStore
+Covers the entity indexes, retention segments, module sharing and dirty sets
+"""
+
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from src.analytics.trade_store import DirtySet, TradeRecord, TradeStore
+from src.analytics.edge_detection_system import EdgeConfig, EdgeDetectionSystem
+from src.analytics.cusum_edge_decay_detector import CUSUMConfig, CUSUMEdgeDecayDetector
+from src.analytics.whale_lifecycle_tracker import LifecycleConfig, WhaleLifecycleTracker
+from src.analytics.market_efficiency_analyzer import (
+    EfficiencyConfig, MarketEfficiencyAnalyzer, Trade as EfficiencyTrade,
+)
+
+
+# ==================== Fixtures ====================
+
+@pytest.fixture
+def records():
+    """Trades over the last 60 days for a handful of whales and markets"""
+    rng = random.Random(3)
+    now = datetime.now()
+    records = []
+    for n in range(300):
+        exit_time = now - timedelta(hours=rng.uniform(0, 24 * 60))
+        is_open = rng.random() < 0.1
+        records.append(TradeRecord(
+            trade_id=f"t{n}",
+            whale_address=f"0xwhale{rng.randrange(5)}",
+            market_id=f"market_{rng.randrange(12)}",
+            entry_time=exit_time - timedelta(hours=3),
+            exit_time=None if is_open else exit_time,
+            pnl_usd=Decimal(str(round(rng.uniform(-40, 50), 2))),
+            is_open=is_open,
+        ))
+    return records
+
+
+# ==================== Tests ====================
+
+class TestTradeStore:
+    """Indexes and segments"""
+
+    def test_entity_views_match_scan(self, records):
+        """Index lookups return the same trades, in order, as a full scan"""
+        store = TradeStore.from_trades(records)
+        cutoff = datetime.now() - timedelta(days=7)
+
+        for whale in {t.whale_address for t in records}:
+            assert store.for_whale(whale) == [t for t in records if t.whale_address == whale]
+            assert store.for_whale(whale, closed_only=True) == [
+                t for t in records if t.whale_address == whale and not t.is_open
+            ]
+        for market in {t.market_id for t in records}:
+            assert store.for_market(market, since=cutoff) == [
+                t for t in records
+                if t.market_id == market and not t.is_open and t.exit_time and t.exit_time >= cutoff
+            ]
+
+        assert sorted(store.markets()) == sorted({t.market_id for t in records})
+        assert store.for_whale("0xunknown") == []
+
+    def test_retention_drops_old_segments(self, records):
+        """Segments older than the retention window are evicted as new days open"""
+        ordered = sorted(records, key=lambda t: t.exit_time or t.entry_time)
+        store = TradeStore.from_trades(ordered, retention_days=14)
+
+        newest = (ordered[-1].exit_time or ordered[-1].entry_time).toordinal()
+        kept = [t for t in ordered if (t.exit_time or t.entry_time).toordinal() >= newest - 14]
+
+        assert store.trades == kept
+        assert sum(len(store.for_whale(w)) for w in store.whales()) == len(kept)
+        assert len(store.columns()) == len(kept)
+
+    def test_entity_columns_read_only_requested_rows(self, records):
+        """A dirty subset costs its own trades, not the whole history"""
+        store = TradeStore.from_trades(records)
+        cols, codes, labels, rows = store.entity_columns("whale", ["0xwhale1", "0xunknown", "0xwhale3"])
+
+        assert labels == ["0xwhale1", "0xwhale3"]
+        expected = store._by_whale["0xwhale1"] + store._by_whale["0xwhale3"]
+        assert rows.tolist() == expected
+        assert len(cols) == len(expected) < len(records)
+        assert [labels[c] for c in codes] == [records[r].whale_address for r in rows]
+        assert cols.pnl.tolist() == [float(records[r].pnl_usd) for r in rows]
+
+
+class TestSharedStore:
+    """Modules reading one store behave as if each owned the trades"""
+
+    @pytest.mark.asyncio
+    async def test_modules_share_one_history(self, records):
+        """A trade appended once is seen by edge, CUSUM and lifecycle"""
+        store = TradeStore()
+        edge = EdgeDetectionSystem(EdgeConfig(), trade_store=store)
+        cusum = CUSUMEdgeDecayDetector(CUSUMConfig(), trade_store=store)
+        lifecycle = WhaleLifecycleTracker(LifecycleConfig(), trade_store=store)
+        store.extend(records)
+
+        standalone = EdgeDetectionSystem(EdgeConfig(use_numeric_core=False))
+        for trade in records:
+            standalone.add_trade(trade)
+
+        await edge.calculate_all_edges()
+        await standalone.calculate_all_edges()
+        await cusum.update_all_cusum()
+        await lifecycle.update_all_lifecycles()
+
+        assert edge.trades is cusum.trades is lifecycle.trades
+        assert edge.whale_edges.keys() == standalone.whale_edges.keys()
+        for whale, metrics in standalone.whale_edges.items():
+            assert float(edge.whale_edges[whale].edge) == pytest.approx(float(metrics.edge))
+        assert set(cusum.cusum_states) == set(lifecycle.whale_states) == set(store.whales())
+
+    @pytest.mark.asyncio
+    async def test_integration_appends_once(self):
+        """AnalyticsIntegration.on_trade stores one record for all three modules"""
+        from src.analytics.analytics_integration import AnalyticsIntegration, AnalyticsIntegrationConfig
+
+        config = AnalyticsIntegrationConfig(
+            enable_performance_metrics=False,
+            enable_attribution=False,
+            enable_benchmarking=False,
+            enable_reporting=False,
+            enable_realtime_dashboard=False,
+            enable_market_efficiency=False,
+            enable_adaptive_thresholds=False,
+        )
+        integration = AnalyticsIntegration(config)
+        await integration.initialize()
+
+        integration.on_trade({
+            'trade_id': 't1',
+            'trader_address': '0xwhale1',
+            'market_id': 'market_1',
+            'price': 0.5,
+            'size': 100,
+            'pnl': 12.5,
+            'is_open': False,
+            'exit_time': datetime.now(),
+        })
+
+        assert len(integration.trade_store) == 1
+        assert integration.edge_detection.trades is integration.lifecycle_tracker.trades
+        assert integration.trade_store.trades[0].position_size_usd == Decimal("50.0")
+
+
+class TestDirtySet:
+    """Incremental updates driven by new trades"""
+
+    def test_drain_returns_marked_entities(self):
+        """First drain is a full pass; later drains return only what was marked"""
+        dirty = DirtySet(full_refresh_seconds=3600)
+        dirty.mark("0xwhale1", "market_1")
+
+        assert dirty.drain() is None
+        assert dirty.drain() == (set(), set())
+
+        dirty.mark("0xwhale2", "market_2")
+        dirty.mark("0xwhale2", "market_3")
+        assert dirty.drain() == ({"0xwhale2"}, {"market_2", "market_3"})
+
+    def test_full_refresh_interval(self):
+        """A zero interval asks for a full pass on every drain"""
+        dirty = DirtySet(full_refresh_seconds=0)
+        dirty.drain()
+        dirty.mark("0xwhale1")
+
+        assert dirty.drain() is None
+
+    @pytest.mark.asyncio
+    async def test_edges_update_only_dirty_entities(self, records):
+        """Clean entities keep their previous EdgeMetrics object"""
+        system = EdgeDetectionSystem(EdgeConfig(), trade_store=TradeStore.from_trades(records))
+        await system.calculate_all_edges()
+        before = dict(system.whale_edges)
+
+        await system.calculate_all_edges(whales={"0xwhale1"}, markets=set())
+
+        for whale, metrics in system.whale_edges.items():
+            assert (metrics is before[whale]) == (whale != "0xwhale1")
+
+    @pytest.mark.asyncio
+    async def test_dirty_subset_matches_full_pass(self, records):
+        """Per-entity reads give the same numbers as grouping the whole store"""
+        store = TradeStore.from_trades(records)
+        full = EdgeDetectionSystem(EdgeConfig(), trade_store=store)
+        await full.calculate_all_edges()
+        dirty = EdgeDetectionSystem(EdgeConfig(), trade_store=store)
+        await dirty.calculate_all_edges(whales={"0xwhale2", "0xwhale4"}, markets={"market_3"})
+
+        assert set(dirty.whale_edges) == {"0xwhale2", "0xwhale4"}
+        for whale, metrics in dirty.whale_edges.items():
+            assert (metrics.edge, metrics.total_trades, metrics.edge_7d) == (
+                full.whale_edges[whale].edge, full.whale_edges[whale].total_trades,
+                full.whale_edges[whale].edge_7d)
+        assert dirty.market_edges["market_3"].edge_30d == full.market_edges["market_3"].edge_30d
+
+        tracker = WhaleLifecycleTracker(LifecycleConfig(), trade_store=store)
+        everyone = tracker._lifecycle_inputs_numeric(None)
+        subset = tracker._lifecycle_inputs_numeric({"0xwhale4", "0xwhale0"})
+        assert subset == {w: everyone[w] for w in ("0xwhale4", "0xwhale0")}
+
+        detector = CUSUMEdgeDecayDetector(CUSUMConfig(), trade_store=store)
+        await detector.update_all_cusum({"0xwhale1"})
+        assert list(detector.cusum_states) == ["0xwhale1"]
+
+    @pytest.mark.asyncio
+    async def test_efficiency_skips_markets_without_closed_trades(self, records):
+        """Dirty markets holding only open trades are not analyzed"""
+        analyzer = MarketEfficiencyAnalyzer(EfficiencyConfig())
+        for t in records:
+            analyzer.add_trade(EfficiencyTrade(
+                t.trade_id, t.whale_address, t.market_id, t.entry_time, t.exit_time,
+                Decimal("0.5"), None, t.pnl_usd, t.is_open
+            ))
+        now = datetime.now()
+        analyzer.add_trade(EfficiencyTrade("open", "0xwhale0", "market_new", now, None,
+                                           Decimal("0.5"), None, Decimal("0"), True))
+
+        await analyzer.analyze_all_markets({"market_new", "market_1"})
+        assert set(analyzer.market_metrics) == {"market_1"}
+
+    @pytest.mark.asyncio
+    async def test_cusum_ignores_repeated_observations(self, records):
+        """Ticks without new closed trades leave the CUSUM state untouched"""
+        detector = CUSUMEdgeDecayDetector(CUSUMConfig(), trade_store=TradeStore.from_trades(records))
+        await detector.update_all_cusum()
+        first = dict(detector.cusum_states)
+
+        await detector.update_all_cusum()
+
+        for whale, state in detector.cusum_states.items():
+            assert state is first[whale]
+            assert len(state.edge_history) == 1
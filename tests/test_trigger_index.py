@@ -0,0 +1,198 @@
+"""
+Unit tests for price-driven stop-loss / take-profit triggers
+Tests the per-token trigger index and parity with full-scan polling
+"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+import pytest
+
+from src.risk.stop_loss_take_profit import (
+    ExitTrigger,
+    RiskControlLimits,
+    StopLossTakeProfitManager,
+)
+from src.risk.trigger_index import TriggerDirection, TriggerIndex
+from src.trading.production_position_manager import PositionStatus
+
+
+# ==================== Fixtures ====================
+
+@dataclass
+class FakePosition:
+    position_id: str
+    token_id: str
+    entry_price: Decimal
+    current_price: Optional[Decimal] = None
+    status: PositionStatus = PositionStatus.OPEN
+    opened_at: datetime = field(default_factory=datetime.now)
+    realized_pnl: Decimal = Decimal("0")
+
+    @property
+    def pnl_percentage(self) -> Decimal:
+        return (self.current_price - self.entry_price) / self.entry_price * Decimal("100")
+
+
+class FakePositionManager:
+    def __init__(self, positions):
+        self.positions = {p.position_id: p for p in positions}
+        self.closed = []
+
+    async def close_position(self, position_id, price, reason, notes=""):
+        position = self.positions[position_id]
+        position.status = PositionStatus.CLOSED
+        self.closed.append((position_id, reason))
+        return True
+
+
+def make_manager(positions, **limits):
+    limits.setdefault("pre_resolution_exit_enabled", False)
+    manager = StopLossTakeProfitManager(FakePositionManager(positions), RiskControlLimits(**limits))
+    for position in positions:
+        manager.arm_position(position)
+    return manager
+
+
+async def push_price(manager, position, price):
+    position.current_price = price
+    return await manager.on_price_update(position.token_id, price)
+
+
+# ==================== Trigger Index ====================
+
+class TestTriggerIndex:
+    """Sorted per-token thresholds"""
+
+    def test_fires_only_crossed_triggers(self):
+        index = TriggerIndex()
+        for i, level in enumerate(["0.40", "0.45", "0.50"]):
+            index.arm(f"p{i}", "tok", "stop", TriggerDirection.BELOW, Decimal(level))
+        index.arm("p3", "tok", "target", TriggerDirection.ABOVE, Decimal("0.70"))
+        index.arm("p4", "other", "stop", TriggerDirection.BELOW, Decimal("0.90"))
+
+        assert index.on_price("tok", Decimal("0.60")) == []
+        fired = index.on_price("tok", Decimal("0.45"))
+        assert sorted(t.position_id for t in fired) == ["p1", "p2"]
+        assert [t.position_id for t in index.on_price("tok", Decimal("0.70"))] == ["p3"]
+        assert index.armed_positions() == ["p0", "p4"]
+
+    def test_disarm_position(self):
+        index = TriggerIndex()
+        index.arm("p1", "tok", "stop", TriggerDirection.BELOW, Decimal("0.5"))
+        index.arm("p1", "tok", "target", TriggerDirection.ABOVE, Decimal("0.8"))
+        index.arm("p2", "tok", "stop", TriggerDirection.BELOW, Decimal("0.5"))
+
+        assert index.disarm_position("p1") == 2
+        assert not index.is_armed("p1")
+        assert [t.position_id for t in index.on_price("tok", Decimal("0.1"))] == ["p2"]
+        assert index.tokens() == []
+
+    def test_matches_linear_scan(self):
+        rng = random.Random(0)
+        index = TriggerIndex()
+        armed = {}
+        for i in range(300):
+            direction = rng.choice(list(TriggerDirection))
+            threshold = Decimal(str(round(rng.uniform(0.05, 0.95), 3)))
+            armed[i] = index.arm(str(i), "tok", "k", direction, threshold)
+
+        for _ in range(50):
+            price = Decimal(str(round(rng.uniform(0.0, 1.0), 3)))
+            expected = {
+                key for key, t in armed.items()
+                if (t.direction == TriggerDirection.BELOW and price <= t.threshold)
+                or (t.direction == TriggerDirection.ABOVE and price >= t.threshold)
+            }
+            fired = {int(t.position_id) for t in index.on_price("tok", price)}
+            assert fired == expected
+            for key in expected:
+                del armed[key]
+
+
+# ==================== Price-Driven Exits ====================
+
+class TestPriceDrivenExits:
+    """StopLossTakeProfitManager.on_price_update"""
+
+    @pytest.mark.asyncio
+    async def test_stop_loss_and_take_profit(self):
+        loser = FakePosition("p1", "tok", Decimal("0.50"))
+        winner = FakePosition("p2", "tok2", Decimal("0.50"))
+        manager = make_manager([loser, winner], trailing_stop_enabled=False)
+
+        assert await push_price(manager, loser, Decimal("0.44")) == []
+        events = await push_price(manager, loser, Decimal("0.42"))
+        assert [e.trigger for e in events] == [ExitTrigger.STOP_LOSS]
+
+        events = await push_price(manager, winner, Decimal("0.66"))
+        assert [e.trigger for e in events] == [ExitTrigger.TAKE_PROFIT]
+        assert len(manager.trigger_index) == 0
+
+    @pytest.mark.asyncio
+    async def test_trailing_stop_ratchets_up(self):
+        position = FakePosition("p1", "tok", Decimal("0.50"))
+        manager = make_manager([position])
+
+        await push_price(manager, position, Decimal("0.56"))
+        state = manager.trailing_stops["p1"]
+        assert state.activated
+        assert state.current_stop_price == Decimal("0.56") * Decimal("0.95")
+
+        await push_price(manager, position, Decimal("0.60"))
+        assert state.current_stop_price == Decimal("0.60") * Decimal("0.95")
+        await push_price(manager, position, Decimal("0.58"))
+        assert state.current_stop_price == Decimal("0.60") * Decimal("0.95")
+
+        events = await push_price(manager, position, Decimal("0.57"))
+        assert [e.trigger for e in events] == [ExitTrigger.TRAILING_STOP]
+        assert "p1" not in manager.trailing_stops
+
+    @pytest.mark.asyncio
+    async def test_failed_close_rearms(self):
+        position = FakePosition("p1", "tok", Decimal("0.50"))
+        manager = make_manager([position], trailing_stop_enabled=False)
+
+        async def refuse(*args, **kwargs):
+            return False
+        manager.position_manager.close_position = refuse
+
+        assert await push_price(manager, position, Decimal("0.40")) == []
+        assert manager.trigger_index.is_armed("p1")
+
+    @pytest.mark.asyncio
+    async def test_matches_polling_on_random_paths(self):
+        """Same exits, at the same price step, as the full-scan checks"""
+        rng = random.Random(7)
+
+        def build():
+            return [FakePosition(f"p{i}", f"tok{i % 4}", Decimal("0.50")) for i in range(12)]
+
+        event_positions = build()
+        polled_positions = build()
+        event_manager = make_manager(event_positions)
+        polled_manager = make_manager(polled_positions, price_driven=False)
+
+        prices = {f"tok{i}": Decimal("0.50") for i in range(4)}
+        for step in range(400):
+            token_id = rng.choice(sorted(prices))
+            move = Decimal(str(round(rng.gauss(0, 0.02), 4)))
+            prices[token_id] = min(max(prices[token_id] + move, Decimal("0.01")), Decimal("0.99"))
+
+            for event_pos, polled_pos in zip(event_positions, polled_positions):
+                if event_pos.token_id == token_id:
+                    event_pos.current_price = prices[token_id]
+                    polled_pos.current_price = prices[token_id]
+
+            await event_manager.on_price_update(token_id, prices[token_id])
+            for position in polled_positions:
+                if position.token_id == token_id and position.status == PositionStatus.OPEN:
+                    await polled_manager._check_position_triggers(position)
+
+            assert [(e.position_id, e.trigger, e.exit_price) for e in event_manager.exit_events] == \
+                [(e.position_id, e.trigger, e.exit_price) for e in polled_manager.exit_events]
+
+        assert len(event_manager.exit_events) > 0